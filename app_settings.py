@@ -0,0 +1,292 @@
+"""
+アプリケーション設定モジュール - config.json を型付き・不変の設定オブジェクトに変換する。
+検証とデフォルト値の補完を行い、描画処理は生の辞書ではなくこのオブジェクトを参照する。
+"""
+import json
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Union
+
+
+# 演算精度の選択肢（"auto" はピクセル間隔から自動選択）
+PRECISION_CHOICES = ("auto", "float64", "double_double")
+# 並列分割方式の選択肢（"auto" はチューニングプロファイルの結果を使用）
+SCHEDULE_CHOICES = ("auto", "rows", "tiles")
+
+
+@dataclass(frozen=True)
+class WindowSettings:
+    """ウィンドウと生成画像のサイズ設定"""
+    title: str = "マンデルブロ集合"
+    width: int = 800
+    height: int = 650
+    image_width: int = 800
+    image_height: int = 600
+
+
+@dataclass(frozen=True)
+class MandelbrotSettings:
+    """フラクタル計算の設定"""
+    default_formula: str = "z * z + c"
+    max_iterations: int = 100
+    real_start: float = -2.0
+    real_end: float = 1.0
+    imaginary_start: float = -1.2
+    imaginary_end: float = 1.2
+
+
+@dataclass(frozen=True)
+class UISettings:
+    """UI表示文字列とアニメーションの設定"""
+    formula_placeholder: str = "zの更新式を入力 (例: z * z + c)"
+    redraw_button_text: str = "再描画"
+    status_ready: str = "準備完了"
+    status_calculating: str = "計算中"
+    status_complete: str = "完了"
+    animation_interval: int = 300
+
+
+@dataclass(frozen=True)
+class PerformanceSettings:
+    """
+    実行中に調整可能なパフォーマンス設定
+
+    num_threads が 0 の場合はチューニングプロファイルのスレッド数
+    （プロファイルがなければNumbaの既定スレッド数＝全コア）を使用する。
+    schedule が "auto" の場合は分割方式・タイルサイズ・チャンクサイズも
+    プロファイルの値を使用する。
+    """
+    numba_cache_enabled: bool = True
+    use_parallel_processing: bool = True
+    num_threads: int = 0
+    precision: str = "auto"
+    tile_size: int = 64
+    formula_cache_limit: int = 32
+    schedule: str = "auto"
+    chunk_size: int = 0
+    auto_tune: bool = False
+    tuning_profile: str = "tuning_profile.json"
+    exploit_symmetry: bool = True
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    """ログ出力の設定"""
+    level: str = "INFO"
+    enabled: bool = True
+    file: str = "logs/app.log"
+    clear_on_startup: bool = False
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    """
+    config.json 全体を表す不変の設定オブジェクト
+
+    インスタンスは変更できないため、設定の更新は新しいインスタンスへの
+    差し替えで行う。描画中のワーカーは開始時のインスタンスを保持し続ける。
+    """
+    window: WindowSettings = field(default_factory=WindowSettings)
+    mandelbrot: MandelbrotSettings = field(default_factory=MandelbrotSettings)
+    ui: UISettings = field(default_factory=UISettings)
+    performance: PerformanceSettings = field(default_factory=PerformanceSettings)
+    logging: LoggingSettings = field(default_factory=LoggingSettings)
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'AppSettings':
+        """
+        設定辞書から設定オブジェクトを生成する
+
+        欠けているキーはデフォルト値で補完される。
+
+        Args:
+            config: config.json を読み込んだ辞書
+
+        Returns:
+            AppSettings: 検証済みの設定オブジェクト
+
+        Raises:
+            ValueError: 設定値の型や範囲が不正な場合
+        """
+        if not isinstance(config, dict):
+            raise ValueError("設定はJSONオブジェクトである必要があります")
+
+        window_cfg = _section(config, "window")
+        mandelbrot_cfg = _section(config, "mandelbrot")
+        real_range = _section(mandelbrot_cfg, "real_range")
+        imag_range = _section(mandelbrot_cfg, "imaginary_range")
+        ui_cfg = _section(config, "ui")
+        perf_cfg = _section(config, "performance")
+        logging_cfg = _section(config, "logging")
+
+        defaults_w = WindowSettings()
+        window = WindowSettings(
+            title=_get_str(window_cfg, "title", defaults_w.title),
+            width=_get_int(window_cfg, "width", defaults_w.width, minimum=1),
+            height=_get_int(window_cfg, "height", defaults_w.height, minimum=1),
+            image_width=_get_int(window_cfg, "image_width", defaults_w.image_width, minimum=1),
+            image_height=_get_int(window_cfg, "image_height", defaults_w.image_height, minimum=1),
+        )
+
+        defaults_m = MandelbrotSettings()
+        mandelbrot = MandelbrotSettings(
+            default_formula=_get_str(mandelbrot_cfg, "default_formula", defaults_m.default_formula),
+            max_iterations=_get_int(mandelbrot_cfg, "max_iterations", defaults_m.max_iterations, minimum=1),
+            real_start=_get_float(real_range, "start", defaults_m.real_start),
+            real_end=_get_float(real_range, "end", defaults_m.real_end),
+            imaginary_start=_get_float(imag_range, "start", defaults_m.imaginary_start),
+            imaginary_end=_get_float(imag_range, "end", defaults_m.imaginary_end),
+        )
+        if mandelbrot.real_start >= mandelbrot.real_end:
+            raise ValueError("mandelbrot.real_range の start は end より小さい必要があります")
+        if mandelbrot.imaginary_start >= mandelbrot.imaginary_end:
+            raise ValueError("mandelbrot.imaginary_range の start は end より小さい必要があります")
+
+        defaults_u = UISettings()
+        ui = UISettings(
+            formula_placeholder=_get_str(ui_cfg, "formula_placeholder", defaults_u.formula_placeholder),
+            redraw_button_text=_get_str(ui_cfg, "redraw_button_text", defaults_u.redraw_button_text),
+            status_ready=_get_str(ui_cfg, "status_ready", defaults_u.status_ready),
+            status_calculating=_get_str(ui_cfg, "status_calculating", defaults_u.status_calculating),
+            status_complete=_get_str(ui_cfg, "status_complete", defaults_u.status_complete),
+            animation_interval=_get_int(ui_cfg, "animation_interval", defaults_u.animation_interval, minimum=1),
+        )
+
+        defaults_p = PerformanceSettings()
+        precision = _get_str(perf_cfg, "precision", defaults_p.precision)
+        if precision not in PRECISION_CHOICES:
+            raise ValueError(
+                f"performance.precision は {', '.join(PRECISION_CHOICES)} のいずれかである必要があります: {precision}")
+        schedule = _get_str(perf_cfg, "schedule", defaults_p.schedule)
+        if schedule not in SCHEDULE_CHOICES:
+            raise ValueError(
+                f"performance.schedule は {', '.join(SCHEDULE_CHOICES)} のいずれかである必要があります: {schedule}")
+        performance = PerformanceSettings(
+            numba_cache_enabled=_get_bool(perf_cfg, "numba_cache_enabled", defaults_p.numba_cache_enabled),
+            use_parallel_processing=_get_bool(perf_cfg, "use_parallel_processing",
+                                              defaults_p.use_parallel_processing),
+            num_threads=_get_int(perf_cfg, "num_threads", defaults_p.num_threads, minimum=0),
+            precision=precision,
+            tile_size=_get_int(perf_cfg, "tile_size", defaults_p.tile_size, minimum=1),
+            formula_cache_limit=_get_int(perf_cfg, "formula_cache_limit",
+                                         defaults_p.formula_cache_limit, minimum=1),
+            schedule=schedule,
+            chunk_size=_get_int(perf_cfg, "chunk_size", defaults_p.chunk_size, minimum=0),
+            auto_tune=_get_bool(perf_cfg, "auto_tune", defaults_p.auto_tune),
+            tuning_profile=_get_str(perf_cfg, "tuning_profile", defaults_p.tuning_profile),
+            exploit_symmetry=_get_bool(perf_cfg, "exploit_symmetry", defaults_p.exploit_symmetry),
+        )
+
+        defaults_l = LoggingSettings()
+        logging = LoggingSettings(
+            level=_get_str(logging_cfg, "level", defaults_l.level).upper(),
+            enabled=_get_bool(logging_cfg, "enabled", defaults_l.enabled),
+            file=_get_str(logging_cfg, "file", defaults_l.file),
+            clear_on_startup=_get_bool(logging_cfg, "clear_on_startup", defaults_l.clear_on_startup),
+        )
+
+        return cls(window=window, mandelbrot=mandelbrot, ui=ui,
+                   performance=performance, logging=logging)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        config.json と同じ構造の辞書に変換する
+
+        Returns:
+            Dict[str, Any]: 設定辞書
+        """
+        m = self.mandelbrot
+        return {
+            "window": asdict(self.window),
+            "mandelbrot": {
+                "default_formula": m.default_formula,
+                "max_iterations": m.max_iterations,
+                "real_range": {"start": m.real_start, "end": m.real_end},
+                "imaginary_range": {"start": m.imaginary_start, "end": m.imaginary_end},
+            },
+            "ui": asdict(self.ui),
+            "performance": asdict(self.performance),
+            "logging": asdict(self.logging),
+        }
+
+
+def load_settings(config_path: Union[str, Path] = "config.json") -> AppSettings:
+    """
+    設定ファイルを読み込み、検証済みの設定オブジェクトを返す
+
+    Args:
+        config_path: 設定ファイルのパス
+
+    Returns:
+        AppSettings: 設定オブジェクト
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        json.JSONDecodeError: JSONの形式が不正な場合
+        ValueError: 設定値が不正な場合
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return AppSettings.from_dict(config)
+
+
+def as_settings(config: Union[AppSettings, Dict[str, Any]]) -> AppSettings:
+    """
+    設定辞書または設定オブジェクトを設定オブジェクトに揃える
+
+    Args:
+        config: 設定辞書または AppSettings
+
+    Returns:
+        AppSettings: 設定オブジェクト
+    """
+    if isinstance(config, AppSettings):
+        return config
+    return AppSettings.from_dict(config)
+
+
+def _section(config: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """設定辞書からサブセクションを取得する（存在しない場合は空辞書）"""
+    value = config.get(key, {})
+    if not isinstance(value, dict):
+        raise ValueError(f"設定 '{key}' はJSONオブジェクトである必要があります")
+    return value
+
+
+def _get_str(section: Dict[str, Any], key: str, default: str) -> str:
+    """文字列の設定値を取得する"""
+    value = section.get(key, default)
+    if not isinstance(value, str):
+        raise ValueError(f"設定 '{key}' は文字列である必要があります: {value!r}")
+    return value
+
+
+def _get_int(section: Dict[str, Any], key: str, default: int, minimum: int) -> int:
+    """整数の設定値を取得し、下限を検証する"""
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"設定 '{key}' は整数である必要があります: {value!r}")
+    if value < minimum:
+        raise ValueError(f"設定 '{key}' は {minimum} 以上である必要があります: {value}")
+    return value
+
+
+def _get_float(section: Dict[str, Any], key: str, default: float) -> float:
+    """数値の設定値を取得する"""
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"設定 '{key}' は数値である必要があります: {value!r}")
+    return float(value)
+
+
+def _get_bool(section: Dict[str, Any], key: str, default: bool) -> bool:
+    """真偽値の設定値を取得する（"true"/"false" 文字列も許容）"""
+    value = section.get(key, default)
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized not in ("true", "false"):
+            raise ValueError(f"設定 '{key}' は真偽値（\"true\" または \"false\"）である必要があります: {value!r}")
+        return normalized == "true"
+    if not isinstance(value, bool):
+        raise ValueError(f"設定 '{key}' は真偽値である必要があります: {value!r}")
+    return value
@@ -0,0 +1,84 @@
+"""
+設定ファイル監視モジュール - config.json の変更を検知して設定オブジェクトを差し替える。
+"""
+from pathlib import Path
+from typing import Union
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from app_settings import AppSettings, load_settings
+from logger.custom_logger import logger
+
+
+class ConfigWatcher(QObject):
+    """
+    config.json を監視し、変更時に新しい AppSettings へ差し替えるクラス
+    読み込みや検証に失敗した場合は現在の設定を維持する
+    """
+    settings_changed = pyqtSignal(object)
+
+    # エディタの連続書き込みをまとめるための待機時間（ミリ秒）
+    DEBOUNCE_MS = 200
+
+    def __init__(self, config_path: Union[str, Path], settings: AppSettings, parent=None):
+        """
+        監視を開始する
+
+        Args:
+            config_path: 監視する設定ファイルのパス
+            settings: 現在の設定オブジェクト
+            parent: 親オブジェクト
+        """
+        super().__init__(parent)
+        self._config_path = str(Path(config_path).resolve())
+        self._settings = settings
+
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self.reload)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(self._config_path)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        logger.info(f"設定ファイルの監視を開始しました: {self._config_path}")
+
+    @property
+    def settings(self) -> AppSettings:
+        """現在の設定オブジェクト"""
+        return self._settings
+
+    def _on_file_changed(self, path: str):
+        """
+        ファイル変更通知を受け取り、再読み込みを予約する
+
+        Args:
+            path: 変更されたファイルのパス
+        """
+        # 一時ファイル経由で保存するエディタでは監視対象から外れるため再登録する
+        if path not in self._watcher.files() and Path(path).exists():
+            self._watcher.addPath(path)
+        self._reload_timer.start()
+
+    def reload(self) -> bool:
+        """
+        設定ファイルを再読み込みし、変更があれば差し替えて通知する
+
+        Returns:
+            bool: 設定が差し替えられた場合True
+        """
+        if self._config_path not in self._watcher.files() and Path(self._config_path).exists():
+            self._watcher.addPath(self._config_path)
+
+        try:
+            new_settings = load_settings(self._config_path)
+        except Exception as e:
+            logger.warning(f"設定ファイルの再読み込みに失敗したため、現在の設定を維持します: {e}")
+            return False
+
+        if new_settings == self._settings:
+            logger.debug("設定ファイルに変更はありませんでした")
+            return False
+
+        self._settings = new_settings
+        logger.info("設定ファイルの変更を反映しました")
+        self.settings_changed.emit(new_settings)
+        return True
@@ -0,0 +1,165 @@
+"""
+倍々精度（double-double）演算によるマンデルブロ集合の計算モジュール。
+2つのfloat64の和 (hi + lo) で約32桁の有効数字を表現し、
+float64では精度が足りない深いズーム（ピクセル間隔 1e-13 ～ 1e-30 程度）で使用する。
+参照軌道やグリッチ補正は不要で、コストはfloat64版の10～20倍程度。
+"""
+import numpy as np
+from numba import jit, prange
+
+
+# Dekker分割の定数（2^27 + 1）
+_SPLITTER = 134217729.0
+
+
+@jit(nopython=True, inline='always')
+def _two_sum(a: float, b: float):
+    """a + b を丸め誤差なしで (和, 誤差) に分解する"""
+    s = a + b
+    bb = s - a
+    err = (a - (s - bb)) + (b - bb)
+    return s, err
+
+
+@jit(nopython=True, inline='always')
+def _quick_two_sum(a: float, b: float):
+    """|a| >= |b| を前提に a + b を (和, 誤差) に分解する"""
+    s = a + b
+    err = b - (s - a)
+    return s, err
+
+
+@jit(nopython=True, inline='always')
+def _split(a: float):
+    """float64を上位26ビットと残りに分割する（Dekker分割）"""
+    t = _SPLITTER * a
+    hi = t - (t - a)
+    lo = a - hi
+    return hi, lo
+
+
+@jit(nopython=True, inline='always')
+def _two_prod(a: float, b: float):
+    """a * b を丸め誤差なしで (積, 誤差) に分解する"""
+    p = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    err = ((a_hi * b_hi - p) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+    return p, err
+
+
+@jit(nopython=True, inline='always')
+def dd_add(a_hi: float, a_lo: float, b_hi: float, b_lo: float):
+    """
+    倍々精度の加算
+
+    Returns:
+        Tuple[float, float]: (hi, lo)
+    """
+    s, e = _two_sum(a_hi, b_hi)
+    t, f = _two_sum(a_lo, b_lo)
+    e += t
+    s, e = _quick_two_sum(s, e)
+    e += f
+    return _quick_two_sum(s, e)
+
+
+@jit(nopython=True, inline='always')
+def dd_mul(a_hi: float, a_lo: float, b_hi: float, b_lo: float):
+    """
+    倍々精度の乗算
+
+    Returns:
+        Tuple[float, float]: (hi, lo)
+    """
+    p, e = _two_prod(a_hi, b_hi)
+    e += a_hi * b_lo + a_lo * b_hi
+    return _quick_two_sum(p, e)
+
+
+@jit(nopython=True, inline='always')
+def dd_from_offset(start_hi: float, start_lo: float, index: int, step: float):
+    """
+    start + index * step を倍々精度で計算する（ピクセル座標の算出用）
+
+    Returns:
+        Tuple[float, float]: (hi, lo)
+    """
+    p, e = _two_prod(float(index), step)
+    return dd_add(start_hi, start_lo, p, e)
+
+
+@jit(nopython=True)
+def _mandelbrot_point_dd_jit(c_real_hi: float, c_real_lo: float,
+                             c_imag_hi: float, c_imag_lo: float,
+                             max_iter: int) -> int:
+    """
+    倍々精度で z = z^2 + c の発散判定を行う。
+
+    Args:
+        c_real_hi (float): cの実部の上位
+        c_real_lo (float): cの実部の下位
+        c_imag_hi (float): cの虚部の上位
+        c_imag_lo (float): cの虚部の下位
+        max_iter (int): 最大反復回数
+
+    Returns:
+        int: 発散までの反復回数（発散しなければmax_iter）
+    """
+    zr_hi = 0.0
+    zr_lo = 0.0
+    zi_hi = 0.0
+    zi_lo = 0.0
+    zr2_hi = 0.0
+    zr2_lo = 0.0
+    zi2_hi = 0.0
+    zi2_lo = 0.0
+
+    for i in range(max_iter):
+        # z_imag = 2 * z_real * z_imag + c_imag（2倍は誤差なし）
+        zri_hi, zri_lo = dd_mul(zr_hi, zr_lo, zi_hi, zi_lo)
+        zi_hi, zi_lo = dd_add(2.0 * zri_hi, 2.0 * zri_lo, c_imag_hi, c_imag_lo)
+
+        # z_real = z_real^2 - z_imag^2 + c_real
+        d_hi, d_lo = dd_add(zr2_hi, zr2_lo, -zi2_hi, -zi2_lo)
+        zr_hi, zr_lo = dd_add(d_hi, d_lo, c_real_hi, c_real_lo)
+
+        zr2_hi, zr2_lo = dd_mul(zr_hi, zr_lo, zr_hi, zr_lo)
+        zi2_hi, zi2_lo = dd_mul(zi_hi, zi_lo, zi_hi, zi_lo)
+
+        # 発散判定（上位部のみで十分）
+        if zr2_hi + zi2_hi > 4.0:
+            return i
+
+    return max_iter
+
+
+@jit(nopython=True, parallel=True)
+def generate_mandelbrot_grid_dd_jit(result: np.ndarray, y_start: int, y_end: int,
+                                    re_start_hi: float, re_start_lo: float,
+                                    im_start_hi: float, im_start_lo: float,
+                                    pixel_width: float, pixel_height: float,
+                                    max_iter: int):
+    """
+    倍々精度でマンデルブロ集合のグリッド計算を並列実行する。
+    表示範囲の原点は倍々精度で受け取るため、float64で表せない深いズームにも対応する。
+    結果配列のうち y_start から y_end-1 の行だけを計算する。
+
+    Args:
+        result (np.ndarray): 反復回数を書き込む2次元配列 (height, width)
+        y_start (int): 計算する最初の行
+        y_end (int): 計算する最後の行の次
+        re_start_hi (float): 実部の開始値の上位
+        re_start_lo (float): 実部の開始値の下位
+        im_start_hi (float): 虚部の開始値の上位
+        im_start_lo (float): 虚部の開始値の下位
+        pixel_width (float): 1ピクセルあたりの実部の増分
+        pixel_height (float): 1ピクセルあたりの虚部の増分
+        max_iter (int): 最大反復回数
+    """
+    width = result.shape[1]
+    for y in prange(y_start, y_end):
+        ci_hi, ci_lo = dd_from_offset(im_start_hi, im_start_lo, y, pixel_height)
+        for x in range(width):
+            cr_hi, cr_lo = dd_from_offset(re_start_hi, re_start_lo, x, pixel_width)
+            result[y, x] = _mandelbrot_point_dd_jit(cr_hi, cr_lo, ci_hi, ci_lo, max_iter)
@@ -8,36 +8,42 @@ import json
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from mandelbrot_window import MandelbrotWindow
+from app_settings import AppSettings, load_settings
+from config_watcher import ConfigWatcher
+from performance_tuner import ensure_tuning_profile
 from numba_utils import configure_numba, get_numba_info
 from logger.custom_logger import logger
 
 
-def load_config(config_path: str = "config.json") -> dict:
+def load_config(config_path: str = "config.json") -> AppSettings:
     """
-    設定ファイルを読み込む。
+    設定ファイルを読み込み、検証済みの設定オブジェクトを返す。
 
     Args:
         config_path (str): 設定ファイルのパス
 
     Returns:
-        dict: 設定情報
+        AppSettings: 設定オブジェクト
 
     Raises:
         FileNotFoundError: 設定ファイルが見つからない場合
         json.JSONDecodeError: JSONの形式が不正な場合
+        ValueError: 設定値が不正な場合
     """
     logger.debug(f"設定ファイルを読み込み中: {config_path}")
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        settings = load_settings(config_path)
         logger.info(f"設定ファイルの読み込みが完了しました: {config_path}")
-        return config
+        return settings
     except FileNotFoundError:
         logger.error(f"設定ファイルが見つかりません: {config_path}")
         raise FileNotFoundError(f"設定ファイル '{config_path}' が見つかりません。")
     except json.JSONDecodeError as e:
         logger.error(f"設定ファイルのJSON形式が不正です: {e}")
-        raise json.JSONDecodeError(f"設定ファイルのJSON形式が不正です: {e}")
+        raise json.JSONDecodeError(f"設定ファイルのJSON形式が不正です: {e.msg}", e.doc, e.pos)
+    except ValueError as e:
+        logger.error(f"設定ファイルの値が不正です: {e}")
+        raise ValueError(f"設定ファイルの値が不正です: {e}")
 
 
 def main():
@@ -60,18 +66,25 @@ def main():
 
     try:
         # 設定ファイルを読み込み
-        config = load_config()
+        settings = load_config()
+
+        # 自動チューニングが有効でプロファイルがなければキャリブレーションを実行
+        ensure_tuning_profile(settings.performance)
 
         # メインウィンドウを作成・表示
         logger.info("メインウィンドウを作成中...")
-        window = MandelbrotWindow(config)
+        window = MandelbrotWindow(settings)
         window.show()
         logger.info("メインウィンドウを表示しました")
 
+        # 設定ファイルの変更を監視し、実行中のウィンドウに反映
+        config_watcher = ConfigWatcher("config.json", settings, window)
+        config_watcher.settings_changed.connect(window.apply_settings)
+
         logger.info("アプリケーションのメインループを開始します")
         sys.exit(app.exec())
 
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
         # 設定ファイルの読み込みエラーを表示
         logger.critical(f"設定ファイルエラー: {e}", exc_info=True)
         error_dialog = QMessageBox()
@@ -4,12 +4,17 @@ Numbaを使用した高速化を実装。
 """
 import math
 import cmath
+from fractions import Fraction
 import numpy as np
 from numba import jit, prange
 from PyQt6.QtGui import QImage
 from logger.custom_logger import logger
 import ast
 import operator
+from typing import Dict, Any, Optional, Tuple, Union
+from app_settings import AppSettings, as_settings
+from numba_utils import RenderSchedule, apply_render_schedule
+from double_double import generate_mandelbrot_grid_dd_jit
 
 
 @jit(nopython=True)
@@ -45,6 +50,29 @@ def _mandelbrot_point_basic_jit(c_real: float, c_imag: float, max_iter: int) ->
 
 # 式のコンパイル結果をキャッシュ
 _compiled_formula_cache = {}
+# キャッシュに保持する式の最大数（performance.formula_cache_limit で変更可能）
+_formula_cache_limit = 32
+
+
+def set_formula_cache_limit(limit: int):
+    """
+    数式キャッシュの最大保持数を設定し、超過分を古い順に破棄する。
+
+    Args:
+        limit (int): 保持する式の最大数
+    """
+    global _formula_cache_limit
+    _formula_cache_limit = max(1, limit)
+    _trim_formula_cache()
+
+
+def _trim_formula_cache():
+    """
+    数式キャッシュが上限を超えている場合、古いものから破棄する。
+    """
+    while len(_compiled_formula_cache) > _formula_cache_limit:
+        oldest = next(iter(_compiled_formula_cache))
+        del _compiled_formula_cache[oldest]
 
 
 def clear_formula_cache():
@@ -93,6 +121,7 @@ def _compile_formula(formula_str: str):
             return eval(compiled_code, {"__builtins__": {}}, local_vars)
 
         _compiled_formula_cache[formula_str] = compiled_func
+        _trim_formula_cache()
         return compiled_func
 
     except Exception:
@@ -107,6 +136,7 @@ def _compile_formula(formula_str: str):
             return eval(formula_str, {"__builtins__": {}}, safe_dict)
 
         _compiled_formula_cache[formula_str] = fallback_func
+        _trim_formula_cache()
         return fallback_func
 
 
@@ -183,40 +213,211 @@ def pixel_color(n: int, max_iter: int) -> int:
 
 
 @jit(nopython=True, parallel=True)
-def _generate_mandelbrot_grid_jit(width: int, height: int,
+def _generate_mandelbrot_grid_jit(result: np.ndarray, y_start: int, y_end: int,
                                   re_start: float, re_end: float,
                                   im_start: float, im_end: float,
-                                  max_iter: int) -> np.ndarray:
+                                  max_iter: int):
     """
     マンデルブロ集合のグリッド計算をJITコンパイルで並列実行。
     基本的なマンデルブロ式（z = z^2 + c）専用の高速化版。
+    結果配列のうち y_start から y_end-1 の行だけを計算する。
 
     Args:
-        width (int): 画像の幅
-        height (int): 画像の高さ
+        result (np.ndarray): 反復回数を書き込む2次元配列 (height, width)
+        y_start (int): 計算する最初の行
+        y_end (int): 計算する最後の行の次
         re_start (float): 実部の開始値
         re_end (float): 実部の終了値
         im_start (float): 虚部の開始値
         im_end (float): 虚部の終了値
         max_iter (int): 最大反復回数
-
-    Returns:
-        np.ndarray: 反復回数の2次元配列
     """
-    result = np.empty((height, width), dtype=np.int32)
+    height, width = result.shape
 
     # 複素平面上のピクセル間隔を計算
     pixel_width_complex = (re_end - re_start) / width
     pixel_height_complex = (im_end - im_start) / height
 
     # 並列処理でy軸方向をループ
-    for y in prange(height):
+    for y in prange(y_start, y_end):
         c_imag = im_start + y * pixel_height_complex
         for x in range(width):
             c_real = re_start + x * pixel_width_complex
             result[y, x] = _mandelbrot_point_basic_jit(
                 c_real, c_imag, max_iter)
 
+
+@jit(nopython=True, parallel=True)
+def _generate_mandelbrot_grid_tiled_jit(result: np.ndarray, y_start: int, y_end: int,
+                                        re_start: float, re_end: float,
+                                        im_start: float, im_end: float,
+                                        max_iter: int, tile_size: int):
+    """
+    マンデルブロ集合のグリッド計算を正方タイル単位で並列実行。
+    発散の速い領域と遅い領域が行内で偏る場合に負荷を均しやすい。
+    結果配列のうち y_start から y_end-1 の行だけを計算する。
+
+    Args:
+        result (np.ndarray): 反復回数を書き込む2次元配列 (height, width)
+        y_start (int): 計算する最初の行
+        y_end (int): 計算する最後の行の次
+        re_start (float): 実部の開始値
+        re_end (float): 実部の終了値
+        im_start (float): 虚部の開始値
+        im_end (float): 虚部の終了値
+        max_iter (int): 最大反復回数
+        tile_size (int): タイルの一辺のピクセル数
+    """
+    height, width = result.shape
+
+    pixel_width_complex = (re_end - re_start) / width
+    pixel_height_complex = (im_end - im_start) / height
+
+    tiles_x = (width + tile_size - 1) // tile_size
+    tiles_y = (y_end - y_start + tile_size - 1) // tile_size
+
+    # 並列処理でタイル番号をループ
+    for tile in prange(tiles_x * tiles_y):
+        y0 = y_start + (tile // tiles_x) * tile_size
+        x0 = (tile % tiles_x) * tile_size
+        y1 = min(y0 + tile_size, y_end)
+        x1 = min(x0 + tile_size, width)
+        for y in range(y0, y1):
+            c_imag = im_start + y * pixel_height_complex
+            for x in range(x0, x1):
+                c_real = re_start + x * pixel_width_complex
+                result[y, x] = _mandelbrot_point_basic_jit(
+                    c_real, c_imag, max_iter)
+
+
+# ピクセル間隔が座標の大きさに対してこの比率を下回るとfloat64では精度が不足する
+DOUBLE_DOUBLE_THRESHOLD = 1e-13
+# 倍々精度でも精度が不足し始める比率
+DOUBLE_DOUBLE_LIMIT = 1e-30
+
+
+def select_precision(precision: str, width: int, height: int,
+                     re_start: float, re_end: float,
+                     im_start: float, im_end: float) -> str:
+    """
+    ピクセル間隔から計算に使う演算精度を決定する。
+
+    Args:
+        precision (str): 設定の演算精度（"auto" の場合に自動選択する）
+        width (int): 画像の幅
+        height (int): 画像の高さ
+        re_start (float): 実部の開始値
+        re_end (float): 実部の終了値
+        im_start (float): 虚部の開始値
+        im_end (float): 虚部の終了値
+
+    Returns:
+        str: "float64" または "double_double"
+    """
+    if precision != "auto":
+        return precision
+    spacing = min((re_end - re_start) / width, (im_end - im_start) / height)
+    scale = max(1.0, abs(re_start), abs(re_end), abs(im_start), abs(im_end))
+    if spacing >= DOUBLE_DOUBLE_THRESHOLD * scale:
+        return "float64"
+    if spacing < DOUBLE_DOUBLE_LIMIT * scale:
+        logger.warning(f"ピクセル間隔 {spacing:.3e} は倍々精度でも精度が不足する可能性があります")
+    return "double_double"
+
+
+def real_axis_mirror_rows(height: int, im_start: float,
+                          im_step: float, exact: bool = False) -> Optional[Tuple[int, int, int]]:
+    """
+    行 y の虚部 im_start + y * im_step が実軸に対して対称な行の組を求める。
+    行 y と行 k - y が対称になる整数 k が存在する場合のみ対称性を利用できる。
+
+    Args:
+        height (int): 画像の高さ
+        im_start (float): 虚部の開始値（行0の虚部）
+        im_step (float): 1行あたりの虚部の増分
+        exact (bool): Trueの場合、im_start + k * im_step = -im_start が
+            丸め誤差なしで成り立つ場合のみ対称とみなす（倍々精度用）
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (k, lo, hi)。行 lo..hi（両端含む）を
+            行 k-hi..k-lo に鏡映できる。対称な行の組がなければNone
+    """
+    if im_step <= 0:
+        return None
+    k_float = -2.0 * im_start / im_step
+    k = int(round(k_float))
+    # ピクセル位置が実軸に対して厳密に揃っている場合のみ利用する
+    if abs(k_float - k) > 1e-9 * max(1.0, abs(k_float)):
+        return None
+    if exact and Fraction(im_start) * -2 != k * Fraction(im_step):
+        return None
+    lo = max(0, k - (height - 1))
+    hi = (k - 1) // 2
+    if hi < lo:
+        return None
+    return k, lo, hi
+
+
+def compute_mandelbrot_grid(width: int, height: int,
+                            re_start: float, re_end: float,
+                            im_start: float, im_end: float,
+                            max_iter: int, schedule: RenderSchedule,
+                            precision: str = "float64") -> np.ndarray:
+    """
+    基本式のグリッド計算を、スケジュールの分割方式に従って実行する。
+    スレッド数と分割サイズは呼び出し元スレッドに適用される。
+    倍々精度では分割方式によらず行単位で計算する。
+
+    表示範囲が実軸をまたぐ場合は、z^2 + c が実軸対称であることを利用して
+    大きい側の半分と非対称な残りだけを計算し、残りは行を鏡映して埋める。
+
+    Args:
+        width (int): 画像の幅
+        height (int): 画像の高さ
+        re_start (float): 実部の開始値
+        re_end (float): 実部の終了値
+        im_start (float): 虚部の開始値
+        im_end (float): 虚部の終了値
+        max_iter (int): 最大反復回数
+        schedule (RenderSchedule): 並列計算のスケジュール
+        precision (str): 演算精度（"float64" または "double_double"）
+
+    Returns:
+        np.ndarray: 反復回数の2次元配列
+    """
+    apply_render_schedule(schedule)
+    result = np.empty((height, width), dtype=np.int32)
+    double_double = precision == "double_double"
+
+    def fill_rows(y_start: int, y_end: int):
+        if y_end <= y_start:
+            return
+        if double_double:
+            generate_mandelbrot_grid_dd_jit(
+                result, y_start, y_end, re_start, 0.0, im_start, 0.0,
+                (re_end - re_start) / width, (im_end - im_start) / height, max_iter)
+        elif schedule.strategy == "tiles":
+            _generate_mandelbrot_grid_tiled_jit(
+                result, y_start, y_end, re_start, re_end, im_start, im_end,
+                max_iter, max(1, schedule.tile_size))
+        else:
+            _generate_mandelbrot_grid_jit(
+                result, y_start, y_end, re_start, re_end, im_start, im_end, max_iter)
+
+    mirror = None
+    if schedule.exploit_symmetry:
+        mirror = real_axis_mirror_rows(height, im_start, (im_end - im_start) / height,
+                                       exact=double_double)
+
+    if mirror is None:
+        fill_rows(0, height)
+        return result
+
+    k, lo, hi = mirror
+    logger.debug(f"実軸対称性を利用します: 行{lo}-{hi}を行{k - hi}-{k - lo}に鏡映")
+    fill_rows(0, k - hi)
+    fill_rows(k - lo + 1, height)
+    result[k - hi:k - lo + 1] = result[lo:hi + 1][::-1]
     return result
 
 
@@ -274,12 +475,61 @@ def _numpy_to_qimage_fast(rgb_array: np.ndarray) -> QImage:
     return image.copy()
 
 
+# 複素共役と可換な（実係数の）関数・定数
+_CONJUGATE_SYMMETRIC_FUNCTIONS = {'abs', 'sin', 'cos', 'exp', 'log', 'pow', 'sqrt'}
+_CONJUGATE_SYMMETRIC_NAMES = {'z', 'c', 'n', 'pi', 'e'}
+_CONJUGATE_SYMMETRIC_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
+                                  ast.USub, ast.UAdd)
+
+
+def is_conjugate_symmetric(formula_str: str) -> bool:
+    """
+    数式 f が f(conj(z), conj(c)) = conj(f(z, c)) を満たすかを構文木から判定する。
+    満たす場合、z=0 から始まる反復は実軸に対して対称になる。
+    z, c, n、実数定数、四則演算とべき乗、実係数の関数のみからなる式を対称とみなす。
+
+    Args:
+        formula_str (str): zの更新式
+
+    Returns:
+        bool: 共役対称と判定できる場合True（判定できない式はFalse）
+    """
+    try:
+        tree = ast.parse(formula_str.strip(), mode='eval')
+    except SyntaxError:
+        return False
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load)):
+            continue
+        if isinstance(node, _CONJUGATE_SYMMETRIC_OPERATORS):
+            continue
+        if isinstance(node, ast.Constant):
+            # 複素数リテラル（1j など）は対称性を壊す
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                return False
+            continue
+        if isinstance(node, ast.Name):
+            if node.id in _CONJUGATE_SYMMETRIC_NAMES or node.id in _CONJUGATE_SYMMETRIC_FUNCTIONS:
+                continue
+            return False
+        if isinstance(node, ast.Call):
+            if (isinstance(node.func, ast.Name) and node.func.id in _CONJUGATE_SYMMETRIC_FUNCTIONS
+                    and not node.keywords):
+                continue
+            return False
+        return False
+    return True
+
+
 def _generate_mandelbrot_custom_vectorized(width: int, height: int,
                                            re_start: float, re_end: float,
                                            im_start: float, im_end: float,
-                                           formula_str: str, max_iter: int) -> np.ndarray:
+                                           formula_str: str, max_iter: int,
+                                           exploit_symmetry: bool = False) -> np.ndarray:
     """
     カスタム式用のベクトル化された計算（部分的な並列化）。
+    exploit_symmetry が有効で数式が共役対称な場合、実軸の反対側の行は鏡映で埋める。
 
     Args:
         width (int): 画像の幅
@@ -290,6 +540,7 @@ def _generate_mandelbrot_custom_vectorized(width: int, height: int,
         im_end (float): 虚部の終了値
         formula_str (str): カスタム数式
         max_iter (int): 最大反復回数
+        exploit_symmetry (bool): 実軸対称性を利用するかどうか
 
     Returns:
         np.ndarray: 反復回数の2次元配列
@@ -304,8 +555,21 @@ def _generate_mandelbrot_custom_vectorized(width: int, height: int,
     # コンパイル済み関数を取得
     compiled_func = _compile_formula(formula_str)
 
+    # 鏡映で埋める行の範囲
+    mirror = None
+    if exploit_symmetry and height > 1 and is_conjugate_symmetric(formula_str):
+        mirror = real_axis_mirror_rows(height, im_start, (im_end - im_start) / (height - 1))
+    if mirror is not None:
+        k, lo, hi = mirror
+        mirrored_rows = range(k - hi, k - lo + 1)
+        logger.debug(f"実軸対称性を利用します: 行{lo}-{hi}を行{k - hi}-{k - lo}に鏡映")
+    else:
+        mirrored_rows = range(0)
+
     # 行ごとに処理（メモリ効率を考慮）
     for y in range(height):
+        if y in mirrored_rows:
+            continue
         c_imag = imag_vals[y]
         # 1行分の複素数配列を作成
         c_row = real_vals + 1j * c_imag
@@ -326,11 +590,16 @@ def _generate_mandelbrot_custom_vectorized(width: int, height: int,
             else:
                 result[y, x] = max_iter
 
+    if mirror is not None:
+        result[k - hi:k - lo + 1] = result[lo:hi + 1][::-1]
+
     return result
 
 
 def generate_mandelbrot_image(width: int, height: int, formula_str: str,
-                              config: dict, max_iter: int = 100) -> QImage:
+                              config: Union[AppSettings, Dict[str, Any]],
+                              max_iter: int = 100,
+                              schedule: Optional[RenderSchedule] = None) -> QImage:
     """
     マンデルブロ集合の画像を生成する。
     基本的な式の場合はJIT最適化版を使用し、大幅な高速化を実現。
@@ -339,28 +608,44 @@ def generate_mandelbrot_image(width: int, height: int, formula_str: str,
         width (int): 画像の幅
         height (int): 画像の高さ
         formula_str (str): ユーザーが入力したzの更新式
-        config (dict): 設定情報
+        config (Union[AppSettings, Dict[str, Any]]): 設定オブジェクト（設定辞書も可）
         max_iter (int): 最大反復回数
+        schedule (Optional[RenderSchedule]): 並列計算のスケジュール
+            （省略時は性能設定のみから作成）
 
     Returns:
         QImage: 生成された画像
     """
     logger.debug(
         f"画像生成を開始: {width}x{height}, 式: '{formula_str}', 最大反復: {max_iter}")
-    re_start = config['mandelbrot']['real_range']['start']
-    re_end = config['mandelbrot']['real_range']['end']
-    im_start = config['mandelbrot']['imaginary_range']['start']
-    im_end = config['mandelbrot']['imaginary_range']['end']
+    settings = as_settings(config)
+    re_start = settings.mandelbrot.real_start
+    re_end = settings.mandelbrot.real_end
+    im_start = settings.mandelbrot.imaginary_start
+    im_end = settings.mandelbrot.imaginary_end
+
+    # 実行中に変更された性能設定を計算スレッドに反映
+    performance = settings.performance
+    if schedule is None:
+        schedule = RenderSchedule.from_performance(performance)
+    threads = apply_render_schedule(schedule)
+    set_formula_cache_limit(performance.formula_cache_limit)
+    logger.debug(f"並列処理スレッド数: {threads}, 分割方式: {schedule.strategy}")
 
     logger.debug(f"複素平面範囲: 実部[{re_start}, {re_end}], 虚部[{im_start}, {im_end}]")
 
+    # ピクセル間隔から演算精度を選択
+    precision = select_precision(performance.precision, width, height,
+                                 re_start, re_end, im_start, im_end)
+
     # 基本的なマンデルブロ式の場合は高速化版を使用
     if formula_str.strip() in ['z * z + c', 'z**2 + c', 'z*z+c']:
-        logger.info("高速化版（JIT最適化）を使用します")
+        logger.info(f"高速化版（JIT最適化）を使用します（演算精度: {precision}）")
         try:
             # JIT最適化版で計算
-            iterations = _generate_mandelbrot_grid_jit(
-                width, height, re_start, re_end, im_start, im_end, max_iter
+            iterations = compute_mandelbrot_grid(
+                width, height, re_start, re_end, im_start, im_end, max_iter, schedule,
+                precision=precision
             )
 
             # RGB配列に変換
@@ -377,10 +662,13 @@ def generate_mandelbrot_image(width: int, height: int, formula_str: str,
 
     # カスタム式の場合は最適化版を使用
     logger.info("カスタム式最適化版を使用します")
+    if precision == "double_double":
+        logger.warning("カスタム式は倍々精度に対応していないため、float64で計算します")
     try:
         # ベクトル化された計算を実行
         iterations = _generate_mandelbrot_custom_vectorized(
-            width, height, re_start, re_end, im_start, im_end, formula_str, max_iter
+            width, height, re_start, re_end, im_start, im_end, formula_str, max_iter,
+            exploit_symmetry=schedule.exploit_symmetry
         )
 
         # RGB配列に変換
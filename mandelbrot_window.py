@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import QMainWindow, QLabel, QLineEdit, QPushButton, QVBoxLa
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import Qt, QTimer
 from mandelbrot_worker import MandelbrotWorker
+from app_settings import AppSettings
 from logger.custom_logger import logger
 
 
@@ -14,16 +15,16 @@ class MandelbrotWindow(QMainWindow):
     ユーザーが数式を入力し、再描画できる。
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, settings: AppSettings):
         """
         ウィンドウを初期化し、マンデルブロ集合画像とUIを表示する。
         
         Args:
-            config (dict): 設定情報
+            settings (AppSettings): 設定オブジェクト
         """
         logger.debug("MandelbrotWindow: 初期化を開始します")
         super().__init__()
-        self.config = config
+        self.settings = settings
         self._setup_window()
         self._setup_ui()
         self._setup_status_bar()
@@ -37,10 +38,10 @@ class MandelbrotWindow(QMainWindow):
     def _setup_window(self):
         """ウィンドウの基本設定を行う。"""
         logger.debug("ウィンドウの基本設定を行います")
-        window_config = self.config['window']
-        self.setWindowTitle(window_config['title'])
-        self.setFixedSize(window_config['width'], window_config['height'])
-        logger.debug(f"ウィンドウサイズを設定しました: {window_config['width']}x{window_config['height']}")
+        window_settings = self.settings.window
+        self.setWindowTitle(window_settings.title)
+        self.setFixedSize(window_settings.width, window_settings.height)
+        logger.debug(f"ウィンドウサイズを設定しました: {window_settings.width}x{window_settings.height}")
 
     def _setup_ui(self):
         """UIコンポーネントを設定する。"""
@@ -49,16 +50,15 @@ class MandelbrotWindow(QMainWindow):
         layout = QVBoxLayout(central_widget)
 
         # 数式入力欄
-        ui_config = self.config['ui']
-        mandelbrot_config = self.config['mandelbrot']
+        ui_settings = self.settings.ui
         
         self.formula_input = QLineEdit(self)
-        self.formula_input.setText(mandelbrot_config['default_formula'])
-        self.formula_input.setPlaceholderText(ui_config['formula_placeholder'])
+        self.formula_input.setText(self.settings.mandelbrot.default_formula)
+        self.formula_input.setPlaceholderText(ui_settings.formula_placeholder)
         layout.addWidget(self.formula_input)
 
         # 再描画ボタン
-        self.redraw_button = QPushButton(ui_config['redraw_button_text'], self)
+        self.redraw_button = QPushButton(ui_settings.redraw_button_text, self)
         layout.addWidget(self.redraw_button)
 
         # 画像表示用ラベル
@@ -72,15 +72,15 @@ class MandelbrotWindow(QMainWindow):
         """ステータスバーを設定する。"""
         logger.debug("ステータスバーを設定します")
         self.status = self.statusBar()
-        self.status.showMessage(self.config['ui']['status_ready'])
+        self.status.showMessage(self.settings.ui.status_ready)
 
     def _setup_animation(self):
         """アニメーション用タイマーを設定する。"""
         self.anim_timer = QTimer(self)
-        self.anim_timer.setInterval(self.config['ui']['animation_interval'])
+        self.anim_timer.setInterval(self.settings.ui.animation_interval)
         self.anim_timer.timeout.connect(self.update_anim)
         self.anim_step = 0
-        self.anim_base = self.config['ui']['status_calculating']
+        self.anim_base = self.settings.ui.status_calculating
 
     def _connect_signals(self):
         """シグナルとスロットを接続する。"""
@@ -104,19 +104,19 @@ class MandelbrotWindow(QMainWindow):
         
         # ステータスバーに計算中を表示しアニメーション開始
         self.anim_step = 0
-        self.anim_base = self.config['ui']['status_calculating']
+        self.anim_base = self.settings.ui.status_calculating
         self.anim_timer.start()
         self.status.showMessage(self.anim_base)
         logger.debug("計算中アニメーションを開始しました")
         
         # 画像生成を別スレッドで実行
-        window_config = self.config['window']
-        logger.debug(f"ワーカースレッドを開始します。画像サイズ: {window_config['image_width']}x{window_config['image_height']}")
+        window_settings = self.settings.window
+        logger.debug(f"ワーカースレッドを開始します。画像サイズ: {window_settings.image_width}x{window_settings.image_height}")
         self.worker = MandelbrotWorker(
-            window_config['image_width'], 
-            window_config['image_height'], 
+            window_settings.image_width, 
+            window_settings.image_height, 
             formula_str, 
-            self.config
+            self.settings
         )
         self.worker.finished.connect(self.on_image_ready)
         self.worker.start()
@@ -132,5 +132,29 @@ class MandelbrotWindow(QMainWindow):
         pixmap = QPixmap.fromImage(image)
         self.label.setPixmap(pixmap)
         self.anim_timer.stop()
-        self.status.showMessage(self.config['ui']['status_complete'])
-        logger.debug("計算中アニメーションを停止しました")
\ No newline at end of file
+        self.status.showMessage(self.settings.ui.status_complete)
+        logger.debug("計算中アニメーションを停止しました")
+
+    def apply_settings(self, settings: AppSettings):
+        """
+        実行中に差し替えられた設定を反映し、描画に影響する変更があれば再描画する。
+        
+        Args:
+            settings (AppSettings): 新しい設定オブジェクト
+        """
+        previous = self.settings
+        self.settings = settings
+        logger.info("MandelbrotWindow: 新しい設定を反映します")
+
+        if settings.window != previous.window:
+            self._setup_window()
+        if settings.ui != previous.ui:
+            self.formula_input.setPlaceholderText(settings.ui.formula_placeholder)
+            self.redraw_button.setText(settings.ui.redraw_button_text)
+            self.anim_timer.setInterval(settings.ui.animation_interval)
+
+        # 計算結果に影響する設定が変わった場合のみ再描画
+        if (settings.mandelbrot != previous.mandelbrot
+                or settings.performance != previous.performance
+                or settings.window != previous.window):
+            self.update_image()
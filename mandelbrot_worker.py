@@ -4,6 +4,8 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtGui import QImage
 from mandelbrot_core import generate_mandelbrot_image
+from app_settings import AppSettings
+from performance_tuner import resolve_render_schedule
 from logger.custom_logger import logger
 
 
@@ -13,7 +15,7 @@ class MandelbrotWorker(QThread):
     """
     finished = pyqtSignal(QImage)
 
-    def __init__(self, width: int, height: int, formula_str: str, config: dict, parent=None):
+    def __init__(self, width: int, height: int, formula_str: str, settings: AppSettings, parent=None):
         """
         ワーカースレッドを初期化する。
         
@@ -21,7 +23,7 @@ class MandelbrotWorker(QThread):
             width (int): 画像の幅
             height (int): 画像の高さ
             formula_str (str): ユーザーが入力したzの更新式
-            config (dict): 設定情報
+            settings (AppSettings): 開始時点の設定オブジェクト（計算中に差し替えられても影響を受けない）
             parent (QObject): 親オブジェクト
         """
         logger.debug(f"MandelbrotWorker: 初期化 - サイズ: {width}x{height}, 式: '{formula_str}'")
@@ -29,7 +31,7 @@ class MandelbrotWorker(QThread):
         self.width = width
         self.height = height
         self.formula_str = formula_str
-        self.config = config
+        self.settings = settings
 
     def run(self):
         """
@@ -37,7 +39,7 @@ class MandelbrotWorker(QThread):
         """
         logger.info(f"画像生成を開始します - サイズ: {self.width}x{self.height}, 式: '{self.formula_str}'")
         
-        max_iter = self.config['mandelbrot']['max_iterations']
+        max_iter = self.settings.mandelbrot.max_iterations
         logger.debug(f"最大反復回数: {max_iter}")
         
         # 計算開始時刻を記録
@@ -45,7 +47,9 @@ class MandelbrotWorker(QThread):
         start_time = time.time()
         
         try:
-            image = generate_mandelbrot_image(self.width, self.height, self.formula_str, self.config, max_iter)
+            schedule = resolve_render_schedule(self.settings.performance)
+            image = generate_mandelbrot_image(self.width, self.height, self.formula_str, self.settings, max_iter,
+                                              schedule=schedule)
             
             # 計算時間を表示
             end_time = time.time()
@@ -2,10 +2,48 @@
 Numbaの設定とキャッシュ管理のためのユーティリティモジュール。
 """
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
 import numba
 
 
+# 並列グリッド計算の分割方式（"rows": 行単位, "tiles": 正方タイル単位）
+SCHEDULE_STRATEGIES = ("rows", "tiles")
+
+
+@dataclass(frozen=True)
+class RenderSchedule:
+    """
+    並列グリッド計算のスレッド数と分割方式
+
+    chunk_size が 0 の場合は prange の静的分割、1以上の場合は
+    指定数の反復ごとにスレッドへ割り当てる動的分割になる。
+    exploit_symmetry が有効な場合、実軸対称な数式では半分の行だけを計算する。
+    """
+    num_threads: int = 0
+    strategy: str = "rows"
+    tile_size: int = 64
+    chunk_size: int = 0
+    exploit_symmetry: bool = True
+
+    @classmethod
+    def from_performance(cls, performance) -> 'RenderSchedule':
+        """
+        性能設定からチューニングプロファイルを使わずにスケジュールを作成する
+
+        Args:
+            performance (PerformanceSettings): 性能設定
+
+        Returns:
+            RenderSchedule: スケジュール
+        """
+        strategy = performance.schedule if performance.schedule in SCHEDULE_STRATEGIES else "rows"
+        num_threads = performance.num_threads if performance.use_parallel_processing else 1
+        return cls(num_threads=num_threads, strategy=strategy,
+                   tile_size=performance.tile_size, chunk_size=performance.chunk_size,
+                   exploit_symmetry=performance.exploit_symmetry)
+
+
 def configure_numba(cache_enabled: bool = True):
     """
     Numbaのキャッシュ設定を適用する。
@@ -46,4 +84,37 @@ def get_numba_info():
     logger.info(f"Numba バージョン: {numba.__version__}")
     logger.info(f"キャッシュ有効: {numba.config.CACHE}")
     logger.info(f"キャッシュディレクトリ: {numba.config.CACHE_DIR}")
-    logger.info(f"並列処理スレッド数: {numba.config.NUMBA_NUM_THREADS}")
\ No newline at end of file
+    logger.info(f"並列処理スレッド数: {numba.config.NUMBA_NUM_THREADS}")
+
+def apply_num_threads(num_threads: int) -> int:
+    """
+    Numbaの並列処理スレッド数を設定する。
+    numba.set_num_threads は呼び出したスレッドにのみ作用するため、
+    計算を行うスレッドから呼び出すこと。
+
+    Args:
+        num_threads (int): スレッド数（0の場合は既定の全コアを使用）
+
+    Returns:
+        int: 実際に設定されたスレッド数
+    """
+    max_threads = numba.config.NUMBA_NUM_THREADS
+    threads = max_threads if num_threads <= 0 else min(num_threads, max_threads)
+    if numba.get_num_threads() != threads:
+        numba.set_num_threads(threads)
+    return threads
+
+
+def apply_render_schedule(schedule: RenderSchedule) -> int:
+    """
+    スケジュールのスレッド数と prange の分割サイズを呼び出し元スレッドに適用する。
+
+    Args:
+        schedule (RenderSchedule): 適用するスケジュール
+
+    Returns:
+        int: 実際に設定されたスレッド数
+    """
+    threads = apply_num_threads(schedule.num_threads)
+    numba.set_parallel_chunksize(schedule.chunk_size)
+    return threads
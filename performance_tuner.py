@@ -0,0 +1,277 @@
+"""
+並列計算の自動チューニングモジュール。
+短いキャリブレーション描画を行い、このマシンに適したスレッド数・分割方式・
+タイル/チャンクサイズを選んでローカルのプロファイルファイルに保存する。
+
+単体でも実行可能:
+    python performance_tuner.py
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numba
+from app_settings import PerformanceSettings
+from mandelbrot_core import compute_mandelbrot_grid
+from numba_utils import RenderSchedule, SCHEDULE_STRATEGIES
+from logger.custom_logger import logger
+
+
+# キャリブレーション用の描画条件（既定表示範囲を縮小した解像度で計算）
+CALIBRATION_VIEW = (-2.0, 1.0, -1.2, 1.2)
+CALIBRATION_SIZE = (320, 240)
+CALIBRATION_MAX_ITER = 200
+
+
+@dataclass(frozen=True)
+class TuningProfile:
+    """キャリブレーションで選ばれた並列計算の設定と、その測定環境"""
+    num_threads: int
+    strategy: str
+    tile_size: int
+    chunk_size: int
+    pixels_per_second: float
+    max_threads: int
+    numba_version: str
+    created_at: str
+
+    def matches_environment(self) -> bool:
+        """
+        プロファイルが現在の実行環境で測定されたものかを判定する
+
+        Returns:
+            bool: 利用可能スレッド数とNumbaバージョンが一致する場合True
+        """
+        return (self.max_threads == numba.config.NUMBA_NUM_THREADS
+                and self.numba_version == numba.__version__)
+
+
+# 読み込み済みプロファイルのキャッシュ（パス -> (更新時刻, プロファイル)）
+_profile_cache: Dict[str, Tuple[float, Optional[TuningProfile]]] = {}
+
+
+def load_tuning_profile(path: Union[str, Path]) -> Optional[TuningProfile]:
+    """
+    プロファイルファイルを読み込む。ファイルの更新時刻が変わるまで結果を再利用する。
+
+    Args:
+        path: プロファイルファイルのパス
+
+    Returns:
+        Optional[TuningProfile]: 現在の環境で有効なプロファイル（なければNone）
+    """
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    key = str(path.resolve())
+    cached = _profile_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    profile = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        profile = TuningProfile(**data)
+        if profile.strategy not in SCHEDULE_STRATEGIES:
+            raise ValueError(f"不明な分割方式です: {profile.strategy}")
+        if not profile.matches_environment():
+            logger.info(f"チューニングプロファイルは別の環境で作成されたため使用しません: {path}")
+            profile = None
+    except Exception as e:
+        logger.warning(f"チューニングプロファイルの読み込みに失敗しました: {path}, {e}")
+        profile = None
+
+    _profile_cache[key] = (mtime, profile)
+    return profile
+
+
+def save_tuning_profile(profile: TuningProfile, path: Union[str, Path]):
+    """
+    プロファイルをファイルに保存する（一時ファイル経由で置き換える）。
+
+    Args:
+        profile: 保存するプロファイル
+        path: 保存先のパス
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(profile), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    _profile_cache.pop(str(path.resolve()), None)
+    logger.info(f"チューニングプロファイルを保存しました: {path}")
+
+
+def resolve_render_schedule(performance: PerformanceSettings,
+                            profile: Optional[TuningProfile] = None) -> RenderSchedule:
+    """
+    性能設定とチューニングプロファイルから描画に使うスケジュールを決定する。
+    設定で明示された値がプロファイルより優先される。
+
+    Args:
+        performance: 性能設定
+        profile: チューニングプロファイル（省略時は設定のパスから読み込む）
+
+    Returns:
+        RenderSchedule: スケジュール
+    """
+    if profile is None:
+        profile = load_tuning_profile(performance.tuning_profile)
+
+    if not performance.use_parallel_processing:
+        num_threads = 1
+    elif performance.num_threads > 0:
+        num_threads = performance.num_threads
+    else:
+        num_threads = profile.num_threads if profile else 0
+
+    if performance.schedule == "auto" and profile is not None:
+        return RenderSchedule(num_threads=num_threads, strategy=profile.strategy,
+                              tile_size=profile.tile_size, chunk_size=profile.chunk_size,
+                              exploit_symmetry=performance.exploit_symmetry)
+
+    base = RenderSchedule.from_performance(performance)
+    return replace(base, num_threads=num_threads)
+
+
+def _measure(schedule: RenderSchedule, repeats: int) -> float:
+    """
+    キャリブレーション描画を行い、最良の処理速度を返す。
+
+    Args:
+        schedule: 測定するスケジュール
+        repeats: 繰り返し回数
+
+    Returns:
+        float: ピクセル/秒
+    """
+    width, height = CALIBRATION_SIZE
+    re_start, re_end, im_start, im_end = CALIBRATION_VIEW
+    # 分割方式の比較が対称性の有無に左右されないよう全行を計算する
+    schedule = replace(schedule, exploit_symmetry=False)
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        compute_mandelbrot_grid(width, height, re_start, re_end, im_start, im_end,
+                                CALIBRATION_MAX_ITER, schedule)
+        best = min(best, time.perf_counter() - start_time)
+    return (width * height) / max(best, 1e-9)
+
+
+def _thread_candidates(max_threads: int) -> List[int]:
+    """2のべき乗と最大スレッド数からなるスレッド数の候補を返す"""
+    candidates = []
+    n = 1
+    while n < max_threads:
+        candidates.append(n)
+        n *= 2
+    candidates.append(max_threads)
+    return candidates
+
+
+def run_calibration(repeats: int = 3, efficiency: float = 0.9,
+                    max_threads: Optional[int] = None,
+                    tile_sizes: Sequence[int] = (16, 32, 64, 128),
+                    chunk_sizes: Sequence[int] = (0, 1, 4, 16)) -> TuningProfile:
+    """
+    キャリブレーション描画でスレッド数と分割方式を選ぶ。
+
+    スレッド数は、最速の結果に対して efficiency 以上の速度が出る最小の数を選ぶ。
+    共有マシンで全コアを占有しないため、速度がほとんど伸びない分のコアは使わない。
+
+    Args:
+        repeats: 各候補の測定回数（最良値を採用）
+        efficiency: スレッド数選択で許容する速度比（0.0-1.0）
+        max_threads: 試行する最大スレッド数（省略時はNumbaの最大スレッド数）
+        tile_sizes: タイル分割で試すタイルサイズ
+        chunk_sizes: 行分割で試すチャンクサイズ
+
+    Returns:
+        TuningProfile: 選ばれた設定
+    """
+    limit = numba.config.NUMBA_NUM_THREADS
+    if max_threads is not None:
+        limit = max(1, min(max_threads, limit))
+    logger.info(f"並列計算のキャリブレーションを開始します（最大 {limit} スレッド）")
+
+    # JITコンパイルを測定から除外するためのウォームアップ
+    for strategy in SCHEDULE_STRATEGIES:
+        _measure(RenderSchedule(num_threads=limit, strategy=strategy), 1)
+
+    # 1. スレッド数の選択（行分割・静的割り当て）
+    thread_results = {}
+    for threads in _thread_candidates(limit):
+        thread_results[threads] = _measure(RenderSchedule(num_threads=threads), repeats)
+        logger.debug(f"スレッド数 {threads}: {thread_results[threads]:,.0f} px/s")
+    best_speed = max(thread_results.values())
+    num_threads = min(t for t, speed in thread_results.items() if speed >= best_speed * efficiency)
+
+    # 2. 選んだスレッド数で分割方式とサイズを選択
+    candidates = [RenderSchedule(num_threads=num_threads, strategy="rows", chunk_size=chunk)
+                  for chunk in chunk_sizes]
+    candidates += [RenderSchedule(num_threads=num_threads, strategy="tiles", tile_size=tile, chunk_size=1)
+                   for tile in tile_sizes]
+    best_schedule = candidates[0]
+    best_schedule_speed = 0.0
+    for schedule in candidates:
+        speed = _measure(schedule, repeats)
+        logger.debug(f"{schedule}: {speed:,.0f} px/s")
+        if speed > best_schedule_speed:
+            best_schedule, best_schedule_speed = schedule, speed
+
+    profile = TuningProfile(
+        num_threads=num_threads,
+        strategy=best_schedule.strategy,
+        tile_size=best_schedule.tile_size,
+        chunk_size=best_schedule.chunk_size,
+        pixels_per_second=best_schedule_speed,
+        max_threads=numba.config.NUMBA_NUM_THREADS,
+        numba_version=numba.__version__,
+        created_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+    logger.info(f"キャリブレーションが完了しました: スレッド数 {profile.num_threads}, "
+                f"分割方式 {profile.strategy}, タイル {profile.tile_size}, チャンク {profile.chunk_size}, "
+                f"{profile.pixels_per_second:,.0f} px/s")
+    return profile
+
+
+def ensure_tuning_profile(performance: PerformanceSettings) -> Optional[TuningProfile]:
+    """
+    自動チューニングが有効で有効なプロファイルがない場合、キャリブレーションを実行して保存する。
+
+    Args:
+        performance: 性能設定
+
+    Returns:
+        Optional[TuningProfile]: 利用可能なプロファイル
+    """
+    profile = load_tuning_profile(performance.tuning_profile)
+    if profile is not None or not performance.auto_tune:
+        return profile
+
+    max_threads = performance.num_threads if performance.num_threads > 0 else None
+    profile = run_calibration(max_threads=max_threads)
+    try:
+        save_tuning_profile(profile, performance.tuning_profile)
+    except OSError as e:
+        logger.warning(f"チューニングプロファイルを保存できませんでした: {e}")
+    return profile
+
+
+def main():
+    """キャリブレーションを実行し、config.json で指定されたパスに保存する"""
+    from app_settings import load_settings
+    settings = load_settings()
+    profile = run_calibration()
+    save_tuning_profile(profile, settings.performance.tuning_profile)
+    print(json.dumps(asdict(profile), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,55 +12,54 @@ class ColorManager:
         # color_packs_dir はプロジェクトルートからの相対パスを想定しています
         self.color_packs_dir = Path(color_packs_dir)
         self.color_packs = {}  # {カラーパック名: {カラーマップ名: RGB/RGBAタプルのリスト, ...}}
+        # グラデーション定義 {(カラーパック名, カラーマップ名): グラデーションポイントのリスト} (高解像度LUTの再生成用)
+        self._gradient_points = {}
+        # 着色カーネル用LUTのキャッシュ {(カラーパック名, カラーマップ名, 解像度 or None): (N,4) uint8 配列}
+        self._lut_cache = {}
         self.load_color_packs()
 
-    def _generate_gradient_colors(self, gradient_points: list[dict], num_colors: int) -> list[tuple]:
-        """指定されたグラデーションポイントと色数に基づいてグラデーションカラーを生成します。"""
+    def _generate_gradient_lut(self, gradient_points: list[dict], num_colors: int) -> np.ndarray:
+        """
+        グラデーションポイントを num_colors 色に補間した (N,4) の uint8 配列を生成します。
+        アルファが指定されていないポイントは不透明 (255) として扱います。
+        """
         if not gradient_points:
-            logger.log("_generate_gradient_colors がグラデーションポイントなしで呼び出されました。", level="WARNING")
-            return [(0, 0, 0)] * num_colors
+            logger.log("_generate_gradient_lut がグラデーションポイントなしで呼び出されました。", level="WARNING")
+            lut = np.zeros((max(num_colors, 0), 4), dtype=np.uint8)
+            lut[:, 3] = 255
+            return lut
         if num_colors <= 0:
-            return []
+            return np.zeros((0, 4), dtype=np.uint8)
 
-        # ポイントを位置 (pos) でソートする
+        # ポイントを位置 (pos) でソートする (np.interp はソートされた xp を期待する)
         points = sorted(gradient_points, key=lambda p: p['pos'])
-
-        has_alpha = any(len(p.get('color', [])) == 4 for p in points)
-
-        # 各ポイントの位置と色値を抽出します
-        # np.interpはソートされたxpを期待するため、元の0-1スケールを使用する
-        positions = np.array([p['pos'] for p in points])
-
-        colors_r = np.array([p['color'][0] for p in points])
-        colors_g = np.array([p['color'][1] for p in points])
-        colors_b = np.array([p['color'][2] for p in points])
-        if has_alpha:
-            # Default alpha to 255 (opaque) if not provided for a specific point.
-            colors_a = np.array([p['color'][3] if len(p['color']) == 4 else 255 for p in points])
+        positions = np.array([p['pos'] for p in points], dtype=np.float64)
+        point_colors = np.array(
+            [list(p['color'][:3]) + [p['color'][3] if len(p['color']) == 4 else 255] for p in points],
+            dtype=np.float64
+        )
 
         # 補間する新しい位置 (0.0 から 1.0 の範囲で均等に配置します)
         target_positions = np.linspace(0.0, 1.0, num_colors)
+        lut = np.empty((num_colors, 4), dtype=np.uint8)
+        for ch in range(4):
+            # np.rint は round() と同じく偶数丸め
+            lut[:, ch] = np.rint(np.clip(np.interp(target_positions, positions, point_colors[:, ch]), 0, 255))
+        return lut
 
-        interp_r = np.interp(target_positions, positions, colors_r)
-        interp_g = np.interp(target_positions, positions, colors_g)
-        interp_b = np.interp(target_positions, positions, colors_b)
-        if has_alpha:
-            interp_a = np.interp(target_positions, positions, colors_a)
-
-        output_colors = []
-        for i in range(num_colors):
-            r = int(round(np.clip(interp_r[i], 0, 255)))
-            g = int(round(np.clip(interp_g[i], 0, 255)))
-            b = int(round(np.clip(interp_b[i], 0, 255)))
-            if has_alpha:
-                a = int(round(np.clip(interp_a[i], 0, 255)))
-                output_colors.append((r, g, b, a))
-            else:
-                output_colors.append((r, g, b))
-        return output_colors
+    def _generate_gradient_colors(self, gradient_points: list[dict], num_colors: int) -> list[tuple]:
+        """指定されたグラデーションポイントと色数に基づいてグラデーションカラー (RGB/RGBAタプルのリスト) を生成します。"""
+        if not gradient_points:
+            logger.log("_generate_gradient_colors がグラデーションポイントなしで呼び出されました。", level="WARNING")
+            return [(0, 0, 0)] * num_colors
+        lut = self._generate_gradient_lut(gradient_points, num_colors)
+        has_alpha = any(len(p.get('color', [])) == 4 for p in gradient_points)
+        return [tuple(row) for row in lut[:, :4 if has_alpha else 3].tolist()]
 
     def load_color_packs(self) -> None:
         self.color_packs.clear()
+        self._gradient_points.clear()
+        self._lut_cache.clear()
 
         # プロジェクトルートからの相対パスとして解決する (より堅牢な方法が望ましい)
         # このファイル(color_manager.py)の場所からプロジェクトルートを推定するのは困難な場合があります。
@@ -126,6 +125,7 @@ class ColorManager:
                         if isinstance(gradient_points, list) and isinstance(num_colors, int) and num_colors > 0:
                             colors_list = self._generate_gradient_colors(gradient_points, num_colors)
                             current_pack_maps[map_name] = colors_list
+                            self._gradient_points[(pack_name, map_name)] = gradient_points
                         else:
                             logger.log(f"'{pack_name}/{map_name}' のグラデーション定義が無効です。", level="WARNING")
                     else:
@@ -157,6 +157,76 @@ class ColorManager:
         """指定されたカラーパックとマップ名に対応するカラーデータのリスト (RGB/RGBAタプルのリスト) を返します。"""
         return self.color_packs.get(pack_name, {}).get(map_name)
 
+    def get_color_map_lut(self, pack_name: str, map_name: str, resolution: int | None = None) -> np.ndarray | None:
+        """
+        指定されたカラーマップを、着色カーネルにそのまま渡せる (N,4) の uint8 配列 (LUT) として返します。
+
+        LUT は (カラーパック名, カラーマップ名, 解像度) ごとに一度だけ生成してキャッシュするため、
+        2回目以降は辞書の参照だけで済みます。返す配列は C 連続かつ読み取り専用で、呼び出し側でコピーせずに
+        使用できます。RGB のみのマップのアルファは 255 になります。
+
+        Args:
+            pack_name (str): カラーパック名。
+            map_name (str): カラーマップ名。
+            resolution (int | None, optional): LUT の色数。None の場合はマップ定義の色数のまま。
+                グラデーション定義のマップは指定した色数で補間し直し、固定色のマップは隣り合う色を線形補間します。
+                スムーズな補間用の高解像度LUTを得るために使用します。
+        Returns:
+            np.ndarray | None: (N,4) の uint8 配列。マップが存在しない場合は None。
+        """
+        key = (pack_name, map_name, resolution)
+        lut = self._lut_cache.get(key)
+        if lut is not None:
+            return lut
+
+        colors = self.get_color_map_data(pack_name, map_name)
+        if not colors:
+            return None
+        if resolution is None or resolution <= 0 or resolution == len(colors):
+            lut = _colors_to_lut(colors)
+        elif (pack_name, map_name) in self._gradient_points:
+            lut = self._generate_gradient_lut(self._gradient_points[(pack_name, map_name)], resolution)
+        else:
+            lut = _resample_lut(_colors_to_lut(colors), resolution)
+        lut.setflags(write=False)
+        self._lut_cache[key] = lut
+        return lut
+
+
+def _colors_to_lut(colors: list[tuple]) -> np.ndarray:
+    """RGB/RGBAタプルのリストを (N,4) の uint8 配列に変換します (アルファがない色は 255)。"""
+    lut = np.full((len(colors), 4), 255, dtype=np.uint8)
+    for i, color in enumerate(colors):
+        lut[i, :len(color)] = color
+    return lut
+
+
+def _resample_lut(lut: np.ndarray, num_colors: int) -> np.ndarray:
+    """LUT の色を線形補間して num_colors 色に増減します。"""
+    source_positions = np.linspace(0.0, 1.0, lut.shape[0])
+    target_positions = np.linspace(0.0, 1.0, num_colors)
+    resampled = np.empty((num_colors, 4), dtype=np.uint8)
+    for ch in range(4):
+        resampled[:, ch] = np.rint(np.interp(target_positions, source_positions, lut[:, ch].astype(np.float64)))
+    return resampled
+
+
+def grayscale_lut(num_colors: int = 256) -> np.ndarray:
+    """
+    黒から白へのグレースケールLUT ((N,4) uint8, 読み取り専用) を返します。
+    カラーマップが指定されていない場合のフォールバックとして使用し、色数ごとにキャッシュします。
+    """
+    lut = _GRAYSCALE_LUTS.get(num_colors)
+    if lut is None:
+        lut = np.full((num_colors, 4), 255, dtype=np.uint8)
+        lut[:, :3] = np.linspace(0, 255, num_colors).astype(np.uint8)[:, None] if num_colors > 1 else 0
+        lut.setflags(write=False)
+        _GRAYSCALE_LUTS[num_colors] = lut
+    return lut
+
+
+_GRAYSCALE_LUTS: dict[int, np.ndarray] = {}
+
 if __name__ == '__main__':
     # テスト用の一時ディレクトリとファイルを作成する
     # このスクリプトは "temp_color_packs" を作成できる場所から実行されることを想定しています
@@ -218,6 +288,13 @@ if __name__ == '__main__':
                 assert len(map_data_fixed) == 3
                 assert map_data_fixed[0] == (255,0,0)
 
+            lut = manager.get_color_map_lut(first_pack_name, map_name_gradient)
+            logger.log(f"  '{first_pack_name}/{map_name_gradient}' LUT: 形状={lut.shape}, dtype={lut.dtype}", level="DEBUG")
+            assert lut.shape == (16, 4) and lut.dtype == np.uint8
+            assert manager.get_color_map_lut(first_pack_name, map_name_gradient) is lut  # 2回目はキャッシュから返る
+            lut_hi = manager.get_color_map_lut(first_pack_name, map_name_gradient, resolution=1024)
+            assert lut_hi.shape == (1024, 4) and tuple(lut_hi[-1]) == (240, 240, 240, 255)
+
     # 一時ディレクトリをクリーンアップ
     import shutil # 一時ディレクトリをクリーンアップします
     try:
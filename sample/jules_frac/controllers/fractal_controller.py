@@ -2,9 +2,12 @@ import time
 import traceback # この行が存在しない場合に追加
 from pathlib import Path # Path を追加
 from export.image_exporter import ImageExporter # ExporterSignals は ImageExporter 内部で使用されるシグナルです
+from export.batch_exporter import BatchExporter, config_to_output_overrides, jobs_from_presets
+from export.zoom_movie import ZoomMovieExporter, ZoomMovieJob, zoom_path
+from export.preset_thumbnails import PresetThumbnailCache, PresetThumbnailWorker
 from models.fractal_engine import FractalEngine # FractalEngineモデルのインポート (型ヒント用)
-from .fractal_renderer import FractalRenderer
-from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool, pyqtSlot, QRunnable # QRunnable を追加
+from .fractal_renderer import FractalRenderer, WarmUpTask
+from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool, pyqtSlot, QRunnable, QTimer # QRunnable を追加
 from logger.custom_logger import CustomLogger
 from plugins.base_coloring_plugin import ColoringAlgorithmPlugin # ColoringAlgorithmPlugin をインポート
 from settings_manager import SettingsManager # SettingsManager をインポート
@@ -35,6 +38,13 @@ class FractalController(QObject):
     export_started = pyqtSignal()  # エクスポート開始
     export_progress_updated = pyqtSignal(int)  # エクスポート進捗
     export_process_finished = pyqtSignal(bool, str)  # エクスポート完了（成功/失敗, メッセージ）
+    # --- バッチ出力用シグナル ---
+    batch_export_job_progress = pyqtSignal(int, int)  # ジョブごとの進捗（ジョブ番号, 0-100）
+    batch_export_job_finished = pyqtSignal(int, bool, str)  # ジョブ完了（ジョブ番号, 成功/失敗, 出力パス/メッセージ）
+    batch_export_finished = pyqtSignal(bool, str)  # バッチ全体の完了（すべて成功したか, 概要メッセージ）
+    # パレットアニメーション関連のシグナル
+    palette_cycling_changed = pyqtSignal(bool)  # パレットの循環の開始:True/停止:False
+    preset_thumbnail_ready = pyqtSignal(str, str)  # プリセットのサムネイルの用意ができた（プリセット名, ファイルパス）
 
     def __init__(self, fractal_engine: FractalEngine, settings_manager: SettingsManager):
         """
@@ -57,9 +67,20 @@ class FractalController(QObject):
         self.is_rendering = False  # レンダリング中フラグ
         self.preview_downscale_factor = 0.5  # プレビュー解像度の縮小率
         self.current_exporter: ImageExporter | None = None  # 現在のエクスポート処理
+        self.current_batch_exporter: BatchExporter | None = None  # 現在のバッチ出力処理
+        self.preset_thumbnail_cache = self._create_preset_thumbnail_cache()  # プリセットのサムネイルのキャッシュ
+        self.current_thumbnail_worker: PresetThumbnailWorker | None = None  # 現在のサムネイル作成処理
+        self._pending_thumbnail_names: set[str] | None = None  # 作成中に追加で要求されたプリセット名
         self.thread_pool = QThreadPool.globalInstance()  # スレッドプール
         self.current_renderer_task = None  # 現在のレンダリングタスク
+        self._pending_render_request: tuple[int, int, bool] | None = None  # 実行中のタスクの終了後に開始する最新の要求 (幅, 高さ, 完全再計算)
         self.active_coloring_target_type: str = 'divergent'  # デフォルトのカラーリングターゲット
+        self.palette_cycles_per_second = 0.1  # パレットアニメーションの速さ（1秒あたりのカラーマップの周回数）
+        self._palette_cycle_start_time = 0.0  # パレットアニメーションを開始した時刻
+        self._palette_cycle_start_offset = 0.0  # パレットアニメーション開始時の循環位置
+        self.palette_cycle_timer = QTimer(self)  # パレットアニメーションのフレーム用タイマー（約60fps）
+        self.palette_cycle_timer.setInterval(16)
+        self.palette_cycle_timer.timeout.connect(self._on_palette_cycle_tick)
         # 必要に応じて同時エクスポート数を制限可能: self.thread_pool.setMaxThreadCount(1)
 
     def _apply_config_to_engine(self, config: dict):
@@ -111,6 +132,9 @@ class FractalController(QObject):
                 if pack_name and map_name:
                     self.fractal_engine.set_active_color_map(pack_name, map_name, target_type=target_type)
 
+            # 4. パレットの循環位置 (保存されていない設定では循環させない)
+            self.fractal_engine.set_palette_offset(config.get('palette_offset', 0.0))
+
             self.fractal_engine.last_fractal_data_cache = None # 設定適用後はキャッシュをクリア
             logger.log("エンジン設定の適用が完了しました。", "DEBUG")
             logger.log(f"適用後のアクティブなフラクタルプラグイン: {self.get_active_fractal_plugin_name_from_engine()}", level="DEBUG")
@@ -131,6 +155,15 @@ class FractalController(QObject):
         logger.log("保存されたエンジン設定を読み込んで適用します...", level="INFO")
         self._apply_config_to_engine(config)
 
+    def start_background_warm_up(self):
+        """
+        アクティブなプラグインの JIT コンパイルをスレッドプールで開始します。
+        起動時に呼び出すと、最初の描画を待たずにウィンドウを表示できます。
+        ウォームアップはエンジンの kernel_lock を保持して実行されるため、その間に要求された最初の描画は
+        ウォームアップの完了を待ってから計算されます (並列カーネルが同時に実行されることはありません)。
+        """
+        self.thread_pool.start(WarmUpTask(self.fractal_engine))
+
     def get_preset_names(self) -> list[str]:
         """プリセット名の一覧を取得します。"""
         return list(self.settings_manager.get_presets().keys())
@@ -143,6 +176,7 @@ class FractalController(QObject):
         config = self.get_full_configuration()
         self.settings_manager.save_preset(name, config)
         self.logger.log(f"プリセット '{name}' を保存しました。", "INFO")
+        self.prune_preset_thumbnails()  # 上書きした場合の古いサムネイルを削除
 
     def load_preset(self, name: str):
         """プリセットを読み込み、適用します。"""
@@ -160,6 +194,7 @@ class FractalController(QObject):
         """プリセットを削除します。"""
         self.settings_manager.delete_preset(name)
         self.logger.log(f"プリセット '{name}' を削除しました。", "INFO")
+        self.prune_preset_thumbnails()
 
     def export_presets(self, file_path: str) -> tuple[bool, str]:
         """
@@ -187,12 +222,89 @@ class FractalController(QObject):
         """
         try:
             imported_names = self.settings_manager.import_presets_from_file(Path(file_path), overwrite)
+            self.prune_preset_thumbnails()
             self.configuration_applied.emit() # UIを更新するためにシグナルを発行
             return True, f"プリセットをインポートしました: {', '.join(imported_names) if imported_names else '新しいプリセットはありませんでした。'}"
         except Exception as e:
             self.logger.log(f"プリセットのインポート中にエラーが発生しました: {e}", "ERROR")
             return False, f"プリセットのインポートに失敗しました: {e}"
 
+    # --- プリセットのサムネイル ---
+    def _create_preset_thumbnail_cache(self) -> PresetThumbnailCache | None:
+        """設定ファイルと同じディレクトリの preset_thumbnails フォルダにサムネイルのキャッシュを作成します。"""
+        settings_path = getattr(self.settings_manager, 'filepath', None)
+        if not self.fractal_engine or settings_path is None:
+            return None
+        try:
+            return PresetThumbnailCache(self.fractal_engine, Path(settings_path).parent / "preset_thumbnails")
+        except OSError as e:
+            self.logger.log(f"サムネイルのキャッシュを作成できませんでした: {e}", level="WARNING")
+            return None
+
+    def get_preset_thumbnail_path(self, name: str) -> str | None:
+        """
+        プリセットのサムネイルがキャッシュにあればそのパスを返します。描画は行いません。
+
+        Args:
+            name (str): プリセット名。
+        Returns:
+            str | None: サムネイルのパス。まだ作成されていないか、プリセットが変更された場合は None。
+        """
+        config = self.settings_manager.get_presets().get(name)
+        if config is None or self.preset_thumbnail_cache is None:
+            return None
+        path = self.preset_thumbnail_cache.cached_path(config)
+        return str(path) if path else None
+
+    def request_preset_thumbnails(self, names: list[str] | None = None):
+        """
+        プリセットのサムネイルをバックグラウンドで用意し、用意できたものから preset_thumbnail_ready で通知します。
+
+        キャッシュにあるサムネイルは描画せずに通知し、表示中の描画が進行中の間は次のサムネイルの描画を待ちます。
+        作成中に呼び出された場合は、現在の処理が終わってから要求されたプリセットを処理します。
+
+        Args:
+            names (list[str] | None, optional): 対象のプリセット名。None の場合はすべてのプリセットを対象とし、
+                変更・削除されたプリセットの古いサムネイルも削除します。
+        """
+        if self.preset_thumbnail_cache is None:
+            return
+        if self.current_thumbnail_worker is not None:
+            all_names = set(self.settings_manager.get_presets()) if names is None else set(names)
+            self._pending_thumbnail_names = (self._pending_thumbnail_names or set()) | all_names
+            return
+        presets = self.settings_manager.get_presets()
+        if names is None:
+            self.prune_preset_thumbnails()
+            names = list(presets)
+        targets = {name: presets[name] for name in names if name in presets}
+        if not targets:
+            return
+        worker = PresetThumbnailWorker(self.preset_thumbnail_cache, targets, is_busy=lambda: self.is_rendering)
+        self.current_thumbnail_worker = worker
+        worker.signals.thumbnail_ready.connect(self.preset_thumbnail_ready)
+        worker.signals.finished.connect(self._on_thumbnail_worker_finished)
+        self.thread_pool.start(worker)
+
+    @pyqtSlot()
+    def _on_thumbnail_worker_finished(self):
+        """サムネイルの作成の完了後、作成中に追加で要求されたプリセットがあれば続けて処理します。"""
+        self.current_thumbnail_worker = None
+        pending, self._pending_thumbnail_names = self._pending_thumbnail_names, None
+        if pending:
+            self.request_preset_thumbnails(sorted(pending))
+
+    def prune_preset_thumbnails(self):
+        """変更・削除されたプリセットの古いサムネイルをキャッシュから削除します。"""
+        if self.preset_thumbnail_cache is not None:
+            self.preset_thumbnail_cache.prune(list(self.settings_manager.get_presets().values()))
+
+    def cancel_preset_thumbnails(self):
+        """実行中のサムネイルの作成があれば、それをキャンセルします。"""
+        self._pending_thumbnail_names = None
+        if self.current_thumbnail_worker:
+            self.current_thumbnail_worker.cancel()
+
     def set_main_window(self, main_window):
         """
         メインウィンドウの参照を設定し、初期ステータス表示を更新します。
@@ -283,8 +395,9 @@ class FractalController(QObject):
                   プラグインが見つからないか、エンジンが未設定の場合は空のリストを返します。
         """
         if self.fractal_engine:
-            plugin = self.fractal_engine.plugin_manager.get_fractal_plugin(plugin_name)
-            if plugin: return plugin.get_parameters_definition()
+            # マニフェストから取得するため、未使用のプラグインのモジュールは読み込まない
+            definitions = self.fractal_engine.plugin_manager.get_fractal_plugin_parameters_definition(plugin_name)
+            if definitions is not None: return definitions
         return []
 
     def get_current_fractal_plugin_parameters_from_engine(self) -> dict:
@@ -404,11 +517,9 @@ class FractalController(QObject):
                   プラグインが見つからないか、エンジンが未設定の場合は空のリストを返します。
         """
         if not self.fractal_engine: return []
-        plugin: ColoringAlgorithmPlugin | None = self.fractal_engine.plugin_manager.get_coloring_plugin(plugin_name, target_type=target_type)
-        if plugin:
-            # logger.log(f"Plugin '{getattr(plugin, 'name', plugin_name)}' ({target_type}) PluginManagerから取得したプラグイン情報: {plugin}", level="DEBUG")
-            definitions = plugin.get_parameters_definition()
-            # logger.log(f"プラグイン '{getattr(plugin, 'name', plugin_name)}' ({target_type})、エンジンから定義を取得: {definitions}", level="DEBUG")
+        # マニフェストから取得するため、未使用のプラグインのモジュールは読み込まない
+        definitions = self.fractal_engine.plugin_manager.get_coloring_plugin_parameters_definition(plugin_name, target_type=target_type)
+        if definitions is not None:
             return definitions
         else:
             logger.log(f"プラグイン '{plugin_name}' ({target_type}) は PluginManager によって見つかりませんでした。", level="WARNING")
@@ -540,6 +651,21 @@ class FractalController(QObject):
             return selection[1] if selection else None
         return None
 
+    def get_output_tiling_from_engine(self) -> tuple[int | None, int]:
+        """
+        高解像度出力のタイル分割を FractalEngine から取得します。出力ダイアログのメモリ使用量の予測に使用します。
+
+        Returns:
+            tuple[int | None, int]: (タイルの一辺 (出力画像のピクセル), 適応型アンチエイリアスの1辺のサンプル数)。
+                出力に使うカラーリングが画像全体を一度に着色する (requires_full_frame) 場合、タイルの一辺は None です。
+        """
+        engine = self.fractal_engine
+        if not engine:
+            return None, 1
+        coloring_plugin = engine.get_active_coloring_plugin(engine.active_coloring_target_type)
+        tile_px = None if coloring_plugin and coloring_plugin.requires_full_frame else engine.OUTPUT_TILE_PX
+        return tile_px, engine.ADAPTIVE_AA_GRID
+
     def get_color_map_data_from_engine(self, pack_name: str, map_name: str) -> list[tuple[int,int,int]] | None: # これはグローバルなままにできます
         """
         指定されたカラーパックとカラーマップ名に対応するカラーマップデータ (色のリスト) を
@@ -588,7 +714,8 @@ class FractalController(QObject):
             image_height_px (int, optional): レンダリングする画像の高さ (ピクセル単位)。
                                              None の場合、メインウィンドウの RenderArea の現在の高さを使用します。
             full_recompute (bool, optional): True の場合、フラクタルデータを完全に再計算します。
-                                             False の場合、既存のフラクタルデータを使用して再カラーリングのみを行います。Defaults to True.
+                                             False の場合、表示条件が変わっていなければ既存のフラクタルデータで再カラーリングのみを行い、
+                                             パンされていれば既存データをずらして新しく見える帯だけを計算します。Defaults to True.
             is_preview (bool, optional): True の場合、プレビュー品質 (低解像度) でレンダリングします。Defaults to False.
         """
         # 発信元のパス部分を相対パスに変換して出力
@@ -612,25 +739,6 @@ class FractalController(QObject):
             self.status_updated.emit("エラー: フラクタルエンジン未設定")
             return
 
-        # プレビュー要求は、進行中の高品質レンダリングを中断できる
-        if self.is_rendering:
-            if is_preview:
-                # QRunnableには直接的なキャンセルメソッドがないため、
-                # 新しいタスクがすぐに始まることで古いタスクの結果を事実上無視する。
-                # もしFractalRendererに停止フラグがあれば、ここでセットできる。
-                logger.log("プレビュー要求のため、進行中のレンダリングを置き換えます。", level="DEBUG")
-                # self.current_renderer_task.cancel() # FractalRendererにcancel()が実装されていれば
-            else:
-                # 新しい高品質要求が来たが、既にレンダリング中の場合
-                logger.log("以前の描画処理がまだ実行中。新しいタスクは開始されません。", level="WARNING")
-                self.status_updated.emit("前の描画処理がまだ実行中。")
-                return
-
-        if self.is_rendering and not is_preview: # このチェックは上のロジックに統合されたため、冗長
-            logger.log("以前の描画処理がまだ実行中。新しいタスクは開始されません。", level="WARNING")
-            self.status_updated.emit("前の描画処理がまだ実行中。")
-            return
-
         self.status_updated.emit(f"描画準備中...") # 初期概要メッセージ
 
         # プレビューモードの場合、解像度をダウンスケールする
@@ -647,6 +755,28 @@ class FractalController(QObject):
             self.logger.log(f"無効なレンダリングサイズ ({render_width}x{render_height}) のため、描画をスキップします。", level="WARNING")
             return
 
+        # 常に最新の要求を優先する。進行中 (または待機中) のレンダリングはキャンセルし、その結果は破棄する。
+        # 実行中のタスクはエンジンの状態を変更するため、終了を待ってから最新の要求だけを開始する
+        running_task = self.current_renderer_task
+        if self._cancel_current_render():
+            pending = self._pending_render_request
+            full_recompute = (full_recompute or running_task.full_recompute or
+                              (pending is not None and pending[2]))
+            self._pending_render_request = (render_width, render_height, full_recompute)
+            logger.log("実行中のレンダリングの終了後に描画します。", level="DEBUG")
+            return
+
+        self._start_render(render_width, render_height, full_recompute)
+
+    def _start_render(self, render_width: int, render_height: int, full_recompute: bool):
+        """
+        レンダリングタスクを作成してスレッドプールで開始します。実行中のタスクがないときだけ呼び出してください。
+
+        Args:
+            render_width (int): レンダリングする画像の幅 (ピクセル単位)。
+            render_height (int): レンダリングする画像の高さ (ピクセル単位)。
+            full_recompute (bool): フラクタルデータを完全に再計算するかどうか。
+        """
         self.is_rendering = True
         self.rendering_state_changed.emit(True)
 
@@ -663,15 +793,56 @@ class FractalController(QObject):
         self.current_renderer_task.signals.rendering_started.connect(self._on_renderer_started)
         self.current_renderer_task.signals.rendering_finished.connect(self._on_renderer_finished)
         self.current_renderer_task.signals.rendering_failed.connect(self._on_renderer_failed)
+        self.current_renderer_task.signals.rendering_cancelled.connect(self._on_renderer_cancelled)
 
         self.thread_pool.start(self.current_renderer_task)
 
+    def _start_pending_render(self) -> bool:
+        """
+        実行中のタスクの終了を待っていた描画要求があれば開始します。
+
+        Returns:
+            bool: 待機中の要求を開始した場合は True。
+        """
+        request = self._pending_render_request
+        if request is None:
+            return False
+        self._pending_render_request = None
+        self._start_render(*request)
+        return True
+
+    def _cancel_current_render(self) -> bool:
+        """
+        現在のレンダリングタスクにキャンセルを要求します。
+        スレッドプールでまだ開始されていない場合は、キューから取り除きます。
+
+        Returns:
+            bool: タスクがすでに実行中で、その終了の通知を待つ必要がある場合は True。
+        """
+        task = self.current_renderer_task
+        if task is None:
+            return False
+        logger.log("新しい描画要求のため、進行中のレンダリングをキャンセルします。", level="DEBUG")
+        task.cancel()
+        if self.thread_pool.tryTake(task):
+            logger.log("待機中のレンダリングタスクをキューから取り除きました。", level="DEBUG")
+            self.current_renderer_task = None
+            return False
+        return True
+
+    def _is_current_renderer_signal(self) -> bool:
+        """シグナルの送信元が現在のレンダリングタスクであれば True を返します (置き換えられた古いタスクの通知は無視する)。"""
+        task = self.current_renderer_task
+        return task is not None and self.sender() is task.signals
+
     @pyqtSlot()
     def _on_renderer_started(self):
         """
         FractalRenderer からレンダリング開始のシグナルを受信したときに呼び出されるスロット。
         レンダリング状態を更新し、関連するシグナルを発行します。
         """
+        if not self._is_current_renderer_signal():
+            return
         self.logger.log("信号受信", level="DEBUG")
         self.is_rendering = True
         self.logger.log(f"self.is_rendering を設定した直後: {self.is_rendering}", level="DEBUG")
@@ -681,10 +852,15 @@ class FractalController(QObject):
 
     @pyqtSlot(object, float, float)
     def _on_renderer_finished(self, colored_image, compute_time_ms, coloring_time_ms):
+        if not self._is_current_renderer_signal():
+            self.logger.log("置き換えられたレンダリングの結果を破棄します。", level="DEBUG")
+            return
         self.last_compute_time_ms = compute_time_ms
         self.last_coloring_time_ms = coloring_time_ms
         self.image_rendered.emit(colored_image)
         self.current_renderer_task = None
+        if self._start_pending_render():
+            return
         self.is_rendering = False  # ← 先にFalseにする
         self.logger.log(f"self.is_rendering を設定した直後: {self.is_rendering}", level="DEBUG")
         self.update_status_display()  # ← その後で呼ぶ
@@ -693,8 +869,12 @@ class FractalController(QObject):
 
     @pyqtSlot(str)
     def _on_renderer_failed(self, error_message):
+        if not self._is_current_renderer_signal():
+            return
         self.logger.log(f"レンダータスク失敗: {error_message}", level="ERROR")
         self.current_renderer_task = None
+        if self._start_pending_render():
+            return
         self.is_rendering = False  # ← 先にFalseにする
         self.logger.log("self.is_rendering を False に設定する前。", level="DEBUG")
         self.logger.log(f"self.is_rendering を設定した後: {self.is_rendering}", level="DEBUG")
@@ -703,6 +883,20 @@ class FractalController(QObject):
         self.rendering_state_changed.emit(False)
         self.logger.log("self.rendering_state_changed を発行した後: emit(False)", level="DEBUG")
 
+    @pyqtSlot()
+    def _on_renderer_cancelled(self):
+        """
+        FractalRenderer がキャンセルで中断したときに呼び出されるスロット。
+        終了を待っていた描画要求があれば開始し、なければレンダリング状態を解除します。
+        """
+        if not self._is_current_renderer_signal():
+            return
+        self.current_renderer_task = None
+        if self._start_pending_render():
+            return
+        self.is_rendering = False
+        self.rendering_state_changed.emit(False)
+
     def trigger_recolor(self):
         """
         現在のフラクタルデータを再利用して、カラーリングのみを再実行します。
@@ -738,9 +932,9 @@ class FractalController(QObject):
         """
         現在のフラクタルの中心座標を(dr, di)だけ移動させ、再描画をトリガーします。
 
-        パン操作では、通常フラクタルデータの完全な再計算は不要で、
-        既存のデータを使って再着色するだけで十分高速なプレビューが可能です。
-        ただし、表示領域の端では新しいデータが必要になる場合があります。
+        パン操作では、既存のフラクタルデータを移動量だけずらし、
+        新しく見える端の帯だけを計算します。そのため、移動量は計算済みデータの
+        ピクセル単位に丸められます (端数は次回のパンに繰り越されます)。
 
         Args:
             dr (float): 中心のReal部を移動させる量。
@@ -751,13 +945,8 @@ class FractalController(QObject):
             current_params = self.fractal_engine.get_common_parameters()
             new_center_real = current_params['center_real'] - dr
             new_center_imag = current_params['center_imag'] - di
-            self.fractal_engine.set_common_parameters(
-                center_real=new_center_real,
-                center_imag=new_center_imag,
-                width=current_params['width'],
-                max_iterations=current_params['max_iterations']
-            )
-            # パン操作ではフラクタル計算はスキップ(full_recompute=False)
+            self.fractal_engine.pan_view(new_center_real, new_center_imag)
+            # パン操作では既存データをずらし、新しく見える帯だけを計算する(full_recompute=False)
             self.trigger_render(full_recompute=False, is_preview=is_preview)
             # --- 追加: パラメータ変更をUIに通知 ---
             self.parameters_updated_externally.emit(self.get_current_common_parameters())
@@ -850,6 +1039,170 @@ class FractalController(QObject):
         else:
             logger.log("キャンセル対象のエクスポート処理なし。", level="INFO")
 
+    def start_zoom_movie_export(self, output_path: str, end_view: dict, frame_count: int,
+                                width: int = 1920, height: int = 1080, format: str = 'PNG', method: str = 'auto'):
+        """
+        現在の表示範囲から end_view までのズーム動画のフレームを非同期で出力します。
+
+        進捗と完了は高解像度出力と同じシグナル (export_progress_updated, export_process_finished) で通知し、
+        cancel_current_export でキャンセルできます。
+
+        Args:
+            output_path (str): 'PNG' では連番ファイルの出力先ディレクトリ、'RAW' では出力ファイル。
+            end_view (dict): 最後のフレームの 'center_real', 'center_imag', 'width'。
+            frame_count (int): フレーム数。
+            width (int, optional): フレームの幅。Defaults to 1920.
+            height (int, optional): フレームの高さ。Defaults to 1080.
+            format (str, optional): 'PNG' または 'RAW'。Defaults to 'PNG'.
+            method (str, optional): 'auto', 'exp_map', 'keyframes' のいずれか。Defaults to 'auto'.
+        """
+        if self.current_exporter is not None:
+            self.export_process_finished.emit(False, "既にエクスポート処理が実行中です。")
+            return
+        if not self.fractal_engine:
+            self.export_process_finished.emit(False, "FractalEngineが初期化されていません。")
+            return
+        config = self.get_full_configuration()
+        try:
+            views = zoom_path(config['common_parameters'], end_view, frame_count)
+        except (KeyError, ValueError) as e:
+            self.export_process_finished.emit(False, f"ズーム動画の設定が不正です: {e}")
+            return
+
+        logger.log(f"ズーム動画の出力を開始します: {frame_count} フレーム -> {output_path}", level="INFO")
+        job = ZoomMovieJob(views=views, output_path=output_path, width=width, height=height, format=format, method=method,
+                           output_overrides=config_to_output_overrides(config, self.fractal_engine.active_coloring_target_type))
+        exporter = ZoomMovieExporter(self.fractal_engine, job)
+        self.current_exporter = exporter
+
+        exporter.signals.progress_updated.connect(self.export_progress_updated)
+        exporter.signals.export_finished.connect(self._on_export_actually_finished)
+
+        self.export_started.emit()
+        self.thread_pool.start(exporter)
+
+    # --- バッチ出力 ---
+    def start_preset_batch_export(self, output_dir: str, preset_names: list[str] | None = None,
+                                  width: int = 1920, height: int = 1080, format: str = 'PNG',
+                                  antialiasing: str = "なし", max_workers: int | None = None):
+        """
+        保存済みプリセットを別プロセスで並行して描画し、画像ファイルとして出力します。
+
+        各ジョブはヘッドレスの FractalEngine で描画されるため、表示中のエンジンの状態は変わりません。
+        出力先ディレクトリには処理時間などをまとめたマニフェスト (batch_manifest.json) も保存されます。
+
+        Args:
+            output_dir (str): 出力先ディレクトリ。
+            preset_names (list[str] | None, optional): 出力するプリセット名。None の場合はすべて。
+            width (int, optional): 出力画像の幅。Defaults to 1920.
+            height (int, optional): 出力画像の高さ。Defaults to 1080.
+            format (str, optional): 保存形式。Defaults to 'PNG'.
+            antialiasing (str, optional): アンチエイリアスのレベル。Defaults to "なし".
+            max_workers (int | None, optional): ワーカープロセス数。None の場合は CPU コア数まで。
+        """
+        if self.current_batch_exporter is not None:
+            self.batch_export_finished.emit(False, "既にバッチ出力が実行中です。")
+            return
+        try:
+            jobs = jobs_from_presets(self.settings_manager.get_presets(), output_dir, preset_names,
+                                     width, height, format, antialiasing)
+        except KeyError as e:
+            self.batch_export_finished.emit(False, str(e))
+            return
+        if not jobs:
+            self.batch_export_finished.emit(False, "出力するプリセットがありません。")
+            return
+
+        logger.log(f"バッチ出力を開始します: {len(jobs)} 件 -> {output_dir}", level="INFO")
+        batch_exporter = BatchExporter(jobs, self.fractal_engine.plugin_manager.project_root, max_workers=max_workers)
+        self.current_batch_exporter = batch_exporter
+        batch_exporter.signals.job_progress.connect(self.batch_export_job_progress)
+        batch_exporter.signals.job_finished.connect(self.batch_export_job_finished)
+        batch_exporter.signals.batch_finished.connect(self._on_batch_export_finished)
+        self.thread_pool.start(batch_exporter)
+
+    @pyqtSlot(bool, str)
+    def _on_batch_export_finished(self, success: bool, message: str):
+        """バッチ出力の完了を通知し、参照をクリアします。"""
+        logger.log(f"バッチ出力処理完了。成功: {success}, メッセージ: {message}", level="INFO")
+        self.current_batch_exporter = None
+        self.batch_export_finished.emit(success, message)
+
+    def cancel_batch_export(self):
+        """実行中のバッチ出力があれば、それをキャンセルしようと試みます。"""
+        if self.current_batch_exporter:
+            self.current_batch_exporter.cancel()
+        else:
+            logger.log("キャンセル対象のバッチ出力なし。", level="INFO")
+
+    # --- パレットアニメーション ---
+    def set_palette_offset_and_recolor(self, offset: float):
+        """
+        パレットの循環位置を設定し、再カラーリングをトリガーします。
+        フラクタルの再計算は行わず、保持しているパレット座標から色を引き直します。
+
+        Args:
+            offset (float): カラーマップ1周分を 1.0 とする循環位置。
+        """
+        if not self.fractal_engine: return
+        self.fractal_engine.set_palette_offset(offset)
+        self.trigger_recolor()
+
+    def start_palette_cycling(self, cycles_per_second: float | None = None):
+        """
+        現在の描画結果のままパレットを循環させるアニメーションを開始します。
+
+        各フレームではフラクタルの再計算もカラーリングプラグインの計算も行わず、
+        エンジンが保持しているパレット座標を LUT で色に変換するだけなので、約60fpsで更新できます。
+
+        Args:
+            cycles_per_second (float | None, optional): 1秒あたりのカラーマップの周回数。None の場合は現在の値を使用します。
+        """
+        if not self.fractal_engine: return
+        if cycles_per_second is not None:
+            self.palette_cycles_per_second = cycles_per_second
+        self._palette_cycle_start_time = time.perf_counter()
+        self._palette_cycle_start_offset = self.fractal_engine.palette_offset
+        if not self.palette_cycle_timer.isActive():
+            self.palette_cycle_timer.start()
+            logger.log(f"パレットアニメーションを開始します ({self.palette_cycles_per_second} 周/秒)。", level="INFO")
+            self.palette_cycling_changed.emit(True)
+
+    def stop_palette_cycling(self):
+        """
+        パレットアニメーションを停止します。
+
+        循環位置はその時点のまま残り、表示と同じ色で出力されるよう、高解像度出力・ズーム動画や
+        保存するプリセット (get_full_configuration) にも引き継がれます。set_palette_offset_and_recolor(0.0) で元に戻せます。
+        """
+        if self.palette_cycle_timer.isActive():
+            self.palette_cycle_timer.stop()
+            logger.log("パレットアニメーションを停止しました。", level="INFO")
+            self.palette_cycling_changed.emit(False)
+
+    @pyqtSlot()
+    def _on_palette_cycle_tick(self):
+        """パレットアニメーションの1フレーム。循環位置を進め、保持しているフラクタルデータを再着色して表示します。"""
+        engine = self.fractal_engine
+        # レンダリング中はエンジンのキャッシュが更新されるため、そのフレームは飛ばす
+        if not engine or self.is_rendering or engine.last_fractal_data_cache is None:
+            return
+        # 出力やサムネイルの描画がカーネルを使用中の場合も、UI スレッドを待たせずにそのフレームは飛ばす
+        if not engine.kernel_lock.acquire(blocking=False):
+            return
+        try:
+            elapsed = time.perf_counter() - self._palette_cycle_start_time
+            engine.set_palette_offset(self._palette_cycle_start_offset + elapsed * self.palette_cycles_per_second)
+            start = time.perf_counter()
+            image = engine.compose_colored_image()
+        finally:
+            engine.kernel_lock.release()
+        if image is None:
+            self.stop_palette_cycling()
+            return
+        self.last_coloring_time_ms = (time.perf_counter() - start) * 1000
+        self.image_rendered.emit(image)
+
     # --- プログラムによるパラメータ変更 (このセクションのコードは変更なし) ---
     def handle_programmatic_parameter_change(self, cr, ci, w, iters=None, plugin_params=None):
         """
@@ -909,7 +1262,8 @@ class FractalController(QObject):
                 'plugin_parameters': self.get_current_coloring_plugin_parameters_from_engine('non_divergent'),
                 'pack_name': self.get_active_color_pack_name_from_engine('non_divergent'),
                 'map_name': self.get_active_color_map_name_from_engine('non_divergent'),
-            }
+            },
+            'palette_offset': self.fractal_engine.palette_offset,
         }
         return config
 
@@ -4,6 +4,7 @@ from models.fractal_engine import FractalEngine  # 型ヒント用
 import time
 import numpy as np # NumPy をインポート
 from logger.custom_logger import CustomLogger
+from utils.cancel_token import CancelToken, RenderCancelledError
 from typing import Any
 
 
@@ -15,6 +16,7 @@ class FractalRendererSignals(QObject):
     rendering_started = pyqtSignal()  # レンダリング処理開始時に通知
     rendering_finished = pyqtSignal(object, float, float)  # レンダリング完了時（画像データ, 計算時間, カラーリング時間）
     rendering_failed = pyqtSignal(str)  # レンダリング失敗時（エラーメッセージ）
+    rendering_cancelled = pyqtSignal()  # 新しい要求に置き換えられて中断したとき
 
     def __init__(self, parent=None):
         """
@@ -31,6 +33,7 @@ class FractalRenderer(QRunnable):
     フラクタル画像のレンダリング処理を別スレッドで実行するクラスです。
     QRunnableを継承し、FractalEngineを用いてフラクタル計算・カラーリングを行い、
     結果をシグナルで通知します。
+    cancel() が呼ばれると、計算の帯の区切りまたは着色の区切りで処理を打ち切り、結果は通知しません。
     """
     def __init__(self, fractal_engine: FractalEngine, image_width_px: int, image_height_px: int, full_recompute: bool, active_coloring_target_type: str):
         """
@@ -51,6 +54,14 @@ class FractalRenderer(QRunnable):
         self.active_coloring_target_type = active_coloring_target_type  # カラーリングターゲット
         self.signals = FractalRendererSignals()  # シグナル管理
         self.logger = CustomLogger()  # ロガー
+        self.cancel_token = CancelToken()  # 協調的キャンセル用トークン
+
+    def cancel(self):
+        """
+        レンダリングの中断を要求します。
+        実行中の計算は次の帯の区切り (着色中は発散部・非発散部の区切り) で打ち切られ、rendering_cancelled が通知されます。
+        """
+        self.cancel_token.cancel()
 
     def run(self):
         """
@@ -58,6 +69,11 @@ class FractalRenderer(QRunnable):
         フラクタル計算・カラーリングを行い、成功時は画像データと計算時間を通知、
         失敗時はエラーメッセージを通知します。
         """
+        if self.cancel_token.is_cancelled:
+            self.logger.log("開始前にキャンセルされたため、レンダリングをスキップします。", level="DEBUG")
+            self.signals.rendering_cancelled.emit()
+            return
+
         self.signals.rendering_started.emit()
         self.logger.log("レンダリング開始", level="INFO")
 
@@ -69,8 +85,10 @@ class FractalRenderer(QRunnable):
 
             compute_time_ms = 0.0
             start_t = time.perf_counter()
-            # フラクタルデータ計算
-            fractal_data = self.fractal_engine.compute_current_fractal()
+            # フラクタルデータ計算 (完全再計算でなければ、キャッシュの再利用やパン分の部分計算を許可)
+            fractal_data = self.fractal_engine.compute_current_fractal(
+                reuse_cache=not self.full_recompute, cancel_token=self.cancel_token
+            )
             compute_time_ms = (time.perf_counter() - start_t) * 1000
 
             if fractal_data is None:
@@ -89,48 +107,63 @@ class FractalRenderer(QRunnable):
                 self.signals.rendering_failed.emit("計算データ型エラー (is_divergedマスク不正)")
                 return
 
+            self.cancel_token.raise_if_cancelled()
             coloring_time_start = time.perf_counter()
 
-            # 発散・非発散領域ごとにカラーリング
-            colored_image_divergent = self.fractal_engine.apply_coloring(
-                target_type='divergent', fractal_data_override=fractal_data
-            )
-            colored_image_non_divergent = self.fractal_engine.apply_coloring(
-                target_type='non_divergent', fractal_data_override=fractal_data
-            )
+            # 発散・非発散領域をそれぞれのプラグインで1回ずつ着色し、1枚のバッファに合成
+            final_image = self.fractal_engine.compose_colored_image(
+                fractal_data_override=fractal_data, cancel_token=self.cancel_token)
 
             coloring_time_ms = (time.perf_counter() - coloring_time_start) * 1000
 
-            if colored_image_divergent is None or colored_image_non_divergent is None:
-                self.logger.log("FractalRenderer: 一方または両方のカラーリング結果がNoneです。", level="ERROR")
-                self.signals.rendering_failed.emit("カラーリング失敗 (片方または両方の結果がNone)")
-                return
-
-            # RGBA画像であることを確認
-            if colored_image_divergent.shape[-1] != 4 or colored_image_non_divergent.shape[-1] != 4:
-                self.logger.log("FractalRenderer: カラーリング結果がRGBAではありません。", level="ERROR")
-                self.signals.rendering_failed.emit("カラーリング結果フォーマットエラー")
+            if final_image is None:
+                self.logger.log("FractalRenderer: カラーリング結果がNoneです。", level="ERROR")
+                self.signals.rendering_failed.emit("カラーリング失敗 (結果がNone)")
                 return
 
-            # is_diverged_mask の形状をRGBA画像に合わせる (H, W) -> (H, W, 1)
-            is_diverged_mask_rgba = is_diverged_mask[..., np.newaxis]
-
-            # 発散領域・非発散領域を合成して最終画像を生成
-            final_image = np.where(
-                is_diverged_mask_rgba,
-                colored_image_divergent,
-                colored_image_non_divergent
-            )
-
+            self.cancel_token.raise_if_cancelled()
             self.logger.log(f"レンダリング完了。計算時間: {compute_time_ms:.1f}ms, 着色時間: {coloring_time_ms:.1f}ms", level="INFO")
             try:
-                self.signals.rendering_finished.emit(final_image.astype(np.uint8), compute_time_ms, coloring_time_ms)
+                self.signals.rendering_finished.emit(final_image, compute_time_ms, coloring_time_ms)
             except RuntimeError as e_emit_finished:
                 self.logger.log(f"レンダリング完了の発行中にエラーが発生しました: {e_emit_finished}", level="ERROR")
 
+        except RenderCancelledError:
+            self.logger.log("レンダリングはキャンセルされました。", level="DEBUG")
+            try:
+                self.signals.rendering_cancelled.emit()
+            except RuntimeError as e_emit_cancelled:
+                self.logger.log(f"レンダリングキャンセルの発行中にエラーが発生しました: {e_emit_cancelled}", level="ERROR")
+
         except Exception as e_outer:
             self.logger.log(f"レンダリング中にエラーが発生しました: {e_outer}", level="ERROR", exc_info=True)
             try:
                 self.signals.rendering_failed.emit(f"レンダリング中にエラーが発生しました: {e_outer}")
             except RuntimeError as e_emit_failed_outer:
                 self.logger.log(f"レンダリング失敗の発行中にエラーが発生しました: {e_emit_failed_outer}", level="ERROR")
+
+
+class WarmUpTask(QRunnable):
+    """
+    起動直後に、アクティブなプラグインの JIT コンパイルを別スレッドで済ませるクラスです。
+    FractalEngine.warm_up で小さな画像を計算・着色し、結果は捨てます。
+    """
+    def __init__(self, fractal_engine: FractalEngine):
+        """
+        WarmUpTask を初期化します。
+
+        Args:
+            fractal_engine (FractalEngine): フラクタル計算エンジン。
+        """
+        super().__init__()
+        self.fractal_engine = fractal_engine  # フラクタル計算エンジン
+        self.logger = CustomLogger()  # ロガー
+
+    def run(self):
+        """
+        ウォームアップを実行します。失敗してもアプリの動作には影響しないため、ログに残すだけです。
+        """
+        try:
+            self.fractal_engine.warm_up()
+        except Exception as e:
+            self.logger.log(f"ウォームアップ中にエラーが発生しました: {e}", level="WARNING")
@@ -1,3 +1,12 @@
 from .image_exporter import ImageExporter, ExporterSignals
+from .streaming_writers import StreamingImageWriter, PngStreamWriter, TiledTiffWriter, BufferedRgbWriter, create_image_writer
+from .batch_exporter import BatchJob, BatchExportRunner, BatchExporter, jobs_from_presets, jobs_from_sweep
+from .zoom_movie import (ZoomMovieJob, ZoomMovieRenderer, ZoomMovieExporter, PngFrameSequenceWriter, RawVideoWriter,
+                         create_frame_writer, find_zoom_fixed_point, zoom_path)
+from .preset_thumbnails import PresetThumbnailCache, PresetThumbnailSignals, PresetThumbnailWorker
 
-__all__ = ['ImageExporter', 'ExporterSignals']
+__all__ = ['ImageExporter', 'ExporterSignals', 'StreamingImageWriter', 'PngStreamWriter', 'TiledTiffWriter',
+           'BufferedRgbWriter', 'create_image_writer', 'BatchJob', 'BatchExportRunner', 'BatchExporter',
+           'jobs_from_presets', 'jobs_from_sweep', 'ZoomMovieJob', 'ZoomMovieRenderer', 'ZoomMovieExporter',
+           'PngFrameSequenceWriter', 'RawVideoWriter', 'create_frame_writer', 'find_zoom_fixed_point', 'zoom_path',
+           'PresetThumbnailCache', 'PresetThumbnailSignals', 'PresetThumbnailWorker']
@@ -0,0 +1,402 @@
+import copy
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from logger.custom_logger import CustomLogger
+from export.streaming_writers import create_image_writer
+from utils.cancel_token import CancelToken, RenderCancelledError
+
+logger = CustomLogger()
+
+MANIFEST_FILENAME = "batch_manifest.json"
+_FORMAT_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'TIFF': '.tif', 'BMP': '.bmp'}
+
+
+@dataclass
+class BatchJob:
+    """バッチ出力の画像1枚分のジョブを表すデータクラス"""
+    name: str
+    config: dict  # プリセットと同じ形式の設定 (FractalController.get_full_configuration 参照)
+    output_path: str
+    width: int = 1920
+    height: int = 1080
+    format: str = 'PNG'
+    antialiasing: str = "なし"  # FractalEngine.iter_output_bands の antialiasing_level
+
+
+def _safe_filename(name: str) -> str:
+    """ファイル名に使えない文字を '_' に置き換えます。"""
+    return re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name).strip() or "untitled"
+
+
+def jobs_from_presets(presets: dict, output_dir: str | Path, names: list[str] | None = None,
+                      width: int = 1920, height: int = 1080, format: str = 'PNG',
+                      antialiasing: str = "なし") -> list[BatchJob]:
+    """
+    保存済みプリセット (SettingsManager.get_presets の戻り値) からジョブの一覧を作成します。
+
+    Args:
+        presets (dict): プリセット名をキー、設定を値とする辞書。
+        output_dir (str | Path): 出力先ディレクトリ。ファイル名はプリセット名から作成します。
+        names (list[str] | None, optional): 出力するプリセット名。None の場合はすべて。
+        width (int, optional): 出力画像の幅。Defaults to 1920.
+        height (int, optional): 出力画像の高さ。Defaults to 1080.
+        format (str, optional): 保存形式 ('PNG', 'JPEG', 'TIFF', 'BMP')。Defaults to 'PNG'.
+        antialiasing (str, optional): アンチエイリアスのレベル。Defaults to "なし".
+    Returns:
+        list[BatchJob]: ジョブの一覧。
+    Raises:
+        KeyError: names に存在しないプリセット名が含まれる場合。
+    """
+    extension = _FORMAT_EXTENSIONS.get(format.upper(), f".{format.lower()}")
+    jobs = []
+    for name in (names if names is not None else list(presets)):
+        if name not in presets:
+            raise KeyError(f"プリセット '{name}' が見つかりません。")
+        jobs.append(BatchJob(name=name, config=copy.deepcopy(presets[name]),
+                             output_path=str(Path(output_dir) / f"{_safe_filename(name)}{extension}"),
+                             width=width, height=height, format=format.upper(), antialiasing=antialiasing))
+    return jobs
+
+
+def jobs_from_sweep(base_config: dict, key_path: str, values: list, output_dir: str | Path,
+                    name_prefix: str = "sweep", width: int = 1920, height: int = 1080,
+                    format: str = 'PNG', antialiasing: str = "なし") -> list[BatchJob]:
+    """
+    基準の設定のうち1つのパラメータを順に変えたジョブの一覧を作成します。
+
+    Args:
+        base_config (dict): 基準となるプリセット形式の設定。
+        key_path (str): 変更するパラメータのドット区切りのパス
+                        (例: 'common_parameters.max_iterations', 'fractal_plugin_parameters.c_real')。
+        values (list): パラメータに順に設定する値。
+        output_dir (str | Path): 出力先ディレクトリ。
+        name_prefix (str, optional): ジョブ名とファイル名の接頭辞。Defaults to "sweep".
+        width (int, optional): 出力画像の幅。Defaults to 1920.
+        height (int, optional): 出力画像の高さ。Defaults to 1080.
+        format (str, optional): 保存形式。Defaults to 'PNG'.
+        antialiasing (str, optional): アンチエイリアスのレベル。Defaults to "なし".
+    Returns:
+        list[BatchJob]: ジョブの一覧。
+    """
+    keys = key_path.split('.')
+    extension = _FORMAT_EXTENSIONS.get(format.upper(), f".{format.lower()}")
+    digits = len(str(max(len(values) - 1, 0)))
+    jobs = []
+    for index, value in enumerate(values):
+        config = copy.deepcopy(base_config)
+        node = config
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+        name = f"{name_prefix}_{index:0{digits}d}"
+        jobs.append(BatchJob(name=f"{name} ({key_path}={value})", config=config,
+                             output_path=str(Path(output_dir) / f"{_safe_filename(name)}{extension}"),
+                             width=width, height=height, format=format.upper(), antialiasing=antialiasing))
+    return jobs
+
+
+def config_to_output_overrides(config: dict, target_type: str = 'divergent') -> dict:
+    """
+    プリセット形式の設定を FractalEngine.iter_output_bands の上書き引数に変換します。
+
+    エンジンの状態を変更せずに設定を渡すため、同じエンジンで続けて別のジョブを処理できます。
+
+    Args:
+        config (dict): プリセット形式の設定。
+        target_type (str, optional): 出力に使うカラーリングの対象 ('divergent' または 'non_divergent')。
+    Returns:
+        dict: iter_output_bands のキーワード引数。
+    """
+    common_params = {key: value for key, value in (config.get('common_parameters') or {}).items() if key != 'height'}
+    coloring = config.get(f'coloring_{target_type}') or {}
+    return {
+        'common_params_override': common_params,
+        'fractal_plugin_name_override': config.get('fractal_plugin_name'),
+        'fractal_plugin_params_override': config.get('fractal_plugin_parameters'),
+        'coloring_algo_name_override': coloring.get('plugin_name'),
+        'coloring_algo_params_override': coloring.get('plugin_parameters'),
+        'color_pack_name_override': coloring.get('pack_name'),
+        'color_map_name_override': coloring.get('map_name'),
+        # 循環位置を持たない設定 (以前のプリセットなど) は循環させずに描画する
+        'palette_offset_override': config.get('palette_offset', 0.0),
+    }
+
+
+# --- ワーカープロセス側 ---
+# 各ワーカープロセスはヘッドレスの FractalEngine を1つだけ作成し、担当するジョブで使い回す
+_worker_engine = None
+_worker_progress_queue = None
+_worker_cancel_event = None
+
+
+def _init_worker(project_root: str, progress_queue, cancel_event, numba_threads: int) -> None:
+    """ワーカープロセスの初期化。プラグインの読み込みはプロセスごとに1回だけ行います。"""
+    global _worker_engine, _worker_progress_queue, _worker_cancel_event
+    _worker_progress_queue = progress_queue
+    _worker_cancel_event = cancel_event
+    try:
+        import numba
+        # ワーカー数 x 全コアのスレッドでコアを取り合わないよう、プロセスあたりのスレッド数を制限する
+        numba.set_num_threads(max(1, min(numba_threads, numba.config.NUMBA_NUM_THREADS)))
+    except Exception as e:
+        logger.log(f"Numba のスレッド数を設定できませんでした: {e}", level="WARNING")
+    from models.fractal_engine import FractalEngine
+    _worker_engine = FractalEngine(Path(project_root))
+
+
+def _render_job(job_index: int, job: BatchJob) -> dict:
+    """ワーカープロセスでジョブを1つ描画し、ファイルへ逐次書き込みます。"""
+    if _worker_cancel_event.is_set():
+        raise RenderCancelledError()
+    start = time.perf_counter()
+    cancel_token = CancelToken()
+
+    def on_progress(fraction: float) -> None:
+        _worker_progress_queue.put((job_index, fraction))
+        if _worker_cancel_event.is_set():
+            cancel_token.cancel()
+
+    Path(job.output_path).parent.mkdir(parents=True, exist_ok=True)
+    with create_image_writer(job.format, job.output_path, job.width, job.height) as writer:
+        for _, band in _worker_engine.iter_output_bands(
+                job.width, job.height, antialiasing_level=job.antialiasing,
+                cancel_token=cancel_token, progress_callback=on_progress,
+                **config_to_output_overrides(job.config, _worker_engine.active_coloring_target_type)):
+            writer.write_band(band)
+    return {'render_seconds': time.perf_counter() - start, 'pid': os.getpid()}
+
+
+# --- 親プロセス側 ---
+class BatchExportRunner:
+    """
+    ジョブの一覧をプロセスプールで並行して描画し、結果の概要をマニフェスト (JSON) に書き出します。
+
+    Qt に依存しないため、スクリプトからも直接使用できます。各ワーカープロセスの Numba スレッド数は
+    CPU コア数をワーカー数で割った値に制限します。失敗したジョブは max_retries 回まで再実行し、
+    ワーカープロセスが異常終了した場合はプールを作り直して残りのジョブを続行します。
+    """
+    def __init__(self, jobs: list[BatchJob], project_root: str | Path, max_workers: int | None = None,
+                 max_retries: int = 1, manifest_path: str | Path | None = None):
+        """
+        Args:
+            jobs (list[BatchJob]): 処理するジョブの一覧。
+            project_root (str | Path): プラグインやカラーパックを読み込むプロジェクトのルート。
+            max_workers (int | None, optional): ワーカープロセス数。None の場合は min(CPU コア数, ジョブ数)。
+            max_retries (int, optional): 失敗したジョブを再実行する回数。Defaults to 1.
+            manifest_path (str | Path | None, optional): マニフェストの保存先。None の場合は
+                最初のジョブの出力先ディレクトリの `batch_manifest.json`。
+        """
+        self.jobs = list(jobs)
+        self.project_root = str(project_root)
+        cpu_count = os.cpu_count() or 1
+        self.max_workers = max(1, min(max_workers or cpu_count, len(self.jobs) or 1))
+        self.numba_threads = max(1, cpu_count // self.max_workers)
+        self.max_retries = max_retries
+        if manifest_path is None and self.jobs:
+            manifest_path = Path(self.jobs[0].output_path).parent / MANIFEST_FILENAME
+        self.manifest_path = Path(manifest_path) if manifest_path is not None else None
+        self._context = multiprocessing.get_context('spawn')  # Qt や Numba のスレッドを fork で複製しない
+        self._cancel_event = self._context.Event()
+
+    def cancel(self) -> None:
+        """未処理のジョブを取り消し、処理中のジョブにはタイルの区切りで中断を要求します。"""
+        self._cancel_event.set()
+
+    def _create_executor(self, progress_queue) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context,
+                                   initializer=_init_worker,
+                                   initargs=(self.project_root, progress_queue, self._cancel_event, self.numba_threads))
+
+    def run(self, progress_callback=None, job_finished_callback=None) -> dict:
+        """
+        すべてのジョブを処理し、マニフェストを返します (manifest_path があれば保存もします)。
+
+        Args:
+            progress_callback (Callable[[int, float], None] | None, optional): (ジョブ番号, 進捗 0.0-1.0) を受け取る関数。
+            job_finished_callback (Callable[[int, str, str], None] | None, optional):
+                (ジョブ番号, 状態 'succeeded' / 'failed' / 'cancelled', 出力パスまたはエラーメッセージ) を受け取る関数。
+        Returns:
+            dict: マニフェスト。
+        """
+        started_at = datetime.now()
+        wall_start = time.perf_counter()
+        results = [{'name': job.name, 'output_path': job.output_path, 'status': 'pending', 'attempts': 0,
+                    'render_seconds': None, 'error': None} for job in self.jobs]
+        logger.log(f"バッチ出力開始: {len(self.jobs)} 件, ワーカー {self.max_workers} プロセス "
+                   f"(各 {self.numba_threads} スレッド)", level="INFO")
+
+        def finish(index: int, status: str, detail: str) -> None:
+            results[index]['status'] = status
+            if status != 'succeeded':
+                results[index]['error'] = detail
+            logger.log(f"  [{index + 1}/{len(self.jobs)}] {self.jobs[index].name}: {status} ({detail})",
+                       level="INFO" if status == 'succeeded' else "WARNING")
+            if job_finished_callback is not None:
+                job_finished_callback(index, status, detail)
+
+        def relay_progress() -> None:
+            while True:
+                try:
+                    index, fraction = progress_queue.get_nowait()
+                except Empty:
+                    return
+                if progress_callback is not None:
+                    progress_callback(index, fraction)
+
+        progress_queue = self._context.Queue()
+        executor = self._create_executor(progress_queue)
+        pending = {}
+        try:
+            def submit(index: int) -> None:
+                results[index]['attempts'] += 1
+                pending[executor.submit(_render_job, index, self.jobs[index])] = index
+
+            for index in range(len(self.jobs)):
+                submit(index)
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                relay_progress()
+                pool_broken = False
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        outcome = future.result()
+                    except RenderCancelledError:
+                        finish(index, 'cancelled', "キャンセルされました。")
+                        continue
+                    except Exception as e:
+                        pool_broken = pool_broken or isinstance(e, BrokenProcessPool)
+                        if results[index]['attempts'] <= self.max_retries and not self._cancel_event.is_set():
+                            logger.log(f"  {self.jobs[index].name}: 失敗したため再実行します ({e})", level="WARNING")
+                            results[index]['status'] = 'retrying'
+                            results[index]['error'] = str(e)
+                            if not pool_broken:
+                                submit(index)
+                        else:
+                            finish(index, 'failed', str(e) or type(e).__name__)
+                        continue
+                    results[index]['render_seconds'] = round(outcome['render_seconds'], 3)
+                    results[index]['error'] = None
+                    finish(index, 'succeeded', self.jobs[index].output_path)
+                if pool_broken:
+                    # 異常終了したワーカーがあるとプール全体が使えなくなるため、作り直して未完了のジョブを投入し直す
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    unfinished = sorted(set(pending.values()) |
+                                        {i for i, r in enumerate(results) if r['status'] == 'retrying'})
+                    pending.clear()
+                    executor = self._create_executor(progress_queue)
+                    for index in unfinished:
+                        submit(index)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            relay_progress()
+
+        manifest = self._build_manifest(results, started_at, time.perf_counter() - wall_start)
+        if self.manifest_path is not None:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=4, ensure_ascii=False)
+            logger.log(f"バッチ出力のマニフェストを保存しました: {self.manifest_path}", level="INFO")
+        return manifest
+
+    def _build_manifest(self, results: list[dict], started_at: datetime, wall_seconds: float) -> dict:
+        jobs = []
+        for job, result in zip(self.jobs, results):
+            entry = dict(result)
+            entry.update({key: value for key, value in asdict(job).items() if key in ('width', 'height', 'format', 'antialiasing')})
+            jobs.append(entry)
+        counts = {status: sum(1 for r in results if r['status'] == status) for status in ('succeeded', 'failed', 'cancelled')}
+        return {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'wall_seconds': round(wall_seconds, 3),
+            'workers': self.max_workers,
+            'threads_per_worker': self.numba_threads,
+            'summary': dict(counts, total=len(results),
+                            total_render_seconds=round(sum(r['render_seconds'] or 0.0 for r in results), 3)),
+            'jobs': jobs,
+        }
+
+
+class BatchExporterSignals(QObject):
+    """バッチ出力の非同期処理のためのシグナルを定義するクラスです。
+
+    Attributes:
+        job_progress (pyqtSignal): ジョブごとの進捗を通知するシグナル (int: ジョブ番号, int: 0-100)。
+        job_finished (pyqtSignal): ジョブの完了を通知するシグナル (int: ジョブ番号, bool: 成功フラグ, str: 出力パス/エラーメッセージ)。
+        batch_finished (pyqtSignal): バッチ全体の完了を通知するシグナル (bool: すべて成功したか, str: 概要メッセージ)。
+    """
+    job_progress = pyqtSignal(int, int)
+    job_finished = pyqtSignal(int, bool, str)
+    batch_finished = pyqtSignal(bool, str)
+
+
+class BatchExporter(QRunnable):
+    """BatchExportRunner を QThreadPool 上で実行し、結果をシグナルで通知するクラスです。"""
+    def __init__(self, jobs: list[BatchJob], project_root: str | Path, max_workers: int | None = None,
+                 max_retries: int = 1):
+        """BatchExporter を初期化します。
+
+        Args:
+            jobs (list[BatchJob]): 処理するジョブの一覧。
+            project_root (str | Path): プロジェクトのルート。
+            max_workers (int | None, optional): ワーカープロセス数。
+            max_retries (int, optional): 失敗したジョブを再実行する回数。
+        """
+        super().__init__()
+        self.signals = BatchExporterSignals()
+        self.runner = BatchExportRunner(jobs, project_root, max_workers=max_workers, max_retries=max_retries)
+
+    def run(self):
+        """バッチ出力を実行します。"""
+        try:
+            manifest = self.runner.run(
+                progress_callback=lambda index, fraction: self.signals.job_progress.emit(index, int(100 * fraction)),
+                job_finished_callback=lambda index, status, detail: self.signals.job_finished.emit(index, status == 'succeeded', detail))
+            summary = manifest['summary']
+            message = (f"バッチ出力完了: 成功 {summary['succeeded']} / 失敗 {summary['failed']} / "
+                       f"キャンセル {summary['cancelled']} (マニフェスト: {self.runner.manifest_path})")
+            self.signals.batch_finished.emit(summary['succeeded'] == summary['total'], message)
+        except Exception as e:
+            import traceback
+            logger.log(f"バッチ出力中に予期せぬエラーが発生: {e}\n{traceback.format_exc()}", level="ERROR")
+            self.signals.batch_finished.emit(False, f"予期せぬバッチ出力エラー: {e}")
+
+    def cancel(self):
+        """バッチ出力のキャンセルを要求します。"""
+        logger.log("バッチ出力のキャンセル要求を受け付けました。", level="INFO")
+        self.runner.cancel()
+
+
+if __name__ == '__main__':
+    # 保存済みプリセットをまとめて出力する (例: python -m export.batch_exporter out_dir --width 800 --height 600)
+    import argparse
+    from settings_manager import SettingsManager
+
+    parser = argparse.ArgumentParser(description="保存済みプリセットを画像ファイルにまとめて出力します。")
+    parser.add_argument('output_dir')
+    parser.add_argument('--presets', nargs='*', help="出力するプリセット名 (省略時はすべて)")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--format', default='PNG', choices=sorted(_FORMAT_EXTENSIONS))
+    parser.add_argument('--antialiasing', default="なし")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    batch_jobs = jobs_from_presets(SettingsManager().get_presets(), args.output_dir, args.presets,
+                                   args.width, args.height, args.format, args.antialiasing)
+    runner = BatchExportRunner(batch_jobs, Path(__file__).resolve().parent.parent, max_workers=args.workers)
+    result = runner.run(progress_callback=None)
+    print(json.dumps(result['summary'], ensure_ascii=False))
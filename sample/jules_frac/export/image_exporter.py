@@ -1,13 +1,14 @@
 from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, QThreadPool
 import time
 import numpy as np
-from PIL import Image
 from pathlib import Path
 # Pillowをインポート
 # fractal_engine_refの型ヒント用
 from typing import Any
 from logger.custom_logger import CustomLogger
 from models.fractal_engine import FractalEngine
+from utils.cancel_token import CancelToken, RenderCancelledError
+from export.streaming_writers import create_image_writer
 
 logger = CustomLogger()
 
@@ -25,7 +26,8 @@ class ImageExporter(QRunnable):
     """画像のエクスポート処理を別スレッドで実行するクラスです。QRunnableを継承しています。
 
     高解像度のフラクタル画像をファイルに保存する機能を提供します。
-    Pillowライブラリを使用して各種画像形式に対応し、キャンセル処理もサポートします。
+    エンジンが帯ごとに生成した画像を export.streaming_writers のライターへ逐次渡すため、
+    PNG と TIFF では画像全体をメモリ上に確保しません。キャンセル処理もサポートします。
     """
     def __init__(self, fractal_engine_ref, export_settings: dict):
         """ImageExporter を初期化します。
@@ -40,12 +42,13 @@ class ImageExporter(QRunnable):
         self.export_settings = export_settings
         self.signals = ExporterSignals()
         self._is_cancelled = False
+        self.cancel_token = CancelToken()  # タイル単位でエンジンの計算を中断するためのトークン
 
     def run(self):
         """メインのエクスポート処理を実行します。
 
-        設定に基づいて画像を生成し、指定されたファイルパスに保存します。
-        進捗と完了/失敗はシグナルを通じて通知されます。
+        設定に基づいて画像を帯ごとに生成しながら、指定されたファイルパスへ書き込みます。
+        進捗と完了/失敗はシグナルを通じて通知されます。キャンセルや失敗時は書きかけのファイルを削除します。
         """
         filepath = self.export_settings.get('filepath', 'fractal_export.png') # exceptブロックで使用するために初期化
         try: # exceptブロックで使用するために初期化
@@ -68,8 +71,12 @@ class ImageExporter(QRunnable):
             color_map_name_override = self.export_settings.get('color_map_name')
 
             # アンチエイリアシング: ダイアログは係数を渡し、エンジンは文字列を期待
+            # (適応型アンチエイリアスは係数ではなくダイアログの文字列で指定される)
             aa_factor = self.export_settings.get('antialiasing_factor', 1)
-            antialiasing_level_str = f"{aa_factor}x{aa_factor} SSAA" if aa_factor > 1 else "なし"
+            if self.export_settings.get('antialiasing') == FractalEngine.ADAPTIVE_AA_LEVEL:
+                antialiasing_level_str = FractalEngine.ADAPTIVE_AA_LEVEL
+            else:
+                antialiasing_level_str = f"{aa_factor}x{aa_factor} SSAA" if aa_factor > 1 else "なし"
 
             def _to_relpath(path):
                 try:
@@ -80,14 +87,23 @@ class ImageExporter(QRunnable):
                     pass
                 return str(path)
 
-            logger.log(f"エクスポート処理開始: {_to_relpath(filepath)} ({output_width}x{output_height}), AA: {antialiasing_level_str}", level="INFO")
-            self.signals.progress_updated.emit(5)
+            format_str = self.export_settings.get('format', 'PNG').upper()
+            logger.log(f"エクスポート処理開始: {_to_relpath(filepath)} ({output_width}x{output_height}, {format_str}), AA: {antialiasing_level_str}", level="INFO")
 
             if self._is_cancelled:
                 self.signals.export_finished.emit(False, "計算開始前にキャンセルされました。")
                 return
 
-            image_data_np = self.fractal_engine.generate_image_for_output(
+            try:
+                writer = create_image_writer(format_str, filepath, output_width, output_height,
+                                             jpeg_quality=self.export_settings.get('jpeg_quality', 90))
+            except ValueError as e:
+                self.signals.export_finished.emit(False, str(e))
+                return
+
+            # エンジンが帯を生成するたびにライターへ渡し、画像全体をメモリ上に確保せずに保存する。
+            # 進捗はタイル単位の実際の進み具合 (書き込み込み) を 0% から 99% に割り当てる。
+            bands = self.fractal_engine.iter_output_bands(
                 output_width=output_width,
                 output_height=output_height,
                 common_params_override=common_params_override,
@@ -97,84 +113,22 @@ class ImageExporter(QRunnable):
                 coloring_algo_params_override=coloring_algo_params_override,
                 color_pack_name_override=color_pack_name_override,
                 color_map_name_override=color_map_name_override,
-                antialiasing_level=antialiasing_level_str
+                antialiasing_level=antialiasing_level_str,
+                cancel_token=self.cancel_token,
+                progress_callback=lambda fraction: self.signals.progress_updated.emit(int(99 * fraction))
             )
-
-            self.signals.progress_updated.emit(80)
-
-            if self._is_cancelled:
-                self.signals.export_finished.emit(False, "ファイル保存前にキャンセルされました。")
-                return
-
-            if image_data_np is None:
-                self.signals.export_finished.emit(False, "画像データの生成に失敗しました (エンジンがNoneを返しました)。")
-                return
-
-            # --- Pillowを使用したファイル保存 ---
-            logger.log(f"画像データ生成完了 ({image_data_np.shape})。ファイル保存開始: {_to_relpath(filepath)}", level="INFO")
-
-            pil_image = Image.fromarray(image_data_np, 'RGBA')
-            format_str = self.export_settings.get('format', 'PNG').upper()
-            save_options = {}
-
-            image_to_save = pil_image # デフォルトでは元のRGBAを使用
-
-            if format_str == 'PNG':
-                save_options['optimize'] = True
-                # PNGはRGBAを直接サポート。ダイアログのpng_transparentオプションは、
-                # 「アルファが使用されていることを確認する」または「背景がまだ透明でない場合は透明にする」
-                # ことを意味する可能性がある。エンジンからのRGBAデータには既に正しいアルファがあると仮定。
-                # 'png_transparent'がFalseで画像にアルファがある場合、白い背景とブレンドしてRGBに変換
-                # することも考えられるが、通常ユーザーはアルファが存在する場合はそれを期待する。
-                # 簡単のため、アルファがあればRGBAとして保存し、なければRGBとして保存する。
-                # エンジンでRGBAを作成するため、RGBAとして保存される。
-                # png_transparentがFalseの場合、RGBに変換することもできる:
-                # if not self.export_settings.get('png_transparent', True) and pil_image.mode == 'RGBA':
-                #    background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                #    background.paste(pil_image, mask=pil_image.split()[3])
-                #    image_to_save = background
-                pass # デフォルトではPNG用にRGBAをそのまま保存
-
-            elif format_str == 'JPEG':
-                save_options['quality'] = self.export_settings.get('jpeg_quality', 90)
-                save_options['optimize'] = True
-                # save_options['progressive'] = True # オプション (プログレッシブJPEG)
-                if pil_image.mode == 'RGBA':
-                    # JPEG用にRGBに変換する前に白い背景とブレンド
-                    background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                    # 元の画像のアルファチャンネルをマスクとして使用
-                    try:
-                        alpha_channel = pil_image.split()[3]
-                        background.paste(pil_image, mask=alpha_channel)
-                        image_to_save = background
-                    except IndexError: # 画像がRGBAでない場合 (例: LA)
-                        image_to_save = pil_image.convert('RGB')
-                else: # RGBAでない場合は、RGBであることを確認
-                    image_to_save = pil_image.convert('RGB')
-
-            elif format_str == 'TIFF':
-                save_options['compression'] = 'tiff_lzw' # 一般的な可逆圧縮
-                # TIFFはRGBAを処理可能
-
-            elif format_str == 'BMP':
-                # BMPは通常アルファをうまくサポートしないため、RGBに変換
-                if pil_image.mode == 'RGBA':
-                    image_to_save = pil_image.convert('RGB')
-            else:
-                self.signals.export_finished.emit(False, f"未対応のファイル形式です: {format_str}")
-                return
-
-            if self._is_cancelled:
-                self.signals.export_finished.emit(False, "エクスポートがキャンセルされました (保存直前)。")
-                return
-
-            logger.log(f"'{_to_relpath(filepath)}' に '{format_str}' として保存中です (オプション: {save_options})。", level="INFO")
-            image_to_save.save(filepath, format=format_str, **save_options)
+            with writer:
+                for _, band in bands:
+                    writer.write_band(band)
+                self.cancel_token.raise_if_cancelled()
+                logger.log(f"'{_to_relpath(filepath)}' の書き込みを完了しています ({type(writer).__name__})。", level="INFO")
 
             self.signals.progress_updated.emit(100)
             self.signals.export_finished.emit(True, filepath)
             logger.log("保存完了。", level="INFO")
 
+        except RenderCancelledError:
+            self.signals.export_finished.emit(False, "画像の生成中にキャンセルされました。")
         except FileNotFoundError:
             error_msg = f"指定されたパスのディレクトリが見つかりません: {Path(filepath).parent}"
             logger.log(f"エラー - {error_msg}", level="ERROR")
@@ -193,16 +147,22 @@ class ImageExporter(QRunnable):
         """現在進行中のエクスポート処理のキャンセルを試みます。"""
         logger.log("キャンセル要求を受け付けました。", level="INFO")
         self._is_cancelled = True
+        self.cancel_token.cancel()
 
 if __name__ == '__main__':
     logger.log("ImageExporter スタンドアロンテスト (シミュレート実行)", level="INFO")
     # ... (前のステップからのMockFractalEngineとテストセットアップ、簡略化されている可能性あり)
     class MockFractalEngine:
-        def generate_image_for_output(self, output_width, output_height, **kwargs):
-            logger.log(f"  モックエンジン: generate_image_for_output ({output_width}x{output_height})、アンチエイリアス: {kwargs.get('antialiasing_level')}", level="DEBUG")
-            time.sleep(0.1) # 生成時間をシミュレート
-            if exporter_for_test._is_cancelled: return None # テスト用に直接参照を使用
-            return np.random.randint(0, 256, size=(output_height, output_width, 4), dtype=np.uint8)
+        max_iterations = 100
+
+        def iter_output_bands(self, output_width, output_height, **kwargs):
+            logger.log(f"  モックエンジン: iter_output_bands ({output_width}x{output_height})、アンチエイリアス: {kwargs.get('antialiasing_level')}", level="DEBUG")
+            cancel_token = kwargs.get('cancel_token')
+            for y0 in range(0, output_height, 32):
+                time.sleep(0.02) # 生成時間をシミュレート
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                yield y0, np.random.randint(0, 256, size=(min(32, output_height - y0), output_width, 4), dtype=np.uint8)
 
     mock_engine_instance = MockFractalEngine()
     test_settings_png = {
@@ -244,7 +204,7 @@ if __name__ == '__main__':
     exporter_for_test = exporter_cancel # モックエンジンはこのインスタンスのフラグにアクセスする必要がある
     exporter_cancel.signals.progress_updated.connect(handle_progress)
     exporter_cancel.signals.export_finished.connect(handle_finished)
-    exporter_cancel.cancel() # 実行前にキャンセルを要求、generate_image_for_outputがそれを検知するはず
+    exporter_cancel.cancel() # 実行前にキャンセルを要求、run がそれを検知するはず
     exporter_cancel.run()
 
     logger.log("\nImageExporter スタンドアロンテスト終了。", level="INFO")
@@ -0,0 +1,226 @@
+"""
+プリセットのサムネイルの作成とディスクキャッシュ。
+
+各プリセットを低解像度で描画した PNG を、プリセットの設定 (と使用するカラーマップの内容) のハッシュを
+ファイル名としてキャッシュディレクトリに保存します。プリセットを変更するとハッシュが変わるため、
+古いサムネイルは参照されなくなり、`PresetThumbnailCache.prune` で削除されます。変更のないプリセットは再描画しません。
+
+描画は `PresetThumbnailWorker` が QThreadPool 上で1件ずつ行い、表示中の描画が進行中の間は次のサムネイルの描画を待ちます。
+各サムネイルの描画中はエンジンの `kernel_lock` を保持するため、表示用の描画などの並列カーネルと同時には実行されません。
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from export.batch_exporter import config_to_output_overrides
+from export.streaming_writers import create_image_writer
+from logger.custom_logger import CustomLogger
+from utils.cancel_token import CancelToken, RenderCancelledError
+
+logger = CustomLogger()
+
+
+class PresetThumbnailCache:
+    """
+    プリセットのサムネイルをディスクにキャッシュするクラスです。
+
+    Qt に依存しないため、スクリプトからも直接使用できます。描画にはエンジンの出力用の経路
+    (`generate_image_for_output`) だけを使うため、エンジンの表示中の状態は変わりません。
+    """
+    CACHE_VERSION = 1  # 描画方法を変えた場合に増やすと、既存のサムネイルがすべて作り直される
+    DEFAULT_WIDTH = 160
+    DEFAULT_HEIGHT = 120
+
+    def __init__(self, fractal_engine, cache_dir: str | Path,
+                 width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
+        """
+        Args:
+            fractal_engine (FractalEngine): 描画に使うエンジン。
+            cache_dir (str | Path): サムネイルの保存先ディレクトリ。存在しない場合は作成します。
+            width (int, optional): サムネイルの幅 (ピクセル)。
+            height (int, optional): サムネイルの高さ (ピクセル)。
+        """
+        self.engine = fractal_engine
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.width = width
+        self.height = height
+
+    def config_key(self, config: dict) -> str:
+        """
+        プリセットの設定からキャッシュのキー (SHA-256 の16進文字列) を求めます。
+
+        カラーマップは名前だけでなく内容 (LUT) もキーに含めるため、カラーマップを編集した場合も作り直されます。
+
+        Args:
+            config (dict): プリセット形式の設定。
+        Returns:
+            str: キャッシュのキー。
+        """
+        digest = hashlib.sha256()
+        header = {'version': self.CACHE_VERSION, 'size': [self.width, self.height],
+                  'target': self.engine.active_coloring_target_type, 'config': config}
+        digest.update(json.dumps(header, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        for target_type in ('divergent', 'non_divergent'):
+            coloring = config.get(f'coloring_{target_type}') or {}
+            pack_name, map_name = coloring.get('pack_name'), coloring.get('map_name')
+            lut = self.engine.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+            if lut is not None:
+                digest.update(lut.tobytes())
+        return digest.hexdigest()
+
+    def path_for_key(self, key: str) -> Path:
+        """キーに対応するサムネイルのパスを返します (ファイルが存在するとは限りません)。"""
+        return self.cache_dir / f"{key}.png"
+
+    def cached_path(self, config: dict) -> Path | None:
+        """
+        プリセットのサムネイルがキャッシュにあればそのパスを返します。描画は行いません。
+
+        Args:
+            config (dict): プリセット形式の設定。
+        Returns:
+            Path | None: サムネイルのパス。キャッシュにない (またはプリセットが変更された) 場合は None。
+        """
+        path = self.path_for_key(self.config_key(config))
+        return path if path.is_file() else None
+
+    def render(self, config: dict, cancel_token: CancelToken | None = None) -> Path:
+        """
+        プリセットのサムネイルを描画してキャッシュに保存し、そのパスを返します。キャッシュにある場合は描画しません。
+
+        一時ファイルに書き込んでから置き換えるため、描画中や中断時に不完全なファイルが読まれることはありません。
+
+        Args:
+            config (dict): プリセット形式の設定。
+            cancel_token (CancelToken | None, optional): キャンセルトークン。
+        Returns:
+            Path: サムネイルのパス。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+            RuntimeError: 描画に失敗した場合。
+        """
+        path = self.path_for_key(self.config_key(config))
+        if path.is_file():
+            return path
+        image = self.engine.generate_image_for_output(
+            self.width, self.height, antialiasing_level="なし", cancel_token=cancel_token,
+            **config_to_output_overrides(config, self.engine.active_coloring_target_type))
+        if image is None:
+            raise RuntimeError("サムネイルの描画に失敗しました。")
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with create_image_writer('PNG', temp_path, self.width, self.height) as writer:
+            writer.write_band(image)
+        os.replace(temp_path, path)
+        return path
+
+    def prune(self, configs: list[dict]) -> int:
+        """
+        指定したプリセットのいずれにも対応しないサムネイル (変更・削除されたプリセットのもの) を削除します。
+
+        Args:
+            configs (list[dict]): 現在のプリセットの設定の一覧。
+        Returns:
+            int: 削除したファイルの数。
+        """
+        keep = {self.path_for_key(self.config_key(config)).name for config in configs}
+        removed = 0
+        for path in self.cache_dir.glob('*.png'):
+            if path.name not in keep:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.log(f"古いサムネイル '{path.name}' を削除できませんでした: {e}", level="WARNING")
+        if removed:
+            logger.log(f"古いサムネイルを {removed} 件削除しました。", level="DEBUG")
+        return removed
+
+
+class PresetThumbnailSignals(QObject):
+    """PresetThumbnailWorker の進捗を通知するシグナル"""
+    thumbnail_ready = pyqtSignal(str, str)  # サムネイルの用意ができた (プリセット名, ファイルパス)
+    finished = pyqtSignal()  # すべてのプリセットを処理した (キャンセルされた場合も含む)
+
+
+class PresetThumbnailWorker(QRunnable):
+    """
+    プリセットのサムネイルを QThreadPool 上で1件ずつ用意するクラスです。
+
+    キャッシュにあるサムネイルは描画せずにすぐ通知します。is_busy が True を返す間 (表示中の描画の進行中など) は
+    次のサムネイルの描画を始めずに待つため、対話的な操作の応答を妨げません。
+    is_busy の確認後に始まった描画とも重ならないよう、1件の描画の間はエンジンの `kernel_lock` を保持します。
+    """
+    BUSY_POLL_SEC = 0.05
+
+    def __init__(self, cache: PresetThumbnailCache, presets: dict[str, dict],
+                 is_busy: Callable[[], bool] | None = None):
+        """
+        Args:
+            cache (PresetThumbnailCache): サムネイルのキャッシュ。
+            presets (dict[str, dict]): 処理するプリセット (名前 -> 設定)。
+            is_busy (Callable[[], bool] | None, optional): True の間は描画を待つ関数。
+        """
+        super().__init__()
+        self.cache = cache
+        self.presets = dict(presets)
+        self.is_busy = is_busy
+        self.signals = PresetThumbnailSignals()
+        self.cancel_token = CancelToken()
+
+    def run(self):
+        """各プリセットのサムネイルを用意し、用意できたものから通知します。"""
+        start = time.perf_counter()
+        rendered = 0
+        try:
+            for name, config in self.presets.items():
+                if self.cancel_token.is_cancelled:
+                    break
+                try:
+                    path = self.cache.cached_path(config)
+                    if path is None:
+                        while self.is_busy is not None and self.is_busy() and not self.cancel_token.is_cancelled:
+                            time.sleep(self.BUSY_POLL_SEC)
+                        with self.cache.engine.kernel_lock:
+                            path = self.cache.render(config, self.cancel_token)
+                        rendered += 1
+                    self.signals.thumbnail_ready.emit(name, str(path))
+                except RenderCancelledError:
+                    break
+                except Exception as e:
+                    logger.log(f"プリセット '{name}' のサムネイルを作成できませんでした: {e}", level="WARNING")
+            logger.log(f"プリセットのサムネイル: {len(self.presets)} 件中 {rendered} 件を描画 "
+                       f"({time.perf_counter() - start:.2f} 秒)", level="DEBUG")
+        finally:
+            self.signals.finished.emit()
+
+    def cancel(self):
+        """サムネイルの作成のキャンセルを要求します。"""
+        self.cancel_token.cancel()
+
+
+if __name__ == '__main__':
+    # 回帰チェック (ヘッドレス): 変更のないプリセットは再描画せず、変更・削除されたプリセットのサムネイルは prune で消える
+    import tempfile
+    from models.fractal_engine import FractalEngine
+
+    engine = FractalEngine(project_root_path=Path.cwd())
+    config = {'fractal_plugin_name': 'Mandelbrot',
+              'common_parameters': {'center_real': -0.75, 'center_imag': 0.1, 'width': 2.7, 'max_iterations': 100}}
+    changed_config = {**config, 'common_parameters': {**config['common_parameters'], 'max_iterations': 120}}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PresetThumbnailCache(engine, temp_dir)
+        assert cache.cached_path(config) is None
+        path = cache.render(config)
+        mtime = path.stat().st_mtime_ns
+        assert cache.cached_path(config) == path and cache.render(config) == path and path.stat().st_mtime_ns == mtime
+        changed_path = cache.render(changed_config)
+        assert changed_path != path
+        assert cache.prune([changed_config]) == 1 and not path.exists() and changed_path.exists()
+        assert not list(Path(temp_dir).glob('*.tmp'))
+    logger.log("回帰チェック: サムネイルのキャッシュの再利用と削除", level="INFO")
@@ -0,0 +1,381 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from logger.custom_logger import CustomLogger
+
+logger = CustomLogger()
+
+
+class StreamingImageWriter:
+    """
+    画像を上から順に帯 (複数行) 単位で受け取り、ファイルへ書き込むライターの基底クラスです。
+
+    `write_band` で全行を渡したあと `close` を呼ぶとファイルが完成します。with 文で使用すると、
+    途中で例外が発生した場合は書きかけのファイルを削除します。
+    """
+    def __init__(self, filepath: str | Path, width: int, height: int):
+        """
+        Args:
+            filepath (str | Path): 保存先のファイルパス。
+            width (int): 画像の幅 (ピクセル)。
+            height (int): 画像の高さ (ピクセル)。
+        """
+        self.filepath = Path(filepath)
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+
+    def write_band(self, band: np.ndarray) -> None:
+        """
+        次の帯を書き込みます。
+
+        Args:
+            band (np.ndarray): RGBA形式の帯 (帯の高さ x 幅 x 4, uint8)。
+        Raises:
+            ValueError: 帯の幅が画像と異なる場合、または画像の高さを超える場合。
+        """
+        if band.ndim != 3 or band.shape[1] != self.width or band.shape[2] != 4:
+            raise ValueError(f"帯の形状 {band.shape} が画像の幅 {self.width} と一致しません。")
+        if self.rows_written + band.shape[0] > self.height:
+            raise ValueError(f"画像の高さ {self.height} を超える行が渡されました。")
+        self._write_rows(band)
+        self.rows_written += band.shape[0]
+
+    def close(self) -> None:
+        """
+        残りのデータを書き出してファイルを完成させます。
+
+        Raises:
+            ValueError: すべての行が書き込まれていない場合。
+        """
+        if self.rows_written != self.height:
+            raise ValueError(f"{self.height} 行中 {self.rows_written} 行しか書き込まれていません。")
+        self._finish()
+
+    def abort(self) -> None:
+        """書き込みを中止し、書きかけのファイルを削除します。"""
+        try:
+            self.filepath.unlink(missing_ok=True)
+        except OSError as e:
+            logger.log(f"書きかけのファイルを削除できませんでした ({self.filepath}): {e}", level="WARNING")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if exc_type is None:
+            try:
+                self.close()
+            except BaseException:
+                self._release()
+                self.abort()
+                raise
+        else:
+            self._release()
+            self.abort()
+        return False
+
+    def _write_rows(self, band: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        raise NotImplementedError
+
+    def _release(self) -> None:
+        """例外発生時に、開いているファイルなどを解放します。"""
+        pass
+
+
+class _DeflateFileWriter(StreamingImageWriter):
+    """ファイルへ逐次書き込み、圧縮をスレッドプールで並列に行うライターの共通部分。"""
+    def __init__(self, filepath: str | Path, width: int, height: int,
+                 compress_level: int = 6, workers: int | None = None):
+        super().__init__(filepath, width, height)
+        self.compress_level = compress_level
+        # zlib は圧縮中に GIL を解放するため、スレッドで並列に圧縮できる
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._file = open(self.filepath, 'wb')
+
+    def _finish(self) -> None:
+        try:
+            self._finish_file()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._executor.shutdown(wait=True)
+        if not self._file.closed:
+            self._file.close()
+
+    def _finish_file(self) -> None:
+        raise NotImplementedError
+
+
+class PngStreamWriter(_DeflateFileWriter):
+    """
+    PNG (RGBA, 8bit) を行単位で書き込むライターです。
+
+    各行に Sub フィルターをかけ、`PNG_BLOCK_ROWS` 行ずつのブロックを別々のスレッドで raw deflate 圧縮します。
+    各ブロックは直前のブロック末尾 32KB を辞書として使い、Z_SYNC_FLUSH でバイト境界に揃えて終えるため、
+    連結するとそのまま1つの zlib ストリームになります (pigz と同じ方式)。Adler-32 は元データから逐次計算します。
+    """
+    PNG_BLOCK_ROWS = 32
+    _DICT_SIZE = 32768
+    _ZLIB_HEADER = b'\x78\x9c'
+
+    def __init__(self, filepath: str | Path, width: int, height: int,
+                 compress_level: int = 6, workers: int | None = None):
+        """
+        Args:
+            filepath (str | Path): 保存先のファイルパス。
+            width (int): 画像の幅 (ピクセル)。
+            height (int): 画像の高さ (ピクセル)。
+            compress_level (int, optional): deflate の圧縮レベル (0-9)。Defaults to 6.
+            workers (int | None, optional): 圧縮に使うスレッド数。None の場合は CPU コア数。
+        """
+        super().__init__(filepath, width, height, compress_level, workers)
+        self._adler = 1
+        self._dictionary = b''
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        # 幅, 高さ, ビット深度 8, カラータイプ 6 (RGBA), 圧縮 0, フィルター 0, インターレースなし
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        self._write_chunk(b'IDAT', self._ZLIB_HEADER)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    @staticmethod
+    def _sub_filter(band: np.ndarray) -> np.ndarray:
+        """各行の先頭にフィルター種別 1 (Sub) を付け、左隣のピクセルとの差分に変換します。"""
+        rows = band.reshape(band.shape[0], -1)
+        filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 1
+        filtered[:, 1:5] = rows[:, :4]
+        np.subtract(rows[:, 4:], rows[:, :-4], out=filtered[:, 5:])
+        return filtered
+
+    def _compress_block(self, data: bytes, dictionary: bytes) -> bytes:
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15, zdict=dictionary) if dictionary \
+            else zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _write_rows(self, band: np.ndarray) -> None:
+        filtered = self._sub_filter(band)
+        futures = []
+        for r0 in range(0, filtered.shape[0], self.PNG_BLOCK_ROWS):
+            block = filtered[r0:r0 + self.PNG_BLOCK_ROWS].tobytes()
+            futures.append(self._executor.submit(self._compress_block, block, self._dictionary))
+            self._adler = zlib.adler32(block, self._adler)
+            self._dictionary = (self._dictionary + block)[-self._DICT_SIZE:]
+        for future in futures:
+            compressed = future.result()
+            if compressed:
+                self._write_chunk(b'IDAT', compressed)
+
+    def _finish_file(self) -> None:
+        # 空の最終ブロックで deflate ストリームを閉じ、Adler-32 を付ける
+        final_block = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15).flush(zlib.Z_FINISH)
+        self._write_chunk(b'IDAT', final_block + struct.pack('>I', self._adler))
+        self._write_chunk(b'IEND', b'')
+
+
+class TiledTiffWriter(_DeflateFileWriter):
+    """
+    タイル形式の TIFF (RGBA, 8bit, Deflate 圧縮 + 水平差分 Predictor) を逐次書き込むライターです。
+
+    受け取った行を `tile_px` 行分ためてから横一列分のタイルを並列に圧縮して書き出し、最後にタイルの位置を
+    記録した IFD を書き込みます。ためておくのはタイル一列分の行だけです。形式は通常の TIFF のため
+    ファイルサイズは 4GB までです。
+    """
+    def __init__(self, filepath: str | Path, width: int, height: int, tile_px: int = 256,
+                 compress_level: int = 6, workers: int | None = None):
+        """
+        Args:
+            filepath (str | Path): 保存先のファイルパス。
+            width (int): 画像の幅 (ピクセル)。
+            height (int): 画像の高さ (ピクセル)。
+            tile_px (int, optional): タイルの一辺 (16 の倍数)。Defaults to 256.
+            compress_level (int, optional): deflate の圧縮レベル (0-9)。Defaults to 6.
+            workers (int | None, optional): 圧縮に使うスレッド数。None の場合は CPU コア数。
+        Raises:
+            ValueError: tile_px が 16 の倍数でない場合。
+        """
+        if tile_px <= 0 or tile_px % 16 != 0:
+            raise ValueError(f"TIFF のタイルの一辺は 16 の倍数である必要があります: {tile_px}")
+        super().__init__(filepath, width, height, compress_level, workers)
+        self.tile_px = tile_px
+        self._pending = np.zeros((tile_px, width, 4), dtype=np.uint8)
+        self._pending_rows = 0
+        self._tile_offsets: list[int] = []
+        self._tile_byte_counts: list[int] = []
+        self._file.write(b'II*\x00\x00\x00\x00\x00')  # IFD の位置は最後に書き込む
+
+    def _compress_tile(self, tile: np.ndarray) -> bytes:
+        diff = np.empty_like(tile)
+        diff[:, 0] = tile[:, 0]
+        np.subtract(tile[:, 1:], tile[:, :-1], out=diff[:, 1:])  # Predictor 2 (水平差分)
+        return zlib.compress(diff.tobytes(), self.compress_level)
+
+    def _flush_tile_row(self) -> None:
+        # 行が足りない最後のタイル列や右端のタイルは 0 で埋める (TIFF の仕様)
+        self._pending[self._pending_rows:] = 0
+        tiles = []
+        for x0 in range(0, self.width, self.tile_px):
+            tile = np.zeros((self.tile_px, self.tile_px, 4), dtype=np.uint8)
+            x1 = min(x0 + self.tile_px, self.width)
+            tile[:, :x1 - x0] = self._pending[:, x0:x1]
+            tiles.append(tile)
+        for compressed in self._executor.map(self._compress_tile, tiles):
+            self._tile_offsets.append(self._file.tell())
+            self._tile_byte_counts.append(len(compressed))
+            self._file.write(compressed)
+        self._pending_rows = 0
+
+    def _write_rows(self, band: np.ndarray) -> None:
+        row = 0
+        while row < band.shape[0]:
+            take = min(self.tile_px - self._pending_rows, band.shape[0] - row)
+            self._pending[self._pending_rows:self._pending_rows + take] = band[row:row + take]
+            self._pending_rows += take
+            row += take
+            if self._pending_rows == self.tile_px:
+                self._flush_tile_row()
+
+    def _write_array(self, fmt: str, values: list[int]) -> int:
+        """値の配列をワード境界に書き込み、その位置を返します。"""
+        if self._file.tell() % 2:
+            self._file.write(b'\x00')
+        offset = self._file.tell()
+        self._file.write(struct.pack(f'<{len(values)}{fmt}', *values))
+        return offset
+
+    def _finish_file(self) -> None:
+        if self._pending_rows:
+            self._flush_tile_row()
+        SHORT, LONG = 3, 4
+        tile_count = len(self._tile_offsets)
+        entries = [
+            (256, LONG, [self.width]),
+            (257, LONG, [self.height]),
+            (258, SHORT, [8, 8, 8, 8]),          # BitsPerSample
+            (259, SHORT, [8]),                   # Compression: Deflate
+            (262, SHORT, [2]),                   # PhotometricInterpretation: RGB
+            (277, SHORT, [4]),                   # SamplesPerPixel
+            (284, SHORT, [1]),                   # PlanarConfiguration: chunky
+            (317, SHORT, [2]),                   # Predictor: 水平差分
+            (322, LONG, [self.tile_px]),         # TileWidth
+            (323, LONG, [self.tile_px]),         # TileLength
+            (324, LONG, self._tile_offsets),     # TileOffsets
+            (325, LONG, self._tile_byte_counts),  # TileByteCounts
+            (338, SHORT, [2]),                   # ExtraSamples: 非乗算済みアルファ
+        ]
+        packed_entries = []
+        for tag, field_type, values in entries:
+            fmt = 'H' if field_type == SHORT else 'I'
+            if struct.calcsize(f'<{len(values)}{fmt}') <= 4:
+                value = struct.pack(f'<{len(values)}{fmt}', *values).ljust(4, b'\x00')
+            else:
+                value = struct.pack('<I', self._write_array(fmt, values))
+            packed_entries.append(struct.pack('<HHI', tag, field_type, len(values)) + value)
+        ifd_offset = self._write_array('H', [len(packed_entries)])
+        for entry in packed_entries:
+            self._file.write(entry)
+        self._file.write(struct.pack('<I', 0))
+        if self._file.tell() >= 2 ** 32:
+            raise IOError(f"TIFF ファイルが 4GB を超えました ({tile_count} タイル)。")
+        self._file.seek(4)
+        self._file.write(struct.pack('<I', ifd_offset))
+
+
+class BufferedRgbWriter(StreamingImageWriter):
+    """
+    逐次書き込みに対応しない形式 (JPEG, BMP) 用のライターです。
+
+    帯を受け取るたびに白背景へ合成して RGB の画像バッファへ書き込み、最後に Pillow で保存します。
+    RGBA の画像全体や合成用の背景画像は確保しません。
+    """
+    def __init__(self, filepath: str | Path, width: int, height: int, format_str: str, save_options: dict | None = None):
+        """
+        Args:
+            filepath (str | Path): 保存先のファイルパス。
+            width (int): 画像の幅 (ピクセル)。
+            height (int): 画像の高さ (ピクセル)。
+            format_str (str): Pillow の保存形式名 ('JPEG', 'BMP')。
+            save_options (dict | None, optional): Pillow の save に渡すオプション。
+        """
+        super().__init__(filepath, width, height)
+        self.format_str = format_str
+        self.save_options = save_options or {}
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+
+    def _write_rows(self, band: np.ndarray) -> None:
+        alpha = band[..., 3:4].astype(np.uint16)
+        blended = (band[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255
+        self._rgb[self.rows_written:self.rows_written + band.shape[0]] = blended
+
+    def _finish(self) -> None:
+        Image.fromarray(self._rgb, 'RGB').save(self.filepath, format=self.format_str, **self.save_options)
+        self._rgb = None
+
+    def _release(self) -> None:
+        self._rgb = None
+
+
+def create_image_writer(format_str: str, filepath: str | Path, width: int, height: int,
+                        jpeg_quality: int = 90) -> StreamingImageWriter:
+    """
+    保存形式に応じたライターを作成します。
+
+    Args:
+        format_str (str): 保存形式 ('PNG', 'JPEG', 'TIFF', 'BMP')。
+        filepath (str | Path): 保存先のファイルパス。
+        width (int): 画像の幅 (ピクセル)。
+        height (int): 画像の高さ (ピクセル)。
+        jpeg_quality (int, optional): JPEG の品質。Defaults to 90.
+    Returns:
+        StreamingImageWriter: 作成したライター。
+    Raises:
+        ValueError: 未対応の保存形式の場合。
+    """
+    format_str = format_str.upper()
+    if format_str == 'PNG':
+        return PngStreamWriter(filepath, width, height)
+    if format_str == 'TIFF':
+        return TiledTiffWriter(filepath, width, height)
+    if format_str == 'JPEG':
+        return BufferedRgbWriter(filepath, width, height, 'JPEG', {'quality': jpeg_quality, 'optimize': True})
+    if format_str == 'BMP':
+        return BufferedRgbWriter(filepath, width, height, 'BMP')
+    raise ValueError(f"未対応のファイル形式です: {format_str}")
+
+
+if __name__ == '__main__':
+    # 回帰チェック (ヘッドレス): エンジンの帯を逐次書き込んだファイルをデコードすると、
+    # generate_image_for_output で一度に生成した画像と同じピクセルになる
+    import tempfile
+    from models.fractal_engine import FractalEngine
+
+    engine = FractalEngine(project_root_path=Path.cwd())
+    output_override = {'center_real': -0.75, 'center_imag': 0.1, 'width': 2.7, 'max_iterations': 150}
+    width_px, height_px = 300, 280  # 帯・PNG の圧縮ブロック・TIFF のタイルのいずれも端が半端になる大きさ
+    expected = engine.generate_image_for_output(width_px, height_px, output_override)
+    assert expected is not None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for format_str in ('PNG', 'TIFF'):
+            path = Path(temp_dir) / f"stream.{format_str.lower()}"
+            with create_image_writer(format_str, path, width_px, height_px) as writer:
+                for _, band in engine.iter_output_bands(width_px, height_px, output_override):
+                    writer.write_band(band)
+            with Image.open(path) as decoded:
+                assert decoded.mode == 'RGBA' and decoded.size == (width_px, height_px)
+                assert np.array_equal(np.asarray(decoded), expected), f"{format_str} のデコード結果が一致しません"
+            logger.log(f"回帰チェック: 逐次書き込みした {format_str} == generate_image_for_output", level="INFO")
@@ -0,0 +1,710 @@
+"""
+ズーム動画 (1点に向かって拡大し続ける連番フレーム) の出力。
+
+各フレームを `FractalEngine.generate_image_for_output` で個別に描画すると、隣り合うフレームはほとんど同じ領域なのに
+毎回すべてのピクセルを計算し直すことになります。ここでは次の2つの方法でフレーム間の計算を共有します。
+
+- 指数マップ (`ZoomMovieRenderer.METHOD_EXP_MAP`): すべてのフレームが1つの不動点を中心とする拡大縮小で
+  移り合う場合 (`zoom_path` で作った経路は常にそうなります)、不動点の周りを対数極座標 (行が log 半径、列が角度)
+  で1回だけ描画した帯 (ストリップ) を作り、各フレームはそこから双一次補間で引き直します。ストリップは
+  フレームが必要とする行の範囲だけをリングバッファに保持し、ズームの進行に合わせて行の帯ごとに計算します。
+  計算量はフレーム数ではなくズームの倍率の対数に比例します。
+- キーフレーム (`ZoomMovieRenderer.METHOD_KEYFRAMES`): 不動点を持たない経路 (パンを含む経路など) や、
+  任意の点の計算・着色に対応しないプラグインの場合は、連続する数フレームを覆う範囲をそれらのうち最も細かい
+  ピクセルの大きさで1枚描画し (最大で `KEYFRAME_MAX_SCALE` 倍の解像度)、各フレームは面積平均で縮小して作ります。
+
+フレームは連番の PNG ファイル、または ffmpeg などに渡せる生の RGB ストリームとして書き出します。
+"""
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+import numpy as np
+from numba import jit, prange
+from PyQt6.QtCore import QRunnable
+
+from export.image_exporter import ExporterSignals
+from export.streaming_writers import create_image_writer
+from plugins.base_fractal_plugin import pixel_grid
+from logger.custom_logger import CustomLogger
+from utils.cancel_token import CancelToken, RenderCancelledError
+
+logger = CustomLogger()
+
+
+@dataclass
+class ZoomMovieJob:
+    """ズーム動画の出力1件分の設定を表すデータクラス"""
+    views: list[dict]  # フレームごとの表示範囲 ('center_real', 'center_imag', 'width')。zoom_path 参照
+    output_path: str  # 'PNG' では連番ファイルの出力先ディレクトリ、'RAW' では出力ファイル ('-' で標準出力)
+    width: int = 1920
+    height: int = 1080
+    format: str = 'PNG'  # 'PNG' または 'RAW' (rgb24 の生フレームの連結)
+    method: str = 'auto'  # 'auto', 'exp_map', 'keyframes'
+    output_overrides: dict = field(default_factory=dict)  # iter_output_bands の上書き引数 (config_to_output_overrides 参照)
+
+
+def zoom_path(start_view: dict, end_view: dict, frame_count: int) -> list[dict]:
+    """
+    start_view から end_view までを、1フレームあたり一定の倍率で拡大 (縮小) する表示範囲の列を作ります。
+
+    中心は幅の変化量に比例して動かすため、経路全体が1つの不動点を中心とする拡大縮小になり、
+    指数マップで描画できます (終点の中心は画面上の同じ位置に留まりながら画面の中央へ近づきます)。
+    幅が変わらない場合は中心を線形に動かします (パン)。
+
+    Args:
+        start_view (dict): 最初のフレームの 'center_real', 'center_imag', 'width'。
+        end_view (dict): 最後のフレームの 'center_real', 'center_imag', 'width'。
+        frame_count (int): フレーム数 (2 以上)。
+    Returns:
+        list[dict]: フレームごとの 'center_real', 'center_imag', 'width'。
+    Raises:
+        ValueError: frame_count が 2 未満、または幅が正でない場合。
+    """
+    if frame_count < 2:
+        raise ValueError("フレーム数は 2 以上を指定してください。")
+    w0, w1 = float(start_view['width']), float(end_view['width'])
+    if w0 <= 0.0 or w1 <= 0.0:
+        raise ValueError("表示範囲の幅は正の値を指定してください。")
+    c0 = complex(start_view['center_real'], start_view['center_imag'])
+    c1 = complex(end_view['center_real'], end_view['center_imag'])
+    views = []
+    for index in range(frame_count):
+        t = index / (frame_count - 1)
+        frame_width = w0 * (w1 / w0) ** t
+        u = (w0 - frame_width) / (w0 - w1) if w0 != w1 else t
+        center = c0 + (c1 - c0) * u
+        views.append({'center_real': center.real, 'center_imag': center.imag, 'width': frame_width})
+    views[-1].update(center_real=c1.real, center_imag=c1.imag, width=w1)
+    return views
+
+
+def find_zoom_fixed_point(views: list[dict], width_px: int, tolerance_px: float = 0.5) -> complex | None:
+    """
+    すべてのフレームが1つの点を中心とする拡大縮小で移り合う場合に、その不動点を返します。
+
+    最初と最後のフレームから不動点を求め、各フレームの中心が不動点からの位置を画面上で
+    tolerance_px ピクセル以内に保っているかを確認します。深いズームでは中心の座標の丸め誤差がピクセルの大きさに
+    近づくため、許容するずれは丸め誤差より大きくしておく必要があります。
+
+    Args:
+        views (list[dict]): フレームごとの 'center_real', 'center_imag', 'width'。
+        width_px (int): フレームの幅 (ピクセル)。
+        tolerance_px (float, optional): 許容するずれ (ピクセル)。Defaults to 0.5.
+    Returns:
+        complex | None: 不動点。幅が変わらない場合や、不動点を持たない経路の場合は None。
+    """
+    first, last = views[0], views[-1]
+    w_a, w_b = float(first['width']), float(last['width'])
+    if len(views) < 2 or w_a == w_b:
+        return None
+    c_a = complex(first['center_real'], first['center_imag'])
+    c_b = complex(last['center_real'], last['center_imag'])
+    fixed_point = c_a + (c_b - c_a) * w_a / (w_a - w_b)
+    offset_per_width = (c_a - fixed_point) / w_a  # 不動点から見た中心の位置 (幅単位、全フレームで一定)
+    for view in views:
+        frame_width = float(view['width'])
+        expected = fixed_point + offset_per_width * frame_width
+        actual = complex(view['center_real'], view['center_imag'])
+        if abs(actual - expected) > tolerance_px * frame_width / width_px:
+            return None
+    return fixed_point
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def _exp_map_gather_kernel(ring: np.ndarray, row_coords: np.ndarray, col_coords: np.ndarray,
+                           row_shift: float, out: np.ndarray) -> None:
+    """
+    リングバッファに保持した対数極座標のストリップから、フレームの各ピクセルの色を双一次補間で求めます。
+
+    Args:
+        ring (np.ndarray): ストリップの行を (行番号 % リングの行数) に保持した RGBA 配列 (リングの行数 x 角度の列数 x 4, uint8)。
+        row_coords (np.ndarray): 各ピクセルの、ピクセルの大きさが 1 のときのストリップ上の行位置 (高さ x 幅, float64)。
+        col_coords (np.ndarray): 各ピクセルのストリップ上の列位置 (角度, 高さ x 幅, float64)。
+        row_shift (float): このフレームのピクセルの大きさによる行位置のずれ。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さ x 幅 x 4, uint8)。
+    """
+    ring_rows, num_cols = ring.shape[0], ring.shape[1]
+    height, width = row_coords.shape
+    for y in prange(height):
+        for x in range(width):
+            rf = row_coords[y, x] + row_shift
+            r0 = int(math.floor(rf))
+            fr = rf - r0
+            cf = col_coords[y, x]
+            c0 = int(math.floor(cf))
+            fc = cf - c0
+            c0 = c0 % num_cols
+            c1 = (c0 + 1) % num_cols
+            a = r0 % ring_rows
+            b = (r0 + 1) % ring_rows
+            for ch in range(4):
+                top = (1.0 - fc) * ring[a, c0, ch] + fc * ring[a, c1, ch]
+                bottom = (1.0 - fc) * ring[b, c0, ch] + fc * ring[b, c1, ch]
+                value = (1.0 - fr) * top + fr * bottom + 0.5
+                out[y, x, ch] = np.uint8(min(value, 255.0))
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def _area_resample_kernel(src: np.ndarray, out: np.ndarray, x_origin: float, y_origin: float, scale: float) -> None:
+    """
+    src の一部を面積平均で縮小 (拡大) して out に書き込みます。
+
+    out のピクセル (x, y) は、src のセル座標 (ピクセル j が [j, j+1) を占める) で
+    [x_origin + x*scale, x_origin + (x+1)*scale) x [y_origin + y*scale, y_origin + (y+1)*scale) の範囲の平均になります。
+
+    Args:
+        src (np.ndarray): 元のRGBA画像配列 (高さ x 幅 x 4, uint8)。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さ x 幅 x 4, uint8)。
+        x_origin (float): out の左端に対応する src のセル座標。
+        y_origin (float): out の上端に対応する src のセル座標。
+        scale (float): out の1ピクセルに対応する src のセル数。
+    """
+    src_h, src_w = src.shape[0], src.shape[1]
+    height, width = out.shape[0], out.shape[1]
+    for y in prange(height):
+        y_lo = y_origin + y * scale
+        y_hi = y_lo + scale
+        sy0 = max(int(math.floor(y_lo)), 0)
+        sy1 = min(int(math.ceil(y_hi)), src_h)
+        for x in range(width):
+            x_lo = x_origin + x * scale
+            x_hi = x_lo + scale
+            sx0 = max(int(math.floor(x_lo)), 0)
+            sx1 = min(int(math.ceil(x_hi)), src_w)
+            acc0 = 0.0
+            acc1 = 0.0
+            acc2 = 0.0
+            acc3 = 0.0
+            total = 0.0
+            for sy in range(sy0, sy1):
+                wy = min(y_hi, sy + 1.0) - max(y_lo, float(sy))
+                if wy <= 0.0:
+                    continue
+                for sx in range(sx0, sx1):
+                    wx = min(x_hi, sx + 1.0) - max(x_lo, float(sx))
+                    if wx <= 0.0:
+                        continue
+                    w = wx * wy
+                    acc0 += w * src[sy, sx, 0]
+                    acc1 += w * src[sy, sx, 1]
+                    acc2 += w * src[sy, sx, 2]
+                    acc3 += w * src[sy, sx, 3]
+                    total += w
+            if total > 0.0:
+                out[y, x, 0] = np.uint8(min(acc0 / total + 0.5, 255.0))
+                out[y, x, 1] = np.uint8(min(acc1 / total + 0.5, 255.0))
+                out[y, x, 2] = np.uint8(min(acc2 / total + 0.5, 255.0))
+                out[y, x, 3] = np.uint8(min(acc3 / total + 0.5, 255.0))
+            else:
+                out[y, x, 0] = 0
+                out[y, x, 1] = 0
+                out[y, x, 2] = 0
+                out[y, x, 3] = 255
+
+
+class ZoomMovieRenderer:
+    """
+    ズーム動画のフレームを、フレーム間で計算を共有しながら順に生成するクラスです。
+
+    Qt に依存しないため、スクリプトからも直接使用できます。エンジンの出力用の経路
+    (`color_points_for_output`, `generate_image_for_output`) だけを使うため、エンジンの表示中の状態は変わりません。
+    フレームを組み立てる並列カーネルも、エンジンの `kernel_lock` を取って実行します。
+    """
+    METHOD_EXP_MAP = 'exp_map'
+    METHOD_KEYFRAMES = 'keyframes'
+    STRIP_BAND_ROWS = 64  # 指数マップのストリップを1回に計算する行数
+    INNER_RADIUS_PX = 16.0  # 不動点からこの距離 (ピクセル) 未満のピクセルはストリップを使わずフレームごとに直接計算する
+    MAX_STRIP_BYTES = 1 << 30  # 指数マップのリングバッファの上限。超える場合はキーフレームで描画する
+    KEYFRAME_MAX_SCALE = 2.0  # キーフレームの解像度の上限 (フレームの縦横それぞれ何倍まで)
+
+    def __init__(self, fractal_engine, job: ZoomMovieJob, strip_oversample: float = 1.0):
+        """
+        Args:
+            fractal_engine (FractalEngine): 描画に使うエンジン。
+            job (ZoomMovieJob): 出力するズーム動画の設定。
+            strip_oversample (float, optional): 指数マップのストリップの角度方向の解像度の倍率。
+                1.0 でフレームの角のピクセルの大きさと同じ間隔になります。Defaults to 1.0.
+        """
+        if job.width <= 0 or job.height <= 0 or not job.views:
+            raise ValueError("フレームの大きさとフレームの一覧を指定してください。")
+        self.engine = fractal_engine
+        self.job = job
+        self.strip_oversample = max(float(strip_oversample), 0.25)
+        self.computed_points = 0  # 実際に計算した点の数 (統計用)
+        self.method = self._choose_method()
+
+    # --- 方法の選択 ---
+    def _choose_method(self) -> str:
+        """job.method と経路・プラグインの対応状況から、描画の方法を決めます。"""
+        requested = self.job.method
+        if requested not in ('auto', self.METHOD_EXP_MAP, self.METHOD_KEYFRAMES):
+            raise ValueError(f"不明な描画方法です: {requested}")
+        if requested == self.METHOD_KEYFRAMES:
+            return self.METHOD_KEYFRAMES
+        reason = self._exp_map_unavailable_reason()
+        if reason is None and requested == 'auto':
+            # 1オクターブあたりのフレーム数が少ないとストリップの方が計算する点が多くなる
+            strip_points = self.estimate_exp_map_points()
+            keyframe_points = sum(key_w * key_h for _, _, _, key_w, key_h in self.plan_keyframes())
+            if strip_points > keyframe_points:
+                reason = f"ストリップの点の数 ({strip_points}) がキーフレーム ({keyframe_points}) より多くなります"
+        if reason is None:
+            return self.METHOD_EXP_MAP
+        if requested == self.METHOD_EXP_MAP:
+            raise ValueError(f"指数マップで描画できません: {reason}")
+        logger.log(f"ズーム動画: {reason}。キーフレームで描画します。", level="INFO")
+        return self.METHOD_KEYFRAMES
+
+    def _exp_map_unavailable_reason(self) -> str | None:
+        """指数マップで描画できない理由を返します。描画できる場合は None。"""
+        fixed_point = find_zoom_fixed_point(self.job.views, self.job.width)
+        if fixed_point is None:
+            return "経路が1点を中心とする拡大縮小ではありません"
+        self._setup_exp_map_geometry(fixed_point)
+        strip_bytes = self._ring_rows * self._num_cols * 4
+        if strip_bytes > self.MAX_STRIP_BYTES:
+            return f"ストリップのバッファ ({strip_bytes / (1 << 20):.0f} MiB) が上限を超えます"
+        probe = self._color_points(np.array([[fixed_point.real]]), np.array([[fixed_point.imag]]))
+        if probe is None:
+            return "プラグインが任意の点の計算・着色に対応していません"
+        return None
+
+    def _color_points(self, real_coords: np.ndarray, imag_coords: np.ndarray) -> np.ndarray | None:
+        """出力の上書き引数で、任意の点を計算・着色します。"""
+        self.computed_points += real_coords.size
+        return self.engine.color_points_for_output(real_coords, imag_coords, **self._overrides_for_view(None))
+
+    def _overrides_for_view(self, view: dict | None) -> dict:
+        """job.output_overrides の共通パラメータに表示範囲を加えた上書き引数を返します。"""
+        overrides = dict(self.job.output_overrides)
+        common_params = dict(overrides.get('common_params_override') or {})
+        common_params.pop('height', None)
+        if view is not None:
+            common_params.update(center_real=view['center_real'], center_imag=view['center_imag'], width=view['width'])
+        overrides['common_params_override'] = common_params
+        return overrides
+
+    # --- 指数マップ ---
+    def _setup_exp_map_geometry(self, fixed_point: complex) -> None:
+        """
+        指数マップのストリップの形状と、各ピクセルのストリップ上の位置を求めます。
+
+        ストリップの行 i は不動点からの距離 exp(s_top - i * ds)、列 j は角度 j * ds の点です (ds = 2π / 列数)。
+        フレーム k のピクセル (x, y) は不動点から q * p_k (q はピクセル単位の位置、p_k はピクセルの大きさ) にあるため、
+        行位置は (s_top - log|q|) / ds - log(p_k) / ds となり、フレームごとに一定のずれを加えるだけで求まります。
+        """
+        width_px, height_px = self.job.width, self.job.height
+        views = self.job.views
+        pixel_sizes = np.array([float(view['width']) / width_px for view in views])
+        first = views[0]
+        # 不動点から見たフレームの中心の位置 (ピクセル単位)。全フレームで一定
+        center_offset = (complex(first['center_real'], first['center_imag']) - fixed_point) / pixel_sizes[0]
+        xs = np.arange(width_px, dtype=np.float64) - width_px / 2.0 + center_offset.real
+        ys = np.arange(height_px, dtype=np.float64) - height_px / 2.0 + center_offset.imag
+        qx, qy = np.meshgrid(xs, ys)
+        # 不動点のごく近くはストリップの角度方向が極端に細かくなり無駄が大きいため、フレームごとに直接計算する
+        inner = np.hypot(qx, qy) < self.INNER_RADIUS_PX
+        self._inner_y, self._inner_x = np.nonzero(inner)
+        self._inner_q = qx[inner] + 1j * qy[inner]
+        radius_px = np.maximum(np.hypot(qx, qy), self.INNER_RADIUS_PX)
+        log_radius_px = np.log(radius_px)
+
+        num_cols = int(math.ceil(2.0 * math.pi * float(radius_px.max()) * self.strip_oversample))
+        ds = 2.0 * math.pi / num_cols
+        self._fixed_point = fixed_point
+        self._num_cols = num_cols
+        self._ds = ds
+        self._s_top = float(np.log(pixel_sizes.max()) + log_radius_px.max()) + ds
+        self._row_coords = (self._s_top - log_radius_px) / ds
+        self._col_coords = np.mod(np.arctan2(qy, qx), 2.0 * math.pi) / ds
+        self._row_shifts = -np.log(pixel_sizes) / ds
+        self._pixel_sizes = pixel_sizes
+        self._frame_row_span = (float(self._row_coords.min()), float(self._row_coords.max()))
+        span_rows = int(math.ceil(self._frame_row_span[1] - self._frame_row_span[0])) + 2
+        self._ring_rows = span_rows + self.STRIP_BAND_ROWS + 2
+        self._ring: np.ndarray | None = None
+        self._rows_lo = 0  # リングバッファに保持している行の範囲 [lo, hi)
+        self._rows_hi = 0
+
+    def estimate_exp_map_points(self) -> int:
+        """指数マップで描画する場合にストリップで計算する点の数の見積もりを返します。"""
+        row_min, row_max = self._frame_row_span
+        rows = (row_max + float(self._row_shifts.max())) - (row_min + float(self._row_shifts.min()))
+        return int((math.ceil(rows) + 2 * self.STRIP_BAND_ROWS) * self._num_cols)
+
+    def _compute_strip_rows(self, row_start: int, row_count: int) -> None:
+        """ストリップの行 [row_start, row_start + row_count) を計算し、リングバッファに書き込みます。"""
+        rows = np.arange(row_start, row_start + row_count, dtype=np.float64)
+        radii = np.exp(self._s_top - rows * self._ds)
+        angles = np.arange(self._num_cols, dtype=np.float64) * self._ds
+        real_coords = self._fixed_point.real + radii[:, None] * np.cos(angles)[None, :]
+        imag_coords = self._fixed_point.imag + radii[:, None] * np.sin(angles)[None, :]
+        rgba = self._color_points(real_coords, imag_coords)
+        if rgba is None:
+            raise RuntimeError("ストリップの計算に失敗しました。")
+        slots = np.arange(row_start, row_start + row_count) % self._ring_rows
+        self._ring[slots] = rgba
+
+    def _ensure_strip_rows(self, first_row: int, last_row: int, cancel_token: CancelToken | None) -> None:
+        """ストリップの行 [first_row, last_row] がリングバッファにそろうよう、足りない行を帯ごとに計算します。"""
+        band_rows = self.STRIP_BAND_ROWS
+        if self._rows_hi <= first_row or last_row < self._rows_lo:
+            self._rows_lo = self._rows_hi = first_row  # 重なりがなければ作り直す
+        while self._rows_hi <= last_row:  # 拡大方向 (半径の小さい行) へ伸ばす
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            self._compute_strip_rows(self._rows_hi, band_rows)
+            self._rows_hi += band_rows
+            self._rows_lo = max(self._rows_lo, self._rows_hi - self._ring_rows)
+        while self._rows_lo > first_row:  # 縮小方向 (半径の大きい行) へ伸ばす
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            start = max(self._rows_lo - band_rows, first_row - band_rows // 2)
+            self._compute_strip_rows(start, self._rows_lo - start)
+            self._rows_lo = start
+            self._rows_hi = min(self._rows_hi, self._rows_lo + self._ring_rows)
+
+    def _iter_exp_map_frames(self, cancel_token: CancelToken | None) -> Iterator[np.ndarray]:
+        """指数マップのストリップからフレームを順に生成します。"""
+        self._ring = np.zeros((self._ring_rows, self._num_cols, 4), dtype=np.uint8)
+        logger.log(f"ズーム動画 (指数マップ): ストリップ {self._num_cols} 列, リングバッファ {self._ring_rows} 行 "
+                   f"({self._ring.nbytes / (1 << 20):.0f} MiB)", level="INFO")
+        row_min, row_max = self._frame_row_span
+        for row_shift, pixel_size in zip(self._row_shifts, self._pixel_sizes):
+            first_row = int(math.floor(row_min + row_shift))
+            last_row = int(math.floor(row_max + row_shift)) + 1
+            self._ensure_strip_rows(first_row, last_row, cancel_token)
+            frame = np.empty((self.job.height, self.job.width, 4), dtype=np.uint8)
+            with self.engine.kernel_lock:
+                _exp_map_gather_kernel(self._ring, self._row_coords, self._col_coords, float(row_shift), frame)
+            if self._inner_q.size:
+                # カラーリングのカーネルは2次元配列を前提とするため、1行の配列として計算する
+                inner_points = (self._fixed_point + self._inner_q * pixel_size)[None, :]
+                inner_rgba = self._color_points(inner_points.real, inner_points.imag)
+                if inner_rgba is None:
+                    raise RuntimeError("不動点付近のピクセルの計算に失敗しました。")
+                frame[self._inner_y, self._inner_x] = inner_rgba[0]
+            yield frame
+        self._ring = None
+
+    # --- キーフレーム ---
+    def plan_keyframes(self) -> list[tuple[int, int, dict, int, int]]:
+        """
+        連続するフレームをまとめて、各まとまりを覆うキーフレームの一覧を作ります。
+
+        まとまりのフレームすべてを覆う範囲を、それらのうち最も小さいピクセルの大きさで描画したときの画素数が
+        フレームの `KEYFRAME_MAX_SCALE` ** 2 倍を超えない範囲で、フレームを順に加えていきます。
+
+        Returns:
+            list[tuple[int, int, dict, int, int]]: (最初のフレーム番号, 最後のフレーム番号 (含む),
+                キーフレームの表示範囲, キーフレームの幅, キーフレームの高さ) の一覧。
+        """
+        width_px, height_px = self.job.width, self.job.height
+        max_pixels = (self.KEYFRAME_MAX_SCALE ** 2) * width_px * height_px
+        aspect = height_px / width_px
+
+        def bounds(view: dict) -> tuple[float, float, float, float]:
+            half_w = float(view['width']) / 2.0
+            half_h = half_w * aspect
+            return (view['center_real'] - half_w, view['center_real'] + half_w,
+                    view['center_imag'] - half_h, view['center_imag'] + half_h)
+
+        def keyframe_for(first: int, last: int) -> tuple[dict, int, int]:
+            group = self.job.views[first:last + 1]
+            pixel_size = min(float(view['width']) for view in group) / width_px
+            boxes = [bounds(view) for view in group]
+            min_re, max_re = min(b[0] for b in boxes), max(b[1] for b in boxes)
+            min_im, max_im = min(b[2] for b in boxes), max(b[3] for b in boxes)
+            # 面積平均でフレームの端のピクセルを作れるよう、周囲に1ピクセルずつ余白をとる
+            key_w = int(math.ceil((max_re - min_re) / pixel_size)) + 2
+            key_h = int(math.ceil((max_im - min_im) / pixel_size)) + 2
+            view = {'center_real': (min_re + max_re) / 2.0, 'center_imag': (min_im + max_im) / 2.0,
+                    'width': key_w * pixel_size}
+            return view, key_w, key_h
+
+        plan = []
+        first = 0
+        frame_count = len(self.job.views)
+        while first < frame_count:
+            last = first
+            keyframe = keyframe_for(first, last)
+            while last + 1 < frame_count:
+                candidate = keyframe_for(first, last + 1)
+                if candidate[1] * candidate[2] > max_pixels:
+                    break
+                last += 1
+                keyframe = candidate
+            plan.append((first, last, *keyframe))
+            first = last + 1
+        return plan
+
+    def _iter_keyframe_frames(self, cancel_token: CancelToken | None) -> Iterator[np.ndarray]:
+        """キーフレームを描画し、そこからフレームを順に生成します。"""
+        plan = self.plan_keyframes()
+        logger.log(f"ズーム動画 (キーフレーム): {len(self.job.views)} フレームを {len(plan)} 枚のキーフレームから作成します。", level="INFO")
+        width_px, height_px = self.job.width, self.job.height
+        for first, last, key_view, key_w, key_h in plan:
+            keyframe = self.engine.generate_image_for_output(
+                key_w, key_h, antialiasing_level="なし", cancel_token=cancel_token,
+                **self._overrides_for_view(key_view))
+            if keyframe is None:
+                raise RuntimeError(f"キーフレーム (フレーム {first}-{last}) の描画に失敗しました。")
+            self.computed_points += key_w * key_h
+            key_pixel = key_view['width'] / key_w
+            key_min_re, key_min_im = self._grid_origin(key_view, key_w, key_h)
+            for view in self.job.views[first:last + 1]:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                pixel_size = float(view['width']) / width_px
+                min_re, min_im = self._grid_origin(view, width_px, height_px)
+                # ピクセル x の値は点 min + x * p のもの。その周り ±p/2 をキーフレームのセル座標で平均する
+                x_origin = (min_re - 0.5 * pixel_size - key_min_re) / key_pixel + 0.5
+                y_origin = (min_im - 0.5 * pixel_size - key_min_im) / key_pixel + 0.5
+                frame = np.empty((height_px, width_px, 4), dtype=np.uint8)
+                with self.engine.kernel_lock:
+                    _area_resample_kernel(keyframe, frame, x_origin, y_origin, pixel_size / key_pixel)
+                yield frame
+
+    @staticmethod
+    def _grid_origin(view: dict, width_px: int, height_px: int) -> tuple[float, float]:
+        """ビューを width_px x height_px で描画したときのピクセル (0, 0) の座標を返します (pixel_grid 参照)。"""
+        pixel_size = float(view['width']) / width_px
+        pixel_w, offset_x, pixel_h, offset_y = pixel_grid(
+            {'center_real': view['center_real'], 'center_imag': view['center_imag'],
+             'width': float(view['width']), 'height': height_px * pixel_size}, width_px, height_px)
+        return offset_x * pixel_w, offset_y * pixel_h
+
+    # --- 共通 ---
+    def iter_frames(self, cancel_token: CancelToken | None = None,
+                    progress_callback=None) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        フレームを順に生成して返すジェネレーターです。
+
+        Args:
+            cancel_token (CancelToken | None, optional): フレームやストリップの帯ごとに確認するキャンセルトークン。
+            progress_callback (Callable[[float], None] | None, optional): フレームを生成するたびに進捗 (0.0-1.0) を受け取る関数。
+        Yields:
+            tuple[int, np.ndarray]: (フレーム番号, RGBA形式のフレーム (高さ x 幅 x 4, uint8))。フレームは毎回新しく確保されます。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+            RuntimeError: 描画に失敗した場合。
+        """
+        frames = self._iter_exp_map_frames(cancel_token) if self.method == self.METHOD_EXP_MAP \
+            else self._iter_keyframe_frames(cancel_token)
+        frame_count = len(self.job.views)
+        for index, frame in enumerate(frames):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            yield index, frame
+            if progress_callback is not None:
+                progress_callback((index + 1) / frame_count)
+
+    def render(self, cancel_token: CancelToken | None = None, progress_callback=None) -> dict:
+        """
+        すべてのフレームを生成して job の出力先へ書き込み、処理の概要を返します。
+
+        Args:
+            cancel_token (CancelToken | None, optional): キャンセルトークン。
+            progress_callback (Callable[[float], None] | None, optional): 進捗 (0.0-1.0) を受け取る関数。
+        Returns:
+            dict: 'method', 'frames', 'seconds', 'computed_points' (実際に計算した点の数),
+                  'direct_points' (各フレームを個別に描画した場合の点の数) を含む辞書。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+        """
+        start = time.perf_counter()
+        self.computed_points = 0
+        logger.log(f"ズーム動画の出力開始: {len(self.job.views)} フレーム ({self.job.width}x{self.job.height}, "
+                   f"{self.job.format}, 方法: {self.method}) -> {self.job.output_path}", level="INFO")
+        with create_frame_writer(self.job.format, self.job.output_path, self.job.width, self.job.height,
+                                 len(self.job.views)) as writer:
+            for index, frame in self.iter_frames(cancel_token, progress_callback):
+                writer.write_frame(index, frame)
+        direct_points = len(self.job.views) * self.job.width * self.job.height
+        summary = {'method': self.method, 'frames': len(self.job.views),
+                   'seconds': round(time.perf_counter() - start, 3),
+                   'computed_points': self.computed_points, 'direct_points': direct_points}
+        logger.log(f"ズーム動画の出力完了: {summary['seconds']:.1f} 秒, 計算した点 {self.computed_points} "
+                   f"(個別に描画した場合の {self.computed_points / max(direct_points, 1):.1%})", level="INFO")
+        return summary
+
+
+# --- フレームの書き出し ---
+class PngFrameSequenceWriter:
+    """フレームを出力先ディレクトリへ連番の PNG ファイル (frame_00000.png, ...) として書き出すクラスです。"""
+    def __init__(self, output_dir: str | Path, width: int, height: int, frame_count: int):
+        """
+        Args:
+            output_dir (str | Path): 出力先ディレクトリ。存在しない場合は作成します。
+            width (int): フレームの幅 (ピクセル)。
+            height (int): フレームの高さ (ピクセル)。
+            frame_count (int): フレーム数 (連番の桁数を決めるために使います)。
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.width = width
+        self.height = height
+        self.digits = max(5, len(str(max(frame_count - 1, 0))))
+
+    def frame_path(self, index: int) -> Path:
+        """フレーム番号 index の出力先のパスを返します。"""
+        return self.output_dir / f"frame_{index:0{self.digits}d}.png"
+
+    def write_frame(self, index: int, frame: np.ndarray) -> None:
+        """フレームを1枚書き出します。"""
+        with create_image_writer('PNG', self.frame_path(index), self.width, self.height) as writer:
+            writer.write_band(frame)
+
+    def close(self) -> None:
+        """何もしません (各フレームは write_frame で完成しています)。"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+class RawVideoWriter:
+    """
+    フレームを rgb24 の生データとして連結して書き出すクラスです。
+
+    出力は `ffmpeg -f rawvideo -pix_fmt rgb24 -s 幅x高さ -r fps -i 出力 ...` でそのまま読み込めます。
+    出力先に '-' を指定すると標準出力に書き出すため、ffmpeg へパイプで渡せます。
+    """
+    def __init__(self, output_path: str | Path, width: int, height: int):
+        """
+        Args:
+            output_path (str | Path): 出力ファイルのパス。'-' の場合は標準出力。
+            width (int): フレームの幅 (ピクセル)。
+            height (int): フレームの高さ (ピクセル)。
+        """
+        self.width = width
+        self.height = height
+        self._owns_stream = str(output_path) != '-'
+        if self._owns_stream:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self._stream: BinaryIO = open(output_path, 'wb') if self._owns_stream else sys.stdout.buffer
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+
+    def write_frame(self, index: int, frame: np.ndarray) -> None:
+        """フレームを1枚書き出します (アルファは捨てます)。"""
+        if frame.shape != (self.height, self.width, 4):
+            raise ValueError(f"フレームの形状 {frame.shape} が ({self.height}, {self.width}, 4) と一致しません。")
+        self._rgb[...] = frame[..., :3]
+        self._stream.write(self._rgb.data)
+
+    def close(self) -> None:
+        """ストリームを閉じます (標準出力の場合はフラッシュだけ行います)。"""
+        if self._owns_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+def create_frame_writer(format_str: str, output_path: str | Path, width: int, height: int,
+                        frame_count: int) -> PngFrameSequenceWriter | RawVideoWriter:
+    """
+    出力形式に応じたフレームのライターを作成します。
+
+    Args:
+        format_str (str): 'PNG' (連番ファイル) または 'RAW' (rgb24 の生ストリーム)。
+        output_path (str | Path): 'PNG' では出力先ディレクトリ、'RAW' では出力ファイル ('-' で標準出力)。
+        width (int): フレームの幅。
+        height (int): フレームの高さ。
+        frame_count (int): フレーム数。
+    Raises:
+        ValueError: 未対応の形式の場合。
+    """
+    format_upper = format_str.upper()
+    if format_upper == 'PNG':
+        return PngFrameSequenceWriter(output_path, width, height, frame_count)
+    if format_upper == 'RAW':
+        return RawVideoWriter(output_path, width, height)
+    raise ValueError(f"ズーム動画の出力形式 '{format_str}' には対応していません ('PNG' または 'RAW')。")
+
+
+class ZoomMovieExporter(QRunnable):
+    """
+    ZoomMovieRenderer を QThreadPool 上で実行し、結果を ExporterSignals で通知するクラスです。
+
+    シグナルは ImageExporter と同じため、コントローラは高解像度出力と同じ経路で進捗と完了を扱えます。
+    """
+    def __init__(self, fractal_engine_ref, job: ZoomMovieJob):
+        """
+        Args:
+            fractal_engine_ref (FractalEngine): フラクタル計算エンジンの参照。
+            job (ZoomMovieJob): 出力するズーム動画の設定。
+        """
+        super().__init__()
+        self.fractal_engine = fractal_engine_ref
+        self.job = job
+        self.signals = ExporterSignals()
+        self.cancel_token = CancelToken()
+
+    def run(self):
+        """ズーム動画を出力します。"""
+        try:
+            self.signals.progress_updated.emit(0)
+            renderer = ZoomMovieRenderer(self.fractal_engine, self.job)
+            summary = renderer.render(
+                cancel_token=self.cancel_token,
+                progress_callback=lambda fraction: self.signals.progress_updated.emit(int(100 * fraction)))
+            self.signals.export_finished.emit(
+                True, f"{self.job.output_path} ({summary['frames']} フレーム, {summary['method']}, {summary['seconds']:.1f} 秒)")
+        except RenderCancelledError:
+            self.signals.export_finished.emit(False, "ズーム動画の出力がキャンセルされました。")
+        except Exception as e:
+            import traceback
+            logger.log(f"ズーム動画の出力中に予期せぬエラーが発生: {e}\n{traceback.format_exc()}", level="ERROR")
+            self.signals.export_finished.emit(False, f"ズーム動画の出力エラー: {e}")
+
+    def cancel(self):
+        """ズーム動画の出力のキャンセルを要求します。"""
+        logger.log("ズーム動画の出力のキャンセル要求を受け付けました。", level="INFO")
+        self.cancel_token.cancel()
+
+
+if __name__ == '__main__':
+    # 保存済みプリセットの表示範囲から指定した幅までのズーム動画を出力する
+    # (例: python -m export.zoom_movie frames --preset 名前 --end-width 1e-6 --frames 600)
+    import argparse
+    from export.batch_exporter import config_to_output_overrides
+    from models.fractal_engine import FractalEngine
+    from settings_manager import SettingsManager
+
+    parser = argparse.ArgumentParser(description="保存済みプリセットからズーム動画のフレームを出力します。")
+    parser.add_argument('output_path', help="PNG では出力先ディレクトリ、RAW では出力ファイル ('-' で標準出力)")
+    parser.add_argument('--preset', required=True)
+    parser.add_argument('--end-width', type=float, required=True)
+    parser.add_argument('--end-center', type=float, nargs=2, metavar=('REAL', 'IMAG'), default=None)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--format', default='PNG', choices=['PNG', 'RAW'])
+    parser.add_argument('--method', default='auto', choices=['auto', ZoomMovieRenderer.METHOD_EXP_MAP, ZoomMovieRenderer.METHOD_KEYFRAMES])
+    args = parser.parse_args()
+
+    preset_config = SettingsManager().get_presets()[args.preset]
+    engine = FractalEngine(Path(__file__).resolve().parent.parent)
+    start = preset_config['common_parameters']
+    end_center = args.end_center or (start['center_real'], start['center_imag'])
+    movie_job = ZoomMovieJob(
+        views=zoom_path(start, {'center_real': end_center[0], 'center_imag': end_center[1], 'width': args.end_width}, args.frames),
+        output_path=args.output_path, width=args.width, height=args.height, format=args.format, method=args.method,
+        output_overrides=config_to_output_overrides(preset_config, engine.active_coloring_target_type))
+    result = ZoomMovieRenderer(engine, movie_job).render()
+    logger.log(f"概要: {result}", level="INFO")
+    if args.format == 'RAW' and args.output_path != '-':
+        logger.log(f"動画への変換例: ffmpeg -f rawvideo -pix_fmt rgb24 -s {args.width}x{args.height} -r 60 "
+                   f"-i {args.output_path} -pix_fmt yuv420p zoom.mp4", level="INFO")
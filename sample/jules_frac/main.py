@@ -135,6 +135,7 @@ def init_mvc_components(settings_manager: SettingsManager) -> Tuple[FractalEngin
     fractal_engine = FractalEngine(project_root_path=_project_root, settings_manager=settings_manager)
     fractal_controller = FractalController(fractal_engine, settings_manager)
     fractal_controller.apply_configuration_from_settings()
+    fractal_controller.start_background_warm_up()
     main_window = MainWindow(fractal_controller, settings_manager)
     fractal_controller.set_main_window(main_window)
     return fractal_engine, fractal_controller, main_window
@@ -1,19 +1,29 @@
 import numpy as np
+import threading
+import time
 import traceback
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from plugins.plugin_manager import PluginManager
-from plugins.base_fractal_plugin import FractalPlugin
+from plugins.base_fractal_plugin import FractalPlugin, pixel_grid
 from plugins.base_coloring_plugin import ColoringAlgorithmPlugin
+from plugins.fractal_data import FractalData, allocate_frame_like
 from coloring.color_manager import ColorManager
+from plugins.coloring.kernels import palette_gather_kernel
 from logger.custom_logger import CustomLogger
+from utils.cancel_token import CancelToken, RenderCancelledError
+from utils.symmetry import is_centred_grid, point_symmetric_regions, fill_point_symmetric
 
 if TYPE_CHECKING:
     from settings_manager import SettingsManager
 
 logger = CustomLogger()
 
+# 出力時にカラーマップが解決できなかった場合の16階調グレースケール ((N,4) uint8, 読み取り専用)
+_OUTPUT_FALLBACK_COLOR_MAP = np.array([(i, i, i, 255) for i in range(0, 256, 16)], dtype=np.uint8)
+_OUTPUT_FALLBACK_COLOR_MAP.setflags(write=False)
+
 class FractalEngine:
     """
     フラクタル画像の計算、カラーリング、および関連パラメータ管理を行うコアエンジン。
@@ -23,6 +33,13 @@ class FractalEngine:
     各種パラメータやプラグインの管理、カラーマップの適用、
     設定の保存・復元など、アプリの中核的な役割を担います。
     """
+    CANCEL_BAND_ROWS = 32  # キャンセル確認の間隔となる帯の行数
+    OUTPUT_TILE_PX = 256  # 高解像度出力でタイルごとに処理する出力画像の一辺 (ピクセル)
+    ADAPTIVE_AA_LEVEL = "Adaptive"  # 境界付近のピクセルだけをスーパーサンプリングするアンチエイリアス
+    ADAPTIVE_AA_GRID = 4  # 再サンプリングするピクセル内のサンプルを 4x4 の層に分けて揺らす
+    ADAPTIVE_AA_COLOR_THRESHOLD = 16  # 近傍との色差 (チャンネルごとの最大値) がこれを超えたら再サンプリング
+    WARM_UP_PX = 16  # JIT のウォームアップで計算する画像の一辺 (ピクセル)
+
     def __init__(self, project_root_path: Path, image_width_px=800, image_height_px=600,
                  settings_manager: 'SettingsManager | None' = None, fractal_plugin_folder="plugins/fractals",  # project_root_pathからの相対パス
                  coloring_plugin_folder="plugins/coloring", # 同上
@@ -75,7 +92,17 @@ class FractalEngine:
         self.current_color_pack_name_non_divergent: str | None = None  # 非発散部カラーパック名
         self.current_color_map_name_non_divergent: str | None = None  # 非発散部カラーマップ名
 
+        # 並列カーネル (Numba の parallel=True) を使う処理はすべてこのロックを取ってから実行する。
+        # Numba の workqueue スレッド層は複数のスレッドからの同時実行に対応しておらず、異常終了するため
+        # (表示用の描画・ウォームアップ・出力・サムネイルが別スレッドで重なりうる)
+        self.kernel_lock = threading.RLock()
         self.last_fractal_data_cache: dict | None = None  # 直近の計算結果キャッシュ
+        self._cache_view: dict | None = None  # キャッシュを計算したときの表示条件 (再利用・パン判定用)
+        self._pan_residual: tuple[float, float] = (0.0, 0.0)  # ピクセル格子に丸めきれずに繰り越したパン量
+        self.palette_offset: float = 0.0  # パレットの循環位置 (カラーマップ1周分を 1.0 とする割合)
+        self._palette_coords: np.ndarray | None = None  # 着色プラグインが求めたピクセルごとのパレット座標 (float32)
+        self._palette_coords_source: dict | None = None  # パレット座標を求めたフラクタルデータ
+        self._palette_coords_keys: dict[str, tuple] = {}  # ターゲットタイプ -> パレット座標を求めたときの (プラグイン名, パラメータ)
 
         # 設定のロードを試みる
         if self.settings_manager:
@@ -190,6 +217,35 @@ class FractalEngine:
         if escape_radius is not None: self.escape_radius = escape_radius
         self.update_aspect_ratio()
         self.last_fractal_data_cache = None # キャッシュを無効化
+        self._pan_residual = (0.0, 0.0)
+
+    def pan_view(self, center_real: float, center_imag: float):
+        """
+        表示領域の中心だけを移動します (パン)。
+
+        計算済みのデータがある場合はキャッシュを破棄せず、移動量をキャッシュのピクセル格子に
+        丸めます。丸めで生じた端数は次回のパンに繰り越します。これにより
+        `compute_current_fractal(reuse_cache=True)` はキャッシュをずらし、
+        新しく見える帯だけを計算できます。
+
+        Args:
+            center_real (float): 新しい中心の実部。
+            center_imag (float): 新しい中心の虚部。
+        """
+        view = self._cache_view
+        if self.last_fractal_data_cache is None or view is None:
+            self.center_real = center_real
+            self.center_imag = center_imag
+            self._pan_residual = (0.0, 0.0)
+            return
+
+        pixel_w = view['width'] / view['image_width_px']
+        pixel_h = view['height'] / view['image_height_px']
+        target_real = center_real + self._pan_residual[0]
+        target_imag = center_imag + self._pan_residual[1]
+        self.center_real = view['center_real'] + round((target_real - view['center_real']) / pixel_w) * pixel_w
+        self.center_imag = view['center_imag'] + round((target_imag - view['center_imag']) / pixel_h) * pixel_h
+        self._pan_residual = (target_real - self.center_real, target_imag - self.center_imag)
 
     def get_common_parameters(self) -> dict:
         """
@@ -237,7 +293,7 @@ class FractalEngine:
 
     def get_available_fractal_plugin_names(self) -> list[str]:
         """利用可能なすべてのフラクタルプラグインの名前のリストを返します。"""
-        return [p.name for p in self.plugin_manager.get_available_fractal_plugins()]
+        return self.plugin_manager.get_fractal_plugin_names()
 
     def get_current_fractal_plugin_parameter_definitions(self) -> list:
         """
@@ -316,7 +372,7 @@ class FractalEngine:
 
     def get_available_coloring_plugin_names(self, target_type: str) -> list[str]:
         """指定されたターゲットタイプで利用可能なカラーリングプラグインの名前のリストを返します。"""
-        return [p.name for p in self.plugin_manager.get_available_coloring_plugins(target_type=target_type)]
+        return self.plugin_manager.get_coloring_plugin_names(target_type=target_type)
 
     def get_current_coloring_plugin_parameter_definitions(self, target_type: str) -> list: # target_type を追加
         """
@@ -398,27 +454,349 @@ class FractalEngine:
         self.logger.log(f"カラーマップ選択取得のための無効なターゲットタイプ '{target_type}'", level="WARNING")
         return None, None
 
-    def compute_current_fractal(self) -> dict | None:
+    def warm_up(self) -> bool:
+        """
+        アクティブなフラクタル・カラーリングプラグインで小さな画像を計算・着色し、JIT コンパイルを済ませます。
+
+        起動直後にバックグラウンドで呼び出すことを想定しています。計算結果は捨て、キャッシュや
+        パレット座標などエンジンの状態は変更しません。計算中は `kernel_lock` を保持するため、
+        直後に始まった最初の描画はウォームアップの完了を待ってから計算します。
+
+        Returns:
+            bool: 計算と着色を行った場合は True。プラグインが未設定か、失敗した場合は False。
+        """
+        fractal_plugin = self.current_fractal_plugin
+        if fractal_plugin is None:
+            return False
+        size_px = self.WARM_UP_PX
+        common_params = self.get_common_parameters()
+        common_params['height'] = common_params['width']
+        common_params.update(self._distance_estimate_params())
+        start_t = time.perf_counter()
+        with self.kernel_lock:
+            try:
+                fractal_data = fractal_plugin.compute_fractal(
+                    common_params, dict(self.current_fractal_plugin_parameters), size_px, size_px
+                )
+                fractal_data = self._compact_fractal_data(fractal_data, self._final_z_dtype())
+                is_diverged_mask = fractal_data['is_diverged']
+                coloring_common_params = self._build_coloring_common_params(fractal_data)
+                output_image = np.empty((size_px, size_px, 4), dtype=np.uint8)
+                for target_type, target_mask in (('divergent', is_diverged_mask), ('non_divergent', ~is_diverged_mask)):
+                    coloring_plugin = self.get_active_coloring_plugin(target_type)
+                    if coloring_plugin is None:
+                        continue
+                    pack_name, map_name = self.get_current_color_map_selection(target_type)
+                    color_map_data = self.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+                    coloring_plugin.apply_coloring_masked(
+                        fractal_data=fractal_data,
+                        common_fractal_params=coloring_common_params,
+                        algorithm_params=dict(self.get_coloring_plugin_parameters(target_type)),
+                        color_map_data=color_map_data,
+                        mask=target_mask,
+                        out=output_image
+                    )
+            except Exception as e:
+                self.logger.log(f"ウォームアップ中にエラーが発生しました: {e}", level="WARNING")
+                return False
+        self.logger.log(f"ウォームアップ完了 ({fractal_plugin.name}): {(time.perf_counter() - start_t) * 1000:.1f}ms", level="DEBUG")
+        return True
+
+    def compute_current_fractal(self, reuse_cache: bool = False,
+                                cancel_token: CancelToken | None = None) -> dict | None:
         """
         現在アクティブなフラクタルプラグインとパラメータを使用してフラクタルデータを計算します。
         計算結果は内部キャッシュ (`last_fractal_data_cache`) にも保存されます。
 
+        Args:
+            reuse_cache (bool, optional): True の場合、キャッシュを計算したときと表示条件が同じなら
+                キャッシュをそのまま返し、中心だけがピクセル単位で移動していれば (パン)
+                キャッシュをずらして新しく見える帯だけを計算します。Defaults to False.
+            cancel_token (CancelToken | None, optional): 指定した場合、画像を `CANCEL_BAND_ROWS` 行ずつの
+                帯に分けて計算し、帯ごとにキャンセルを確認します。キャンセルされた場合はキャッシュを変更しません。
         Returns:
             dict | None: 計算されたフラクタルデータ (通常 'iterations', 'last_values' を含む辞書)。
                          計算に失敗した場合はNone。
+        Raises:
+            RenderCancelledError: cancel_token によって計算が中断された場合。
         """
         if not self.current_fractal_plugin: return None
-        common_params = self.get_common_parameters()
-        try:
-            self.last_fractal_data_cache = self.current_fractal_plugin.compute_fractal(
-                common_params, self.current_fractal_plugin_parameters,
-                self.image_width_px, self.image_height_px
-            )
+        with self.kernel_lock:
+            view = self._current_view()
+            if reuse_cache and self.last_fractal_data_cache is not None and self._cache_view is not None:
+                reused = self._reuse_cached_fractal(view, cancel_token)
+                if reused is not None:
+                    return reused
+
+            common_params = self.get_common_parameters()
+            common_params['distance_estimate'] = view['distance_estimate']
+            common_params['distance_estimate_early_out_px'] = view['distance_estimate_early_out_px']
+            try:
+                if cancel_token is not None:
+                    fractal_data = self._compute_in_bands(view, cancel_token)
+                else:
+                    fractal_data = self.current_fractal_plugin.compute_fractal(
+                        common_params, self.current_fractal_plugin_parameters,
+                        self.image_width_px, self.image_height_px
+                    )
+                    fractal_data = self._compact_fractal_data(fractal_data, view['z_dtype'])
+                self.last_fractal_data_cache = fractal_data
+                self._cache_view = view
+                return self.last_fractal_data_cache
+            except RenderCancelledError:
+                raise
+            except Exception as e:
+                self.logger.log(f"計算中のエラー: {e}", level="ERROR")
+                self.last_fractal_data_cache = None
+                self._cache_view = None
+                return None
+
+    def _current_view(self) -> dict:
+        """キャッシュの再利用判定に使う、現在の計算条件を返します。"""
+        view = self.get_common_parameters()
+        view['image_width_px'] = self.image_width_px
+        view['image_height_px'] = self.image_height_px
+        view['plugin_name'] = self.current_fractal_plugin.name if self.current_fractal_plugin else None
+        view['plugin_params'] = dict(self.current_fractal_plugin_parameters)
+        view['z_dtype'] = self._final_z_dtype()
+        view.update(self._distance_estimate_params())
+        return view
+
+    def _final_z_dtype(self) -> type:
+        """
+        計算結果の最終Zを保持する型を返します。
+
+        発散部・非発散部の両方のカラーリングプラグインが float32 で足りると宣言していれば
+        np.float32、そうでなければ np.float64 を返します。
+        """
+        for target_type in ('divergent', 'non_divergent'):
+            plugin = self.get_active_coloring_plugin(target_type)
+            if plugin is not None and plugin.z_precision != 'float32':
+                return np.float64
+        return np.float32
+
+    def _distance_estimate_params(self) -> dict:
+        """
+        フラクタルプラグインに渡す距離推定の共通パラメータを返します。
+
+        発散部・非発散部のいずれかのカラーリングプラグインが距離推定を必要とする場合は 'distance_estimate' を
+        True にし、発散部のカラーリングプラグインが同じ色で塗る距離を 'distance_estimate_early_out_px' とします。
+        どちらも計算結果を左右するため、キャッシュの再利用判定に使う計算条件に含めます。
+        """
+        required = any(plugin is not None and plugin.requires_distance_estimate
+                       for plugin in (self.get_active_coloring_plugin(target_type)
+                                      for target_type in ('divergent', 'non_divergent')))
+        early_out_px = 0.0
+        divergent_plugin = self.get_active_coloring_plugin('divergent')
+        if divergent_plugin is not None and divergent_plugin.requires_distance_estimate:
+            early_out_px = divergent_plugin.distance_estimate_early_out_px(self.get_coloring_plugin_parameters('divergent'))
+        return {'distance_estimate': required, 'distance_estimate_early_out_px': early_out_px}
+
+    @staticmethod
+    def _compact_fractal_data(fractal_data: dict, z_dtype: type) -> dict:
+        """FractalData であれば最終Zを z_dtype に変換して返します。辞書形式の結果はそのまま返します。"""
+        if isinstance(fractal_data, FractalData):
+            return fractal_data.with_z_dtype(z_dtype)
+        return fractal_data
+
+    def _reuse_cached_fractal(self, view: dict, cancel_token: CancelToken | None = None) -> dict | None:
+        """
+        キャッシュが現在の表示条件にそのまま、またはずらして使えるなら、それを返します。
+
+        Args:
+            view (dict): `_current_view` で取得した現在の計算条件。
+            cancel_token (CancelToken | None, optional): パン用の部分計算で確認するキャンセルトークン。
+        Returns:
+            dict | None: 再利用したフラクタルデータ。再利用できない場合はNone。
+        Raises:
+            RenderCancelledError: 部分計算中にキャンセルが要求された場合。
+        """
+        cached_view = self._cache_view
+        if any(view[key] != cached_view[key] for key in view if key not in ('center_real', 'center_imag')):
+            return None
+        if view['center_real'] == cached_view['center_real'] and view['center_imag'] == cached_view['center_imag']:
             return self.last_fractal_data_cache
+
+        width_px, height_px = view['image_width_px'], view['image_height_px']
+        _, offset_x, _, offset_y = pixel_grid(view, width_px, height_px)
+        _, cached_offset_x, _, cached_offset_y = pixel_grid(cached_view, width_px, height_px)
+        offset_x -= cached_offset_x
+        offset_y -= cached_offset_y
+        shift_x, shift_y = round(offset_x), round(offset_y)
+        # 格子が整数ピクセルずれていない (半ピクセルずれた) 移動や、画面外まで移動した場合は全体を再計算する
+        if offset_x != shift_x or offset_y != shift_y:
+            return None
+        if abs(shift_x) >= width_px or abs(shift_y) >= height_px:
+            return None
+
+        try:
+            shifted = self._shift_cached_fractal(shift_x, shift_y, view, cancel_token)
+        except RenderCancelledError:
+            raise
         except Exception as e:
-            self.logger.log(f"計算中のエラー: {e}", level="ERROR")
-            self.last_fractal_data_cache = None
+            self.logger.log(f"パン用の部分計算中のエラー: {e}", level="ERROR")
+            return None
+        if shifted is None:
             return None
+        self.last_fractal_data_cache = shifted
+        self._cache_view = view
+        return shifted
+
+    def _shift_cached_fractal(self, shift_x: int, shift_y: int, view: dict,
+                              cancel_token: CancelToken | None = None) -> dict | None:
+        """
+        キャッシュの各配列を (shift_x, shift_y) ピクセルずらし、新しく見える行・列の帯だけを
+        アクティブなプラグインで計算して埋めます。
+
+        新しい画像の (y, x) は、キャッシュの (y + shift_y, x + shift_x) に対応します。
+
+        Args:
+            shift_x (int): 列方向の移動量 (ピクセル)。正の値は表示領域が実部の正方向へ動いたことを示します。
+            shift_y (int): 行方向の移動量 (ピクセル)。正の値は表示領域が虚部の正方向へ動いたことを示します。
+            view (dict): 移動後の計算条件。
+            cancel_token (CancelToken | None, optional): 帯ごとに確認するキャンセルトークン。
+        Returns:
+            dict | None: 移動後のフラクタルデータ。帯の計算結果に必要なキーがない場合はNone。
+        Raises:
+            RenderCancelledError: 計算中にキャンセルが要求された場合。
+        """
+        width_px, height_px = view['image_width_px'], view['image_height_px']
+
+        def _overlap(shift: int, size: int) -> tuple[slice, slice]:
+            # (移動先, 移動元) のスライス
+            if shift >= 0:
+                return slice(0, size - shift), slice(shift, size)
+            return slice(-shift, size), slice(0, size + shift)
+
+        dst_x, src_x = _overlap(shift_x, width_px)
+        dst_y, src_y = _overlap(shift_y, height_px)
+
+        shifted, grid_keys = allocate_frame_like(self.last_fractal_data_cache, (height_px, width_px), height_px, width_px)
+        for key in grid_keys:
+            shifted[key][dst_y, dst_x] = self.last_fractal_data_cache[key][src_y, src_x]
+
+        # 新しく見える帯 (y0, y1, x0, x1): 列の帯は全高、行の帯は列の帯と重ならない範囲
+        strips = []
+        if shift_x != 0:
+            x0, x1 = (width_px - shift_x, width_px) if shift_x > 0 else (0, -shift_x)
+            strips.append((0, height_px, x0, x1))
+        if shift_y != 0:
+            y0, y1 = (height_px - shift_y, height_px) if shift_y > 0 else (0, -shift_y)
+            strips.append((y0, y1, dst_x.start, dst_x.stop))
+
+        computed_px = 0
+        for y0, y1, x0, x1 in strips:
+            if y1 <= y0 or x1 <= x0:
+                continue
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            strip_data = self._compute_region(view, y0, y1, x0, x1)
+            for key in grid_keys:
+                if key not in strip_data:
+                    self.logger.log(f"パン用の部分計算結果にキー '{key}' がありません。全体を再計算します。", level="WARNING")
+                    return None
+                shifted[key][y0:y1, x0:x1] = strip_data[key]
+            computed_px += (y1 - y0) * (x1 - x0)
+
+        self.logger.log(f"パン: ({shift_x}, {shift_y}) px 移動、{computed_px} / {width_px * height_px} px を計算", level="DEBUG")
+        return shifted
+
+    def _compute_region(self, view: dict, y0: int, y1: int, x0: int, x1: int) -> dict:
+        """
+        表示条件 view の画像のうち、行 y0..y1-1、列 x0..x1-1 の矩形だけをアクティブなプラグインで計算します。
+        全体を計算した場合と同じ格子点になります (`_region_common_params` 参照)。
+
+        Args:
+            view (dict): `_current_view` で取得した計算条件。
+            y0 (int): 最初の行。
+            y1 (int): 最後の行の次。
+            x0 (int): 最初の列。
+            x1 (int): 最後の列の次。
+        Returns:
+            dict: プラグインが返した矩形部分のフラクタルデータ。
+        """
+        region_params = self._region_common_params(
+            {key: view[key] for key in ('center_real', 'center_imag', 'width', 'height', 'max_iterations', 'escape_radius',
+                                        'distance_estimate', 'distance_estimate_early_out_px')},
+            view['image_width_px'], view['image_height_px'], y0, y1, x0, x1
+        )
+        return self.current_fractal_plugin.compute_fractal(
+            region_params, view['plugin_params'], x1 - x0, y1 - y0
+        )
+
+    @staticmethod
+    def _region_common_params(common_params: dict, width_px: int, height_px: int,
+                              y0: int, y1: int, x0: int, x1: int, scale: int = 1) -> dict:
+        """
+        width_px x height_px の画像のうち、行 y0..y1-1、列 x0..x1-1 の矩形を計算するための共通パラメータを返します。
+
+        画像全体の格子 (`pixel_grid`) を 'grid_*' キーで明示し、矩形の左下のオフセットだけをずらすため、
+        プラグインは全体を計算した場合とビット単位で同じ格子点を計算します。矩形の中心と幅も合わせて更新します。
+
+        Args:
+            common_params (dict): 画像全体の共通パラメータ。
+            width_px (int): 画像全体の幅 (ピクセル)。
+            height_px (int): 画像全体の高さ (ピクセル)。
+            y0 (int): 最初の行。
+            y1 (int): 最後の行の次。
+            x0 (int): 最初の列。
+            x1 (int): 最後の列の次。
+            scale (int, optional): 各ピクセルを scale x scale 点で計算する場合 (スーパーサンプリング) の倍率。
+                矩形は scale 倍の解像度の画像全体の格子で計算されます。Defaults to 1.
+        Returns:
+            dict: 矩形用の共通パラメータ (common_params のコピー)。
+        """
+        pixel_w, offset_x, pixel_h, offset_y = pixel_grid(common_params, width_px * scale, height_px * scale)
+        region_params = dict(common_params)
+        region_params['grid_pixel_width'] = pixel_w
+        region_params['grid_pixel_height'] = pixel_h
+        region_params['grid_offset_x'] = offset_x + x0 * scale
+        region_params['grid_offset_y'] = offset_y + y0 * scale
+        region_params['width'] = (x1 - x0) * scale * pixel_w
+        region_params['height'] = (y1 - y0) * scale * pixel_h
+        region_params['center_real'] = (region_params['grid_offset_x'] + (x1 - x0) * scale / 2.0) * pixel_w
+        region_params['center_imag'] = (region_params['grid_offset_y'] + (y1 - y0) * scale / 2.0) * pixel_h
+        return region_params
+
+    def _compute_in_bands(self, view: dict, cancel_token: CancelToken) -> dict:
+        """
+        表示条件 view の画像全体を行の帯に分けて計算し、帯ごとにキャンセルを確認します。
+
+        プラグインが原点対称を報告し、中心が原点のビューであれば、上半分 (と下半分の列0) だけを
+        帯に分けて計算し、残りは複製します。
+
+        Args:
+            view (dict): `_current_view` で取得した計算条件。
+            cancel_token (CancelToken): キャンセルトークン。
+        Returns:
+            dict: 画像全体のフラクタルデータ。
+        Raises:
+            RenderCancelledError: 計算中にキャンセルが要求された場合。
+        """
+        width_px, height_px = view['image_width_px'], view['image_height_px']
+        _, offset_x, _, offset_y = pixel_grid(view, width_px, height_px)
+        use_symmetry = (self.current_fractal_plugin.is_point_symmetric(view['plugin_params']) and
+                        is_centred_grid(offset_x, offset_y, width_px, height_px))
+        if use_symmetry:
+            regions = point_symmetric_regions(height_px, width_px)
+        else:
+            regions = [(0, height_px, 0, width_px)]
+
+        result = None
+        for region_y0, region_y1, x0, x1 in regions:
+            for y0 in range(region_y0, region_y1, self.CANCEL_BAND_ROWS):
+                cancel_token.raise_if_cancelled()
+                y1 = min(y0 + self.CANCEL_BAND_ROWS, region_y1)
+                band = self._compute_region(view, y0, y1, x0, x1)
+                if result is None:
+                    result, grid_keys = allocate_frame_like(band, (y1 - y0, x1 - x0), height_px, width_px, view['z_dtype'])
+                for key in grid_keys:
+                    if key in band:
+                        result[key][y0:y1, x0:x1] = band[key]
+        cancel_token.raise_if_cancelled()
+        if use_symmetry:
+            fill_point_symmetric(result, height_px, width_px)
+        return result
 
     def apply_coloring(self, target_type: str, fractal_data_override: dict | None = None) -> np.ndarray | None:
         """
@@ -446,10 +824,207 @@ class FractalEngine:
             self.logger.log(f"apply_coloring ({target_type}) 中止: プラグイン ({active_plugin is not None}) またはデータ ({data_to_color is not None}) がありません。", level="WARNING")
             return None
 
-        # 共通パラメータを構築
+        common_params = self._build_coloring_common_params(data_to_color)
+
+        with self.kernel_lock:
+            try:
+                color_map_data = self.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+                self.logger.log(f"apply_coloring: color_map_dataの色数={len(color_map_data) if color_map_data is not None else 0}", level="DEBUG")
+                return active_plugin.apply_coloring(
+                    fractal_data=data_to_color,
+                    common_fractal_params=common_params,
+                    algorithm_params=plugin_params,
+                    color_map_data=color_map_data
+                )
+            except Exception as e:
+                self.logger.log(f"カラーリングプラグイン '{active_plugin.name}' の実行中にエラーが発生しました: {e}", level="ERROR")
+                self.logger.log("トレースバック (直近の呼び出し):", level="ERROR")
+                traceback.print_exc()
+                h = common_params.get('height', self.image_height_px)
+                w = common_params.get('width', self.image_width_px)
+                err_img = np.full((h if h > 0 else 1, w if w > 0 else 1, 4), [255, 0, 0, 255], dtype=np.uint8)
+                return err_img
+
+    def compose_colored_image(self, fractal_data_override: dict | None = None,
+                              cancel_token: CancelToken | None = None) -> np.ndarray | None:
+        """
+        発散部と非発散部をそれぞれのカラーリングプラグインで着色し、1枚のRGBA画像に合成します。
+
+        'is_diverged' マスクで領域を分け、各プラグインには自分の領域のピクセルだけを
+        共有の出力バッファへ書き込ませるため、各ピクセルの着色は1回だけで済みます。
+
+        パレット座標に対応したプラグインは、フラクタルデータごとに1回だけパレット座標を求めて保持し、
+        以降カラーマップ・palette_parameters・palette_offset だけが変わった場合は LUT からの引き直しだけで着色します。
+
+        Args:
+            fractal_data_override (dict | None, optional):
+                カラーリングに使用するフラクタルデータ。Noneの場合、最後に計算された
+                `last_fractal_data_cache` を使用します。
+            cancel_token (CancelToken | None, optional): 発散部・非発散部の着色の前にそれぞれ確認するキャンセルトークン。
+        Returns:
+            np.ndarray | None: RGBA形式 (高さ x 幅 x 4) の合成画像データ (uint8)。
+                               マスクがない場合やプラグインが未設定の場合はNone。
+        Raises:
+            RenderCancelledError: cancel_token によって着色が中断された場合。
+        """
+        with self.kernel_lock:
+            data_to_color = fractal_data_override if fractal_data_override is not None else self.last_fractal_data_cache
+            if not data_to_color:
+                self.logger.log("compose_colored_image 中止: フラクタルデータがありません。", level="WARNING")
+                return None
+
+            is_diverged_mask = data_to_color.get('is_diverged')
+            if not isinstance(is_diverged_mask, np.ndarray) or is_diverged_mask.ndim != 2:
+                self.logger.log("compose_colored_image 中止: 'is_diverged' マスクが見つからないか、無効な形状です。", level="ERROR")
+                return None
+
+            height_px, width_px = is_diverged_mask.shape
+            output_image = np.empty((height_px, width_px, 4), dtype=np.uint8)
+            for target_type, target_mask in (('divergent', is_diverged_mask), ('non_divergent', ~is_diverged_mask)):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                if self._apply_palette_coloring_into(target_type, data_to_color, target_mask, output_image):
+                    continue
+                if not self._apply_coloring_into(target_type, data_to_color, target_mask, output_image):
+                    return None
+            if isinstance(data_to_color, FractalData):
+                # キャッシュには最小限の状態と小さな統計だけを残す (派生配列は次の着色時に再計算される)
+                data_to_color.release_derived(keep_statistics=True)
+            return output_image
+
+    def _apply_palette_coloring_into(self, target_type: str, fractal_data: dict, mask: np.ndarray, out: np.ndarray) -> bool:
+        """
+        保持しているパレット座標を LUT で色に変換し、mask 部分を out に書き込みます。
+
+        パレット座標がないか、フラクタルデータ・プラグイン・palette_parameters 以外のパラメータが
+        求めたときと変わっていれば、プラグインに mask 部分のパレット座標を求め直させます。
+
+        Args:
+            target_type (str): 'divergent' または 'non_divergent'。
+            fractal_data (dict): カラーリングに使用するフラクタルデータ。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+            out (np.ndarray): 書き込み先のRGBAバッファ。
+        Returns:
+            bool: 着色した場合は True。プラグインがパレット座標に対応していないか失敗した場合は False
+                  (呼び出し側は _apply_coloring_into で通常どおり着色します)。
+        """
+        active_plugin = self.get_active_coloring_plugin(target_type)
+        if not active_plugin:
+            return False
+        if not mask.any():
+            return True
+
+        plugin_params = self.get_coloring_plugin_parameters(target_type)
+        palette_params = active_plugin.palette_parameters
+        coords_key = (active_plugin.name, {k: v for k, v in plugin_params.items() if k not in palette_params})
+
+        coords = self._palette_coords
+        if coords is None or self._palette_coords_source is not fractal_data or coords.shape != mask.shape:
+            # フラクタルデータが変わったら新しいバッファに求め直す (古いバッファは上書きしない)
+            coords = np.full(mask.shape, np.nan, dtype=np.float32)
+            self._palette_coords_keys = {}
+        if self._palette_coords_keys.get(target_type) != coords_key:
+            try:
+                computed = active_plugin.compute_palette_coordinates_masked(
+                    fractal_data=fractal_data,
+                    common_fractal_params=self._build_coloring_common_params(fractal_data),
+                    algorithm_params=plugin_params,
+                    mask=mask,
+                    out_coords=coords
+                )
+            except Exception as e:
+                self.logger.log(f"カラーリングプラグイン '{active_plugin.name}' のパレット座標の計算中にエラーが発生しました: {e}", level="ERROR", exc_info=True)
+                computed = False
+            if not computed:
+                self._palette_coords_keys.pop(target_type, None)
+                return False
+            self._palette_coords_keys[target_type] = coords_key
+        self._palette_coords = coords
+        self._palette_coords_source = fractal_data
+
+        pack_name, map_name = self.get_current_color_map_selection(target_type)
+        color_map_data = self.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+        try:
+            self._gather_palette_into(active_plugin, plugin_params, color_map_data, coords, mask, out, self.palette_offset)
+        except Exception as e:
+            self.logger.log(f"カラーリングプラグイン '{active_plugin.name}' のパレットの準備中にエラーが発生しました: {e}", level="ERROR", exc_info=True)
+            return False
+        return True
+
+    @staticmethod
+    def _gather_palette_into(plugin: ColoringAlgorithmPlugin, plugin_params: dict, color_map_data, coords: np.ndarray,
+                             mask: np.ndarray, out: np.ndarray, palette_offset: float) -> None:
+        """
+        パレット座標をプラグインの palette_mapping に従って色に変換し、mask 部分を out に書き込みます。
+
+        Args:
+            plugin (ColoringAlgorithmPlugin): パレット座標を求めたカラーリングプラグイン。
+            plugin_params (dict): そのパラメータ。
+            color_map_data: カラーマップ (palette_mapping に渡す)。
+            coords (np.ndarray): パレット座標 (高さx幅, float32)。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+            out (np.ndarray): 書き込み先のRGBAバッファ。
+            palette_offset (float): カラーマップ1周分を 1.0 とする循環位置。
+        """
+        color_map_np, scale, wrap = plugin.palette_mapping(plugin_params, color_map_data)
+        offset = (palette_offset % 1.0) * color_map_np.shape[0]
+        # 循環させる場合は、端で切り詰めるプラグインでもカラーマップを折り返す
+        palette_gather_kernel(coords, mask, out, color_map_np, float(scale), offset, bool(wrap or offset != 0.0))
+
+    def set_palette_offset(self, offset: float) -> None:
+        """
+        パレットの循環位置を設定します。次回の compose_colored_image から反映されます。
+
+        Args:
+            offset (float): カラーマップ1周分を 1.0 とする循環位置。整数部は無視されます。
+        """
+        self.palette_offset = float(offset) % 1.0
+
+    def _apply_coloring_into(self, target_type: str, fractal_data: dict, mask: np.ndarray, out: np.ndarray) -> bool:
+        """
+        指定されたターゲットタイプのカラーリングを mask 部分だけに適用し、out に書き込みます。
+        プラグインの実行に失敗した場合は、apply_coloring と同様に対象ピクセルを赤で塗ります。
+
+        Args:
+            target_type (str): 'divergent' または 'non_divergent'。
+            fractal_data (dict): カラーリングに使用するフラクタルデータ。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+            out (np.ndarray): 書き込み先のRGBAバッファ。
+        Returns:
+            bool: プラグインが設定されていない場合はFalse、それ以外はTrue。
+        """
+        active_plugin = self.get_active_coloring_plugin(target_type)
+        if not active_plugin:
+            self.logger.log(f"_apply_coloring_into ({target_type}) 中止: プラグインがありません。", level="WARNING")
+            return False
+        if not mask.any():
+            return True
+
+        plugin_params = self.get_coloring_plugin_parameters(target_type)
+        pack_name, map_name = self.get_current_color_map_selection(target_type)
+        common_params = self._build_coloring_common_params(fractal_data)
+        try:
+            color_map_data = self.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+            active_plugin.apply_coloring_masked(
+                fractal_data=fractal_data,
+                common_fractal_params=common_params,
+                algorithm_params=plugin_params,
+                color_map_data=color_map_data,
+                mask=mask,
+                out=out
+            )
+        except Exception as e:
+            self.logger.log(f"カラーリングプラグイン '{active_plugin.name}' の実行中にエラーが発生しました: {e}", level="ERROR", exc_info=True)
+            out[mask] = (255, 0, 0, 255)
+        return True
+
+    def _build_coloring_common_params(self, fractal_data: dict) -> dict:
+        """
+        カラーリングプラグインに渡す共通パラメータを構築します。
+        'height' と 'width' は、これから処理する画像のピクセル寸法で上書きされます。
+        """
         common_params = self.get_common_parameters()
-        # common_params の 'height' と 'width' を、これから処理する画像のピクセル寸法で上書きする
-        iterations_array = data_to_color.get('iterations')
+        iterations_array = fractal_data.get('iterations')
         if iterations_array is not None and iterations_array.ndim == 2:
             height_px, width_px = iterations_array.shape
             common_params['height'] = height_px
@@ -458,42 +1033,26 @@ class FractalEngine:
             self.logger.log("apply_coloring: iterations_array が見つからないか、無効な形状です。デフォルトの画像サイズを使用します。", level="WARNING")
             common_params['height'] = self.image_height_px
             common_params['width'] = self.image_width_px
-
-        try:
-            color_map_data = self.color_manager.get_color_map_data(pack_name, map_name) if pack_name and map_name else []
-            self.logger.log(f"apply_coloring: color_map_dataの長さ={len(color_map_data)} (先頭3色={color_map_data[:3] if color_map_data else 'なし'})", level="DEBUG")
-            return active_plugin.apply_coloring(
-                fractal_data=data_to_color,
-                common_fractal_params=common_params,
-                algorithm_params=plugin_params,
-                color_map_data=color_map_data
-            )
-        except Exception as e:
-            self.logger.log(f"カラーリングプラグイン '{active_plugin.name}' の実行中にエラーが発生しました: {e}", level="ERROR")
-            self.logger.log("トレースバック (直近の呼び出し):", level="ERROR")
-            traceback.print_exc()
-            h = common_params.get('height', self.image_height_px)
-            w = common_params.get('width', self.image_width_px)
-            err_img = np.full((h if h > 0 else 1, w if w > 0 else 1, 4), [255, 0, 0, 255], dtype=np.uint8)
-            return err_img
+        return common_params
 
     def _get_antialiasing_factor(self, antialiasing_level_str: str) -> int:
         """
         アンチエイリアスレベルの文字列から、スーパーサンプリングの係数を返します。
 
         Args:
-            antialiasing_level_str (str): "なし", "2x2 SSAA", "3x3 SSAA", "4x4 SSAA" のいずれか。
+            antialiasing_level_str (str): "なし", "2x2 SSAA", "3x3 SSAA", "4x4 SSAA", "Adaptive" のいずれか。
         Returns:
-            int: スーパーサンプリング係数 (1, 2, 3, または 4)。
+            int: スーパーサンプリング係数 (1, 2, 3, または 4)。"Adaptive" は最初に等倍で描画するため 1。
         """
         if antialiasing_level_str == "2x2 SSAA": return 2
         if antialiasing_level_str == "3x3 SSAA": return 3
         if antialiasing_level_str == "4x4 SSAA": return 4
         return 1
 
-    def _prepare_output_parameters(self, output_width: int, output_height: int, common_params_override: dict, fractal_plugin_name_override: str | None, fractal_plugin_params_override: dict | None, coloring_algo_name_override: str | None, coloring_algo_params_override: dict | None, color_pack_name_override: str | None, color_map_name_override: str | None, antialiasing_level: str) -> tuple[dict, FractalPlugin, dict, ColoringAlgorithmPlugin, dict, list, int, int, int]:
+    def _prepare_output_parameters(self, output_width: int, output_height: int, common_params_override: dict, fractal_plugin_name_override: str | None, fractal_plugin_params_override: dict | None, coloring_algo_name_override: str | None, coloring_algo_params_override: dict | None, color_pack_name_override: str | None, color_map_name_override: str | None, palette_offset_override: float | None, antialiasing_level: str) -> tuple[dict, FractalPlugin, dict, ColoringAlgorithmPlugin, dict, list, float, int, int, int]:
         """
         出力画像生成のための全パラメータを準備し、必要なインスタンスやデータを返す。
+        パレットの循環位置は palette_offset_override が None の場合、表示中の palette_offset を使う。
         """
         final_common_params = self.get_common_parameters()
         final_common_params.update(common_params_override)
@@ -528,15 +1087,21 @@ class FractalEngine:
         current_pack_name_for_target, current_map_name_for_target = self.get_current_color_map_selection(active_target_type_for_output)
         pack_name = color_pack_name_override if color_pack_name_override else current_pack_name_for_target
         map_name = color_map_name_override if color_map_name_override else current_map_name_for_target
-        final_color_map_data = self.color_manager.get_color_map_data(pack_name, map_name) if pack_name and map_name else []
-        if not final_color_map_data:
-            final_color_map_data = [(i,i,i) for i in range(0,256,16)]
+        final_color_map_data = self.color_manager.get_color_map_lut(pack_name, map_name) if pack_name and map_name else None
+        if final_color_map_data is None:
+            final_color_map_data = _OUTPUT_FALLBACK_COLOR_MAP
+        final_palette_offset = float(self.palette_offset if palette_offset_override is None else palette_offset_override) % 1.0
         aa_factor = self._get_antialiasing_factor(antialiasing_level)
         ss_width = output_width * aa_factor
         ss_height = output_height * aa_factor
         original_engine_complex_height = final_common_params['height']
         final_common_params['height'] = (final_common_params['width'] * ss_height) / ss_width if ss_width > 0 else final_common_params['width']
-        return (final_common_params, active_fractal_plugin, final_fractal_plugin_params, active_coloring_plugin, final_coloring_algo_params, final_color_map_data, aa_factor, ss_width, ss_height)
+        if active_coloring_plugin.requires_distance_estimate:
+            # 距離推定はスーパーサンプリングの係数によらず出力画像のピクセル単位にする
+            final_common_params['distance_estimate'] = True
+            final_common_params['distance_estimate_pixel_size'] = final_common_params['width'] / output_width
+            final_common_params['distance_estimate_early_out_px'] = active_coloring_plugin.distance_estimate_early_out_px(final_coloring_algo_params)
+        return (final_common_params, active_fractal_plugin, final_fractal_plugin_params, active_coloring_plugin, final_coloring_algo_params, final_color_map_data, final_palette_offset, aa_factor, ss_width, ss_height)
 
     def _compute_fractal_for_output(self, plugin: FractalPlugin, params: dict, common_params: dict, width: int, height: int) -> dict | None:
         try:
@@ -545,30 +1110,346 @@ class FractalEngine:
             self.logger.log(f"スーパーサンプリングされたフラクタル計算に失敗: {e}", level="ERROR")
             return None
 
-    def _apply_coloring_for_output(self, plugin: ColoringAlgorithmPlugin, params: dict, common_params: dict, fractal_data: dict, color_map_data: list) -> np.ndarray | None:
+    def _apply_coloring_for_output(self, plugin: ColoringAlgorithmPlugin, params: dict, common_params: dict, fractal_data: dict, color_map_data: np.ndarray, palette_offset: float = 0.0) -> np.ndarray | None:
+        """
+        出力用のフラクタルデータ全体を着色します。
+
+        palette_offset が 0 でない場合は、表示と同じくパレット座標をカラーマップ上で循環させて着色します
+        (`_gather_palette_into` 参照)。プラグインがパレット座標に対応していない場合は循環させずに着色します。
+        """
         try:
+            height_px, width_px = fractal_data['iterations'].shape
             common_params_for_coloring = common_params.copy()
-            common_params_for_coloring['image_width_px'] = common_params['width']
-            common_params_for_coloring['image_height_px'] = common_params['height']
+            common_params_for_coloring['image_width_px'] = width_px
+            common_params_for_coloring['image_height_px'] = height_px
+            if palette_offset:
+                coords = np.full((height_px, width_px), np.nan, dtype=np.float32)
+                mask = np.ones((height_px, width_px), dtype=np.bool_)
+                if plugin.compute_palette_coordinates_masked(fractal_data, common_params_for_coloring, params, mask, coords):
+                    rgba = np.empty((height_px, width_px, 4), dtype=np.uint8)
+                    self._gather_palette_into(plugin, params, color_map_data, coords, mask, rgba, palette_offset)
+                    return rgba
+                self.logger.log(f"カラーリング '{plugin.name}' はパレット座標に対応していないため、パレットを循環させずに着色します。", level="DEBUG")
             return plugin.apply_coloring(fractal_data, common_params_for_coloring, params, color_map_data)
         except Exception as e:
             self.logger.log(f"スーパーサンプリングされたカラーリングに失敗: {e}", level="ERROR")
             return None
 
+    @staticmethod
+    def _box_downsample_into(image: np.ndarray, out: np.ndarray, aa_factor: int):
+        """
+        スーパーサンプリングされたRGBA画像を aa_factor x aa_factor の平均 (四捨五入) で縮小し、out に書き込みます。
+        中間配列は整数 (uint16/uint32) で扱い、浮動小数点の配列は作りません。
+
+        Args:
+            image (np.ndarray): 縮小元のRGBA画像 (高さ*aa x 幅*aa x 4, uint8)。
+            out (np.ndarray): 書き込み先 (高さ x 幅 x 4, uint8)。
+            aa_factor (int): スーパーサンプリング係数。
+        """
+        if aa_factor == 1:
+            out[...] = image
+            return
+        height_px, width_px = out.shape[:2]
+        samples = aa_factor * aa_factor
+        # 255 * 16 (4x4) は uint16 に収まる
+        sum_dtype = np.uint16 if samples * 255 <= np.iinfo(np.uint16).max else np.uint32
+        blocks = image.reshape(height_px, aa_factor, width_px, aa_factor, 4)
+        totals = blocks.sum(axis=(1, 3), dtype=sum_dtype)
+        totals += samples // 2
+        totals //= samples
+        out[...] = totals
+
     def _downsample_image(self, image: np.ndarray, output_width: int, output_height: int, aa_factor: int) -> np.ndarray:
         if aa_factor > 1:
             try:
                 if image.shape[2] != 4:
                     self.logger.log(f"カラーリングから4チャンネルを期待しましたが、{image.shape[2]} を取得しました", level="ERROR")
                     return image
-                reshaped = image.reshape(output_height, aa_factor, output_width, aa_factor, 4)
-                return reshaped.mean(axis=(1, 3)).astype(np.uint8)
+                downsampled = np.empty((output_height, output_width, 4), dtype=np.uint8)
+                self._box_downsample_into(image, downsampled, aa_factor)
+                return downsampled
             except ValueError as e:
                 self.logger.log(f"ダウンサンプリングリシェイプ中のエラー: {e}。入力: {image.shape}, ターゲット: {output_height}x{output_width}, AA: {aa_factor}", level="ERROR")
                 return image
         else:
             return image
 
+    def _output_tiles(self, output_width: int, output_height: int, tile_px: int) -> list[tuple[int, int, int, int]]:
+        """
+        出力画像を一辺 tile_px のタイルに分割した (y0, y1, x0, x1) の一覧を返します (出力画像のピクセル単位)。
+        """
+        return [(y0, min(y0 + tile_px, output_height), x0, min(x0 + tile_px, output_width))
+                for y0 in range(0, output_height, tile_px)
+                for x0 in range(0, output_width, tile_px)]
+
+    def _render_supersampled_tile(self, output_tile: np.ndarray, bounds: tuple[int, int, int, int],
+                                  output_size: tuple[int, int], aa_factor: int, render_args: tuple) -> bool:
+        """
+        出力画像のタイル1枚を aa_factor 倍の解像度で計算・着色し、縮小して output_tile に書き込みます。
+
+        Args:
+            output_tile (np.ndarray): 書き込み先 (出力画像のタイル部分のビュー)。
+            bounds (tuple[int, int, int, int]): タイルの (y0, y1, x0, x1) (出力画像のピクセル単位)。
+            output_size (tuple[int, int]): 出力画像の (幅, 高さ)。
+            aa_factor (int): スーパーサンプリング係数。
+            render_args (tuple): (共通パラメータ, フラクタルプラグイン, そのパラメータ,
+                                  カラーリングプラグイン, そのパラメータ, カラーマップ, パレットの循環位置)。
+        Returns:
+            bool: 成功した場合は True。
+        """
+        y0, y1, x0, x1 = bounds
+        common_params, fractal_plugin, fractal_params, coloring_plugin, coloring_params, color_map_data, palette_offset = render_args
+        tile_params = self._region_common_params(common_params, output_size[0], output_size[1], y0, y1, x0, x1, aa_factor)
+        tile_data = self._compute_fractal_for_output(fractal_plugin, fractal_params, tile_params,
+                                                     (x1 - x0) * aa_factor, (y1 - y0) * aa_factor)
+        if tile_data is None:
+            return False
+        tile_rgba = self._apply_coloring_for_output(coloring_plugin, coloring_params, tile_params, tile_data, color_map_data, palette_offset)
+        del tile_data
+        if tile_rgba is None:
+            return False
+        self._box_downsample_into(tile_rgba, output_tile, aa_factor)
+        return True
+
+    def _accumulate_frame_statistics(self, tiles: list[tuple[int, int, int, int]], output_size: tuple[int, int],
+                                     aa_factor: int, render_args: tuple, cancel_token: CancelToken | None = None,
+                                     progress_callback=None) -> object:
+        """
+        高解像度出力の1パス目として、タイルごとに aa_factor 倍の解像度で計算し、カラーリングの画像全体の統計を集計します。
+
+        2パス目と同じ格子で計算するため、集計した統計は画像全体を一度に計算した場合と一致します。
+        タイルの計算結果は集計後すぐに破棄します。
+
+        Args:
+            tiles (list[tuple[int, int, int, int]]): 出力画像のタイルの (y0, y1, x0, x1) の一覧。
+            output_size (tuple[int, int]): 出力画像の (幅, 高さ)。
+            aa_factor (int): スーパーサンプリング係数。
+            render_args (tuple): `_render_supersampled_tile` と同じ。
+            cancel_token (CancelToken | None, optional): タイルごとに確認するキャンセルトークン。
+            progress_callback (Callable[[float], None] | None, optional): タイルを処理するたびに進捗 (0.0-1.0) を受け取る関数。
+        Returns:
+            object: カラーリングプラグインの accumulate_frame_statistics で集計した統計。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+            RuntimeError: タイルの計算に失敗した場合。
+        """
+        common_params, fractal_plugin, fractal_params, coloring_plugin, coloring_params, _, _ = render_args
+        statistics = None
+        for tile_index, (y0, y1, x0, x1) in enumerate(tiles):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            tile_params = self._region_common_params(common_params, output_size[0], output_size[1], y0, y1, x0, x1, aa_factor)
+            with self.kernel_lock:
+                tile_data = self._compute_fractal_for_output(fractal_plugin, fractal_params, tile_params,
+                                                             (x1 - x0) * aa_factor, (y1 - y0) * aa_factor)
+                if tile_data is None:
+                    raise RuntimeError(f"タイル {(y0, y1, x0, x1)} の統計の集計に失敗しました。")
+                statistics = coloring_plugin.accumulate_frame_statistics(tile_data, tile_params, coloring_params, statistics)
+            del tile_data
+            if progress_callback is not None:
+                progress_callback((tile_index + 1) / len(tiles))
+        return statistics
+
+    @staticmethod
+    def _find_edge_pixels(rgba: np.ndarray, is_diverged: np.ndarray, color_threshold: int) -> np.ndarray:
+        """
+        8近傍のいずれかと色 (RGBのチャンネルごとの差の最大値) が color_threshold を超えて異なるか、
+        発散・非発散が異なるピクセルを True とするマスクを返します。画像の端は端の値を延長して比較します。
+        """
+        height_px, width_px = is_diverged.shape
+        rgb = rgba[..., :3].astype(np.int16)
+        padded_rgb = np.pad(rgb, ((1, 1), (1, 1), (0, 0)), mode='edge')
+        padded_div = np.pad(is_diverged, 1, mode='edge')
+        edges = np.zeros((height_px, width_px), dtype=np.bool_)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dy == 0 and dx == 0:
+                    continue
+                rows = slice(1 + dy, 1 + dy + height_px)
+                cols = slice(1 + dx, 1 + dx + width_px)
+                edges |= np.abs(padded_rgb[rows, cols] - rgb).max(axis=2) > color_threshold
+                edges |= padded_div[rows, cols] != is_diverged
+        return edges
+
+    def _render_adaptive_tile(self, output_tile: np.ndarray, bounds: tuple[int, int, int, int],
+                              output_size: tuple[int, int], render_args: tuple, rng: np.random.Generator) -> int | None:
+        """
+        出力画像のタイル1枚を適応型アンチエイリアスで描画し、output_tile に書き込みます。
+
+        タイルを周囲1ピクセル分広げて等倍で計算・着色し、近傍と色や発散状態が異なるピクセルだけを
+        `ADAPTIVE_AA_GRID` x `ADAPTIVE_AA_GRID` の層ごとに揺らしたサンプル点で計算し直して平均します。
+        フラクタルプラグインが任意の点の計算 (`compute_points`) に対応していない場合は、
+        タイル全体を同じサンプル数の一様なスーパーサンプリングで描画します。
+
+        Args:
+            output_tile (np.ndarray): 書き込み先 (出力画像のタイル部分のビュー)。
+            bounds (tuple[int, int, int, int]): タイルの (y0, y1, x0, x1) (出力画像のピクセル単位)。
+            output_size (tuple[int, int]): 出力画像の (幅, 高さ)。
+            render_args (tuple): `_render_supersampled_tile` と同じ。
+            rng (np.random.Generator): サンプル位置の揺らぎに使う乱数生成器。
+        Returns:
+            int | None: 再サンプリングしたピクセル数。失敗した場合は None。
+        """
+        y0, y1, x0, x1 = bounds
+        output_width, output_height = output_size
+        common_params, fractal_plugin, fractal_params, coloring_plugin, coloring_params, color_map_data, palette_offset = render_args
+
+        # 1. タイルを周囲1ピクセル広げて等倍で描画 (タイル境界でも近傍と比較できるように)
+        ay0, ay1 = max(y0 - 1, 0), min(y1 + 1, output_height)
+        ax0, ax1 = max(x0 - 1, 0), min(x1 + 1, output_width)
+        base_params = self._region_common_params(common_params, output_width, output_height, ay0, ay1, ax0, ax1)
+        base_data = self._compute_fractal_for_output(fractal_plugin, fractal_params, base_params, ax1 - ax0, ay1 - ay0)
+        if base_data is None:
+            return None
+        base_rgba = self._apply_coloring_for_output(coloring_plugin, coloring_params, base_params, base_data, color_map_data, palette_offset)
+        if base_rgba is None:
+            return None
+        edges = self._find_edge_pixels(base_rgba, np.asarray(base_data['is_diverged']), self.ADAPTIVE_AA_COLOR_THRESHOLD)
+        del base_data
+        inner = (slice(y0 - ay0, y1 - ay0), slice(x0 - ax0, x1 - ax0))
+        output_tile[...] = base_rgba[inner]
+        edge_y, edge_x = np.nonzero(edges[inner])
+        if edge_y.size == 0:
+            return 0
+
+        # 2. 境界ピクセルだけを層別に揺らしたサンプル点で計算し直す
+        grid = self.ADAPTIVE_AA_GRID
+        samples = grid * grid
+        jitter = rng.random((edge_y.size, samples, 2))
+        sub_y = (np.repeat(np.arange(grid), grid)[None, :] + jitter[..., 0]) / grid
+        sub_x = (np.tile(np.arange(grid), grid)[None, :] + jitter[..., 1]) / grid
+        pixel_w, offset_x, pixel_h, offset_y = pixel_grid(common_params, output_width, output_height)
+        real_coords = (offset_x + (x0 + edge_x)[:, None] + sub_x) * pixel_w
+        imag_coords = (offset_y + (y0 + edge_y)[:, None] + sub_y) * pixel_h
+        sample_data = fractal_plugin.compute_points(common_params, fractal_params, real_coords, imag_coords)
+        if sample_data is None:
+            self.logger.log(f"'{fractal_plugin.name}' は任意の点の計算に対応していないため、{grid}x{grid} SSAA で描画します。", level="DEBUG")
+            if not self._render_supersampled_tile(output_tile, bounds, output_size, grid, render_args):
+                return None
+            return (y1 - y0) * (x1 - x0)
+        sample_rgba = self._apply_coloring_for_output(coloring_plugin, coloring_params, common_params, sample_data, color_map_data, palette_offset)
+        if sample_rgba is None:
+            return None
+        totals = sample_rgba.sum(axis=1, dtype=np.uint32)
+        output_tile[edge_y, edge_x] = (totals + samples // 2) // samples
+        return int(edge_y.size)
+
+    def iter_output_bands(self, output_width: int, output_height: int,
+                          common_params_override: dict,
+                          fractal_plugin_name_override: str | None = None,
+                          fractal_plugin_params_override: dict | None = None,
+                          coloring_algo_name_override: str | None = None,
+                          coloring_algo_params_override: dict | None = None,
+                          color_pack_name_override: str | None = None,
+                          color_map_name_override: str | None = None,
+                          palette_offset_override: float | None = None,
+                          antialiasing_level: str = "なし",
+                          cancel_token: CancelToken | None = None,
+                          progress_callback=None
+                          ) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        高解像度出力用の画像を、上から順に横一列分のタイル (帯) ごとに生成して返すジェネレーターです。
+
+        スーパーサンプリング解像度の画像全体を一度に確保せず、出力画像を `OUTPUT_TILE_PX` 四方のタイルに分け、
+        タイルごとに「スーパーサンプリング解像度で計算 → 着色 → 整数演算の平均で縮小して帯へ書き込み」を行い、
+        タイルの中間データはすぐに破棄します。帯が埋まるたびに呼び出し側へ渡すため、ファイルへ逐次書き込む
+        呼び出し側 (export.streaming_writers 参照) では出力画像全体も確保されません。
+        各タイルの計算はプラグインの並列カーネルで全コアを使用します。
+        画像全体の統計をタイルごとに集計できるカラーリング (`requires_frame_statistics` が True) の場合は、
+        1パス目でタイルごとに統計を集計し (`_accumulate_frame_statistics`)、2パス目の各タイルの着色にその統計を渡します。
+        集計できない画像全体の統計を使うカラーリング (`requires_full_frame` が True) の場合は、タイルの継ぎ目が出ないよう
+        画像全体を1枚のタイル (帯) として処理します。
+
+        Args:
+            output_width (int): 出力画像の幅 (ピクセル)。
+            output_height (int): 出力画像の高さ (ピクセル)。
+            common_params_override (dict): 共通パラメータの上書き。
+            fractal_plugin_name_override (str | None, optional): 使用するフラクタルプラグイン名。
+            fractal_plugin_params_override (dict | None, optional): フラクタルプラグインのパラメータの上書き。
+            coloring_algo_name_override (str | None, optional): 使用するカラーリングプラグイン名。
+            coloring_algo_params_override (dict | None, optional): カラーリングのパラメータの上書き。
+            color_pack_name_override (str | None, optional): カラーパック名。
+            color_map_name_override (str | None, optional): カラーマップ名。
+            palette_offset_override (float | None, optional): パレットの循環位置 (カラーマップ1周分を 1.0 とする割合)。
+                None の場合は表示中の palette_offset を使用します。
+            antialiasing_level (str, optional): "なし", "2x2 SSAA", "3x3 SSAA", "4x4 SSAA", "Adaptive" のいずれか。
+                "Adaptive" は等倍で描画したうえで、境界付近のピクセルだけを再サンプリングします
+                (`_render_adaptive_tile` 参照)。
+            cancel_token (CancelToken | None, optional): タイルごとに確認するキャンセルトークン。
+            progress_callback (Callable[[float], None] | None, optional): タイルを処理するたびに進捗 (0.0-1.0) を受け取る関数。
+        Yields:
+            tuple[int, np.ndarray]: (帯の先頭行, RGBA形式の帯 (帯の高さ x 出力幅 x 4, uint8))。帯は毎回新しく確保されます。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+            RuntimeError: タイルの計算または着色に失敗した場合。
+        """
+        self.logger.log(f"高解像度出力開始 - ターゲット: {output_width}x{output_height}, AA: {antialiasing_level}", level="INFO")
+        try:
+            (final_common_params, active_fractal_plugin, final_fractal_plugin_params, active_coloring_plugin, final_coloring_algo_params, final_color_map_data, final_palette_offset, aa_factor, ss_width, ss_height) = self._prepare_output_parameters(
+                output_width, output_height, common_params_override, fractal_plugin_name_override, fractal_plugin_params_override, coloring_algo_name_override, coloring_algo_params_override, color_pack_name_override, color_map_name_override, palette_offset_override, antialiasing_level)
+            self.logger.log(f"  - スーパーサンプリング解像度: {ss_width}x{ss_height} (AA係数: {aa_factor})", level="DEBUG")
+            self.logger.log(f"  - フラクタルプラグイン: {active_fractal_plugin.name}, パラメータ: {final_fractal_plugin_params}", level="DEBUG")
+            self.logger.log(f"  - カラーリングプラグイン: {active_coloring_plugin.name}, パラメータ: {final_coloring_algo_params}", level="DEBUG")
+            self.logger.log(f"  - カラーマップ: {color_pack_name_override}/{color_map_name_override}, パレットの循環位置: {final_palette_offset:.3f}", level="DEBUG")
+            self.logger.log(f"  - 計算用共通パラメータ: 中心=({final_common_params['center_real']:.4f},{final_common_params['center_imag']:.4f}), 幅={final_common_params['width']:.3e}, 高さ(複素)={final_common_params['height']:.3e}, 反復={final_common_params['max_iterations']}", level="DEBUG")
+
+            adaptive = antialiasing_level == self.ADAPTIVE_AA_LEVEL
+            if active_coloring_plugin.requires_full_frame:
+                tile_px = max(output_width, output_height)
+                self.logger.log(f"  - カラーリング '{active_coloring_plugin.name}' は画像全体の統計を使用するため、タイル分割せずに処理します。", level="INFO")
+                if adaptive:
+                    # 再サンプリングした点だけを着色すると正規化の基準が変わるため、一様なスーパーサンプリングにする
+                    adaptive = False
+                    aa_factor = self.ADAPTIVE_AA_GRID
+                    self.logger.log(f"  - 適応型アンチエイリアスの代わりに {aa_factor}x{aa_factor} SSAA を使用します。", level="INFO")
+            else:
+                tile_px = self.OUTPUT_TILE_PX
+            tiles = self._output_tiles(output_width, output_height, tile_px)
+            self.logger.log(f"  - タイル数: {len(tiles)} (一辺 {tile_px}px)", level="DEBUG")
+
+            render_args = (final_common_params, active_fractal_plugin, final_fractal_plugin_params,
+                           active_coloring_plugin, final_coloring_algo_params, final_color_map_data, final_palette_offset)
+            output_size = (output_width, output_height)
+            progress_start, progress_span = 0.0, 1.0
+            if active_coloring_plugin.requires_frame_statistics and not active_coloring_plugin.requires_full_frame:
+                # 1パス目: 画像全体の統計をタイルごとに集計する (進捗の前半)。適応型 (aa_factor 1) では等倍の格子の統計を使う
+                self.logger.log(f"  - カラーリング '{active_coloring_plugin.name}' の画像全体の統計をタイルごとに集計します。", level="DEBUG")
+                stats_progress = (lambda fraction: progress_callback(fraction / 2)) if progress_callback is not None else None
+                frame_statistics = self._accumulate_frame_statistics(
+                    tiles, output_size, aa_factor, render_args, cancel_token, stats_progress)
+                render_args = (dict(final_common_params, frame_statistics=frame_statistics),) + render_args[1:]
+                progress_start, progress_span = 0.5, 0.5
+            rng = np.random.default_rng(0)  # 同じ設定なら同じ画像になるよう乱数を固定
+            refined_px = 0
+            band = None
+            for tile_index, (y0, y1, x0, x1) in enumerate(tiles):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                if band is None:
+                    band = np.empty((y1 - y0, output_width, 4), dtype=np.uint8)
+                output_tile = band[:, x0:x1]
+                # ロックはタイルごとに取り、タイルの合間には表示用の描画やサムネイルの描画を進められるようにする
+                with self.kernel_lock:
+                    if adaptive:
+                        tile_refined = self._render_adaptive_tile(output_tile, (y0, y1, x0, x1), output_size, render_args, rng)
+                        if tile_refined is None:
+                            raise RuntimeError(f"タイル {(y0, y1, x0, x1)} の描画に失敗しました。")
+                        refined_px += tile_refined
+                    elif not self._render_supersampled_tile(output_tile, (y0, y1, x0, x1), output_size, aa_factor, render_args):
+                        raise RuntimeError(f"タイル {(y0, y1, x0, x1)} の描画に失敗しました。")
+                if progress_callback is not None:
+                    progress_callback(progress_start + progress_span * (tile_index + 1) / len(tiles))
+                if x1 == output_width:  # 横一列分のタイルが揃ったら帯を渡す
+                    yield y0, band
+                    band = None
+
+            if adaptive:
+                self.logger.log(f"  - 適応型アンチエイリアス: {refined_px} / {output_width * output_height} px を再サンプリング", level="DEBUG")
+            self.logger.log(f"高解像度画像が正常に生成されました ({output_width}x{output_height})。", level="INFO")
+        except RenderCancelledError:
+            self.logger.log("高解像度出力がキャンセルされました。", level="INFO")
+            raise
+
     def generate_image_for_output(self, output_width: int, output_height: int,
                                   common_params_override: dict,
                                   fractal_plugin_name_override: str | None = None,
@@ -577,30 +1458,86 @@ class FractalEngine:
                                   coloring_algo_params_override: dict | None = None,
                                   color_pack_name_override: str | None = None,
                                   color_map_name_override: str | None = None,
-                                  antialiasing_level: str = "なし"
+                                  palette_offset_override: float | None = None,
+                                  antialiasing_level: str = "なし",
+                                  cancel_token: CancelToken | None = None,
+                                  progress_callback=None
                                   ) -> np.ndarray | None:
-        self.logger.log(f"高解像度出力開始 - ターゲット: {output_width}x{output_height}, AA: {antialiasing_level}", level="INFO")
+        """
+        高解像度出力用の画像全体を生成します。
+
+        `iter_output_bands` が返す帯を1枚の画像に組み立てます。ファイルへ保存するだけなら、
+        画像全体を確保しない `iter_output_bands` を直接使用してください。引数は `iter_output_bands` と同じです。
+
+        Returns:
+            np.ndarray | None: RGBA形式 (高さ x 幅 x 4, uint8) の画像。失敗した場合はNone。
+        Raises:
+            RenderCancelledError: cancel_token によって中断された場合。
+        """
         try:
-            (final_common_params, active_fractal_plugin, final_fractal_plugin_params, active_coloring_plugin, final_coloring_algo_params, final_color_map_data, aa_factor, ss_width, ss_height) = self._prepare_output_parameters(
-                output_width, output_height, common_params_override, fractal_plugin_name_override, fractal_plugin_params_override, coloring_algo_name_override, coloring_algo_params_override, color_pack_name_override, color_map_name_override, antialiasing_level)
-            self.logger.log(f"  - スーパーサンプリング解像度: {ss_width}x{ss_height} (AA係数: {aa_factor})", level="DEBUG")
-            self.logger.log(f"  - フラクタルプラグイン: {active_fractal_plugin.name}, パラメータ: {final_fractal_plugin_params}", level="DEBUG")
-            self.logger.log(f"  - カラーリングプラグイン: {active_coloring_plugin.name}, パラメータ: {final_coloring_algo_params}", level="DEBUG")
-            self.logger.log(f"  - カラーマップ: {color_pack_name_override}/{color_map_name_override}", level="DEBUG")
-            self.logger.log(f"  - 計算用共通パラメータ: 中心=({final_common_params['center_real']:.4f},{final_common_params['center_imag']:.4f}), 幅={final_common_params['width']:.3e}, 高さ(複素)={final_common_params['height']:.3e]}, 反復={final_common_params['max_iterations']}", level="DEBUG")
-            fractal_data_ss = self._compute_fractal_for_output(active_fractal_plugin, final_fractal_plugin_params, final_common_params, ss_width, ss_height)
-            if fractal_data_ss is None:
-                return None
-            colored_image_ss_rgba = self._apply_coloring_for_output(active_coloring_plugin, final_coloring_algo_params, final_common_params, fractal_data_ss, final_color_map_data)
-            if colored_image_ss_rgba is None:
-                return None
-            downsampled_image_rgba = self._downsample_image(colored_image_ss_rgba, output_width, output_height, aa_factor)
-            self.logger.log(f"高解像度画像が正常に生成されました ({output_width}x{output_height})。", level="INFO")
-            return downsampled_image_rgba
+            output_image = np.empty((output_height, output_width, 4), dtype=np.uint8)
+            for y0, band in self.iter_output_bands(
+                    output_width, output_height, common_params_override,
+                    fractal_plugin_name_override, fractal_plugin_params_override,
+                    coloring_algo_name_override, coloring_algo_params_override,
+                    color_pack_name_override, color_map_name_override, palette_offset_override,
+                    antialiasing_level, cancel_token, progress_callback):
+                output_image[y0:y0 + band.shape[0]] = band
+            return output_image
+        except RenderCancelledError:
+            raise
         except Exception as e:
             self.logger.log(f"generate_image_for_output中にエラー: {e}", level="ERROR")
             return None
 
+    def color_points_for_output(self, real_coords: np.ndarray, imag_coords: np.ndarray,
+                                common_params_override: dict,
+                                fractal_plugin_name_override: str | None = None,
+                                fractal_plugin_params_override: dict | None = None,
+                                coloring_algo_name_override: str | None = None,
+                                coloring_algo_params_override: dict | None = None,
+                                color_pack_name_override: str | None = None,
+                                color_map_name_override: str | None = None,
+                                palette_offset_override: float | None = None
+                                ) -> np.ndarray | None:
+        """
+        格子に並んでいない任意の点を、出力と同じプラグイン・パラメータで計算して着色します。
+
+        ズーム動画の指数マップ (export.zoom_movie 参照) のように、複素平面上の点を独自に並べて描画する場合に使います。
+        点ごとに独立して色が決まるカラーリングでなければならないため、画像全体の統計を使うカラーリング
+        (`requires_full_frame`, `requires_frame_statistics`) と、ピクセルの大きさを前提とする距離推定のカラーリング (`requires_distance_estimate`)
+        には対応しません。引数の上書きは `iter_output_bands` と同じです。
+
+        Args:
+            real_coords (np.ndarray): 各点の実部 (任意の形状, float64)。
+            imag_coords (np.ndarray): 各点の虚部 (real_coords と同じ形状, float64)。
+        Returns:
+            np.ndarray | None: RGBA形式 (real_coords の形状 x 4, uint8) の色。フラクタルプラグインが任意の点の計算
+                               (`compute_points`) に対応していないか、カラーリングが上記の条件を満たさない場合は None。
+        Raises:
+            ValueError: プラグインが解決できない場合。
+            RuntimeError: 計算または着色に失敗した場合。
+        """
+        (common_params, fractal_plugin, fractal_params, coloring_plugin, coloring_params, color_map_data, palette_offset,
+         _, _, _) = self._prepare_output_parameters(
+            1, 1, common_params_override, fractal_plugin_name_override, fractal_plugin_params_override,
+            coloring_algo_name_override, coloring_algo_params_override, color_pack_name_override,
+            color_map_name_override, palette_offset_override, "なし")
+        if (coloring_plugin.requires_full_frame or coloring_plugin.requires_frame_statistics
+                or coloring_plugin.requires_distance_estimate):
+            self.logger.log(f"カラーリング '{coloring_plugin.name}' は点ごとに色を決められないため、任意の点の着色に対応しません。", level="DEBUG")
+            return None
+        with self.kernel_lock:
+            point_data = fractal_plugin.compute_points(common_params, fractal_params, real_coords, imag_coords)
+            if point_data is None:
+                self.logger.log(f"'{fractal_plugin.name}' は任意の点の計算に対応していません。", level="DEBUG")
+                return None
+            rgba = self._apply_coloring_for_output(coloring_plugin, coloring_params, common_params, point_data, color_map_data, palette_offset)
+            if rgba is None:
+                raise RuntimeError("任意の点の着色に失敗しました。")
+        return rgba
+
+
     # --- 設定の保存/読み込み ---
     def save_settings(self) -> dict:
         """現在のエンジンの設定を辞書としてシリアライズします。"""
@@ -709,21 +1646,22 @@ class FractalEngine:
 if __name__ == '__main__':
     # テストには、CWDからの相対的なデフォルトの場所にプラグインとカラーパックが必要です
     # 例: CWD = プロジェクトルートの場合、"src/app/plugins/fractals" のようなパスが有効です。
-    self.logger.log("FractalEngine (generate_image_for_output を含む) スタンドアロンテスト", level="INFO")
+    logger = CustomLogger()
+    logger.log("FractalEngine (generate_image_for_output を含む) スタンドアロンテスト", level="INFO")
     # スタンドアロンテストの場合、CWDがプロジェクトルートであると仮定します
     test_project_root = Path.cwd()
-    self.logger.log(f"  テスト用のプロジェクトルート: {test_project_root}", level="INFO")
+    logger.log(f"  テスト用のプロジェクトルート: {test_project_root}", level="INFO")
     engine = FractalEngine(project_root_path=test_project_root, image_width_px=80, image_height_px=60) # 画面表示用の小さなデフォルト値
 
     if not engine.get_active_fractal_plugin() or not engine.get_active_coloring_plugin('divergent'): # 発散部を確認
-        self.logger.log("デフォルトプラグインが読み込まれていません。パスまたはプラグインの可用性を確認してください。テストを完全に続行できません。", level="WARNING")
+        logger.log("デフォルトプラグインが読み込まれていません。パスまたはプラグインの可用性を確認してください。テストを完全に続行できません。", level="WARNING")
     else:
-        self.logger.log(f"アクティブなフラクタルプラグイン: {engine.get_active_fractal_plugin().name}", level="INFO")
+        logger.log(f"アクティブなフラクタルプラグイン: {engine.get_active_fractal_plugin().name}", level="INFO")
         active_coloring_div = engine.get_active_coloring_plugin('divergent')
         if active_coloring_div:
-            self.logger.log(f"アクティブな発散部カラーリングプラグイン: {active_coloring_div.name}", level="INFO")
+            logger.log(f"アクティブな発散部カラーリングプラグイン: {active_coloring_div.name}", level="INFO")
         cp_div, cm_div = engine.get_current_color_map_selection('divergent')
-        self.logger.log(f"アクティブな発散部カラーマップ: {cp_div} - {cm_div}", level="INFO")
+        logger.log(f"アクティブな発散部カラーマップ: {cp_div} - {cm_div}", level="INFO")
 
         output_params = {
             'max_iterations': 200, # 出力用の反復回数を上書き
@@ -731,7 +1669,7 @@ if __name__ == '__main__':
         }
 
         # 高解像度出力のテスト
-        self.logger.log("\n160x120 画像を 2x2 SSAA で生成中...", level="INFO")
+        logger.log("\n160x120 画像を 2x2 SSAA で生成中...", level="INFO")
         output_image = engine.generate_image_for_output(
             output_width=160, output_height=120,
             common_params_override=output_params,
@@ -739,13 +1677,110 @@ if __name__ == '__main__':
             antialiasing_level="2x2 SSAA"
         )
         if output_image is not None:
-            self.logger.log(f"  出力画像が生成されました。形状: {output_image.shape}, Dtype: {output_image.dtype}", level="INFO")
+            logger.log(f"  出力画像が生成されました。形状: {output_image.shape}, Dtype: {output_image.dtype}", level="INFO")
             assert output_image.shape == (120, 160, 4)
             # import matplotlib.pyplot as plt # 必要に応じて視覚的な確認用
             # plt.imshow(output_image); plt.show()
         else:
-            self.logger.log("  高解像度画像の生成に失敗しました。", level="ERROR")
+            logger.log("  高解像度画像の生成に失敗しました。", level="ERROR")
+
+    # --- 回帰チェック (ヘッドレス) ---
+    # 最適化した経路が、素朴に計算した場合と同じ結果になることを確認します。
+    check_engine = FractalEngine(project_root_path=test_project_root, image_width_px=200, image_height_px=150)
+
+    # 合成: 発散部・非発散部を1回ずつ着色して合成した画像は、それぞれを画像全体に適用してマスクで選んだ画像と一致する
+    check_data = check_engine.compute_current_fractal()
+    composed = check_engine.compose_colored_image()
+    divergent_rgba = check_engine.apply_coloring('divergent')
+    non_divergent_rgba = check_engine.apply_coloring('non_divergent')
+    assert np.array_equal(composed, np.where(np.asarray(check_data['is_diverged'])[..., None], divergent_rgba, non_divergent_rgba))
+    logger.log("回帰チェック: 合成した着色 == ターゲットごとの着色", level="INFO")
+
+    def same_fractal_data(a: dict, b: dict) -> bool:
+        """反復回数と最終Zがビット単位で一致するかを返します。"""
+        return all(np.array_equal(np.asarray(a[key]), np.asarray(b[key])) for key in ('iterations', 'last_z_real', 'last_z_imag'))
+
+    # パン: キャッシュをずらして新しく見える帯だけを計算した結果は、移動後のビューを全体計算した結果と一致する
+    check_pixel_w = check_engine.width / check_engine.image_width_px
+    check_pixel_h = check_engine.height / check_engine.image_height_px
+    for shift_x, shift_y in ((-13, 9), (7, -3), (0, 40)):
+        check_engine.pan_view(check_engine.center_real + shift_x * check_pixel_w, check_engine.center_imag + shift_y * check_pixel_h)
+        panned = dict(check_engine.compute_current_fractal(reuse_cache=True))
+        assert same_fractal_data(panned, check_engine.compute_current_fractal()), f"パン ({shift_x}, {shift_y}) の結果が全体計算と一致しません"
+    logger.log("回帰チェック: パンの部分計算 == 全体計算", level="INFO")
+
+    # 帯ごとの計算: キャンセル確認のために帯に分けて計算した結果は、全体を一度に計算した結果と一致する
+    assert same_fractal_data(check_engine.compute_current_fractal(cancel_token=CancelToken()), check_engine.compute_current_fractal())
+    logger.log("回帰チェック: 帯ごとの計算 == 全体計算", level="INFO")
+
+    # キャンセル: 途中でキャンセルされた計算はキャッシュを変更しない
+    class CancelAfterChecks(CancelToken):
+        """指定した回数だけ確認を通過させた後にキャンセルされるトークン。"""
+        def __init__(self, checks: int):
+            super().__init__()
+            self.remaining_checks = checks
+
+        def raise_if_cancelled(self):
+            self.remaining_checks -= 1
+            if self.remaining_checks < 0:
+                self.cancel()
+            super().raise_if_cancelled()
+
+    for reuse_cache in (False, True):
+        cached_data, cached_view = check_engine.last_fractal_data_cache, check_engine._cache_view
+        if reuse_cache:
+            check_engine.pan_view(check_engine.center_real + 5 * check_pixel_w, check_engine.center_imag + 5 * check_pixel_h)
+        try:
+            check_engine.compute_current_fractal(reuse_cache=reuse_cache, cancel_token=CancelAfterChecks(1))
+            raise AssertionError("計算がキャンセルされませんでした")
+        except RenderCancelledError:
+            pass
+        assert check_engine.last_fractal_data_cache is cached_data and check_engine._cache_view is cached_view
+    logger.log("回帰チェック: キャンセルされた計算はキャッシュを変更しない", level="INFO")
+
+    # 原点対称: 中心が原点のジュリア集合を帯ごとに計算する場合 (上半分だけ計算して複製) も全体計算と一致する
+    if check_engine.set_active_fractal_plugin('Julia'):
+        check_engine.set_common_parameters(0.0, 0.0, 3.0, 150)
+        for width_px, height_px in ((200, 150), (201, 151)):
+            check_engine.update_image_size(width_px, height_px)
+            assert same_fractal_data(check_engine.compute_current_fractal(cancel_token=CancelToken()), check_engine.compute_current_fractal())
+        logger.log("回帰チェック: 原点対称の帯ごとの計算 == 全体計算", level="INFO")
+
+    # タイル分割: スーパーサンプリングの出力をタイルごとに計算した画像は、画像全体を1枚のタイルとした画像と一致する
+    check_engine.set_active_fractal_plugin('Mandelbrot')
+    output_override = {'center_real': -0.75, 'center_imag': 0.1, 'width': 2.7, 'max_iterations': 150}
+    for aa_level in ("2x2 SSAA", "3x3 SSAA"):
+        check_engine.OUTPUT_TILE_PX = 64  # 端に半端なタイルができる大きさ
+        tiled_image = check_engine.generate_image_for_output(300, 200, output_override, antialiasing_level=aa_level)
+        check_engine.OUTPUT_TILE_PX = 300
+        untiled_image = check_engine.generate_image_for_output(300, 200, output_override, antialiasing_level=aa_level)
+        assert tiled_image is not None and np.array_equal(tiled_image, untiled_image), f"{aa_level} のタイル分割の結果が一致しません"
+    # 画像全体の統計を使うカラーリングも、タイルごとに集計した統計で着色すればタイル分割なしと一致する
+    previous_coloring_name = check_engine.get_active_coloring_plugin('divergent').name
+    if check_engine.set_active_coloring_plugin('ヒストグラム均等化', target_type='divergent'):
+        check_engine.OUTPUT_TILE_PX = 64
+        tiled_image = check_engine.generate_image_for_output(300, 200, output_override, antialiasing_level="2x2 SSAA")
+        check_engine.OUTPUT_TILE_PX = 300
+        untiled_image = check_engine.generate_image_for_output(300, 200, output_override, antialiasing_level="2x2 SSAA")
+        assert tiled_image is not None and np.array_equal(tiled_image, untiled_image), "ヒストグラム均等化のタイル分割の結果が一致しません"
+        check_engine.set_active_coloring_plugin(previous_coloring_name, target_type='divergent')
+    del check_engine.OUTPUT_TILE_PX
+    logger.log("回帰チェック: タイルごとのスーパーサンプリング == タイル分割なし", level="INFO")
+
+    # パレットの循環: 出力にも表示と同じ循環位置が反映される (発散部のピクセルを比較)
+    check_engine.update_image_size(300, 200)
+    check_engine.set_common_parameters(**output_override)
+    check_engine.set_palette_offset(0.3)
+    check_data = check_engine.compute_current_fractal()
+    composed = check_engine.compose_colored_image()
+    output_image = check_engine.generate_image_for_output(300, 200, output_override)
+    check_diverged = np.asarray(check_data['is_diverged'])
+    assert np.array_equal(output_image[check_diverged], composed[check_diverged]), "出力にパレットの循環位置が反映されていません"
+    unshifted_image = check_engine.generate_image_for_output(300, 200, output_override, palette_offset_override=0.0)
+    assert not np.array_equal(unshifted_image[check_diverged], output_image[check_diverged])
+    check_engine.set_palette_offset(0.0)
+    logger.log("回帰チェック: 出力のパレットの循環 == 表示のパレットの循環", level="INFO")
 
     # TODO: save_settings と load_settings のテストを実装したらここに追加
 
-    self.logger.log("\nFractalEngine テストが完了しました。", level="INFO")
+    logger.log("\nFractalEngine テストが完了しました。", level="INFO")
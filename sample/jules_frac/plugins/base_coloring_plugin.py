@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import numpy as np
+from coloring.color_manager import grayscale_lut
 
 class ColoringAlgorithmPlugin(ABC):
     """
@@ -22,6 +23,74 @@ class ColoringAlgorithmPlugin(ABC):
         """
         return 'divergent'
 
+    @property
+    def z_precision(self) -> str:
+        """
+        このカラーリングプラグインが必要とする最終Z値の精度を示します。
+        'float32': 単精度で十分 (|Z| や偏角から色を決める場合など)。計算結果のキャッシュが小さくなります。
+        'float64': 倍精度が必要。
+        デフォルトは安全側の 'float64' です。
+        """
+        return 'float64'
+
+    @property
+    def requires_full_frame(self) -> bool:
+        """
+        色の決定に画像全体の統計 (最小値・最大値など) を使う場合は True を返すようオーバーライドします。
+        True の場合、高解像度出力は画像をタイルに分割せず、全体を一度に着色します
+        (タイルごとに統計が変わって継ぎ目が出るのを防ぐため)。デフォルトは False です。
+        """
+        return False
+
+    @property
+    def requires_frame_statistics(self) -> bool:
+        """
+        色の決定に画像全体の統計を使い、その統計をタイルごとに集計できる場合は True を返すようオーバーライドします。
+        True の場合、高解像度出力は1パス目でタイルごとに accumulate_frame_statistics を呼んで画像全体の統計を集計し、
+        2パス目のタイルごとの着色で共通パラメータ 'frame_statistics' として渡します (requires_full_frame と違い、
+        画像全体を一度に確保しません)。デフォルトは False です。
+        """
+        return False
+
+    def accumulate_frame_statistics(self, fractal_data: dict, common_fractal_params: dict,
+                                    algorithm_params: dict, statistics: object | None) -> object:
+        """
+        requires_frame_statistics が True の場合に、1枚のタイルの統計をそれまでの統計に加えて返すようオーバーライドします。
+        すべてのタイルを加えた結果は、画像全体から求めた統計と一致しなければなりません。
+
+        引数:
+            fractal_data (dict): タイルのフラクタル計算結果 (apply_coloring と同じ形式)。
+            common_fractal_params (dict): apply_coloring と同じ。
+            algorithm_params (dict): apply_coloring と同じ。
+            statistics (object | None): それまでのタイルの統計。最初のタイルでは None。
+        戻り値:
+            object: このタイルを加えた統計。
+        """
+        raise NotImplementedError(f"{self.name} は画像全体の統計の集計に対応していません。")
+
+    @property
+    def requires_distance_estimate(self) -> bool:
+        """
+        外部距離推定 ('distance_estimate': 集合までの距離の推定値, ピクセル単位) を使う場合は True を返すようオーバーライドします。
+        True の場合、エンジンはフラクタルプラグインに共通パラメータ 'distance_estimate' を渡して計算を依頼します。
+        対応していないフラクタルプラグインの計算結果にはこのキーが含まれません。デフォルトは False です。
+        """
+        return False
+
+    def distance_estimate_early_out_px(self, algorithm_params: dict) -> float:
+        """
+        距離推定がこの値 (ピクセル) 以上の点をすべて同じ色で塗る場合に、その値を返すようオーバーライドします。
+        正の値を返すと、フラクタルプラグインは距離推定がこの値以上と保証できるタイルの反復を省略し、
+        タイル内の点に距離推定の下限を書き込むことがあります (反復回数と最終Zはタイル中央の点の値になります)。
+        発散部のカラーリングの値だけが使われます。デフォルトは 0.0 (省略しない) です。
+
+        引数:
+            algorithm_params (dict): このカラーリングアルゴリズム固有のパラメータ。
+        戻り値:
+            float: 距離推定のしきい値 (ピクセル)。
+        """
+        return 0.0
+
     @abstractmethod
     def get_parameters_definition(self) -> list:
         """
@@ -37,7 +106,7 @@ class ColoringAlgorithmPlugin(ABC):
         fractal_data: dict,
         common_fractal_params: dict,
         algorithm_params: dict,
-        color_map_data: list[tuple[int, int, int]] | None # カラーマップはオプション
+        color_map_data: np.ndarray | list[tuple[int, int, int]] | None # カラーマップはオプション
     ) -> np.ndarray:
         """
         指定されたデータとカラーマップを使用してカラーリングを適用し、
@@ -57,20 +126,112 @@ class ColoringAlgorithmPlugin(ABC):
                 主なキー:
                     'max_iterations': int
                     'escape_radius': float
+                    'frame_statistics': object - 高解像度出力のタイルの着色で、accumulate_frame_statistics で
+                        集計した画像全体の統計 (requires_frame_statistics が True の場合のみ)
                     # 他、必要に応じてエンジンから渡される共通設定値
 
             algorithm_params (dict): このカラーリングアルゴリズム固有のパラメータ。
                                     get_parameters_definitionで定義された 'name' がキー。
 
-            color_map_data (list[tuple[int, int, int]] | None):
-                使用するカラーマップの色データのリスト。各要素は(R, G, B)のタプル (0-255)。
-                カラーマップを使用しないアルゴリズムの場合は無視されるか、Noneまたは空リストが渡される。
+            color_map_data (np.ndarray | list[tuple[int, int, int]] | None):
+                使用するカラーマップの色データ。エンジンからは ColorManager.get_color_map_lut の
+                (N,4) uint8 配列 (読み取り専用) が渡されるため、np.asarray でコピーせずに使用できる。
+                (R, G, B) / (R, G, B, A) タプルのリストも受け付けること。真偽値ではなく
+                `is None` と len() で有無を判定すること。
+                カラーマップを使用しないアルゴリズムの場合は無視されるか、Noneまたは空が渡される。
 
         戻り値:
             numpy.ndarray: RGBAカラーデータのNumPy配列 (形状: 高Hx幅Wx4, dtype=np.uint8)。
         """
         pass
 
+    def apply_coloring_masked(
+        self,
+        fractal_data: dict,
+        common_fractal_params: dict,
+        algorithm_params: dict,
+        color_map_data: np.ndarray | list[tuple[int, int, int]] | None,
+        mask: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """
+        マスクが True のピクセルだけを着色し、共有の出力バッファへ直接書き込みます。
+
+        発散部と非発散部を1枚のバッファに合成する際に使用します。マスク外のピクセルには
+        書き込みません。既定の実装は apply_coloring で全体を着色してからマスク部分を
+        コピーするため、各プラグインはマスク対応のカーネルでこのメソッドを上書きすることで
+        全画面分の中間バッファと着色処理を省略できます。
+
+        引数:
+            fractal_data (dict): apply_coloring と同じ。
+            common_fractal_params (dict): apply_coloring と同じ。
+            algorithm_params (dict): apply_coloring と同じ。
+            color_map_data (np.ndarray | list[tuple[int, int, int]] | None): apply_coloring と同じ。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列 (形状: 高Hx幅W)。
+            out (np.ndarray): 書き込み先のRGBAバッファ (形状: 高Hx幅Wx4, dtype=np.uint8)。
+        """
+        colored = self.apply_coloring(fractal_data, common_fractal_params, algorithm_params, color_map_data)
+        out[mask] = colored[mask]
+
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """
+        パレット座標には影響せず、palette_mapping だけで使うパラメータ名の集合です。
+        これらのパラメータやカラーマップだけが変わった場合、エンジンはパレット座標を再計算せずに色を引き直します。
+        デフォルトは空の集合です。
+        """
+        return frozenset()
+
+    def compute_palette_coordinates_masked(
+        self,
+        fractal_data: dict,
+        common_fractal_params: dict,
+        algorithm_params: dict,
+        mask: np.ndarray,
+        out_coords: np.ndarray
+    ) -> bool:
+        """
+        mask が True のピクセルの「パレット座標」を out_coords に書き込みます。
+
+        パレット座標はカラーマップに依存しない各ピクセルの値で、palette_mapping が返すスケールを掛けると
+        カラーマップ上の位置になります。NaN の点は黒で塗られます。エンジンはこの座標を計算ごとに1回だけ求めて保持し、
+        カラーマップ・palette_parameters・パレットの循環だけが変わった場合は LUT からの引き直しで再着色します。
+        対応するプラグインは palette_mapping と合わせてオーバーライドし、apply_coloring_masked と同じ色になるようにします。
+
+        引数:
+            fractal_data (dict): apply_coloring と同じ。
+            common_fractal_params (dict): apply_coloring と同じ。
+            algorithm_params (dict): apply_coloring と同じ。
+            mask (np.ndarray): 対象のピクセルを示すブール配列 (形状: 高Hx幅W)。
+            out_coords (np.ndarray): 書き込み先のパレット座標 (形状: 高Hx幅W, dtype=np.float32)。
+
+        戻り値:
+            bool: パレット座標を書き込んだ場合は True。対応していない場合は False (既定の実装)。
+        """
+        return False
+
+    def palette_mapping(
+        self,
+        algorithm_params: dict,
+        color_map_data: np.ndarray | list[tuple[int, int, int]] | None
+    ) -> tuple[np.ndarray, float, bool]:
+        """
+        パレット座標を色に変換するためのカラーマップと写像を返します。
+
+        引数:
+            algorithm_params (dict): apply_coloring と同じ。
+            color_map_data (np.ndarray | list[tuple[int, int, int]] | None): apply_coloring と同じ。
+
+        戻り値:
+            tuple[np.ndarray, float, bool]: (使用するカラーマップの uint8 配列, パレット座標に掛けるスケール,
+                カラーマップを折り返すか)。既定の実装は座標 0-1 をカラーマップの先頭から末尾に割り当て、端で切り詰めます。
+        """
+        if color_map_data is None or len(color_map_data) == 0:
+            color_map_np = grayscale_lut(256)
+        else:
+            color_map_np = np.asarray(color_map_data, dtype=np.uint8)
+        return color_map_np, float(max(color_map_np.shape[0] - 1, 0)), False
+
 if __name__ == '__main__':
     # 簡単なテスト用ダミープラグイン
     class DummyColoringPlugin(ColoringAlgorithmPlugin):
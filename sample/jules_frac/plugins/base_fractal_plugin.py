@@ -1,6 +1,36 @@
 from abc import ABC, abstractmethod
 import numpy as np
 
+
+def pixel_grid(common_params: dict, image_width_px: int, image_height_px: int) -> tuple[float, float, float, float]:
+    """
+    共通パラメータから、ピクセル (y, x) に対応させる複素平面の格子を求めます。
+
+    ピクセル (y, x) は `((x_offset + x) * pixel_width, (y_offset + y) * pixel_height)` に対応します。
+    オフセットは整数または半整数 (半ピクセル単位) で、`中心 - 幅/2` に最も近い半ピクセルの倍数を左下のピクセルとします。
+    座標は整数 (または半整数) とピクセルの大きさの積を1回丸めるだけで求まるため、次の場合に全体を計算した結果と
+    同じ格子点になります:
+        - 画像の一部の矩形だけを計算する場合 (エンジンが 'grid_*' キーで画像全体の格子を明示します)
+        - ピクセル単位でパンした場合 (左下のピクセルのオフセットが整数だけ変わります)
+        - 中心が原点の場合 (列 x と列 `幅px - x` の座標がちょうど符号反転します。utils.symmetry 参照)
+
+    引数:
+        common_params (dict): 共通パラメータ。
+        image_width_px (int): 計算する画像 (矩形) の幅 (ピクセル)。
+        image_height_px (int): 計算する画像 (矩形) の高さ (ピクセル)。
+    戻り値:
+        tuple[float, float, float, float]: (pixel_width, x_offset, pixel_height, y_offset)。
+    """
+    if 'grid_pixel_width' in common_params:
+        return (float(common_params['grid_pixel_width']), float(common_params['grid_offset_x']),
+                float(common_params['grid_pixel_height']), float(common_params['grid_offset_y']))
+    pixel_width = common_params['width'] / image_width_px
+    pixel_height = common_params['height'] / image_height_px
+    x_offset = round(2.0 * (common_params['center_real'] - common_params['width'] / 2.0) / pixel_width) / 2.0
+    y_offset = round(2.0 * (common_params['center_imag'] - common_params['height'] / 2.0) / pixel_height) / 2.0
+    return pixel_width, x_offset, pixel_height, y_offset
+
+
 class FractalPlugin(ABC):
     """
     フラクタルプラグインの抽象基底クラス。
@@ -47,6 +77,15 @@ class FractalPlugin(ABC):
                 'height': float - 描画範囲の高さ (虚数軸方向, アスペクト比から計算)
                 'max_iterations': int - 最大反復回数
                 'escape_radius': float - 発散判定半径
+                画像の一部の矩形を計算する場合、エンジンは以下のキーで画像全体の格子も渡します。
+                プラグインは pixel_grid() で格子を求め、これらのキーを解釈してください:
+                'grid_pixel_width', 'grid_pixel_height': float - 画像全体の1ピクセルの大きさ
+                'grid_offset_x', 'grid_offset_y': float - 矩形の左下のピクセルの格子上の位置
+                距離推定に対応するプラグインは、以下の省略可能なキーも解釈します
+                (ColoringAlgorithmPlugin.requires_distance_estimate 参照):
+                'distance_estimate': bool - True の場合、外部距離推定を 'distance_estimate' キーとして結果に加える
+                'distance_estimate_pixel_size': float - 距離推定の単位とする1ピクセルの大きさ (複素平面の単位)
+                'distance_estimate_early_out_px': float - 距離推定がこの値以上と保証できるタイルの反復を省略してよい
             plugin_params (dict): このプラグイン固有のパラメータ。
                                  get_parameters_definitionで定義された 'name' をキーとする。
             image_width_px (int): 生成画像の幅 (ピクセル単位)
@@ -58,6 +97,9 @@ class FractalPlugin(ABC):
                   'last_zn_values': numpy.ndarray (dtype=np.complex128) - 各ピクセルの最終Z_n値 (複素数)
                   他のキーはプラグインやカラーリングアルゴリズムの要求に応じて追加可能
                   (例: 'last_z_modulus_sq', 'zn_trajectory_real', 'zn_trajectory_imag')
+                  辞書の代わりに plugins.fractal_data.FractalData を返すと、最終Zの実部・虚部だけを保持し、
+                  'last_zn_values', 'last_z_modulus_sq', 'is_diverged' は参照時に導出されるためメモリを節約できます。
+                  エンジンはカラーリングが許す場合に最終Zを float32 に変換してキャッシュします。
         """
         pass
 
@@ -80,6 +122,38 @@ class FractalPlugin(ABC):
         """
         return None
 
+    def compute_points(self, common_params: dict, plugin_params: dict,
+                       real_coords: np.ndarray, imag_coords: np.ndarray) -> dict | None:
+        """
+        格子に並んでいない任意の点を計算する場合にオーバーライドします。
+        適応型アンチエイリアスで、境界付近のピクセル内のサンプル点を計算するために使用します。
+
+        引数:
+            common_params (dict): compute_fractal と同じ共通パラメータ ('max_iterations', 'escape_radius' など)。
+            plugin_params (dict): このプラグイン固有のパラメータ。
+            real_coords (np.ndarray): 各点の実部 (任意の形状, float64)。
+            imag_coords (np.ndarray): 各点の虚部 (real_coords と同じ形状, float64)。
+        戻り値:
+            dict | None: real_coords と同じ形状の配列を持つ、compute_fractal と同じ形式の計算結果。
+                         未対応の場合は None (デフォルト)。呼び出し側は格子での計算にフォールバックします。
+        """
+        return None
+
+    def is_point_symmetric(self, plugin_params: dict) -> bool:
+        """
+        指定したパラメータで、計算結果が原点に関して対称 (点 z と -z で同じ結果) になる場合に
+        True を返すようオーバーライドします。例: 偶数次数 d のジュリア集合 z^d + c。
+
+        True の場合、中心が原点のビューでは画像の下半分を計算せず、上半分から複製します
+        (utils.symmetry 参照)。デフォルトは False です。
+
+        引数:
+            plugin_params (dict): このプラグイン固有のパラメータ。
+        戻り値:
+            bool: 原点対称であれば True。
+        """
+        return False
+
 if __name__ == '__main__':
     # このファイルは直接実行されることを意図していませんが、
     # 簡単なテストやドキュメント確認のために以下のようなコードを書くことはできます。
@@ -0,0 +1,3 @@
+# カラーリングプラグインは PluginManager が divergent / non_divergent フォルダから直接読み込みます。
+# このファイルは、プラグインが共通で使う Numba カーネル (kernels.py) を
+# `plugins.coloring.kernels` としてインポートできるようにするためのものです。
@@ -1,6 +1,4 @@
 import numpy as np
-from numba import jit
-import math
 
 try:
     from plugins.base_coloring_plugin import ColoringAlgorithmPlugin
@@ -29,81 +27,8 @@ except ImportError:
         def log(self, message, level="INFO"): print(f"[{level}] {message}") # ログレベルとメッセージを出力
     logger = PrintLogger()
 
-
-# Numba JITコンパイル済みヘルパー関数
-@jit(nopython=True)
-def _apply_iteration_based_coloring_jit(
-    iterations_array: np.ndarray,
-    max_iters: int,
-    color_map: np.ndarray,
-    color_scale_factor: float
-) -> np.ndarray:
-    """
-    反復回数とカラーマップに基づいてカラーリングを適用するJITコンパイル済み関数。
-
-    Args:
-        iterations_array (np.ndarray): 各点の反復回数を格納した配列。
-        max_iters (int): 最大反復回数。
-        color_map (np.ndarray): 色補間に使用するカラーマップ (形状: (N,3), dtype: uint8)。
-        color_scale_factor (float): 色の変化の速さを調整するスケールファクター。
-    Returns:
-        np.ndarray: RGBA形式のカラーリング済み画像データ。
-    """
-    height, width = iterations_array.shape
-    colored_image_rgba = np.empty((height, width, 4), dtype=np.uint8)
-
-    for r_idx in range(height):
-        for c_idx in range(width):
-            iters = iterations_array[r_idx, c_idx]
-            colored_image_rgba[r_idx, c_idx, 3] = 255  # アルファチャンネル (完全に不透明に設定)
-
-            if iters == max_iters:  # 点は集合内に存在します
-                colored_image_rgba[r_idx, c_idx, 0] = 0  # R
-                colored_image_rgba[r_idx, c_idx, 1] = 0  # G
-                colored_image_rgba[r_idx, c_idx, 2] = 0  # B
-            else: # 点は発散しました
-                if color_map.shape[0] < 2: # カラーマップの色が不足している場合
-                    # デフォルトのグレースケールのような動作（黒から白へ）
-                    gray_value = int((1.0 - (iters / max_iters)) * 255)
-                    gray_value = max(0, min(255, gray_value))
-                    colored_image_rgba[r_idx, c_idx, 0] = np.uint8(gray_value)
-                    colored_image_rgba[r_idx, c_idx, 1] = np.uint8(gray_value)
-                    colored_image_rgba[r_idx, c_idx, 2] = np.uint8(gray_value)
-                else:
-                    # カラーマップを使用
-                    # iters を [0, 1) の範囲に正規化し、スケールを適用
-                    # iters が 0 から max_iters-1 の範囲で変化すると仮定
-                    # (max_iters の場合は既に処理済み)
-                    normalized_iter = iters / max_iters # 0に近いほど早く発散
-
-                    # スムーズなカラーリングと同様のインデックス計算と補間
-                    # (1.0 - normalized_iter) を使うと、早く発散する点がカラーマップの最初の色に近くなる
-                    color_idx_float = (1.0 - normalized_iter) * (color_map.shape[0] -1) * color_scale_factor
-
-                    idx0_floor = math.floor(color_idx_float)
-                    fraction = color_idx_float - idx0_floor
-
-                    c1_idx = int(idx0_floor) % color_map.shape[0]
-                    c2_idx = (int(idx0_floor) + 1) % color_map.shape[0]
-
-                    c1 = color_map[c1_idx]
-                    c2 = color_map[c2_idx]
-                    # RGBA対応: 4要素ならRGBのみ使う
-                    if c1.shape[0] == 4:
-                        c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                        c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-                    else:
-                        c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                        c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-
-                    r_val = c1_r * (1.0 - fraction) + c2_r * fraction
-                    g_val = c1_g * (1.0 - fraction) + c2_g * fraction
-                    b_val = c1_b * (1.0 - fraction) + c2_b * fraction
-
-                    colored_image_rgba[r_idx, c_idx, 0] = np.uint8(max(0.0, min(255.0, r_val)))
-                    colored_image_rgba[r_idx, c_idx, 1] = np.uint8(max(0.0, min(255.0, g_val)))
-                    colored_image_rgba[r_idx, c_idx, 2] = np.uint8(max(0.0, min(255.0, b_val)))
-    return colored_image_rgba
+from plugins.coloring.kernels import iteration_coloring_kernel, iteration_coordinates_kernel
+from coloring.color_manager import grayscale_lut
 
 
 class IterationBasedColoringPlugin(ColoringAlgorithmPlugin):
@@ -116,6 +41,11 @@ class IterationBasedColoringPlugin(ColoringAlgorithmPlugin):
         """カラーリングアルゴリズムの名前を返します。"""
         return "反復回数ベース" # 名前を変更して機能を反映
 
+    @property
+    def z_precision(self) -> str:
+        """反復回数だけを使うため、最終Z値は単精度で十分です。"""
+        return 'float32'
+
     def get_parameters_definition(self) -> list:
         """このカラーリングアルゴリズムに固有の調整可能なパラメータのリストを返します。"""
         return [
@@ -147,31 +77,81 @@ class IterationBasedColoringPlugin(ColoringAlgorithmPlugin):
             fallback_image[:, :, 3] = 255 # アルファチャンネルを不透明に設定
             return fallback_image
 
+        colored_image = np.empty((*iterations.shape, 4), dtype=np.uint8)
+        full_mask = np.ones(iterations.shape, dtype=np.bool_)
+        self._color_into(iterations, common_fractal_params, algorithm_params, color_map_data,
+                         full_mask, colored_image)
+        return colored_image
+
+    def apply_coloring_masked(
+        self,
+        fractal_data: dict,
+        common_fractal_params: dict,
+        algorithm_params: dict,
+        color_map_data: list[tuple[int, int, int]] | None,
+        mask: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """
+        マスクが True のピクセルだけに反復回数ベースのカラーリングを適用し、out に直接書き込みます。
+        """
+        iterations = fractal_data.get('iterations')
+        if iterations is None:
+            logger.log("必須データ 'iterations' が見つかりません。対象ピクセルを黒で塗ります。", level="WARNING")
+            out[mask] = (0, 0, 0, 255)
+            return
+        self._color_into(iterations, common_fractal_params, algorithm_params, color_map_data, mask, out)
+
+    def _color_into(
+        self,
+        iterations: np.ndarray,
+        common_fractal_params: dict,
+        algorithm_params: dict,
+        color_map_data: list[tuple[int, int, int]] | None,
+        mask: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """パラメータとカラーマップを準備し、JIT関数で mask 部分を out に着色します。"""
         max_iters = common_fractal_params.get('max_iterations', 100) # max_iterations が提供されない場合のデフォルト値
 
         color_scale_from_plugin = algorithm_params.get('color_scale', 1.0)
 
-        if not color_map_data or len(color_map_data) < 2:
+        color_map_np = self._prepare_color_map(color_map_data)
+        iteration_coloring_kernel(iterations, mask, out, max_iters, color_map_np, color_scale_from_plugin)
+
+    def _prepare_color_map(self, color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> np.ndarray:
+        """カーネルに渡すカラーマップの uint8 配列を返します。補間に使えない場合は黒から白への2色にします。"""
+        if color_map_data is None or len(color_map_data) < 2:
             logger.log(f"{self.name}: カラーマップが不十分なため、デフォルトのグレースケールマップを使用します。", level="DEBUG")
-            # デフォルトのグレースケールマップ (黒から白へ)
-            # JIT関数内でこのケースを処理するため、ここでは単純な2色マップを渡すか、
-            # JIT関数が color_map.shape[0] < 2 をチェックするようにします。
-            # ここでは、JIT関数が処理しやすいように、有効な（ただし最小限の）グレースケールマップを作成します。
-            # または、JIT関数内で color_map.shape[0] < 2 の場合のフォールバックロジックを強化します。
-            # 現在のJIT関数は color_map.shape[0] < 2 の場合にグレースケール処理を行うため、
-            # ここでは空の配列ではなく、それをトリガーするようなものを渡すか、明示的なフラグを渡す必要があります。
-            # 簡単のため、JIT関数に渡す color_map_np は常に有効な形状とし、JIT内で色数をチェックします。
-            color_map_np = np.array([[0,0,0],[255,255,255]], dtype=np.uint8) # JITが扱う最小限のマップ
-        else:
-            color_map_np = np.array(color_map_data, dtype=np.uint8)
-            # RGBA(4要素)にも対応: shape[1]が3または4ならOK
-            if color_map_np.ndim == 2 and (color_map_np.shape[1] == 3 or color_map_np.shape[1] == 4):
-                pass # OK
-            else:
-                # それ以外は強制的にRGB2色にする
-                color_map_np = np.array([[0,0,0],[255,255,255]], dtype=np.uint8)
-        colored_image = _apply_iteration_based_coloring_jit(iterations, max_iters, color_map_np, color_scale_from_plugin)
-        return colored_image
+            # デフォルトのグレースケールマップ (黒から白へ)。JIT関数に渡すマップは常に有効な形状とする
+            return grayscale_lut(2)
+        # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+        color_map_np = np.asarray(color_map_data, dtype=np.uint8)
+        # RGBA(4要素)にも対応: shape[1]が3または4ならOK
+        if color_map_np.ndim != 2 or (color_map_np.shape[1] != 3 and color_map_np.shape[1] != 4):
+            # それ以外は強制的にグレースケール2色にする
+            return grayscale_lut(2)
+        return color_map_np
+
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """色のスケールはパレット座標に掛けるだけなので、変更時はパレット座標を再計算しません。"""
+        return frozenset({'color_scale'})
+
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """`1 - 反復回数 / 最大反復回数` をパレット座標として書き込みます (集合内の点は NaN)。"""
+        iterations = fractal_data.get('iterations')
+        if iterations is None:
+            return False
+        iteration_coordinates_kernel(iterations, mask, out_coords, common_fractal_params.get('max_iterations', 100))
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> tuple[np.ndarray, float, bool]:
+        """パレット座標 0-1 をカラーマップ全体 x 色のスケールに割り当て、折り返しながら使います。"""
+        color_map_np = self._prepare_color_map(color_map_data)
+        return color_map_np, (color_map_np.shape[0] - 1) * algorithm_params.get('color_scale', 1.0), True
 
 if __name__ == '__main__':
     logger.log("IterationBasedColoringPlugin のテストを開始します...", level="INFO")
@@ -0,0 +1,148 @@
+import numpy as np
+
+from plugins.base_coloring_plugin import ColoringAlgorithmPlugin
+from logger.custom_logger import CustomLogger
+from plugins.coloring.kernels import distance_coordinates_kernel, palette_gather_kernel
+from coloring.color_manager import grayscale_lut
+
+logger = CustomLogger()
+
+
+class DistanceEstimationColoringPlugin(ColoringAlgorithmPlugin):
+    """発散領域を外部距離推定で着色するカラーリングプラグインです。
+
+    集合までの距離の推定値 (ピクセル単位) を、境界の幅に応じてカラーマップの先頭 (境界) から末尾 (遠方) に割り当てます。
+    反復回数ではなく距離で色を決めるため、最大反復回数が小さくても細い繊維状の部分まで一定の太さで描かれます。
+    境界の幅以上離れた点はすべてカラーマップの末尾の色になるため、フラクタルプラグインは遠方のタイルの反復を省略できます。
+    距離推定に対応していないフラクタルプラグインでは、発散部を黒で塗ります。
+    """
+    @property
+    def name(self) -> str:
+        """カラーリングアルゴリズムの名前を返します。"""
+        return "距離推定"
+
+    @property
+    def z_precision(self) -> str:
+        """最終Z値は使わないため、単精度で十分です。"""
+        return 'float32'
+
+    @property
+    def requires_distance_estimate(self) -> bool:
+        """集合までの距離の推定値から色を決めるため、距離推定が必要です。"""
+        return True
+
+    def distance_estimate_early_out_px(self, algorithm_params: dict) -> float:
+        """境界の幅以上離れた点はすべて同じ色になるため、早期打ち切りが有効なら境界の幅を返します。"""
+        if not algorithm_params.get('early_out', 1):
+            return 0.0
+        return float(algorithm_params.get('boundary_width', 2.0))
+
+    def get_parameters_definition(self) -> list:
+        """このカラーリングアルゴリズムに固有の調整可能なパラメータのリストを返します。"""
+        return [
+            {'name': 'boundary_width', 'label': '境界の幅 (px)',
+             'type': 'float', 'default': 2.0, 'range': (0.1, 100.0), 'step': 0.1,
+             'tooltip': '集合からこの距離 (ピクセル) までをカラーマップの先頭から末尾に割り当てます。'},
+            {'name': 'early_out', 'label': '遠方のタイルを省略',
+             'type': 'int', 'default': 1, 'range': (0, 1), 'step': 1,
+             'tooltip': '1 の場合、境界の幅より十分遠いタイルは各点を反復せずに末尾の色で塗ります。'}
+        ]
+
+    def apply_coloring(self, fractal_data: dict, common_fractal_params: dict,
+                       algorithm_params: dict, color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> np.ndarray:
+        """
+        フラクタルデータに距離推定カラーリングを適用します。
+
+        Args:
+            fractal_data (dict): フラクタル計算結果。'iterations' と 'distance_estimate' (ピクセル単位) が必須です。
+            common_fractal_params (dict): フラクタル計算の共通パラメータ。'max_iterations' が期待されます。
+            algorithm_params (dict): このカラーリングアルゴリズム固有のパラメータ。
+            color_map_data (np.ndarray | list[tuple[int,int,int]] | None): 使用するカラーマップ。
+                Noneまたは色数が少ない場合はグレースケールを使用。
+
+        Returns:
+            np.ndarray: RGBA形式のカラーリング済み画像データ。
+        """
+        iterations = fractal_data.get('iterations')
+        if iterations is None:
+            height_px = common_fractal_params.get('image_height_px', 100)
+            width_px = common_fractal_params.get('image_width_px', 100)
+            logger.log("距離推定カラーリングに必要なデータ 'iterations' が見つかりません。黒い画像を返します。", level="WARNING")
+            fallback_img = np.zeros((height_px, width_px, 4), dtype=np.uint8)
+            fallback_img[:, :, 3] = 255
+            return fallback_img
+
+        colored_image = np.empty((*iterations.shape, 4), dtype=np.uint8)
+        full_mask = np.ones(iterations.shape, dtype=np.bool_)
+        self.apply_coloring_masked(fractal_data, common_fractal_params, algorithm_params, color_map_data,
+                                   full_mask, colored_image)
+        return colored_image
+
+    def apply_coloring_masked(self, fractal_data: dict, common_fractal_params: dict, algorithm_params: dict,
+                              color_map_data: np.ndarray | list[tuple[int,int,int]] | None,
+                              mask: np.ndarray, out: np.ndarray) -> None:
+        """
+        マスクが True のピクセルだけに距離推定カラーリングを適用し、out に直接書き込みます。
+        パレット座標を求めてからカラーマップで色に変換します。
+        """
+        coords = np.empty(mask.shape, dtype=np.float32)
+        if not self.compute_palette_coordinates_masked(fractal_data, common_fractal_params, algorithm_params, mask, coords):
+            logger.log("距離推定カラーリングに必要なデータ 'distance_estimate' が見つかりません。"
+                       "フラクタルプラグインが距離推定に対応していない可能性があります。対象ピクセルを黒で塗ります。", level="WARNING")
+            out[mask] = (0, 0, 0, 255)
+            return
+        color_map_np, scale, wrap = self.palette_mapping(algorithm_params, color_map_data)
+        palette_gather_kernel(coords, mask, out, color_map_np, scale, 0.0, wrap)
+
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """境界の幅はパレット座標 (距離) に掛けるだけなので、変更時はパレット座標を再計算しません。"""
+        return frozenset({'boundary_width'})
+
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """距離推定 (ピクセル単位) をパレット座標として書き込みます (集合内の点は NaN)。"""
+        iterations = fractal_data.get('iterations')
+        distances = fractal_data.get('distance_estimate')
+        if iterations is None or distances is None:
+            return False
+        max_iters = int(common_fractal_params.get('max_iterations', 100))
+        distance_coordinates_kernel(iterations, distances, mask, out_coords, max_iters)
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> tuple[np.ndarray, float, bool]:
+        """距離 0 から境界の幅までをカラーマップの先頭から末尾に割り当て、それより遠い点は末尾の色にします。"""
+        if color_map_data is None or len(color_map_data) < 2:
+            color_map_np = grayscale_lut(256)
+        else:
+            # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+            color_map_np = np.asarray(color_map_data, dtype=np.uint8)
+            if color_map_np.ndim != 2 or color_map_np.shape[1] not in (3, 4):
+                logger.log(f"{self.name}: カラーマップの形状が不正です {color_map_np.shape}。グレースケールを使用します。", level="WARNING")
+                color_map_np = grayscale_lut(256)
+        boundary_width = max(float(algorithm_params.get('boundary_width', 2.0)), 1e-6)
+        return color_map_np, (color_map_np.shape[0] - 1) / boundary_width, False
+
+
+if __name__ == '__main__':
+    from plugins.fractals.mandelbrot_plugin import MandelbrotPlugin
+
+    logger.log("DistanceEstimationColoringPlugin のテストを開始します...", level="INFO")
+    plugin = DistanceEstimationColoringPlugin()
+    default_params = {p['name']: p['default'] for p in plugin.get_parameters_definition()}
+
+    # 最大反復回数が小さくても、境界付近だけがカラーマップの先頭側の色になることを確認する
+    h, w = 120, 160
+    common = {'center_real': -0.5, 'center_imag': 0.0, 'width': 3.0, 'height': 2.25, 'max_iterations': 50,
+              'distance_estimate': True,
+              'distance_estimate_early_out_px': plugin.distance_estimate_early_out_px(default_params)}
+    test_data = MandelbrotPlugin().compute_fractal(common, {}, w, h)
+    image = plugin.apply_coloring(test_data, common, default_params, None)
+    assert image.shape == (h, w, 4) and image.dtype == np.uint8
+    assert (image[h//2, w//2 + 20, :3] == 0).all()  # 集合内は黒
+    assert (image[2, 2, :3] == 255).all()  # 境界から遠い点は末尾の色 (白)
+    near = test_data['is_diverged'] & (test_data['distance_estimate'] < default_params['boundary_width'])
+    logger.log(f"境界の幅以内の発散点: {int(near.sum())} / {int(test_data['is_diverged'].sum())}", level="INFO")
+    assert near.any()
+    logger.log("DistanceEstimationColoringPlugin のテストが完了しました。", level="INFO")
@@ -0,0 +1,180 @@
+import numpy as np
+
+from plugins.base_coloring_plugin import ColoringAlgorithmPlugin
+from logger.custom_logger import CustomLogger
+from plugins.fractal_data import FractalData
+from plugins.coloring.kernels import (escape_count_cdf, escape_count_cdf_from_histogram, escape_count_histogram,
+                                      histogram_coordinates_kernel, palette_gather_kernel)
+from coloring.color_manager import grayscale_lut
+
+logger = CustomLogger()
+
+
+class HistogramColoringPlugin(ColoringAlgorithmPlugin):
+    """発散領域をヒストグラム均等化で着色するカラーリングプラグインです。
+
+    発散した点の反復回数の累積分布 (CDF) で反復回数を [0, 1] に写すため、各色がほぼ同じ面積を占めます。
+    最大反復回数を大きくしても色が一部の反復回数に偏らず、色のスケールを調整し直す必要がありません。
+    CDF は画像全体から求めます。高解像度出力では1パス目でタイルごとの反復回数のヒストグラムを合計し、
+    2パス目のタイルごとの着色ではそのヒストグラムから求めた CDF を使います。
+    FractalData の場合、CDF は計算結果にメモ化され、再カラーリングでは再計算しません。
+    """
+    @property
+    def name(self) -> str:
+        """カラーリングアルゴリズムの名前を返します。"""
+        return "ヒストグラム均等化"
+
+    @property
+    def z_precision(self) -> str:
+        """端数の補間に使う |Z|^2 は倍精度で組み立てられるため、最終Z値は単精度で十分です。"""
+        return 'float32'
+
+    @property
+    def requires_frame_statistics(self) -> bool:
+        """反復回数の累積分布を画像全体から求めます。ヒストグラムはタイルごとに数えて合計できます。"""
+        return True
+
+    def accumulate_frame_statistics(self, fractal_data: dict, common_fractal_params: dict,
+                                    algorithm_params: dict, statistics: np.ndarray | None) -> np.ndarray:
+        """タイルの反復回数のヒストグラムを、それまでのヒストグラムに加えて返します。"""
+        max_iters = int(common_fractal_params.get('max_iterations', 100))
+        counts = escape_count_histogram(fractal_data['iterations'], max_iters)
+        return counts if statistics is None else statistics + counts
+
+    def get_parameters_definition(self) -> list:
+        """このカラーリングアルゴリズムに固有の調整可能なパラメータのリストを返します。"""
+        return [
+            {'name': 'color_scale', 'label': '色のスケール',
+             'type': 'float', 'default': 1.0, 'range': (0.01, 100.0), 'step': 0.01,
+             'tooltip': '累積分布の 0-1 をカラーマップ何周分に割り当てるかを指定します。'},
+            {'name': 'smooth', 'label': '端数で補間',
+             'type': 'int', 'default': 1, 'range': (0, 1), 'step': 1,
+             'tooltip': '1 の場合、連続的な反復回数の端数で色を補間し、反復回数の境界の段差をなくします。'}
+        ]
+
+    def apply_coloring(self, fractal_data: dict, common_fractal_params: dict,
+                       algorithm_params: dict, color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> np.ndarray:
+        """
+        フラクタルデータにヒストグラム均等化カラーリングを適用します。
+
+        Args:
+            fractal_data (dict): フラクタル計算結果。'iterations' が必須で、補間には 'last_z_modulus_sq' を使います。
+            common_fractal_params (dict): フラクタル計算の共通パラメータ。'max_iterations' が期待されます。
+            algorithm_params (dict): このカラーリングアルゴリズム固有のパラメータ。
+            color_map_data (np.ndarray | list[tuple[int,int,int]] | None): 使用するカラーマップ。
+                Noneまたは色数が少ない場合はグレースケールを使用。
+
+        Returns:
+            np.ndarray: RGBA形式のカラーリング済み画像データ。
+        """
+        iterations = fractal_data.get('iterations')
+        if iterations is None:
+            height_px = common_fractal_params.get('image_height_px', 100)
+            width_px = common_fractal_params.get('image_width_px', 100)
+            logger.log("ヒストグラム均等化に必要なデータ 'iterations' が見つかりません。黒い画像を返します。", level="WARNING")
+            fallback_img = np.zeros((height_px, width_px, 4), dtype=np.uint8)
+            fallback_img[:, :, 3] = 255
+            return fallback_img
+
+        colored_image = np.empty((*iterations.shape, 4), dtype=np.uint8)
+        full_mask = np.ones(iterations.shape, dtype=np.bool_)
+        self.apply_coloring_masked(fractal_data, common_fractal_params, algorithm_params, color_map_data,
+                                   full_mask, colored_image)
+        return colored_image
+
+    def apply_coloring_masked(self, fractal_data: dict, common_fractal_params: dict, algorithm_params: dict,
+                              color_map_data: np.ndarray | list[tuple[int,int,int]] | None,
+                              mask: np.ndarray, out: np.ndarray) -> None:
+        """
+        マスクが True のピクセルだけにヒストグラム均等化カラーリングを適用し、out に直接書き込みます。
+        パレット座標を求めてからカラーマップで色に変換します。
+        """
+        coords = np.empty(mask.shape, dtype=np.float32)
+        if not self.compute_palette_coordinates_masked(fractal_data, common_fractal_params, algorithm_params, mask, coords):
+            logger.log("ヒストグラム均等化に必要なデータ 'iterations' が見つかりません。対象ピクセルを黒で塗ります。", level="WARNING")
+            out[mask] = (0, 0, 0, 255)
+            return
+        color_map_np, scale, wrap = self.palette_mapping(algorithm_params, color_map_data)
+        palette_gather_kernel(coords, mask, out, color_map_np, scale, 0.0, wrap)
+
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """色のスケールはパレット座標に掛けるだけなので、変更時はパレット座標を再計算しません。"""
+        return frozenset({'color_scale'})
+
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """反復回数を累積分布で均等化した値 (0-1) をパレット座標として書き込みます (集合内の点は NaN)。"""
+        iterations = fractal_data.get('iterations')
+        if iterations is None:
+            return False
+        max_iters = int(common_fractal_params.get('max_iterations', 100))
+        frame_counts = common_fractal_params.get('frame_statistics')
+        if frame_counts is not None:
+            cdf = escape_count_cdf_from_histogram(frame_counts)  # 高解像度出力のタイル: 画像全体の累積分布
+        else:
+            cdf = self._escape_count_cdf(fractal_data, iterations, max_iters)
+
+        last_z_mod_sq = fractal_data.get('last_z_modulus_sq') if algorithm_params.get('smooth', 1) else None
+        use_smooth = last_z_mod_sq is not None
+        if not use_smooth:
+            last_z_mod_sq = np.zeros((1, 1), dtype=np.float64)  # 使用しないが、カーネルの型をそろえるために渡す
+        histogram_coordinates_kernel(iterations, last_z_mod_sq, use_smooth, cdf, mask, out_coords, max_iters)
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> tuple[np.ndarray, float, bool]:
+        """パレット座標 0-1 をカラーマップ全体 x 色のスケールに割り当て、折り返しながら使います。"""
+        if color_map_data is None or len(color_map_data) < 2:
+            color_map_np = grayscale_lut(256)
+        else:
+            # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+            color_map_np = np.asarray(color_map_data, dtype=np.uint8)
+            if color_map_np.ndim != 2 or color_map_np.shape[1] not in (3, 4):
+                logger.log(f"{self.name}: カラーマップの形状が不正です {color_map_np.shape}。グレースケールを使用します。", level="WARNING")
+                color_map_np = grayscale_lut(256)
+        color_scale = algorithm_params.get('color_scale', 1.0)
+        return color_map_np, float((color_map_np.shape[0] - 1) * color_scale), True
+
+    @staticmethod
+    def _escape_count_cdf(fractal_data: dict, iterations: np.ndarray, max_iters: int) -> np.ndarray:
+        """反復回数の累積分布を返します。FractalData の場合は計算結果にメモ化します。"""
+        if isinstance(fractal_data, FractalData):
+            return fractal_data.get_statistic(('escape_count_cdf', max_iters),
+                                              lambda: escape_count_cdf(iterations, max_iters))
+        return escape_count_cdf(iterations, max_iters)
+
+
+if __name__ == '__main__':
+    logger.log("HistogramColoringPlugin のテストを開始します...", level="INFO")
+    plugin = HistogramColoringPlugin()
+    default_params = {p['name']: p['default'] for p in plugin.get_parameters_definition()}
+
+    # 反復回数が小さい値に偏ったデータでも、色がほぼ均等に分布することを確認する
+    h, w, max_i = 120, 160, 1000
+    rng = np.random.default_rng(0)
+    test_iters = np.minimum(rng.exponential(20.0, size=(h, w)).astype(np.int32), max_i)
+    test_iters[h//2 - 5:h//2 + 5, w//2 - 5:w//2 + 5] = max_i
+    test_data = FractalData(test_iters, rng.uniform(2.0, 40.0, size=(h, w)), np.zeros((h, w)), max_i)
+    common = {'max_iterations': max_i}
+
+    coords = np.empty((h, w), dtype=np.float32)
+    plugin.compute_palette_coordinates_masked(test_data, common, default_params, np.ones((h, w), dtype=np.bool_), coords)
+    escaped = coords[~np.isnan(coords)]
+    quartile_counts = np.histogram(escaped, bins=4, range=(0.0, 1.0))[0]
+    logger.log(f"パレット座標の四分位ごとの点数: {quartile_counts.tolist()}", level="INFO")
+    assert quartile_counts.min() > 0.15 * escaped.size
+
+    image = plugin.apply_coloring(test_data, common, default_params, None)
+    assert image.shape == (h, w, 4) and image.dtype == np.uint8
+    assert (image[h//2, w//2, :3] == 0).all()  # 集合内は黒
+
+    # タイルごとに集計したヒストグラムで着色したタイルは、画像全体を着色した結果と一致する
+    counts = None
+    for rows in (slice(0, 50), slice(50, h)):
+        tile_data = {'iterations': test_iters[rows], 'last_z_modulus_sq': test_data['last_z_modulus_sq'][rows]}
+        counts = plugin.accumulate_frame_statistics(tile_data, common, default_params, counts)
+    tile_image = plugin.apply_coloring({'iterations': test_iters[50:], 'last_z_modulus_sq': test_data['last_z_modulus_sq'][50:]},
+                                       dict(common, frame_statistics=counts), default_params, None)
+    assert np.array_equal(tile_image, image[50:])
+    logger.log("HistogramColoringPlugin のテストが完了しました。", level="INFO")
@@ -1,6 +1,4 @@
 import numpy as np
-from numba import jit
-import math
 
 try:
     from plugins.base_coloring_plugin import ColoringAlgorithmPlugin
@@ -28,100 +26,8 @@ except ImportError: # pragma: no cover
         def log(self, message, level="INFO"): print(f"[{level}] {message}") # ログレベルとメッセージを出力
     logger = PrintLogger()
 
-@jit(nopython=True, cache=False, fastmath=True) # Numba JITコンパイラを適用。キャッシュは一時的に無効 (ModuleNotFoundError回避のため)。fastmathを有効化。
-def _apply_smooth_coloring_jit(
-    iterations_array: np.ndarray,
-    last_z_mod_sq_array: np.ndarray,
-    max_iters: int,
-    escape_radius_sq: float, # 現在の平滑化計算式では直接使用されていませんが、将来の拡張や他の平滑化手法との一貫性のために引数として保持しています。
-    color_scale_factor: float,
-    color_map: np.ndarray # カラーマップデータ。形状は (N, 3) または (N, 4) で、各行がRGB値またはRGBA値 (uint8) を表します。
-) -> np.ndarray:
-    """
-    反復回数と最終的な|Z|^2値に基づいてスムーズカラーリングを適用するJITコンパイル済み関数。
-    アルゴリズムは `iters + 1 - log(log(|Z|))/log(2)` に基づいています。
-
-    Args:
-        iterations_array (np.ndarray): 各点の反復回数を格納した配列。
-        last_z_mod_sq_array (np.ndarray): 各点の最終的な|Z|^2値を格納した配列。
-        max_iters (int): 最大反復回数。
-        escape_radius_sq (float): 発散とみなす半径の2乗 (この関数では直接使用されませんが、インターフェースの一貫性のために存在)。
-        color_scale_factor (float): 色の変化の速さを調整するスケールファクター。
-        color_map (np.ndarray): 色補間に使用するカラーマップ (形状: (N,3) または (N,4), dtype: uint8)。
-
-    Returns:
-        np.ndarray: RGBA形式のカラーリング済み画像データ。
-    """
-    height, width = iterations_array.shape
-    output_image_rgba = np.empty((height, width, 4), dtype=np.uint8)
-    output_image_rgba[:, :, 3] = 255 # アルファチャンネルを完全に不透明に設定
-
-    num_colors_in_map = color_map.shape[0]
-    # 補間には少なくとも2色を確保してください。そうでない場合は黒にフォールバックします。
-    # これは理想的には、color_map_data の呼び出し側Pythonコードのロジックによって保証されるべきです。
-    if num_colors_in_map < 2: # カラーマップの色数が2未満の場合
-        output_image_rgba[:, :, 0:3] = 0 # RGBを黒に設定
-        return output_image_rgba
-
-    # RGBA対応: カラーマップの要素数を確認
-    color_channels = color_map.shape[1]
-    # 3要素（RGB）または4要素（RGBA）のみ対応
-    if color_channels not in [3, 4]:
-        output_image_rgba[:, :, 0:3] = 0 # RGBを黒に設定
-        return output_image_rgba
-
-    log_2 = math.log(2.0) # log(2)を事前計算
-
-    for r_idx in range(height):
-        for c_idx in range(width):
-            iters = iterations_array[r_idx, c_idx]
-
-            if iters == max_iters: # 点が集合内に留まった場合
-                output_image_rgba[r_idx, c_idx, 0:3] = 0 # 黒色で描画
-            else:
-                mod_sq = last_z_mod_sq_array[r_idx, c_idx]
-                smooth_val: float
-                try:
-                    # 発散した点の場合、mod_sq は escape_radius_sq より大きくなるはずです (例: 半径2の場合 > 4.0)。
-                    # これは mod_sq > 0 を意味します。
-                    if mod_sq <= 0.0: # 通常、正しく発散した点では mod_sq > 0 となります。これはエッジケースの処理です。
-                        smooth_val = float(iters)
-                    else:
-                        modulus = math.sqrt(mod_sq) # |Z|
-                        # escape_radius > 1 (例: 2) の場合、modulus > 1 です。
-                        if modulus <= 1.0: # 通常、発散した点では modulus > escape_radius (>1) となります。これもエッジケースの処理です。
-                            # |Z| <= 1 の場合、log(|Z|) <= 0 となり、log(log(|Z|)) が問題になります。
-                            smooth_val = float(iters)
-                        else:
-                            log_of_modulus = math.log(modulus) # log(|Z|)
-                            # modulus > 1 なので、log_of_modulus > 0 です。
-                            # これにより、log(log_of_modulus) の項は数学的に有効になります。
-                            smooth_val = float(iters) + 1.0 - math.log(log_of_modulus) / log_2
-                except Exception: # pragma: no cover ; 予期しない数学的エラー (例: 極端な値による domain error) をキャッチ
-                    # 計算エラーが発生した場合は、単純な整数反復回数にフォールバックします
-                    smooth_val = float(iters)
-
-                # smooth_val をカラーインデックスにマッピングします
-                color_idx_float = smooth_val * color_scale_factor
-
-                # マップ内の2色間の線形補間
-                idx0_floor = math.floor(color_idx_float)
-                fraction = color_idx_float - idx0_floor # fraction は常に [0.0, 1.0) の範囲になります
-
-                # 配列アクセス用にインデックスが整数であることを確認し、floor の負の結果を剰余で正しく処理します
-                c1_idx = int(idx0_floor) % num_colors_in_map # 負のインデックスも正しく扱えるように剰余演算を使用
-                c2_idx = (int(idx0_floor) + 1) % num_colors_in_map
-
-                # RGBA対応: 4要素ならRGBのみ使う、3要素ならそのまま使う
-                r_val = color_map[c1_idx, 0] * (1.0 - fraction) + color_map[c2_idx, 0] * fraction
-                g_val = color_map[c1_idx, 1] * (1.0 - fraction) + color_map[c2_idx, 1] * fraction
-                b_val = color_map[c1_idx, 2] * (1.0 - fraction) + color_map[c2_idx, 2] * fraction
-
-                # uint8 に変換する前にカラー値を [0, 255] にクランプします
-                output_image_rgba[r_idx, c_idx, 0] = np.uint8(max(0.0, min(255.0, r_val))) # R
-                output_image_rgba[r_idx, c_idx, 1] = np.uint8(max(0.0, min(255.0, g_val)))
-                output_image_rgba[r_idx, c_idx, 2] = np.uint8(max(0.0, min(255.0, b_val)))
-    return output_image_rgba
+from plugins.coloring.kernels import smooth_coloring_kernel, smooth_coordinates_kernel
+from coloring.color_manager import grayscale_lut
 
 
 class SmoothColoringPlugin(ColoringAlgorithmPlugin):
@@ -135,6 +41,11 @@ class SmoothColoringPlugin(ColoringAlgorithmPlugin):
         """カラーリングアルゴリズムの名前を返します。"""
         return "スムーズカラー"
 
+    @property
+    def z_precision(self) -> str:
+        """log(log|Z|) の計算に使う |Z|^2 は倍精度で組み立てられるため、最終Z値は単精度で十分です。"""
+        return 'float32'
+
     def get_parameters_definition(self) -> list:
         """このカラーリングアルゴリズムに固有の調整可能なパラメータのリストを返します。"""
         return [
@@ -195,30 +106,79 @@ class SmoothColoringPlugin(ColoringAlgorithmPlugin):
             fallback_img[:,:,3] = 255 # アルファチャンネルを不透明に設定
             return fallback_img
 
+        colored_image = np.empty((*iterations.shape, 4), dtype=np.uint8)
+        full_mask = np.ones(iterations.shape, dtype=np.bool_)
+        self._color_into(iterations, last_z_mod_sq, common_fractal_params, algorithm_params,
+                         color_map_data, full_mask, colored_image)
+        return colored_image
+
+    def apply_coloring_masked(self, fractal_data: dict, common_fractal_params: dict,
+                              algorithm_params: dict, color_map_data: list[tuple[int,int,int]] | None,
+                              mask: np.ndarray, out: np.ndarray) -> None:
+        """
+        マスクが True のピクセルだけにスムーズカラーリングを適用し、out に直接書き込みます。
+
+        Args:
+            fractal_data (dict): apply_coloring と同じ。
+            common_fractal_params (dict): apply_coloring と同じ。
+            algorithm_params (dict): apply_coloring と同じ。
+            color_map_data (list[tuple[int,int,int]] | None): apply_coloring と同じ。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+            out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        """
+        iterations = fractal_data.get('iterations')
+        last_z_mod_sq = fractal_data.get('last_z_modulus_sq')
+        if iterations is None or last_z_mod_sq is None:
+            logger.log("スムーズカラーリングに必要なデータ ('iterations' または 'last_z_modulus_sq') が見つかりません。対象ピクセルを黒で塗ります。", level="WARNING")
+            out[mask] = (0, 0, 0, 255)
+            return
+        self._color_into(iterations, last_z_mod_sq, common_fractal_params, algorithm_params,
+                         color_map_data, mask, out)
+
+    def _color_into(self, iterations: np.ndarray, last_z_mod_sq: np.ndarray, common_fractal_params: dict,
+                    algorithm_params: dict, color_map_data: list[tuple[int,int,int]] | None,
+                    mask: np.ndarray, out: np.ndarray) -> None:
+        """パラメータとカラーマップを準備し、JIT関数で mask 部分を out に着色します。"""
         max_iters = common_fractal_params.get('max_iterations', 100)
-        escape_radius = common_fractal_params.get('escape_radius', 2.0)
-        escape_radius_sq = escape_radius * escape_radius # JIT関数に渡されます
 
         color_scale_from_plugin = algorithm_params.get('color_scale', 1.0)
 
-        if not color_map_data or len(color_map_data) < 2: # 補間には少なくとも2色が必要です
-            # logger.log("SmoothColoringPlugin 警告: 提供されたカラーマップの色数が不足しているため (2色未満)、デフォルトのグレースケールマップを使用します。", level="WARNING")
+        color_map_np = self._prepare_color_map(color_map_data)
+        smooth_coloring_kernel(iterations, last_z_mod_sq, mask, out, max_iters, color_scale_from_plugin, color_map_np)
+
+    def _prepare_color_map(self, color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> np.ndarray:
+        """カーネルに渡すカラーマップの uint8 配列を返します。補間に使えない場合はグレースケールにします。"""
+        if color_map_data is None or len(color_map_data) < 2: # 補間には少なくとも2色が必要です
             # カラーマップが提供されていないか、色数が補間に不足している場合は、単純なグレースケールマップをデフォルトとして使用します。
-            color_map_np = np.array([(i,i,i) for i in range(256)], dtype=np.uint8)
-        else:
-            color_map_np = np.array(color_map_data, dtype=np.uint8)
-            # RGBA対応: 4要素ならそのまま、3要素ならそのまま使用
-            if color_map_np.shape[1] not in [3, 4]:
-                logger.log(f"SmoothColoringPlugin 警告: カラーマップの形状が不正です {color_map_np.shape}。デフォルトのグレースケールマップを使用します。", level="WARNING")
-                color_map_np = np.array([(i,i,i) for i in range(256)], dtype=np.uint8)
-
-        colored_image = _apply_smooth_coloring_jit(
-            iterations, last_z_mod_sq, max_iters, escape_radius_sq,
-            color_scale_from_plugin,
-            color_map_np
-        )
+            return grayscale_lut(256)
+        # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+        color_map_np = np.asarray(color_map_data, dtype=np.uint8)
+        # RGBA対応: 4要素ならそのまま、3要素ならそのまま使用
+        if color_map_np.ndim != 2 or color_map_np.shape[1] not in [3, 4]:
+            logger.log(f"SmoothColoringPlugin 警告: カラーマップの形状が不正です {color_map_np.shape}。デフォルトのグレースケールマップを使用します。", level="WARNING")
+            return grayscale_lut(256)
+        return color_map_np
 
-        return colored_image
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """色のスケールはパレット座標に掛けるだけなので、変更時はパレット座標を再計算しません。"""
+        return frozenset({'color_scale'})
+
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """色のスケールを掛ける前の連続的な反復回数をパレット座標として書き込みます (集合内の点は NaN)。"""
+        iterations = fractal_data.get('iterations')
+        last_z_mod_sq = fractal_data.get('last_z_modulus_sq')
+        if iterations is None or last_z_mod_sq is None:
+            return False
+        smooth_coordinates_kernel(iterations, last_z_mod_sq, mask, out_coords,
+                                  common_fractal_params.get('max_iterations', 100))
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int,int,int]] | None) -> tuple[np.ndarray, float, bool]:
+        """パレット座標に色のスケールを掛けた位置の色を、カラーマップを折り返しながら使います。"""
+        return self._prepare_color_map(color_map_data), algorithm_params.get('color_scale', 1.0), True
 
 if __name__ == '__main__':
     logger.log("SmoothColoringPlugin のテストを開始します...", level="INFO")
@@ -0,0 +1,560 @@
+"""
+カラーリングプラグイン用の Numba カーネル。
+
+プラグインファイルは PluginManager がファイルパスから直接読み込むため、モジュール名でインポートできず、
+その中で定義した関数は Numba のディスクキャッシュ (cache=True) を使えません (キャッシュの読み込み時に
+ModuleNotFoundError になります)。そこで、カーネルは通常のパッケージであるこのモジュールにまとめ、
+`plugins.coloring.kernels` としてインポートします。これにより2回目以降の起動ではコンパイルを待たずに済みます。
+
+各カーネルは行単位で prange により並列化されており、マスクが True のピクセルだけに書き込みます。
+最終Z値は複素数配列ではなく実部・虚部の配列 (float32 / float64) で受け取ります。
+
+`*_coordinates_kernel` は色の代わりに「パレット座標」(float32, 対象外の点は NaN) を書き込み、
+`palette_gather_kernel` がそれをカラーマップで色に変換します。エンジンはパレット座標を計算ごとに1回だけ求めて保持し、
+カラーマップや色のスケール、パレットの循環だけが変わった場合は再計算せずに色を引き直します。
+"""
+import math
+
+import numpy as np
+from numba import get_num_threads, jit, prange
+
+
+def final_z_components(fractal_data: dict) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    フラクタルデータから最終Zの実部・虚部の配列を取り出します。
+
+    'last_z_real' / 'last_z_imag' があればそのまま返し、なければ 'last_zn_values' の実部・虚部のビューを返します
+    (FractalData から複素数配列を導出させずに済みます)。
+
+    Args:
+        fractal_data (dict): フラクタル計算結果。
+    Returns:
+        tuple[np.ndarray, np.ndarray] | None: (実部, 虚部)。どちらの形式もない場合は None。
+    """
+    last_z_real = fractal_data.get('last_z_real')
+    last_z_imag = fractal_data.get('last_z_imag')
+    if last_z_real is not None and last_z_imag is not None:
+        return last_z_real, last_z_imag
+    last_zn_values = fractal_data.get('last_zn_values')
+    if last_zn_values is None:
+        return None
+    return last_zn_values.real, last_zn_values.imag
+
+
+@jit(nopython=True, cache=True, inline='always')
+def write_palette_color(out: np.ndarray, r: int, c: int, color_map: np.ndarray, position: float, wrap: bool) -> None:
+    """
+    カラーマップ上の位置 position の色を、隣り合う2色の線形補間で求めて out[r, c, 0:3] に書き込みます。
+
+    Args:
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        r (int): 行。
+        c (int): 列。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8, N >= 1)。アルファは使用しません。
+        position (float): カラーマップ上の位置 (0 が先頭の色、N-1 が末尾の色)。
+        wrap (bool): True の場合は範囲外の位置をカラーマップの周期で折り返し、末尾の色と先頭の色の間も補間します。
+                     False の場合は [0, N-1] に切り詰めます。
+    """
+    num_colors = color_map.shape[0]
+    if wrap:
+        base = math.floor(position)
+        fraction = position - base
+        idx1 = int(base) % num_colors
+        idx2 = (int(base) + 1) % num_colors
+    else:
+        position = max(0.0, min(position, float(num_colors - 1)))
+        idx1 = int(position)
+        idx2 = min(idx1 + 1, num_colors - 1)
+        fraction = position - idx1
+    for ch in range(3):
+        value = color_map[idx1, ch] * (1.0 - fraction) + color_map[idx2, ch] * fraction
+        out[r, c, ch] = np.uint8(max(0.0, min(255.0, value)))
+
+
+@jit(nopython=True, cache=True, inline='always')
+def _set_rgb(out: np.ndarray, r: int, c: int, red: int, green: int, blue: int) -> None:
+    out[r, c, 0] = red
+    out[r, c, 1] = green
+    out[r, c, 2] = blue
+
+
+@jit(nopython=True, cache=True, inline='always')
+def _smooth_value(iters: int, mod_sq: float, log_2: float) -> float:
+    """`iters + 1 - log(log|Z|)/log(2)`。|Z| <= 1 では log(log|Z|) が定義されないため整数の反復回数を返します。"""
+    smooth_val = float(iters)
+    if mod_sq > 1.0:
+        smooth_val = smooth_val + 1.0 - math.log(math.log(math.sqrt(mod_sq))) / log_2
+    return smooth_val
+
+
+@jit(nopython=True, cache=True, parallel=True, fastmath=True)
+def smooth_coloring_kernel(iterations: np.ndarray, last_z_mod_sq: np.ndarray, mask: np.ndarray, out: np.ndarray,
+                           max_iters: int, color_scale: float, color_map: np.ndarray) -> None:
+    """
+    反復回数と最終的な|Z|^2から `iters + 1 - log(log|Z|)/log(2)` で連続的な値を求め、
+    カラーマップを折り返しながら着色します。集合内の点とカラーマップが2色未満の場合は黒にします。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_mod_sq (np.ndarray): 各点の最終的な|Z|^2。
+        mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        max_iters (int): 最大反復回数。
+        color_scale (float): 色の変化の速さを調整するスケール。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8)。
+    """
+    height, width = iterations.shape
+    use_black = color_map.shape[0] < 2 or (color_map.shape[1] != 3 and color_map.shape[1] != 4)
+    log_2 = math.log(2.0)
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            out[r, c, 3] = 255
+            iters = iterations[r, c]
+            if use_black or iters == max_iters:
+                _set_rgb(out, r, c, 0, 0, 0)
+                continue
+            smooth_val = _smooth_value(iters, float(last_z_mod_sq[r, c]), log_2)
+            write_palette_color(out, r, c, color_map, smooth_val * color_scale, True)
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def iteration_coloring_kernel(iterations: np.ndarray, mask: np.ndarray, out: np.ndarray,
+                              max_iters: int, color_map: np.ndarray, color_scale: float) -> None:
+    """
+    反復回数だけから着色します。早く発散した点ほどカラーマップの後ろの色になります。
+    集合内の点は黒、カラーマップが2色未満の場合は白から黒へのグレースケールにします。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        max_iters (int): 最大反復回数。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8)。
+        color_scale (float): 色の変化の速さを調整するスケール。
+    """
+    height, width = iterations.shape
+    num_colors = color_map.shape[0]
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            out[r, c, 3] = 255
+            iters = iterations[r, c]
+            if iters == max_iters:
+                _set_rgb(out, r, c, 0, 0, 0)
+            elif num_colors < 2:
+                gray = max(0, min(255, int((1.0 - iters / max_iters) * 255)))
+                _set_rgb(out, r, c, gray, gray, gray)
+            else:
+                position = (1.0 - iters / max_iters) * (num_colors - 1) * color_scale
+                write_palette_color(out, r, c, color_map, position, True)
+
+
+@jit(nopython=True, cache=True, inline='always')
+def _final_z_abs_value(z_real: float, z_imag: float, escape_radius: float, inv_gamma: float,
+                       magnitude_offset: float, magnitude_scale: float) -> float:
+    """最終Zの絶対値を escape_radius で [0, 1] に正規化し、ガンマ補正した値を返します。"""
+    abs_z = math.hypot(float(z_real), float(z_imag))
+    abs_z = (abs_z + magnitude_offset) * magnitude_scale
+    norm_val = min(max(abs_z / escape_radius, 0.0), 1.0)
+    return norm_val ** inv_gamma if norm_val > 0 else 0.0
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def final_z_abs_coloring_kernel(iterations: np.ndarray, last_z_real: np.ndarray, last_z_imag: np.ndarray,
+                                mask: np.ndarray, out: np.ndarray, max_iters: int, escape_radius: float,
+                                gamma: float, magnitude_offset: float, magnitude_scale: float,
+                                color_map: np.ndarray, use_color_map: bool) -> None:
+    """
+    非発散点の最終Zの絶対値を escape_radius で [0, 1] に正規化し、ガンマ補正してから
+    グレースケールまたはカラーマップで着色します。発散した点は黒にします。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_real (np.ndarray): 各点の最終Zの実部。
+        last_z_imag (np.ndarray): 各点の最終Zの虚部。
+        mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        max_iters (int): 最大反復回数。
+        escape_radius (float): 正規化に使う発散半径。
+        gamma (float): ガンマ補正値 (正の値)。
+        magnitude_offset (float): 絶対値に加算するオフセット。
+        magnitude_scale (float): 絶対値に掛けるスケール。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8)。
+        use_color_map (bool): False の場合はグレースケール。
+    """
+    height, width = iterations.shape
+    inv_gamma = 1.0 / gamma
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            out[r, c, 3] = 255
+            if iterations[r, c] != max_iters:
+                _set_rgb(out, r, c, 0, 0, 0)
+                continue
+            corrected_val = _final_z_abs_value(last_z_real[r, c], last_z_imag[r, c], escape_radius,
+                                               inv_gamma, magnitude_offset, magnitude_scale)
+            if use_color_map:
+                write_palette_color(out, r, c, color_map, corrected_val * (color_map.shape[0] - 1), False)
+            else:
+                gray = max(0, min(255, int(corrected_val * 255)))
+                _set_rgb(out, r, c, gray, gray, gray)
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def potential_kernel(iterations: np.ndarray, last_z_real: np.ndarray, last_z_imag: np.ndarray,
+                     mask: np.ndarray, max_iters: int) -> tuple[np.ndarray, float, float, bool]:
+    """
+    非発散点の複素ポテンシャル log|Z_n| を計算します。対象外のピクセルは NaN、|Z_n| がほぼ 0 の点は -inf です。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_real (np.ndarray): 各点の最終Zの実部。
+        last_z_imag (np.ndarray): 各点の最終Zの虚部。
+        mask (np.ndarray): 計算対象のピクセルを示すブール配列。
+        max_iters (int): 最大反復回数。
+    Returns:
+        tuple[np.ndarray, float, float, bool]: (ポテンシャルの配列, 最小ポテンシャル, 最大ポテンシャル, 有効な点があったか)。
+    """
+    height, width = iterations.shape
+    potentials = np.full((height, width), np.nan, dtype=np.float64)
+    # 行ごとに最小・最大を求めてから最後にまとめる (並列ループ内で共有変数を更新しない)
+    row_min = np.full(height, np.inf)
+    row_max = np.full(height, -np.inf)
+    row_valid = np.zeros(height, dtype=np.bool_)
+    for r in prange(height):
+        for c in range(width):
+            if mask[r, c] and iterations[r, c] == max_iters:
+                abs_zn = math.hypot(float(last_z_real[r, c]), float(last_z_imag[r, c]))
+                potential = math.log(abs_zn) if abs_zn > 1e-9 else -np.inf
+                potentials[r, c] = potential
+                row_min[r] = min(row_min[r], potential)
+                row_max[r] = max(row_max[r], potential)
+                row_valid[r] = True
+    return potentials, row_min.min(), row_max.max(), row_valid.any()
+
+
+@jit(nopython=True, cache=True, inline='always')
+def _normalized_potential(potential: float, min_potential: float, potential_range: float,
+                          potential_offset: float, potential_scale: float) -> float:
+    """ポテンシャルにオフセットとスケールを適用し、[min_potential, min_potential + potential_range] を [0, 1] に正規化します。"""
+    if potential == -np.inf:
+        return 0.0
+    norm_potential = ((potential + potential_offset) * potential_scale - min_potential) / potential_range
+    return max(0.0, min(1.0, norm_potential))
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def potential_coloring_kernel(potentials: np.ndarray, min_potential: float, max_potential: float,
+                              mask: np.ndarray, out: np.ndarray, color_map: np.ndarray, use_color_map: bool,
+                              outside_r: int, outside_g: int, outside_b: int,
+                              color_scale: float, potential_offset: float, potential_scale: float) -> None:
+    """
+    ポテンシャルを [min_potential, max_potential] で正規化し、グレースケールまたはカラーマップで着色します。
+    ポテンシャルが NaN の点 (発散した点) は集合外の色にします。
+
+    Args:
+        potentials (np.ndarray): potential_kernel で求めたポテンシャル。
+        min_potential (float): 正規化の最小値。
+        max_potential (float): 正規化の最大値。
+        mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8)。
+        use_color_map (bool): False の場合はグレースケール。
+        outside_r (int): 集合外の色 (R)。
+        outside_g (int): 集合外の色 (G)。
+        outside_b (int): 集合外の色 (B)。
+        color_scale (float): 正規化後の値に掛けるスケール。
+        potential_offset (float): ポテンシャルに加算するオフセット。
+        potential_scale (float): ポテンシャルに掛けるスケール。
+    """
+    height, width = potentials.shape
+    potential_range = max_potential - min_potential
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            out[r, c, 3] = 255
+            potential = potentials[r, c]
+            if np.isnan(potential):
+                _set_rgb(out, r, c, outside_r, outside_g, outside_b)
+                continue
+            norm_potential = _normalized_potential(potential, min_potential, potential_range,
+                                                   potential_offset, potential_scale) * color_scale
+            if use_color_map:
+                write_palette_color(out, r, c, color_map, norm_potential * (color_map.shape[0] - 1), False)
+            else:
+                gray = np.uint8(min(255.0, norm_potential * 255.0))
+                _set_rgb(out, r, c, gray, gray, gray)
+
+
+@jit(nopython=True, cache=True, parallel=True, fastmath=True)
+def smooth_coordinates_kernel(iterations: np.ndarray, last_z_mod_sq: np.ndarray, mask: np.ndarray,
+                              coords: np.ndarray, max_iters: int) -> None:
+    """
+    smooth_coloring_kernel のパレット座標版です。色のスケールを掛ける前の連続的な反復回数を書き込みます。
+    集合内の点は NaN です。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_mod_sq (np.ndarray): 各点の最終的な|Z|^2。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        max_iters (int): 最大反復回数。
+    """
+    height, width = iterations.shape
+    log_2 = math.log(2.0)
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            iters = iterations[r, c]
+            if iters == max_iters:
+                coords[r, c] = np.nan
+            else:
+                coords[r, c] = _smooth_value(iters, float(last_z_mod_sq[r, c]), log_2)
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def iteration_coordinates_kernel(iterations: np.ndarray, mask: np.ndarray, coords: np.ndarray, max_iters: int) -> None:
+    """
+    iteration_coloring_kernel のパレット座標版です。`1 - iters / max_iters` (0-1) を書き込みます。集合内の点は NaN です。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        max_iters (int): 最大反復回数。
+    """
+    height, width = iterations.shape
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            iters = iterations[r, c]
+            coords[r, c] = np.nan if iters == max_iters else 1.0 - iters / max_iters
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def final_z_abs_coordinates_kernel(iterations: np.ndarray, last_z_real: np.ndarray, last_z_imag: np.ndarray,
+                                   mask: np.ndarray, coords: np.ndarray, max_iters: int, escape_radius: float,
+                                   gamma: float, magnitude_offset: float, magnitude_scale: float) -> None:
+    """
+    final_z_abs_coloring_kernel のパレット座標版です。ガンマ補正後の正規化値 (0-1) を書き込みます。発散した点は NaN です。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_real (np.ndarray): 各点の最終Zの実部。
+        last_z_imag (np.ndarray): 各点の最終Zの虚部。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        max_iters (int): 最大反復回数。
+        escape_radius (float): 正規化に使う発散半径。
+        gamma (float): ガンマ補正値 (正の値)。
+        magnitude_offset (float): 絶対値に加算するオフセット。
+        magnitude_scale (float): 絶対値に掛けるスケール。
+    """
+    height, width = iterations.shape
+    inv_gamma = 1.0 / gamma
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            if iterations[r, c] != max_iters:
+                coords[r, c] = np.nan
+            else:
+                coords[r, c] = _final_z_abs_value(last_z_real[r, c], last_z_imag[r, c], escape_radius,
+                                                  inv_gamma, magnitude_offset, magnitude_scale)
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def potential_coordinates_kernel(potentials: np.ndarray, min_potential: float, max_potential: float,
+                                 mask: np.ndarray, coords: np.ndarray,
+                                 potential_offset: float, potential_scale: float) -> None:
+    """
+    potential_coloring_kernel のパレット座標版です。色のスケールを掛ける前の正規化ポテンシャル (0-1) を書き込みます。
+    ポテンシャルが NaN の点 (発散した点) は NaN です。
+
+    Args:
+        potentials (np.ndarray): potential_kernel で求めたポテンシャル。
+        min_potential (float): 正規化の最小値。
+        max_potential (float): 正規化の最大値。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        potential_offset (float): ポテンシャルに加算するオフセット。
+        potential_scale (float): ポテンシャルに掛けるスケール。
+    """
+    height, width = potentials.shape
+    potential_range = max_potential - min_potential
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            potential = potentials[r, c]
+            if np.isnan(potential):
+                coords[r, c] = np.nan
+            else:
+                coords[r, c] = _normalized_potential(potential, min_potential, potential_range,
+                                                     potential_offset, potential_scale)
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def palette_gather_kernel(coords: np.ndarray, mask: np.ndarray, out: np.ndarray, color_map: np.ndarray,
+                          scale: float, offset: float, wrap: bool) -> None:
+    """
+    パレット座標 t をカラーマップ上の位置 `t * scale + offset` に写し、その色を out に書き込みます。
+    t が NaN の点は黒にします。
+
+    Args:
+        coords (np.ndarray): パレット座標 (高さx幅, float32)。
+        mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+        out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        color_map (np.ndarray): カラーマップ (形状: (N,3) または (N,4), uint8, N >= 1)。
+        scale (float): パレット座標に掛けるスケール (カラーマップの色数単位)。
+        offset (float): 位置に加算するオフセット (カラーマップの色数単位)。
+        wrap (bool): write_palette_color と同じ。
+    """
+    height, width = coords.shape
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            out[r, c, 3] = 255
+            t = coords[r, c]
+            if np.isnan(t):
+                _set_rgb(out, r, c, 0, 0, 0)
+            else:
+                write_palette_color(out, r, c, color_map, t * scale + offset, wrap)
+
+
+def escape_count_cdf(iterations: np.ndarray, max_iters: int) -> np.ndarray:
+    """
+    発散した点の反復回数の累積分布を求めます。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        max_iters (int): 最大反復回数。これに達した点 (集合内) は数えません。
+    Returns:
+        np.ndarray: 長さ max_iters + 1 の float64 配列。要素 n は反復回数が n 未満で発散した点の割合で、
+                    末尾は 1 (発散した点がない場合はすべて 0) です。
+    """
+    return escape_count_cdf_from_histogram(escape_count_histogram(iterations, max_iters))
+
+
+def escape_count_histogram(iterations: np.ndarray, max_iters: int) -> np.ndarray:
+    """
+    発散した点の反復回数のヒストグラムを求めます。
+
+    行を現在の Numba のスレッド数のチャンクに分けてチャンクごとのヒストグラムを並列に数え
+    (スレッド間で同じカウンタを更新しない)、最後に各ビンを合計します。
+    画像を分けて数えたヒストグラムの和は、画像全体のヒストグラムと一致します。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        max_iters (int): 最大反復回数。これに達した点 (集合内) は数えません。
+    Returns:
+        np.ndarray: 長さ max_iters + 1 の int64 配列。要素 n は反復回数 n で発散した点の数です。
+    """
+    # スレッド数はカーネルの外で取得する (カーネル内で参照するとディスクキャッシュが使えないため)
+    return _escape_count_histogram_kernel(iterations, max_iters, get_num_threads())
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def _escape_count_histogram_kernel(iterations: np.ndarray, max_iters: int, num_threads: int) -> np.ndarray:
+    """escape_count_histogram の本体。num_threads 個のチャンクごとのヒストグラムを並列に数えてから合計します。"""
+    height, width = iterations.shape
+    num_chunks = max(1, min(num_threads, height))
+    rows_per_chunk = (height + num_chunks - 1) // num_chunks
+    histograms = np.zeros((num_chunks, max_iters + 1), dtype=np.int64)
+    for chunk in prange(num_chunks):
+        for r in range(chunk * rows_per_chunk, min(height, (chunk + 1) * rows_per_chunk)):
+            for c in range(width):
+                n = iterations[r, c]
+                if 0 <= n < max_iters:
+                    histograms[chunk, n] += 1
+
+    counts = np.zeros(max_iters + 1, dtype=np.int64)
+    for n in prange(max_iters + 1):
+        for chunk in range(num_chunks):
+            counts[n] += histograms[chunk, n]
+    return counts
+
+
+@jit(nopython=True, cache=True)
+def escape_count_cdf_from_histogram(counts: np.ndarray) -> np.ndarray:
+    """
+    escape_count_histogram で求めたヒストグラムから、escape_count_cdf と同じ累積分布を求めます。
+
+    Args:
+        counts (np.ndarray): 反復回数のヒストグラム (int64)。
+    Returns:
+        np.ndarray: counts と同じ長さの float64 配列 (escape_count_cdf 参照)。
+    """
+    total = counts.sum()
+    cdf = np.zeros(counts.shape[0], dtype=np.float64)
+    if total == 0:
+        return cdf
+    running = 0
+    for n in range(counts.shape[0]):
+        cdf[n] = running / total
+        running += counts[n]
+    return cdf
+
+
+@jit(nopython=True, cache=True, parallel=True, fastmath=True)
+def histogram_coordinates_kernel(iterations: np.ndarray, last_z_mod_sq: np.ndarray, use_smooth: bool,
+                                 cdf: np.ndarray, mask: np.ndarray, coords: np.ndarray, max_iters: int) -> None:
+    """
+    反復回数を累積分布で [0, 1] に均等化した値をパレット座標として書き込みます。集合内の点は NaN です。
+
+    use_smooth が True の場合は、スムーズカラーと同じ連続的な反復回数の端数で、反復回数 n の区間
+    [cdf[n], cdf[n+1]] の中を線形補間します (隣り合う反復回数の境界で色が連続します)。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        last_z_mod_sq (np.ndarray): 各点の最終的な|Z|^2 (use_smooth が False の場合は使用しません)。
+        use_smooth (bool): 端数による補間を行うか。
+        cdf (np.ndarray): escape_count_cdf で求めた累積分布。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        max_iters (int): 最大反復回数。
+    """
+    height, width = iterations.shape
+    log_2 = math.log(2.0)
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            n = iterations[r, c]
+            if n < 0 or n >= max_iters:
+                coords[r, c] = np.nan
+                continue
+            fraction = 0.0
+            if use_smooth:
+                fraction = _smooth_value(n, float(last_z_mod_sq[r, c]), log_2) - n
+                fraction = max(0.0, min(1.0, fraction))
+            coords[r, c] = cdf[n] + fraction * (cdf[n + 1] - cdf[n])
+
+
+@jit(nopython=True, cache=True, parallel=True)
+def distance_coordinates_kernel(iterations: np.ndarray, distances: np.ndarray, mask: np.ndarray,
+                                coords: np.ndarray, max_iters: int) -> None:
+    """
+    外部距離推定 (ピクセル単位) をそのままパレット座標として書き込みます。集合内の点は NaN です。
+
+    Args:
+        iterations (np.ndarray): 各点の反復回数。
+        distances (np.ndarray): 各点の外部距離推定 (ピクセル単位)。
+        mask (np.ndarray): 対象のピクセルを示すブール配列。
+        coords (np.ndarray): 書き込み先のパレット座標 (高さx幅, float32)。
+        max_iters (int): 最大反復回数。
+    """
+    height, width = iterations.shape
+    for r in prange(height):
+        for c in range(width):
+            if not mask[r, c]:
+                continue
+            coords[r, c] = np.nan if iterations[r, c] >= max_iters else distances[r, c]
@@ -9,110 +9,11 @@ except ImportError:
     logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
     CustomLogger = type("CustomLogger", (), {"log": lambda self, msg, level="INFO": logging.info(msg) if level == "INFO" else logging.warning(msg) if level == "WARNING" else logging.error(msg)})()
 
-from numba import jit
-import matplotlib.pyplot as plt
+from plugins.coloring.kernels import final_z_abs_coloring_kernel, final_z_abs_coordinates_kernel, final_z_components
+from coloring.color_manager import grayscale_lut
 
 logger = CustomLogger()
 
-@jit(nopython=True)
-def _apply_final_z_abs_coloring_jit(
-    iterations: np.ndarray,
-    last_zn_values: np.ndarray,
-    max_iterations: int,
-    escape_radius: float,
-    gamma: float,
-    img_array_rgb: np.ndarray,
-    color_map_array: np.ndarray | None,
-    use_color_map: bool,
-    magnitude_offset: float,
-    magnitude_scale: float
-) -> None:
-    """最終Z値の絶対値に基づいて色を付けるJITコンパイル済み関数。
-
-    非発散点に対して、最終的なZ値の絶対値を正規化し、ガンマ補正を適用した後、
-    グレースケールまたは指定されたカラーマップに基づいて色を決定します。
-
-    Args:
-        iterations (np.ndarray): 各点の反復回数を格納した配列。
-        last_zn_values (np.ndarray): 各点の最終Z値を格納した複素数型配列。
-        max_iterations (int): 最大反復回数。
-        escape_radius (float): 発散半径。正規化に使用されます。
-        gamma (float): ガンマ補正値。
-        img_array_rgb (np.ndarray): 色を書き込む先のRGB画像配列 (高さx幅x3)。
-        color_map_array (np.ndarray | None): カラーマップとして使用するNumPy配列 (Nx3)。Noneの場合はグレースケール。
-        use_color_map (bool): カラーマップを使用するかどうかのフラグ。
-        magnitude_offset (float): Zの絶対値に加算するオフセット値。
-        magnitude_scale (float): Zの絶対値のスケールを調整する値。
-    """
-    height, width = iterations.shape
-
-    for r_idx in range(height):
-        for c_idx in range(width):
-            if iterations[r_idx, c_idx] == max_iterations:  # 非発散点
-                final_z = last_zn_values[r_idx, c_idx]
-                abs_z = np.abs(final_z)
-
-                # オフセットとスケールを適用
-                abs_z = (abs_z + magnitude_offset) * magnitude_scale
-
-                # escape_radius を上限として [0, 1] に正規化
-                norm_val = min(max(abs_z / escape_radius, 0.0), 1.0)
-
-                # ガンマ補正
-                if norm_val > 0:
-                    corrected_val = norm_val ** (1.0 / gamma)
-                else:
-                    corrected_val = 0.0
-
-                if not use_color_map:  # グレースケール
-                    gray_val = int(corrected_val * 255)
-                    gray_val = max(0, min(gray_val, 255))
-                    img_array_rgb[r_idx, c_idx, 0] = gray_val
-                    img_array_rgb[r_idx, c_idx, 1] = gray_val
-                    img_array_rgb[r_idx, c_idx, 2] = gray_val
-                else:  # カラーマップを使用
-                    if color_map_array is not None:
-                        num_colors = color_map_array.shape[0]
-                        if num_colors > 0:
-                            # 浮動小数点インデックスを計算
-                            float_idx = corrected_val * (num_colors - 1)
-                            float_idx = max(0.0, min(float_idx, num_colors - 1))
-
-                            # 線形補間のためのインデックスと重みを計算
-                            idx1 = int(float_idx)
-                            idx2 = min(idx1 + 1, num_colors - 1)
-
-                            # 補間係数 (小数部分)
-                            interp_factor = float_idx - idx1
-
-                            # 2つの色を取得
-                            c1 = color_map_array[idx1]
-                            c2 = color_map_array[idx2]
-                            # RGBA対応: 4要素ならRGBのみ使う
-                            if c1.shape[0] == 4:
-                                c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                                c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-                            else:
-                                c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                                c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-
-                            # 線形補間
-                            r = c1_r * (1.0 - interp_factor) + c2_r * interp_factor
-                            g = c1_g * (1.0 - interp_factor) + c2_g * interp_factor
-                            b = c1_b * (1.0 - interp_factor) + c2_b * interp_factor
-
-                            # 結果を代入
-                            img_array_rgb[r_idx, c_idx, 0] = int(r)
-                            img_array_rgb[r_idx, c_idx, 1] = int(g)
-                            img_array_rgb[r_idx, c_idx, 2] = int(b)
-                        else: # カラーマップが空の場合 (フォールバック)
-                            img_array_rgb[r_idx, c_idx, 0] = 0
-                            img_array_rgb[r_idx, c_idx, 1] = 0
-                            img_array_rgb[r_idx, c_idx, 2] = 0
-                    # else: カラーマップがNoneだがuse_color_mapがTrue (設計上発生しにくい) -> 黒のまま
-            # else: 発散した点などはデフォルトの色（黒）のまま
-
-
 class FinalZMagnitudeColoringPlugin(ColoringAlgorithmPlugin):
     """
     非発散領域（内部）の点の最終的なZ値の絶対値に基づいて色を付けるプラグイン。
@@ -160,6 +61,11 @@ class FinalZMagnitudeColoringPlugin(ColoringAlgorithmPlugin):
         """このプラグインが対象とする領域タイプ（非発散）を返します。"""
         return "non_divergent"
 
+    @property
+    def z_precision(self) -> str:
+        """|Z| から色を決めるため、最終Z値は単精度で十分です。"""
+        return 'float32'
+
     def get_parameters_definition(self) -> list:
         """このカラーリングアルゴリズムのパラメータ定義リストを返します。"""
         return [
@@ -210,59 +116,117 @@ class FinalZMagnitudeColoringPlugin(ColoringAlgorithmPlugin):
         algorithm_params: dict,
         color_map_data: list[tuple[int, int, int]] | None
     ) -> np.ndarray:
+        gamma, magnitude_offset, magnitude_scale = self._resolve_parameters(algorithm_params)
+
+        final_z = final_z_components(fractal_data)
+        iterations = fractal_data.get('iterations')
+
+        if final_z is None or iterations is None:
+            logger.error("fractal_data に 'last_zn_values' または 'iterations' データが見つかりません。")
+            return np.zeros((100, 100, 4), dtype=np.float32)
+
+        height, width = iterations.shape
+        img_array = np.empty((height, width, 4), dtype=np.uint8)
+        full_mask = np.ones((height, width), dtype=np.bool_)
+        self._color_into(iterations, final_z, common_fractal_params, color_map_data,
+                         gamma, magnitude_offset, magnitude_scale, full_mask, img_array)
+        return img_array
+
+    def apply_coloring_masked(
+        self,
+        fractal_data: dict,
+        common_fractal_params: dict,
+        algorithm_params: dict,
+        color_map_data: list[tuple[int, int, int]] | None,
+        mask: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """マスクが True のピクセルだけに最終Z絶対値カラーリングを適用し、out に直接書き込みます。"""
+        gamma, magnitude_offset, magnitude_scale = self._resolve_parameters(algorithm_params)
+
+        final_z = final_z_components(fractal_data)
+        iterations = fractal_data.get('iterations')
+        if final_z is None or iterations is None:
+            logger.log("fractal_data に 'last_zn_values' または 'iterations' データが見つかりません。対象ピクセルを黒で塗ります。", level="ERROR")
+            out[mask] = (0, 0, 0, 255)
+            return
+        self._color_into(iterations, final_z, common_fractal_params, color_map_data,
+                         gamma, magnitude_offset, magnitude_scale, mask, out)
+
+    def _resolve_parameters(self, algorithm_params: dict) -> tuple[float, float, float]:
+        """アルゴリズムパラメータを検証し、(ガンマ, 絶対値オフセット, 絶対値スケール) を返します。"""
         gamma = algorithm_params.get("gamma", 1.0)
         if gamma <= 0:
-            logger.warning("ガンマ値は正の値である必要があります。デフォルト値（1.0）を使用します。")
+            logger.log("ガンマ値は正の値である必要があります。デフォルト値（1.0）を使用します。", level="WARNING")
             gamma = 1.0
 
         magnitude_offset = algorithm_params.get("magnitude_offset", 0.0)
         magnitude_scale = algorithm_params.get("magnitude_scale", 1.0)
         if magnitude_scale <= 0:
-            logger.warning("絶対値スケールは正の値である必要があります。デフォルト値（1.0）を使用します。")
+            logger.log("絶対値スケールは正の値である必要があります。デフォルト値（1.0）を使用します。", level="WARNING")
             magnitude_scale = 1.0
+        return gamma, magnitude_offset, magnitude_scale
 
-        last_zn_values = fractal_data.get('last_zn_values')
-        iterations = fractal_data.get('iterations')
+    def _color_into(
+        self,
+        iterations: np.ndarray,
+        final_z: tuple[np.ndarray, np.ndarray],
+        common_fractal_params: dict,
+        color_map_data: list[tuple[int, int, int]] | None,
+        gamma: float,
+        magnitude_offset: float,
+        magnitude_scale: float,
+        mask: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """カラーマップを準備し、JITカーネルで mask 部分を out に着色します。final_z は最終Zの (実部, 虚部) です。"""
         max_iterations = common_fractal_params.get('max_iterations', 100)
         escape_radius = common_fractal_params.get('escape_radius', 2.0)
 
-        if last_zn_values is None or iterations is None:
-            logger.error("fractal_data に 'last_zn_values' または 'iterations' データが見つかりません。")
-            return np.zeros((100, 100, 4), dtype=np.float32)
+        color_map_np, use_color_map = self._prepare_color_map(color_map_data)
 
-        height, width = iterations.shape
-        img_array = np.zeros((height, width, 4), dtype=np.uint8)
-        img_array[:, :, 3] = 255  # アルファチャンネルを不透明に設定
-        img_array_rgb = img_array[:,:,:3]
-
-        # カラーマップの準備
-        use_color_map = False
-        color_map_np = None
-        if color_map_data and len(color_map_data) > 0:
+        last_z_real, last_z_imag = final_z
+        final_z_abs_coloring_kernel(
+            iterations, last_z_real, last_z_imag, mask, out,
+            max_iterations, escape_radius, gamma, magnitude_offset, magnitude_scale,
+            color_map_np, use_color_map
+        )
+
+    def _prepare_color_map(self, color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> tuple[np.ndarray, bool]:
+        """(カーネルに渡すカラーマップの uint8 配列, カラーマップを使うか) を返します。使わない場合もカーネルの型をそろえるため空の配列を返します。"""
+        if color_map_data is not None and len(color_map_data) > 0:
             try:
-                color_map_np = np.array(color_map_data, dtype=np.uint8)
+                # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+                candidate = np.asarray(color_map_data, dtype=np.uint8)
                 # RGBA(4要素)にも対応: shape[1]が3または4ならOK
-                if color_map_np.ndim == 2 and (color_map_np.shape[1] == 3 or color_map_np.shape[1] == 4):
-                    use_color_map = True
+                if candidate.ndim == 2 and (candidate.shape[1] == 3 or candidate.shape[1] == 4):
+                    return candidate, True
             except Exception as e:
                 logger.log(f"カラーマップの変換中にエラーが発生しました: {e}", level="WARNING")
+        return np.zeros((0, 3), dtype=np.uint8), False
 
-        # JITコンパイル済み関数を呼び出し
-        _apply_final_z_abs_coloring_jit(
-            iterations,
-            last_zn_values,
-            max_iterations,
-            escape_radius,
-            gamma,
-            img_array_rgb,
-            color_map_np,
-            use_color_map,
-            magnitude_offset,
-            magnitude_scale
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """ガンマ補正後の正規化された絶対値 (0-1) をパレット座標として書き込みます (発散した点は NaN)。"""
+        final_z = final_z_components(fractal_data)
+        iterations = fractal_data.get('iterations')
+        if final_z is None or iterations is None:
+            return False
+        gamma, magnitude_offset, magnitude_scale = self._resolve_parameters(algorithm_params)
+        final_z_abs_coordinates_kernel(
+            iterations, final_z[0], final_z[1], mask, out_coords,
+            common_fractal_params.get('max_iterations', 100), common_fractal_params.get('escape_radius', 2.0),
+            gamma, magnitude_offset, magnitude_scale
         )
-
-        return img_array
-
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> tuple[np.ndarray, float, bool]:
+        """パレット座標 0-1 をカラーマップ (なければグレースケール) の先頭から末尾に割り当てます。"""
+        color_map_np, use_color_map = self._prepare_color_map(color_map_data)
+        if not use_color_map:
+            return grayscale_lut(256), 255.0, False
+        return color_map_np, float(color_map_np.shape[0] - 1), False
 
 if __name__ == '__main__':
     import sys
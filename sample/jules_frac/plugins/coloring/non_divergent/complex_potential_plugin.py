@@ -9,143 +9,11 @@ except ImportError:
     logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
     CustomLogger = type("CustomLogger", (), {"log": lambda self, msg, level="INFO": logging.info(msg) if level == "INFO" else logging.warning(msg) if level == "WARNING" else logging.error(msg)})()
 
-from numba import jit
+from plugins.coloring.kernels import potential_kernel, potential_coloring_kernel, potential_coordinates_kernel, final_z_components
+from coloring.color_manager import grayscale_lut
 
 logger = CustomLogger()
 
-@jit(nopython=True)
-def _calculate_potentials_jit(
-    iterations: np.ndarray,
-    last_zn_values: np.ndarray, # 複素数の最終Z値
-    max_iterations: int
-) -> tuple[np.ndarray, float, float, bool]:
-    """
-    ジュリア集合またはマンデルブロ集合の内部の点に対して複素ポテンシャルを計算します。
-    ポテンシャルは log(|Z_n|) として定義されます。ここで Z_n は最大反復回数に達したときのZの値です。
-
-    Args:
-        iterations (np.ndarray): 各点の反復回数を格納した配列。
-        last_zn_values (np.ndarray): 各点の最終的な複素数Zの値を格納した配列。
-        max_iterations (int): 最大反復回数。
-
-    Returns:
-        tuple[np.ndarray, float, float, bool]: (ポテンシャルの配列, 計算された最小ポテンシャル, 計算された最大ポテンシャル, 有効なポテンシャル値が存在したかどうかのフラグ)
-    """
-    height, width = iterations.shape
-    potentials = np.full((height, width), np.nan, dtype=np.float64)
-    min_p = np.inf
-    max_p = -np.inf
-    has_valid = False
-
-    for r in range(height):
-        for c in range(width):
-            if iterations[r, c] == max_iterations:
-                abs_zn = np.abs(last_zn_values[r, c])
-                if abs_zn > 1e-9: # log(0) を避けるための微小値チェック
-                    potential_val = np.log(abs_zn)
-                    potentials[r, c] = potential_val
-                    min_p = min(min_p, potential_val)
-                    max_p = max(max_p, potential_val)
-                    has_valid = True
-                else: # |Z_n| がほぼ0の場合の処理
-                    potentials[r, c] = -np.inf # 非常に低いポテンシャルとしてマーク
-                    min_p = min(min_p, -np.inf) # これにより min_p は -np.inf になる
-                    has_valid = True # ポテンシャルが実質的に最小であっても、色付け対象の有効な点として扱う
-    return potentials, min_p, max_p, has_valid
-
-@jit(nopython=True)
-def _normalize_and_color_jit(
-    potentials: np.ndarray,
-    min_potential_norm: float, # 正規化に使用する最小ポテンシャル
-    max_potential_norm: float, # 正規化に使用する最大ポテンシャル
-    img_array_rgb: np.ndarray, # 色付け結果を格納する HxWx3 のuint8配列 (RGB部分)
-    color_map_array: np.ndarray | None, # カラーマップ (Numpy配列)。Numbaのためにオプショナル型またはNoneを渡す
-    use_color_map: bool,
-    default_outside_color_r: np.uint8, # 集合外の点のデフォルト色 (R)。Numbaのために型を明示
-    default_outside_color_g: np.uint8, # 集合外の点のデフォルト色 (G)
-    default_outside_color_b: np.uint8, # 集合外の点のデフォルト色 (B)
-    color_scale: float, # 色のスケール
-    potential_offset: float, # ポテンシャルオフセット
-    potential_scale: float # ポテンシャルスケール
-) -> None:
-    """
-    ポテンシャル値を正規化し、カラーマップまたはグレースケールで色付けするJITコンパイル済み関数。
-
-    Args:
-        potentials (np.ndarray): 各点のポテンシャル値を格納した配列。
-        min_potential_norm (float): 正規化に使用する最小ポテンシャル値。
-        max_potential_norm (float): 正規化に使用する最大ポテンシャル値。
-        img_array_rgb (np.ndarray): 色付け結果を格納する配列 (HxWx3)。
-        color_map_array (np.ndarray | None): カラーマップ配列 (Nx3) またはNone。
-        use_color_map (bool): カラーマップを使用するかどうか。
-        default_outside_color_r (np.uint8): 集合外の点のR値。
-        default_outside_color_g (np.uint8): 集合外の点のG値。
-        default_outside_color_b (np.uint8): 集合外の点のB値。
-        color_scale (float): 色のスケール。
-        potential_offset (float): ポテンシャル値に加算するオフセット。
-        potential_scale (float): ポテンシャル値のスケール。
-    """
-    height, width = potentials.shape
-    potential_range_norm = max_potential_norm - min_potential_norm
-
-    for r in range(height):
-        for c in range(width):
-            current_potential = potentials[r,c]
-            if np.isnan(current_potential): # 発散した点 (ポテンシャルがNaN)
-                img_array_rgb[r,c,0] = default_outside_color_r
-                img_array_rgb[r,c,1] = default_outside_color_g
-                img_array_rgb[r,c,2] = default_outside_color_b
-            else:
-                norm_potential: float
-                if current_potential == -np.inf: # ポテンシャルが-infinityの場合 (log(|Z_n|~0))
-                    norm_potential = 0.0
-                else:
-                    # ポテンシャル値にオフセットとスケールを適用
-                    adjusted_potential = (current_potential + potential_offset) * potential_scale
-                    norm_potential = (adjusted_potential - min_potential_norm) / potential_range_norm
-
-                norm_potential = max(0.0, min(1.0, norm_potential)) # [0, 1] の範囲にクランプ
-
-                # 色のスケールを適用
-                norm_potential = norm_potential * color_scale
-
-                if not use_color_map: # グレースケール
-                    gray_val = np.uint8(min(255.0, norm_potential * 255.0))
-                    img_array_rgb[r,c,0] = gray_val
-                    img_array_rgb[r,c,1] = gray_val
-                    img_array_rgb[r,c,2] = gray_val
-                else: # カラーマップを使用
-                    if color_map_array is not None and color_map_array.shape[0] > 0:
-                        # カラーマップのインデックスを計算
-                        color_idx = norm_potential * (color_map_array.shape[0] - 1)
-                        idx1 = int(color_idx)
-                        idx2 = min(idx1 + 1, color_map_array.shape[0] - 1)
-                        fraction = color_idx - idx1
-
-                        # 2つの色を取得して補間
-                        c1 = color_map_array[idx1]
-                        c2 = color_map_array[idx2]
-                        # RGBA対応: 4要素ならRGBのみ使う
-                        if c1.shape[0] == 4:
-                            c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                            c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-                        else:
-                            c1_r, c1_g, c1_b = c1[0], c1[1], c1[2]
-                            c2_r, c2_g, c2_b = c2[0], c2[1], c2[2]
-
-                        # 線形補間
-                        r_val = c1_r * (1.0 - fraction) + c2_r * fraction
-                        g_val = c1_g * (1.0 - fraction) + c2_g * fraction
-                        b_val = c1_b * (1.0 - fraction) + c2_b * fraction
-
-                        # 結果を代入（色のスケールは既にnorm_potentialに適用済み）
-                        img_array_rgb[r,c,0] = np.uint8(min(255.0, r_val))
-                        img_array_rgb[r,c,1] = np.uint8(min(255.0, g_val))
-                        img_array_rgb[r,c,2] = np.uint8(min(255.0, b_val))
-                    else: # use_color_map=True であってもカラーマップが空またはNoneの場合のフォールバック
-                        img_array_rgb[r,c,0] = 0; img_array_rgb[r,c,1] = 0; img_array_rgb[r,c,2] = 0;
-
-
 class ComplexPotentialColoringPlugin(ColoringAlgorithmPlugin):
     """
     複素ポテンシャルに基づいてフラクタル集合の内部を色付けするプラグイン。
@@ -164,6 +32,16 @@ class ComplexPotentialColoringPlugin(ColoringAlgorithmPlugin):
         """このカラーリングアルゴリズムが対象とする領域の種類 ("divergent" または "non_divergent") を返します。"""
         return "non_divergent"
 
+    @property
+    def z_precision(self) -> str:
+        """|Z| の対数から色を決めるため、最終Z値は単精度で十分です。"""
+        return 'float32'
+
+    @property
+    def requires_full_frame(self) -> bool:
+        """ポテンシャルを画像内の最小値・最大値で正規化するため、画像全体が必要です。"""
+        return True
+
     def get_parameters_definition(self) -> list:
         """このカラーリングアルゴリズムに固有の調整可能なパラメータのリストを返します。"""
         return [
@@ -213,12 +91,12 @@ class ComplexPotentialColoringPlugin(ColoringAlgorithmPlugin):
             np.ndarray: RGBA形式のカラーリング済み画像データ。
         """
         iterations = fractal_data.get('iterations')
-        last_zn_values = fractal_data.get('last_zn_values')
+        final_z = final_z_components(fractal_data)
 
         height_param = common_fractal_params.get('height')
         width_param = common_fractal_params.get('width')
 
-        if iterations is None or last_zn_values is None:
+        if iterations is None or final_z is None:
             logger.log("apply_coloring: 必須データ 'iterations' または 'last_zn_values' が見つかりません。", level="ERROR")
             h = height_param if height_param is not None else 100
             w = width_param if width_param is not None else 100
@@ -231,36 +109,89 @@ class ComplexPotentialColoringPlugin(ColoringAlgorithmPlugin):
 
         height, width = iterations.shape
         if (height_param is not None and width_param is not None and \
-            ((height_param, width_param) != (height, width) or last_zn_values.shape != (height, width))):
-            logger.log(f"apply_coloring: 形状の不一致またはlast_zn_valuesの形状エラー。反復回数配列: {iterations.shape}, 最終Z値配列: {last_zn_values.shape}, パラメータ指定サイズ: ({height_param},{width_param})。反復回数配列の形状を使用します。", level="WARNING")
-            if last_zn_values.shape != (height,width): # 形状が一致しない場合はエラー処理を試みる
+            ((height_param, width_param) != (height, width) or final_z[0].shape != (height, width))):
+            logger.log(f"apply_coloring: 形状の不一致またはlast_zn_valuesの形状エラー。反復回数配列: {iterations.shape}, 最終Z値配列: {final_z[0].shape}, パラメータ指定サイズ: ({height_param},{width_param})。反復回数配列の形状を使用します。", level="WARNING")
+            if final_z[0].shape != (height,width): # 形状が一致しない場合はエラー処理を試みる
                  logger.log("apply_coloring: last_zn_values の形状が iterations の形状と一致しません。エラー画像 (赤) を返します。", level="ERROR")
                  err_img = np.zeros((height, width, 4), dtype=np.uint8); err_img[:,:,0]=255; err_img[:,:,3]=255; return err_img # 赤いエラー画像
 
 
-        max_iterations = common_fractal_params.get('max_iterations', 100)
         img_array = np.zeros((height, width, 4), dtype=np.uint8)
-        img_array[:, :, 3] = 255
-        img_array_rgb = img_array[:,:,:3]
+        full_mask = np.ones((height, width), dtype=np.bool_)
+        self._color_into(iterations, final_z, common_fractal_params, algorithm_params,
+                         color_map_data, full_mask, img_array)
+        return img_array
+
+    def apply_coloring_masked(
+        self, fractal_data: dict, common_fractal_params: dict,
+        algorithm_params: dict, color_map_data: list[tuple[int, int, int]] | None,
+        mask: np.ndarray, out: np.ndarray
+    ) -> None:
+        """
+        マスクが True のピクセルだけに複素ポテンシャルカラーリングを適用し、out に直接書き込みます。
+        ポテンシャルの正規化範囲もマスク内の点だけから求めます。
+
+        Args:
+            fractal_data (dict): apply_coloring と同じ。
+            common_fractal_params (dict): apply_coloring と同じ。
+            algorithm_params (dict): apply_coloring と同じ。
+            color_map_data (list[tuple[int, int, int]] | None): apply_coloring と同じ。
+            mask (np.ndarray): 着色対象のピクセルを示すブール配列。
+            out (np.ndarray): 書き込み先のRGBA画像配列 (高さx幅x4, uint8)。
+        """
+        iterations = fractal_data.get('iterations')
+        final_z = final_z_components(fractal_data)
+        if iterations is None or final_z is None or final_z[0].shape != iterations.shape:
+            logger.log("apply_coloring_masked: 'iterations' または 'last_zn_values' が見つからないか形状が一致しません。対象ピクセルを集合外の色で塗ります。", level="ERROR")
+            out[mask] = (*self.DEFAULT_OUTSIDE_COLOR, 255)
+            return
+        self._color_into(iterations, final_z, common_fractal_params, algorithm_params,
+                         color_map_data, mask, out)
+
+    def _color_into(
+        self, iterations: np.ndarray, final_z: tuple[np.ndarray, np.ndarray], common_fractal_params: dict,
+        algorithm_params: dict, color_map_data: list[tuple[int, int, int]] | None,
+        mask: np.ndarray, out: np.ndarray
+    ) -> None:
+        """ポテンシャルを計算・正規化し、JITカーネルで mask 部分を out に着色します。final_z は最終Zの (実部, 虚部) です。"""
+        normalization = self._calculate_normalization(iterations, final_z, common_fractal_params, mask)
+        if normalization is None:
+            logger.log("apply_coloring: 有効なポテンシャル値が見つかりませんでした。集合外のデフォルト色で出力します。", level="WARNING")
+            out[mask] = (*self.DEFAULT_OUTSIDE_COLOR, 255)
+            return
+        potentials, min_potential_for_norm, max_potential_for_norm = normalization
+        color_scale = self._resolve_color_scale(algorithm_params)
 
-        potentials, min_p_raw, max_p_raw, has_valid = _calculate_potentials_jit(
-            iterations, last_zn_values, max_iterations
+        color_map_np, use_color_map = self._prepare_color_map(color_map_data)
+
+        # JITカーネルを呼び出して色付けを実行
+        potential_coloring_kernel(
+            potentials,
+            min_potential_for_norm,
+            max_potential_for_norm,
+            mask,
+            out,
+            color_map_np,
+            use_color_map,
+            int(self.DEFAULT_OUTSIDE_COLOR[0]),
+            int(self.DEFAULT_OUTSIDE_COLOR[1]),
+            int(self.DEFAULT_OUTSIDE_COLOR[2]),
+            color_scale,  # 色のスケールを渡す
+            algorithm_params.get("potential_offset", 0.0),  # ポテンシャルオフセットを渡す
+            algorithm_params.get("potential_scale", 1.0)  # ポテンシャルスケールを渡す
         )
 
+    def _calculate_normalization(
+        self, iterations: np.ndarray, final_z: tuple[np.ndarray, np.ndarray], common_fractal_params: dict, mask: np.ndarray
+    ) -> tuple[np.ndarray, float, float] | None:
+        """ポテンシャルを計算し、(ポテンシャルの配列, 正規化の最小値, 正規化の最大値) を返します。有効な点がない場合は None。"""
+        max_iterations = common_fractal_params.get('max_iterations', 100)
+
+        potentials, min_p_raw, max_p_raw, has_valid = potential_kernel(
+            iterations, final_z[0], final_z[1], mask, max_iterations
+        )
         if not has_valid:
-            # デバッグ用: iterations配列のユニーク値とlast_zn_values配列の一部を出力
-#            try:
-#                logger.log(f"[DEBUG] iterationsのユニーク値: {np.unique(iterations)}", level="DEBUG")
-#                logger.log(f"[DEBUG] last_zn_valuesの一部: {last_zn_values.flatten()[:10]}", level="DEBUG")
-#            except Exception as e:
-#                logger.log(f"[DEBUG] デバッグ出力中に例外: {e}", level="DEBUG")
-            logger.log("apply_coloring: 有効なポテンシャル値が見つかりませんでした。集合外のデフォルト色で出力します。", level="WARNING")
-            for r_idx in range(height):
-                for c_idx in range(width):
-                    img_array_rgb[r_idx, c_idx, 0] = self.DEFAULT_OUTSIDE_COLOR[0]
-                    img_array_rgb[r_idx, c_idx, 1] = self.DEFAULT_OUTSIDE_COLOR[1]
-                    img_array_rgb[r_idx, c_idx, 2] = self.DEFAULT_OUTSIDE_COLOR[2]
-            return img_array
+            return None
 
         min_potential_for_norm = min_p_raw
         max_potential_for_norm = max_p_raw
@@ -278,41 +209,60 @@ class ComplexPotentialColoringPlugin(ColoringAlgorithmPlugin):
 
         if max_potential_for_norm <= min_potential_for_norm: # ポテンシャルの範囲が非常に狭いか無効な場合
              max_potential_for_norm = min_potential_for_norm + 1.0
+        return potentials, min_potential_for_norm, max_potential_for_norm
 
-        # 色のスケールを取得
+    def _resolve_color_scale(self, algorithm_params: dict) -> float:
+        """色のスケールを取得します。正でない場合は 1.0 を使用します。"""
         color_scale = algorithm_params.get("color_scale", 1.0)
         if color_scale <= 0:
             logger.log(f"色のスケール ({color_scale}) は正であるべきです。デフォルト値 1.0 を使用します。", level="WARNING")
             color_scale = 1.0
+        return color_scale
 
-        # カラーマップの準備
-        use_color_map = False
-        color_map_np = None
-        if color_map_data and len(color_map_data) > 0:
+    def _prepare_color_map(self, color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> tuple[np.ndarray, bool]:
+        """(カーネルに渡すカラーマップの uint8 配列, カラーマップを使うか) を返します。使わない場合もカーネルの型をそろえるため空の配列を返します。"""
+        if color_map_data is not None and len(color_map_data) > 0:
             try:
-                color_map_np = np.array(color_map_data, dtype=np.uint8)
+                # ColorManager の LUT (uint8 配列) はコピーせずにそのまま使う
+                candidate = np.asarray(color_map_data, dtype=np.uint8)
                 # RGBA(4要素)にも対応: shape[1]が3または4ならOK
-                if color_map_np.ndim == 2 and (color_map_np.shape[1] == 3 or color_map_np.shape[1] == 4):
-                    use_color_map = True
+                if candidate.ndim == 2 and (candidate.shape[1] == 3 or candidate.shape[1] == 4):
+                    return candidate, True
             except Exception as e:
                 logger.log(f"カラーマップの変換中にエラーが発生しました: {e}", level="WARNING")
+        return np.zeros((0, 3), dtype=np.uint8), False
 
-        # JITコンパイル済み関数を呼び出して色付けを実行
-        _normalize_and_color_jit(
-            potentials,
-            min_potential_for_norm,
-            max_potential_for_norm,
-            img_array_rgb,
-            color_map_np if use_color_map else None,
-            use_color_map,
-            self.DEFAULT_OUTSIDE_COLOR[0],
-            self.DEFAULT_OUTSIDE_COLOR[1],
-            self.DEFAULT_OUTSIDE_COLOR[2],
-            color_scale,  # 色のスケールを渡す
-            algorithm_params.get("potential_offset", 0.0),  # ポテンシャルオフセットを渡す
-            algorithm_params.get("potential_scale", 1.0)  # ポテンシャルスケールを渡す
+    @property
+    def palette_parameters(self) -> frozenset[str]:
+        """色のスケールは正規化後の値に掛けるだけなので、変更時はパレット座標を再計算しません。"""
+        return frozenset({'color_scale'})
+
+    def compute_palette_coordinates_masked(self, fractal_data: dict, common_fractal_params: dict,
+                                           algorithm_params: dict, mask: np.ndarray, out_coords: np.ndarray) -> bool:
+        """色のスケールを掛ける前の正規化ポテンシャル (0-1) をパレット座標として書き込みます (発散した点は NaN)。"""
+        iterations = fractal_data.get('iterations')
+        final_z = final_z_components(fractal_data)
+        if iterations is None or final_z is None or final_z[0].shape != iterations.shape:
+            return False
+        normalization = self._calculate_normalization(iterations, final_z, common_fractal_params, mask)
+        if normalization is None:
+            out_coords[mask] = np.nan  # 有効な点がない場合はすべて集合外の色 (黒)
+            return True
+        potentials, min_p, max_p = normalization
+        potential_coordinates_kernel(
+            potentials, min_p, max_p, mask, out_coords,
+            algorithm_params.get("potential_offset", 0.0), algorithm_params.get("potential_scale", 1.0)
         )
-        return img_array
+        return True
+
+    def palette_mapping(self, algorithm_params: dict,
+                        color_map_data: np.ndarray | list[tuple[int, int, int]] | None) -> tuple[np.ndarray, float, bool]:
+        """パレット座標 x 色のスケールをカラーマップ (なければグレースケール) の先頭から末尾に割り当てます。"""
+        color_scale = self._resolve_color_scale(algorithm_params)
+        color_map_np, use_color_map = self._prepare_color_map(color_map_data)
+        if not use_color_map:
+            return grayscale_lut(256), 255.0 * color_scale, False
+        return color_map_np, (color_map_np.shape[0] - 1) * color_scale, False
 
 if __name__ == '__main__':
     import sys
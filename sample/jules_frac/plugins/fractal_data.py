@@ -0,0 +1,218 @@
+from collections.abc import Callable, Hashable, Mapping, MutableMapping
+from typing import Any
+import numpy as np
+
+
+class FractalData(MutableMapping):
+    """
+    フラクタル計算結果のコンパクトな格納クラス。
+
+    画素ごとに保持するのは反復回数 (int32) と最終Zの実部・虚部 (float32 または float64) だけで、
+    'last_zn_values' (複素数), 'last_z_modulus_sq' (|Z|^2), 'is_diverged' (発散マスク) は
+    最初に参照されたときに計算してメモ化します。
+
+    従来の辞書形式の計算結果と同じく `data['iterations']` や `data.get('is_diverged')` で
+    参照できます。ただし反復 (keys(), items() など) で列挙されるのは保持している配列と
+    追加のキーだけで、派生キーは含みません。これにより、配列をずらしたり帯を組み合わせたりする
+    処理は最小限の状態だけを扱います。保持している配列を直接書き換えた場合は
+    `release_derived()` を呼んでメモを破棄してください。
+
+    カラーリングが画像全体から求める小さな統計 (反復回数の累積分布など) は `get_statistic()` で
+    このインスタンスにメモ化できます。統計は列挙されず、ずらしたり組み立てたりした新しいフレームにも引き継がれません。
+    """
+
+    STORED_KEYS = ('iterations', 'last_z_real', 'last_z_imag')
+    DERIVED_KEYS = ('last_zn_values', 'last_z_modulus_sq', 'is_diverged')
+
+    def __init__(self, iterations: np.ndarray, last_z_real: np.ndarray, last_z_imag: np.ndarray,
+                 max_iterations: int, z_dtype: np.dtype | type | None = None):
+        """
+        FractalData を初期化します。
+
+        Args:
+            iterations (np.ndarray): 反復回数の配列 (高さx幅)。int32 に変換されます。
+            last_z_real (np.ndarray): 最終Zの実部の配列 (高さx幅)。
+            last_z_imag (np.ndarray): 最終Zの虚部の配列 (高さx幅)。
+            max_iterations (int): 最大反復回数。'is_diverged' の判定に使用します。
+            z_dtype (np.dtype | type | None, optional): 最終Zの保持に使う型 (np.float32 または np.float64)。
+                None の場合は渡された配列の型のままにします。
+        """
+        if z_dtype is not None:
+            last_z_real = np.asarray(last_z_real, dtype=z_dtype)
+            last_z_imag = np.asarray(last_z_imag, dtype=z_dtype)
+        self._stored = {
+            'iterations': np.asarray(iterations, dtype=np.int32),
+            'last_z_real': last_z_real,
+            'last_z_imag': last_z_imag,
+        }
+        self.max_iterations = int(max_iterations)
+        self._extras = {}
+        self._derived = {}
+        self._statistics = {}
+
+    @classmethod
+    def empty(cls, height_px: int, width_px: int, max_iterations: int,
+              z_dtype: np.dtype | type = np.float64) -> 'FractalData':
+        """
+        未初期化の配列を持つ FractalData を作成します。帯やタイルを書き込んで組み立てる場合に使用します。
+
+        Args:
+            height_px (int): 画像の高さ (ピクセル)。
+            width_px (int): 画像の幅 (ピクセル)。
+            max_iterations (int): 最大反復回数。
+            z_dtype (np.dtype | type, optional): 最終Zの保持に使う型。Defaults to np.float64.
+        Returns:
+            FractalData: 新しいインスタンス。
+        """
+        shape = (height_px, width_px)
+        return cls(np.empty(shape, dtype=np.int32), np.empty(shape, dtype=z_dtype),
+                   np.empty(shape, dtype=z_dtype), max_iterations)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """画像の形状 (高さ, 幅) を返します。"""
+        return self._stored['iterations'].shape
+
+    @property
+    def z_dtype(self) -> np.dtype:
+        """最終Zの保持に使っている型を返します。"""
+        return self._stored['last_z_real'].dtype
+
+    @property
+    def nbytes(self) -> int:
+        """保持している配列 (メモ化された派生配列と統計を含む) の合計バイト数を返します。"""
+        arrays = (list(self._stored.values()) + list(self._extras.values()) + list(self._derived.values())
+                  + list(self._statistics.values()))
+        return sum(value.nbytes for value in arrays if isinstance(value, np.ndarray))
+
+    def with_z_dtype(self, z_dtype: np.dtype | type) -> 'FractalData':
+        """
+        最終Zの型を変えた FractalData を返します。型が同じ場合は自身を返します。
+
+        Args:
+            z_dtype (np.dtype | type): 最終Zの保持に使う型。
+        Returns:
+            FractalData: 変換後のインスタンス。
+        """
+        if self.z_dtype == np.dtype(z_dtype):
+            return self
+        converted = FractalData(self._stored['iterations'], self._stored['last_z_real'],
+                                self._stored['last_z_imag'], self.max_iterations, z_dtype=z_dtype)
+        converted._extras = dict(self._extras)
+        return converted
+
+    def release_derived(self, keep_statistics: bool = False):
+        """
+        メモ化した派生配列と統計を破棄します。次に参照されたときに再計算されます。
+
+        Args:
+            keep_statistics (bool, optional): True の場合は get_statistic の統計を残します。
+                配列を書き換えずにメモリだけを解放する場合に使用します。Defaults to False.
+        """
+        self._derived.clear()
+        if not keep_statistics:
+            self._statistics.clear()
+
+    def get_statistic(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        画像全体から求める統計をメモ化して返します。初回は compute() を呼び出して保存します。
+
+        Args:
+            key (Hashable): 統計のキー。計算に使ったパラメータ (最大反復回数など) を含めてください。
+            compute (Callable[[], Any]): 統計を計算する関数。
+        Returns:
+            Any: メモ化された統計。
+        """
+        if key not in self._statistics:
+            self._statistics[key] = compute()
+        return self._statistics[key]
+
+    def _compute_derived(self, key: str) -> np.ndarray:
+        """派生キーの値を計算します。"""
+        if key == 'last_zn_values':
+            # 複素数は float64 で組み立てる (float32 では complex64 となり精度が落ちるため)
+            zn = np.empty(self.shape, dtype=np.complex128)
+            zn.real = self._stored['last_z_real']
+            zn.imag = self._stored['last_z_imag']
+            return zn
+        if key == 'last_z_modulus_sq':
+            z_real = self._stored['last_z_real'].astype(np.float64)
+            z_imag = self._stored['last_z_imag'].astype(np.float64)
+            return z_real * z_real + z_imag * z_imag
+        return self._stored['iterations'] < self.max_iterations
+
+    def __getitem__(self, key: str):
+        if key in self._stored:
+            return self._stored[key]
+        if key in self._extras:
+            return self._extras[key]
+        if key in self.DERIVED_KEYS:
+            value = self._derived.get(key)
+            if value is None:
+                value = self._compute_derived(key)
+                self._derived[key] = value
+            return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in self.DERIVED_KEYS:
+            raise KeyError(f"'{key}' は派生キーのため設定できません")
+        if key in self._stored:
+            self._stored[key] = value
+        else:
+            self._extras[key] = value
+        self._derived.clear()
+        self._statistics.clear()
+
+    def __delitem__(self, key: str):
+        if key in self._stored:
+            raise KeyError(f"'{key}' は必須キーのため削除できません")
+        del self._extras[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._stored or key in self._extras or key in self.DERIVED_KEYS
+
+    def __iter__(self):
+        yield from self._stored
+        yield from self._extras
+
+    def __len__(self) -> int:
+        return len(self._stored) + len(self._extras)
+
+    def __repr__(self) -> str:
+        return (f"FractalData(shape={self.shape}, z_dtype={self.z_dtype}, "
+                f"max_iterations={self.max_iterations}, extras={list(self._extras)})")
+
+
+def allocate_frame_like(sample: Mapping, sample_shape: tuple[int, int], height_px: int, width_px: int,
+                        z_dtype: np.dtype | type | None = None) -> tuple[Mapping, list[str]]:
+    """
+    部分的に計算した結果 sample と同じ構成で、画像全体 (height_px x width_px) の未初期化バッファを確保します。
+
+    sample が FractalData の場合は FractalData を、辞書の場合は辞書を返します。
+    画素ごとの配列 (先頭2次元が sample_shape の配列) だけを確保し直し、それ以外の値はそのまま引き継ぎます。
+
+    Args:
+        sample (Mapping): 帯や矩形について計算したフラクタルデータ。
+        sample_shape (tuple[int, int]): sample の画素配列の形状 (高さ, 幅)。
+        height_px (int): 確保する画像の高さ (ピクセル)。
+        width_px (int): 確保する画像の幅 (ピクセル)。
+        z_dtype (np.dtype | type | None, optional): FractalData の最終Zに使う型。None の場合は sample と同じ型。
+    Returns:
+        tuple[Mapping, list[str]]: (確保したバッファ, 画素ごとの配列のキー一覧)。
+    """
+    if isinstance(sample, FractalData):
+        frame = FractalData.empty(height_px, width_px, sample.max_iterations,
+                                  z_dtype if z_dtype is not None else sample.z_dtype)
+    else:
+        frame = {}
+    grid_keys = []
+    for key, value in sample.items():
+        if isinstance(sample, FractalData) and key in FractalData.STORED_KEYS:
+            grid_keys.append(key)
+        elif isinstance(value, np.ndarray) and value.shape[:2] == tuple(sample_shape):
+            frame[key] = np.empty((height_px, width_px) + value.shape[2:], dtype=value.dtype)
+            grid_keys.append(key)
+        else:
+            frame[key] = value
+    return frame, grid_keys
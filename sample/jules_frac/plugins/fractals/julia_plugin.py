@@ -1,47 +1,94 @@
 import numpy as np
-from numba import jit
-from plugins.base_fractal_plugin import FractalPlugin
+from numba import jit, prange
+from plugins.base_fractal_plugin import FractalPlugin, pixel_grid
+from plugins.fractal_data import FractalData
+from utils.complex_power import complex_int_power_jit, complex_polar_power_jit, is_integer_power
+from utils.symmetry import is_centred_grid, point_symmetric_regions, fill_point_symmetric
 from logger.custom_logger import CustomLogger # logger がプロジェクトルート/loggerにあると仮定
 
 logger = CustomLogger()
-@jit(nopython=True) # Numba JITコンパイラを適用します。
-def _calculate_julia_point_jit(z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
+@jit(nopython=True)
+def _calculate_julia_point_quadratic_jit(z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq):
     """
-    ジュリア集合の単一の点に対する計算をJITコンパイルで実行します。
-    power: z^power + c の power
+    次数2（z^2 + c）専用の単一点計算。実数演算のみで反復し、|z|^2 の計算結果を再利用します。
+    """
+    z_real = z_real_start
+    z_imag = z_imag_start
+    for i in range(max_iters):
+        z_real_sq = z_real * z_real
+        z_imag_sq = z_imag * z_imag
+        if z_real_sq + z_imag_sq > escape_radius_sq:
+            return i, z_real, z_imag
+        z_imag = 2.0 * z_real * z_imag + c_imag_const
+        z_real = z_real_sq - z_imag_sq + c_real_const
+    return max_iters, z_real, z_imag
+
+@jit(nopython=True)
+def _calculate_julia_point_int_power_jit(z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
+    """
+    整数次数（z^power + c）の単一点計算。z^power を繰り返し二乗で求めます。
+    """
+    z_real = z_real_start
+    z_imag = z_imag_start
+    for i in range(max_iters):
+        if z_real * z_real + z_imag * z_imag > escape_radius_sq:
+            return i, z_real, z_imag
+        z_real_pow, z_imag_pow = complex_int_power_jit(z_real, z_imag, power)
+        z_real = z_real_pow + c_real_const
+        z_imag = z_imag_pow + c_imag_const
+    return max_iters, z_real, z_imag
+
+@jit(nopython=True)
+def _calculate_julia_point_polar_jit(z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
+    """
+    整数でない次数の単一点計算。z^power を極形式（arctan2, cos, sin）で求めます。
     """
     z_real = z_real_start
     z_imag = z_imag_start
     for i in range(max_iters):
-        z_mod = (z_real ** 2 + z_imag ** 2) ** 0.5
-        if z_mod * z_mod > escape_radius_sq:
+        if z_real * z_real + z_imag * z_imag > escape_radius_sq:
             return i, z_real, z_imag
-        # z^power の計算
-        r = z_mod ** power
-        theta = np.arctan2(z_imag, z_real) * power
-        z_real_new = r * np.cos(theta) + c_real_const
-        z_imag_new = r * np.sin(theta) + c_imag_const
-        z_real = z_real_new
-        z_imag = z_imag_new
+        z_real_pow, z_imag_pow = complex_polar_power_jit(z_real, z_imag, power)
+        z_real = z_real_pow + c_real_const
+        z_imag = z_imag_pow + c_imag_const
     return max_iters, z_real, z_imag
 
 @jit(nopython=True) # Numba JITコンパイラを適用します。
-def _compute_julia_grid_jit(width_px, height_px, min_x, max_x, min_y, max_y,
+def _calculate_julia_point_jit(z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
+    """
+    ジュリア集合の単一の点に対する計算をJITコンパイルで実行します。
+    power: z^power + c の power
+
+    次数に応じて反復ループごと専用の実装へ振り分けるため、ループ内で分岐は発生しません。
+    次数2は専用ループ、その他の整数次数は繰り返し二乗、整数でない次数のみ極形式を使用します。
+    """
+    if power == 2:
+        return _calculate_julia_point_quadratic_jit(
+            z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq)
+    if is_integer_power(power):
+        return _calculate_julia_point_int_power_jit(
+            z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, int(power))
+    return _calculate_julia_point_polar_jit(
+        z_real_start, z_imag_start, c_real_const, c_imag_const, max_iters, escape_radius_sq, power)
+
+@jit(nopython=True, parallel=True)
+def _compute_julia_grid_jit(width_px, height_px, pixel_width, x_offset, pixel_height, y_offset,
                             c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
     """
-    指定されたグリッドのジュリア集合をJITコンパイルで計算します。
+    指定されたグリッドのジュリア集合をJITコンパイルで並列計算します。
 
     Args:
         width_px (int): 画像の幅（ピクセル）。
         height_px (int): 画像の高さ（ピクセル）。
-        min_x (float): 複素平面のx軸の最小値 (z_real_startの範囲)。
-        max_x (float): 複素平面のx軸の最大値 (z_real_startの範囲)。
-        min_y (float): 複素平面のy軸の最小値 (z_imag_startの範囲)。
-        max_y (float): 複素平面のy軸の最大値 (z_imag_startの範囲)。
+        pixel_width (float): 1ピクセルの実軸方向の幅。
+        x_offset (float): 列 0 の格子上の位置。列 x の z_real_start は (x_offset + x) * pixel_width (pixel_grid 参照)。
+        pixel_height (float): 1ピクセルの虚軸方向の高さ。
+        y_offset (float): 行 0 の格子上の位置。行 y の z_imag_start は (y_offset + y) * pixel_height。
         c_real_const (float): 定数複素数cの実数部。
         c_imag_const (float): 定数複素数cの虚数部。
         max_iters (int): 最大反復回数。
         escape_radius_sq (float): 発散とみなすための半径の2乗。
+        power (int | float): zの次数。
 
     Returns:
         tuple[np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列, 最後のzの虚数部の配列)。
@@ -50,13 +97,10 @@ def _compute_julia_grid_jit(width_px, height_px, min_x, max_x, min_y, max_y,
     last_z_real_result = np.empty((height_px, width_px), dtype=np.float64)
     last_z_imag_result = np.empty((height_px, width_px), dtype=np.float64)
 
-    pixel_width_complex = (max_x - min_x) / width_px
-    pixel_height_complex = (max_y - min_y) / height_px
-
-    for y_idx in range(height_px):
-        z_imag_start = min_y + y_idx * pixel_height_complex
+    for y_idx in prange(height_px): # prangeを使用して並列化を明示
+        z_imag_start = (y_offset + y_idx) * pixel_height
         for x_idx in range(width_px):
-            z_real_start = min_x + x_idx * pixel_width_complex
+            z_real_start = (x_offset + x_idx) * pixel_width
             iter_val, last_zr, last_zi = _calculate_julia_point_jit(
                 z_real_start, z_imag_start,
                 c_real_const, c_imag_const,
@@ -67,6 +111,27 @@ def _compute_julia_grid_jit(width_px, height_px, min_x, max_x, min_y, max_y,
             last_z_imag_result[y_idx, x_idx] = last_zi
     return iter_result, last_z_real_result, last_z_imag_result
 
+@jit(nopython=True, parallel=True)
+def _compute_julia_points_jit(z_real_flat, z_imag_flat, c_real_const, c_imag_const, max_iters, escape_radius_sq, power):
+    """
+    任意の初期値 (1次元配列) のジュリア集合をJITコンパイルで並列計算します。
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列, 最後のzの虚数部の配列)。
+    """
+    num_points = z_real_flat.shape[0]
+    iter_result = np.empty(num_points, dtype=np.int32)
+    last_z_real_result = np.empty(num_points, dtype=np.float64)
+    last_z_imag_result = np.empty(num_points, dtype=np.float64)
+    for i in prange(num_points):
+        iter_val, last_zr, last_zi = _calculate_julia_point_jit(
+            z_real_flat[i], z_imag_flat[i], c_real_const, c_imag_const, max_iters, escape_radius_sq, power
+        )
+        iter_result[i] = iter_val
+        last_z_real_result[i] = last_zr
+        last_z_imag_result[i] = last_zi
+    return iter_result, last_z_real_result, last_z_imag_result
+
 
 class JuliaPlugin(FractalPlugin):
     """ジュリア集合を計算するためのフラクタルプラグイン。"""
@@ -121,7 +186,7 @@ class JuliaPlugin(FractalPlugin):
             'max_iterations': 100
         }
 
-    def compute_fractal(self, common_params: dict, plugin_params: dict, image_width_px: int, image_height_px: int) -> dict:
+    def compute_fractal(self, common_params: dict, plugin_params: dict, image_width_px: int, image_height_px: int) -> FractalData:
         """
         指定されたパラメータに基づいてジュリア集合を計算します。
 
@@ -132,12 +197,8 @@ class JuliaPlugin(FractalPlugin):
             image_height_px (int): 生成する画像の高さ（ピクセル）。
 
         Returns:
-            dict: 計算結果。'iterations', 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' を含みます。
+            FractalData: 計算結果。'iterations', 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' を参照できます。
         """
-        center_real = common_params['center_real']
-        center_imag = common_params['center_imag']
-        width = common_params['width']
-        height = common_params['height']
         max_iterations = common_params['max_iterations']
         escape_radius = common_params.get('escape_radius', 2.0)
         escape_radius_sq = escape_radius * escape_radius
@@ -146,33 +207,75 @@ class JuliaPlugin(FractalPlugin):
         c_imag_const = plugin_params.get('c_imag', self.get_parameters_definition()[1]['default'])
         power = plugin_params.get('power', self.get_parameters_definition()[2]['default'])
 
-        min_x = center_real - width / 2.0
-        max_x = center_real + width / 2.0
-        min_y = center_imag - height / 2.0
-        max_y = center_imag + height / 2.0
+        pixel_width, x_offset, pixel_height, y_offset = pixel_grid(common_params, image_width_px, image_height_px)
+        min_x = x_offset * pixel_width
+        min_y = y_offset * pixel_height
 
         logger.log(f"計算開始 - C=({c_real_const:.4f} + {c_imag_const:.4f}i), power={power}, "
               f"画像: {image_width_px}x{image_height_px}px, "
-              f"複素領域: 実数部 ({min_x:.4f} から {max_x:.4f}), 虚数部 ({min_y:.4f} から {max_y:.4f}), "
+              f"複素領域: 実数部 ({min_x:.4f} から {min_x + image_width_px * pixel_width:.4f}), "
+              f"虚数部 ({min_y:.4f} から {min_y + image_height_px * pixel_height:.4f}), "
               f"最大反復回数: {max_iterations}", level="DEBUG")
 
-        iter_array, last_z_real_array, last_z_imag_array = _compute_julia_grid_jit(
-            image_width_px, image_height_px,
-            min_x, max_x, min_y, max_y,
-            c_real_const, c_imag_const,
-            max_iterations, escape_radius_sq, power
+        use_symmetry = (self.is_point_symmetric(plugin_params) and
+                        is_centred_grid(x_offset, y_offset, image_width_px, image_height_px))
+
+        if use_symmetry:
+            # 原点対称: 上半分と列0だけを計算し、残りは複製する
+            iter_array = np.empty((image_height_px, image_width_px), dtype=np.int32)
+            last_z_real_array = np.empty((image_height_px, image_width_px), dtype=np.float64)
+            last_z_imag_array = np.empty((image_height_px, image_width_px), dtype=np.float64)
+            for y0, y1, x0, x1 in point_symmetric_regions(image_height_px, image_width_px):
+                region_iters, region_zr, region_zi = _compute_julia_grid_jit(
+                    x1 - x0, y1 - y0,
+                    pixel_width, x_offset + x0, pixel_height, y_offset + y0,
+                    c_real_const, c_imag_const,
+                    max_iterations, escape_radius_sq, power
+                )
+                iter_array[y0:y1, x0:x1] = region_iters
+                last_z_real_array[y0:y1, x0:x1] = region_zr
+                last_z_imag_array[y0:y1, x0:x1] = region_zi
+        else:
+            iter_array, last_z_real_array, last_z_imag_array = _compute_julia_grid_jit(
+                image_width_px, image_height_px,
+                pixel_width, x_offset, pixel_height, y_offset,
+                c_real_const, c_imag_const,
+                max_iterations, escape_radius_sq, power
+            )
+        # 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' は参照時に FractalData が導出する
+        fractal_data = FractalData(iter_array, last_z_real_array, last_z_imag_array, max_iterations)
+        if use_symmetry:
+            fill_point_symmetric(fractal_data, image_height_px, image_width_px)
+
+        logger.log(f"計算完了。反復回数配列形状: {iter_array.shape}, 原点対称の利用: {use_symmetry}", level="DEBUG")
+        return fractal_data
+
+    def compute_points(self, common_params: dict, plugin_params: dict,
+                       real_coords: np.ndarray, imag_coords: np.ndarray) -> FractalData:
+        """任意の初期値 z0 = real_coords + i*imag_coords についてジュリア集合を計算します。"""
+        max_iterations = common_params['max_iterations']
+        escape_radius = common_params.get('escape_radius', 2.0)
+        c_real_const = plugin_params.get('c_real', self.get_parameters_definition()[0]['default'])
+        c_imag_const = plugin_params.get('c_imag', self.get_parameters_definition()[1]['default'])
+        power = plugin_params.get('power', self.get_parameters_definition()[2]['default'])
+        shape = np.shape(real_coords)
+        iter_flat, last_z_real_flat, last_z_imag_flat = _compute_julia_points_jit(
+            np.ascontiguousarray(real_coords, dtype=np.float64).ravel(),
+            np.ascontiguousarray(imag_coords, dtype=np.float64).ravel(),
+            c_real_const, c_imag_const, max_iterations, escape_radius * escape_radius, power
         )
-        last_zn_values_complex = last_z_real_array + 1j * last_z_imag_array
-        last_z_modulus_sq = np.abs(last_zn_values_complex)**2 # |Z|^2 を計算
-        is_diverged = iter_array < max_iterations
+        return FractalData(iter_flat.reshape(shape), last_z_real_flat.reshape(shape),
+                           last_z_imag_flat.reshape(shape), max_iterations)
 
-        logger.log(f"計算完了。反復回数配列形状: {iter_array.shape}, last_zn_values形状: {last_zn_values_complex.shape}", level="DEBUG")
-        return {
-            'iterations': iter_array,
-            'last_zn_values': last_zn_values_complex,
-            'last_z_modulus_sq': last_z_modulus_sq,
-            'is_diverged': is_diverged
-        }
+    def is_point_symmetric(self, plugin_params: dict) -> bool:
+        """
+        偶数次数では (-z)^d = z^d となるため、ジュリア集合は原点対称になります。
+
+        z^d + c は 2π/d の回転についても対称ですが、ピクセル格子と重なるのは π の回転
+        (原点対称) だけなので、偶数次数の場合のみ True を返します。
+        """
+        power = plugin_params.get('power', self.get_parameters_definition()[2]['default'])
+        return float(power).is_integer() and int(power) % 2 == 0
 
     def get_presets(self) -> dict | None:
         """利用可能なC定数のプリセットを返します。"""
@@ -225,6 +328,20 @@ if __name__ == '__main__':
     logger.log(f"  反復回数配列形状: {iter_result_array.shape}, dtype: {iter_result_array.dtype}", level="DEBUG")
     logger.log(f"  last_zn_values 配列形状: {last_zn_values_array.shape}, dtype: {last_zn_values_array.dtype}", level="DEBUG")
 
+    # 原点対称: 上半分から複製した結果は、対称性を使わずに全体を計算した結果とビット単位で一致する (偶数・奇数の大きさ)
+    assert plugin.is_point_symmetric(test_plugin_params)
+    for width_px, height_px in ((img_width_test, img_height_test), (img_width_test + 1, img_height_test + 1)):
+        mirrored = plugin.compute_fractal(test_common_params, test_plugin_params, width_px, height_px)
+        grid = pixel_grid(test_common_params, width_px, height_px)
+        assert is_centred_grid(grid[1], grid[3], width_px, height_px)
+        direct = _compute_julia_grid_jit(
+            width_px, height_px, *grid,
+            test_plugin_params.get('c_real', param_defs[0]['default']), test_plugin_params.get('c_imag', param_defs[1]['default']),
+            test_common_params['max_iterations'], test_common_params['escape_radius'] ** 2,
+            test_plugin_params.get('power', param_defs[2]['default']))
+        for key, expected in zip(('iterations', 'last_z_real', 'last_z_imag'), direct):
+            assert np.array_equal(np.asarray(mirrored[key]), expected), f"{width_px}x{height_px} の '{key}' が全体計算と一致しません"
+    logger.log("原点対称の複製 == 全体計算", level="INFO")
 
     try:
         import matplotlib.pyplot as plt
@@ -1,47 +1,92 @@
+import math
 import numpy as np
 from numba import jit, prange
-from plugins.base_fractal_plugin import FractalPlugin
+from plugins.base_fractal_plugin import FractalPlugin, pixel_grid
+from plugins.fractal_data import FractalData
+from utils.complex_power import complex_int_power_jit, complex_polar_power_jit, is_integer_power
 from logger.custom_logger import CustomLogger # logger がプロジェクトルート/loggerにあると仮定
 
 logger = CustomLogger()
 
 @jit(nopython=True)
-def _calculate_mandelbrot_point_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+def _calculate_mandelbrot_point_quadratic_jit(c_real, c_imag, max_iters, escape_radius_sq):
     """
-    マンデルブロ集合（マルチブロ）の単一の点に対する計算をJITコンパイルで実行します。
-    power: zの次数
+    次数2（z^2 + c）専用の単一点計算。実数演算のみで反復し、|z|^2 の計算結果を再利用します。
     """
     z_real = 0.0
     z_imag = 0.0
+    z_real_sq = 0.0
+    z_imag_sq = 0.0
     for i in range(max_iters):
-        # 複素数z = z_real + i*z_imag のpower乗を計算
-        r = (z_real**2 + z_imag**2) ** (power / 2)
-        theta = np.arctan2(z_imag, z_real) * power
-        z_real_pow = r * np.cos(theta)
-        z_imag_pow = r * np.sin(theta)
-        z_real_new = z_real_pow + c_real
-        z_imag_new = z_imag_pow + c_imag
-        mod_sq = z_real_new * z_real_new + z_imag_new * z_imag_new
-        if mod_sq > escape_radius_sq:
-            return i, z_real_new, z_imag_new
-        z_real = z_real_new
-        z_imag = z_imag_new
+        z_imag = 2.0 * z_real * z_imag + c_imag
+        z_real = z_real_sq - z_imag_sq + c_real
+        z_real_sq = z_real * z_real
+        z_imag_sq = z_imag * z_imag
+        if z_real_sq + z_imag_sq > escape_radius_sq:
+            return i, z_real, z_imag
     return max_iters, z_real, z_imag
 
+@jit(nopython=True)
+def _calculate_mandelbrot_point_int_power_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+    """
+    整数次数（z^power + c）の単一点計算。z^power を繰り返し二乗で求めます。
+    """
+    z_real = 0.0
+    z_imag = 0.0
+    for i in range(max_iters):
+        z_real_pow, z_imag_pow = complex_int_power_jit(z_real, z_imag, power)
+        z_real = z_real_pow + c_real
+        z_imag = z_imag_pow + c_imag
+        if z_real * z_real + z_imag * z_imag > escape_radius_sq:
+            return i, z_real, z_imag
+    return max_iters, z_real, z_imag
+
+@jit(nopython=True)
+def _calculate_mandelbrot_point_polar_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+    """
+    整数でない次数の単一点計算。z^power を極形式（arctan2, cos, sin）で求めます。
+    """
+    z_real = 0.0
+    z_imag = 0.0
+    for i in range(max_iters):
+        z_real_pow, z_imag_pow = complex_polar_power_jit(z_real, z_imag, power)
+        z_real = z_real_pow + c_real
+        z_imag = z_imag_pow + c_imag
+        if z_real * z_real + z_imag * z_imag > escape_radius_sq:
+            return i, z_real, z_imag
+    return max_iters, z_real, z_imag
+
+@jit(nopython=True)
+def _calculate_mandelbrot_point_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+    """
+    マンデルブロ集合（マルチブロ）の単一の点に対する計算をJITコンパイルで実行します。
+    power: zの次数
+
+    次数に応じて反復ループごと専用の実装へ振り分けるため、ループ内で分岐は発生しません。
+    次数2は専用ループ、その他の整数次数は繰り返し二乗、整数でない次数のみ極形式を使用します。
+    """
+    if power == 2:
+        return _calculate_mandelbrot_point_quadratic_jit(c_real, c_imag, max_iters, escape_radius_sq)
+    if is_integer_power(power):
+        return _calculate_mandelbrot_point_int_power_jit(c_real, c_imag, max_iters, escape_radius_sq, int(power))
+    return _calculate_mandelbrot_point_polar_jit(c_real, c_imag, max_iters, escape_radius_sq, power)
+
 @jit(nopython=True, parallel=True)
-def _compute_mandelbrot_grid_jit(width_px, height_px, min_x, max_x, min_y, max_y, max_iters, escape_radius_sq, power):
+def _compute_mandelbrot_grid_jit(width_px, height_px, pixel_width, x_offset, pixel_height, y_offset,
+                                 max_iters, escape_radius_sq, power):
     """
     指定されたグリッドのマンデルブロ集合をJITコンパイルで並列計算します。
 
     Args:
         width_px (int): 画像の幅（ピクセル）。
         height_px (int): 画像の高さ（ピクセル）。
-        min_x (float): 複素平面のx軸の最小値。
-        max_x (float): 複素平面のx軸の最大値。
-        min_y (float): 複素平面のy軸の最小値。
-        max_y (float): 複素平面のy軸の最大値。
+        pixel_width (float): 1ピクセルの実軸方向の幅。
+        x_offset (float): 列 0 の格子上の位置。列 x の実部は (x_offset + x) * pixel_width (pixel_grid 参照)。
+        pixel_height (float): 1ピクセルの虚軸方向の高さ。
+        y_offset (float): 行 0 の格子上の位置。行 y の虚部は (y_offset + y) * pixel_height。
         max_iters (int): 最大反復回数。
         escape_radius_sq (float): 発散とみなすための半径の2乗。
+        power (int | float): zの次数。
 
     Returns:
         tuple[np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列, 最後のzの虚数部の配列)。
@@ -50,19 +95,235 @@ def _compute_mandelbrot_grid_jit(width_px, height_px, min_x, max_x, min_y, max_y
     last_z_real_result = np.empty((height_px, width_px), dtype=np.float64)
     last_z_imag_result = np.empty((height_px, width_px), dtype=np.float64)
 
-    pixel_width_complex = (max_x - min_x) / width_px
-    pixel_height_complex = (max_y - min_y) / height_px
 
     for y_idx in prange(height_px): # prangeを使用して並列化を明示
-        c_imag = min_y + y_idx * pixel_height_complex
+        c_imag = (y_offset + y_idx) * pixel_height
         for x_idx in range(width_px):
-            c_real = min_x + x_idx * pixel_width_complex
+            c_real = (x_offset + x_idx) * pixel_width
             iter_val, last_zr, last_zi = _calculate_mandelbrot_point_jit(c_real, c_imag, max_iters, escape_radius_sq, power)
             iter_result[y_idx, x_idx] = iter_val
             last_z_real_result[y_idx, x_idx] = last_zr
             last_z_imag_result[y_idx, x_idx] = last_zi
     return iter_result, last_z_real_result, last_z_imag_result
 
+@jit(nopython=True, parallel=True)
+def _compute_mandelbrot_points_jit(c_real_flat, c_imag_flat, max_iters, escape_radius_sq, power):
+    """
+    任意の点 (1次元配列) のマンデルブロ集合をJITコンパイルで並列計算します。
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列, 最後のzの虚数部の配列)。
+    """
+    num_points = c_real_flat.shape[0]
+    iter_result = np.empty(num_points, dtype=np.int32)
+    last_z_real_result = np.empty(num_points, dtype=np.float64)
+    last_z_imag_result = np.empty(num_points, dtype=np.float64)
+    for i in prange(num_points):
+        iter_val, last_zr, last_zi = _calculate_mandelbrot_point_jit(c_real_flat[i], c_imag_flat[i], max_iters, escape_radius_sq, power)
+        iter_result[i] = iter_val
+        last_z_real_result[i] = last_zr
+        last_z_imag_result[i] = last_zi
+    return iter_result, last_z_real_result, last_z_imag_result
+
+# 距離推定の誤差を小さくするため、脱出後も |z|^2 がこの値を超えるまで反復を続ける (|z| = 1e5)
+_DE_BAILOUT_SQ = 1e10
+# 脱出後に距離推定のために続ける反復回数の上限
+_DE_EXTRA_ITERS = 32
+# 距離推定による早期打ち切りでまとめて判定するタイルの一辺 (ピクセル)
+_DE_TILE_PX = 16
+
+@jit(nopython=True)
+def _mandelbrot_derivative_step(z_real, z_imag, dz_real, dz_imag, c_real, c_imag, power):
+    """
+    z <- z^power + c と、c についての導関数 dz <- power * z^(power-1) * dz + 1 を1回計算します。
+    z^power は `_calculate_mandelbrot_point_jit` と同じ方法で求めるため、反復回数と最終Zは一致します。
+    """
+    if is_integer_power(power):
+        z_real_pow, z_imag_pow = complex_int_power_jit(z_real, z_imag, int(power))
+        z_real_der, z_imag_der = complex_int_power_jit(z_real, z_imag, int(power) - 1)
+    else:
+        z_real_pow, z_imag_pow = complex_polar_power_jit(z_real, z_imag, power)
+        z_real_der, z_imag_der = complex_polar_power_jit(z_real, z_imag, power - 1.0)
+    new_dz_real = power * (z_real_der * dz_real - z_imag_der * dz_imag) + 1.0
+    new_dz_imag = power * (z_real_der * dz_imag + z_imag_der * dz_real)
+    return z_real_pow + c_real, z_imag_pow + c_imag, new_dz_real, new_dz_imag
+
+@jit(nopython=True)
+def _exterior_distance_jit(z_real, z_imag, dz_real, dz_imag, c_real, c_imag, power):
+    """
+    脱出した点の反復を |z|^2 > _DE_BAILOUT_SQ まで続け、外部距離推定 |z| log|z| / |dz/dc| を返します。
+
+    推定値 DE と集合までの真の距離 d は、おおよそ DE / 2 < d < 2 * DE の関係にあります。
+    導関数がオーバーフローした点 (境界のごく近く) は 0 になります。
+    """
+    for _ in range(_DE_EXTRA_ITERS):
+        if z_real * z_real + z_imag * z_imag > _DE_BAILOUT_SQ:
+            break
+        z_real, z_imag, dz_real, dz_imag = _mandelbrot_derivative_step(
+            z_real, z_imag, dz_real, dz_imag, c_real, c_imag, power)
+    z_abs = math.sqrt(z_real * z_real + z_imag * z_imag)
+    dz_abs = math.sqrt(dz_real * dz_real + dz_imag * dz_imag)
+    if dz_abs == 0.0:
+        return np.inf
+    return max(z_abs * math.log(z_abs), 0.0) / dz_abs
+
+@jit(nopython=True)
+def _calculate_mandelbrot_point_quadratic_de_jit(c_real, c_imag, max_iters, escape_radius_sq):
+    """
+    次数2専用の、導関数 dz/dc も追跡する単一点計算。反復回数と最終Zは
+    `_calculate_mandelbrot_point_quadratic_jit` と同じ値になります。
+    """
+    z_real = 0.0
+    z_imag = 0.0
+    z_real_sq = 0.0
+    z_imag_sq = 0.0
+    dz_real = 0.0
+    dz_imag = 0.0
+    for i in range(max_iters):
+        # dz <- 2 z dz + 1 (更新前の z を使う)
+        new_dz_real = 2.0 * (z_real * dz_real - z_imag * dz_imag) + 1.0
+        dz_imag = 2.0 * (z_real * dz_imag + z_imag * dz_real)
+        dz_real = new_dz_real
+        z_imag = 2.0 * z_real * z_imag + c_imag
+        z_real = z_real_sq - z_imag_sq + c_real
+        z_real_sq = z_real * z_real
+        z_imag_sq = z_imag * z_imag
+        if z_real_sq + z_imag_sq > escape_radius_sq:
+            return i, z_real, z_imag, _exterior_distance_jit(z_real, z_imag, dz_real, dz_imag, c_real, c_imag, 2)
+    return max_iters, z_real, z_imag, 0.0
+
+@jit(nopython=True)
+def _calculate_mandelbrot_point_general_de_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+    """
+    次数2以外の、導関数 dz/dc も追跡する単一点計算。反復回数と最終Zは
+    `_calculate_mandelbrot_point_jit` と同じ値になります。
+    """
+    z_real = 0.0
+    z_imag = 0.0
+    dz_real = 0.0
+    dz_imag = 0.0
+    for i in range(max_iters):
+        z_real, z_imag, dz_real, dz_imag = _mandelbrot_derivative_step(
+            z_real, z_imag, dz_real, dz_imag, c_real, c_imag, power)
+        if z_real * z_real + z_imag * z_imag > escape_radius_sq:
+            return i, z_real, z_imag, _exterior_distance_jit(z_real, z_imag, dz_real, dz_imag, c_real, c_imag, power)
+    return max_iters, z_real, z_imag, 0.0
+
+@jit(nopython=True)
+def _calculate_mandelbrot_point_de_jit(c_real, c_imag, max_iters, escape_radius_sq, power):
+    """
+    `_calculate_mandelbrot_point_jit` に外部距離推定を加えた単一点計算です。
+
+    Returns:
+        tuple[int, float, float, float]: (反復回数, 最終Zの実数部, 最終Zの虚数部, 距離推定 (複素平面の単位))。
+            集合内の点 (最大反復回数に達した点) の距離推定は 0 です。
+    """
+    if power == 2:
+        return _calculate_mandelbrot_point_quadratic_de_jit(c_real, c_imag, max_iters, escape_radius_sq)
+    return _calculate_mandelbrot_point_general_de_jit(c_real, c_imag, max_iters, escape_radius_sq, power)
+
+@jit(nopython=True, parallel=True)
+def _compute_mandelbrot_grid_de_jit(width_px, height_px, pixel_width, x_offset, pixel_height, y_offset,
+                                    max_iters, escape_radius_sq, power,
+                                    de_pixel_size, early_out_px, tile_px):
+    """
+    `_compute_mandelbrot_grid_jit` に外部距離推定を加えた並列計算です。画像を一辺 tile_px のタイルに分けて計算します。
+
+    early_out_px が正で次数が整数の場合、各タイルの中央の点を先に計算し、その距離推定から
+    タイル内のすべての点の距離推定が early_out_px ピクセル以上と保証できれば、タイルの各点を反復せずに
+    中央の点の結果で埋めます。中央の点の真の距離は DE / 4 以上 (Koebe の 1/4 定理) で、各点の真の距離は
+    そこからタイル中央までの距離 r を引いた値以上、各点の距離推定は真の距離の 1/2 以上なので、
+    埋める距離推定 (DE / 4 - r) / 2 はタイル内の各点の距離推定の下限です。
+    タイルはこの呼び出しの格子の左下から区切るため、画像を帯に分けて計算した場合は埋めるタイルが
+    全体を計算した場合と異なることがあります。埋めた点はどちらの場合も early_out_px 以上の距離推定を持ちます。
+
+    Args:
+        width_px (int): 画像の幅（ピクセル）。
+        height_px (int): 画像の高さ（ピクセル）。
+        pixel_width (float): 1ピクセルの実軸方向の幅。
+        x_offset (float): 列 0 の格子上の位置。列 x の実部は (x_offset + x) * pixel_width (pixel_grid 参照)。
+        pixel_height (float): 1ピクセルの虚軸方向の高さ。
+        y_offset (float): 行 0 の格子上の位置。行 y の虚部は (y_offset + y) * pixel_height。
+        max_iters (int): 最大反復回数。
+        escape_radius_sq (float): 発散とみなすための半径の2乗。
+        power (int | float): zの次数。
+        de_pixel_size (float): 距離推定の単位とする1ピクセルの大きさ (複素平面の単位)。
+        early_out_px (float): タイルを埋めてよい距離推定の下限 (ピクセル)。0 以下の場合は打ち切りません。
+        tile_px (int): タイルの一辺 (ピクセル)。
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列,
+            最後のzの虚数部の配列, 距離推定の配列 (ピクセル単位, float32))。
+    """
+    iter_result = np.empty((height_px, width_px), dtype=np.int32)
+    last_z_real_result = np.empty((height_px, width_px), dtype=np.float64)
+    last_z_imag_result = np.empty((height_px, width_px), dtype=np.float64)
+    distance_result = np.empty((height_px, width_px), dtype=np.float32)
+
+    tiles_x = (width_px + tile_px - 1) // tile_px
+    tiles_y = (height_px + tile_px - 1) // tile_px
+    early_out = early_out_px > 0.0 and is_integer_power(power)
+
+    for tile in prange(tiles_x * tiles_y):
+        y0 = (tile // tiles_x) * tile_px
+        x0 = (tile % tiles_x) * tile_px
+        y1 = min(y0 + tile_px, height_px)
+        x1 = min(x0 + tile_px, width_px)
+
+        filled = False
+        if early_out:
+            half_w = (x1 - 1 - x0) * 0.5 * pixel_width
+            half_h = (y1 - 1 - y0) * 0.5 * pixel_height
+            iter_val, last_zr, last_zi, distance = _calculate_mandelbrot_point_de_jit(
+                (x_offset + x0) * pixel_width + half_w, (y_offset + y0) * pixel_height + half_h,
+                max_iters, escape_radius_sq, power)
+            if iter_val < max_iters:
+                lower_px = (0.25 * distance - math.sqrt(half_w * half_w + half_h * half_h)) * 0.5 / de_pixel_size
+                if lower_px >= early_out_px:
+                    for y_idx in range(y0, y1):
+                        for x_idx in range(x0, x1):
+                            iter_result[y_idx, x_idx] = iter_val
+                            last_z_real_result[y_idx, x_idx] = last_zr
+                            last_z_imag_result[y_idx, x_idx] = last_zi
+                            distance_result[y_idx, x_idx] = lower_px
+                    filled = True
+
+        if not filled:
+            for y_idx in range(y0, y1):
+                c_imag = (y_offset + y_idx) * pixel_height
+                for x_idx in range(x0, x1):
+                    c_real = (x_offset + x_idx) * pixel_width
+                    iter_val, last_zr, last_zi, distance = _calculate_mandelbrot_point_de_jit(
+                        c_real, c_imag, max_iters, escape_radius_sq, power)
+                    iter_result[y_idx, x_idx] = iter_val
+                    last_z_real_result[y_idx, x_idx] = last_zr
+                    last_z_imag_result[y_idx, x_idx] = last_zi
+                    distance_result[y_idx, x_idx] = distance / de_pixel_size
+    return iter_result, last_z_real_result, last_z_imag_result, distance_result
+
+@jit(nopython=True, parallel=True)
+def _compute_mandelbrot_points_de_jit(c_real_flat, c_imag_flat, max_iters, escape_radius_sq, power, de_pixel_size):
+    """
+    `_compute_mandelbrot_points_jit` に外部距離推定 (de_pixel_size を単位とするピクセル数, float32) を加えた並列計算です。
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (反復回数の配列, 最後のzの実数部の配列,
+            最後のzの虚数部の配列, 距離推定の配列)。
+    """
+    num_points = c_real_flat.shape[0]
+    iter_result = np.empty(num_points, dtype=np.int32)
+    last_z_real_result = np.empty(num_points, dtype=np.float64)
+    last_z_imag_result = np.empty(num_points, dtype=np.float64)
+    distance_result = np.empty(num_points, dtype=np.float32)
+    for i in prange(num_points):
+        iter_val, last_zr, last_zi, distance = _calculate_mandelbrot_point_de_jit(
+            c_real_flat[i], c_imag_flat[i], max_iters, escape_radius_sq, power)
+        iter_result[i] = iter_val
+        last_z_real_result[i] = last_zr
+        last_z_imag_result[i] = last_zi
+        distance_result[i] = distance / de_pixel_size
+    return iter_result, last_z_real_result, last_z_imag_result, distance_result
+
 
 class MandelbrotPlugin(FractalPlugin):
     """マンデルブロ集合を計算するためのフラクタルプラグイン。"""
@@ -92,7 +353,7 @@ class MandelbrotPlugin(FractalPlugin):
             'width': 3.0,
         }
 
-    def compute_fractal(self, common_params: dict, plugin_params: dict, image_width_px: int, image_height_px: int) -> dict:
+    def compute_fractal(self, common_params: dict, plugin_params: dict, image_width_px: int, image_height_px: int) -> FractalData:
         """
         指定されたパラメータに基づいてマンデルブロ集合を計算します。
 
@@ -102,45 +363,80 @@ class MandelbrotPlugin(FractalPlugin):
             image_width_px (int): 生成する画像の幅（ピクセル）。
             image_height_px (int): 生成する画像の高さ（ピクセル）。
 
+        common_params の 'distance_estimate' が True の場合は導関数も追跡し、外部距離推定を
+        'distance_estimate' (ピクセル単位, float32) として追加します。単位とする1ピクセルの大きさは
+        'distance_estimate_pixel_size' (省略時はこの画像のピクセル幅)、'distance_estimate_early_out_px' が
+        正の場合は、距離推定がその値以上と保証できるタイルを反復せずに埋めます (`_compute_mandelbrot_grid_de_jit` 参照)。
+
         Returns:
-            dict: 計算結果。'iterations', 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' を含みます。
+            FractalData: 計算結果。'iterations', 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' を参照できます。
         """
-        center_real = common_params['center_real']
-        center_imag = common_params['center_imag']
-        width = common_params['width']
-        height = common_params['height']
         max_iterations = common_params['max_iterations']
         escape_radius = common_params.get('escape_radius', 2.0)
         escape_radius_sq = escape_radius * escape_radius
         power = plugin_params.get('power', 2)
 
-        min_x = center_real - width / 2.0
-        max_x = center_real + width / 2.0
-        min_y = center_imag - height / 2.0
-        max_y = center_imag + height / 2.0
+        pixel_width, x_offset, pixel_height, y_offset = pixel_grid(common_params, image_width_px, image_height_px)
+        region_min_x = x_offset * pixel_width
+        region_min_y = y_offset * pixel_height
 
         logger.log(f"計算開始 - 画像: {image_width_px}x{image_height_px}px, "
-              f"複素領域: 実数部 ({min_x:.4f} から {max_x:.4f}), 虚数部 ({min_y:.4f} から {max_y:.4f}), "
-              f"最大反復回数: {max_iterations}, 次数: {power}", level="INFO")
+              f"複素領域: 実数部 ({region_min_x:.4f} から {region_min_x + image_width_px * pixel_width:.4f}), "
+              f"虚数部 ({region_min_y:.4f} から {region_min_y + image_height_px * pixel_height:.4f}), "
+              f"最大反復回数: {max_iterations}, 次数: {power}", level="DEBUG")
 
-        iter_array, last_z_real_array, last_z_imag_array = _compute_mandelbrot_grid_jit(
-            image_width_px, image_height_px,
-            min_x, max_x, min_y, max_y,
-            max_iterations, escape_radius_sq, power
-        )
+        if common_params.get('distance_estimate', False):
+            de_pixel_size = common_params.get('distance_estimate_pixel_size') or pixel_width
+            iter_array, last_z_real_array, last_z_imag_array, distance_array = _compute_mandelbrot_grid_de_jit(
+                image_width_px, image_height_px,
+                pixel_width, x_offset, pixel_height, y_offset,
+                max_iterations, escape_radius_sq, power,
+                de_pixel_size, float(common_params.get('distance_estimate_early_out_px', 0.0)), _DE_TILE_PX
+            )
+        else:
+            iter_array, last_z_real_array, last_z_imag_array = _compute_mandelbrot_grid_jit(
+                image_width_px, image_height_px,
+                pixel_width, x_offset, pixel_height, y_offset,
+                max_iterations, escape_radius_sq, power
+            )
+            distance_array = None
 
-        last_zn_values_complex = last_z_real_array + 1j * last_z_imag_array
-        last_z_modulus_sq = np.abs(last_zn_values_complex)**2 # |Z|^2 を計算
+        # 'last_zn_values', 'last_z_modulus_sq', 'is_diverged' は参照時に FractalData が導出する
+        fractal_data = FractalData(iter_array, last_z_real_array, last_z_imag_array, max_iterations)
+        if distance_array is not None:
+            fractal_data['distance_estimate'] = distance_array
 
-        is_diverged = iter_array < max_iterations
+        logger.log(f"計算完了。反復回数配列形状: {iter_array.shape}", level="DEBUG")
+        return fractal_data
 
-        logger.log(f"計算完了。反復回数配列形状: {iter_array.shape}, last_zn_values形状: {last_zn_values_complex.shape}", level="DEBUG")
-        return {
-            'iterations': iter_array,
-            'last_zn_values': last_zn_values_complex, # 他の用途や互換性のために保持
-            'last_z_modulus_sq': last_z_modulus_sq,    # スムーズな色付けのために追加
-            'is_diverged': is_diverged
-        }
+    def compute_points(self, common_params: dict, plugin_params: dict,
+                       real_coords: np.ndarray, imag_coords: np.ndarray) -> FractalData:
+        """
+        任意の点 c = real_coords + i*imag_coords についてマンデルブロ集合を計算します。
+        'distance_estimate' の扱いは compute_fractal と同じですが、点が格子に並んでいないため
+        'distance_estimate_pixel_size' を省略すると距離推定は複素平面の単位になり、タイルによる打ち切りも行いません。
+        """
+        max_iterations = common_params['max_iterations']
+        escape_radius = common_params.get('escape_radius', 2.0)
+        power = plugin_params.get('power', 2)
+        shape = np.shape(real_coords)
+        real_flat = np.ascontiguousarray(real_coords, dtype=np.float64).ravel()
+        imag_flat = np.ascontiguousarray(imag_coords, dtype=np.float64).ravel()
+        if common_params.get('distance_estimate', False):
+            de_pixel_size = common_params.get('distance_estimate_pixel_size') or 1.0
+            iter_flat, last_z_real_flat, last_z_imag_flat, distance_flat = _compute_mandelbrot_points_de_jit(
+                real_flat, imag_flat, max_iterations, escape_radius * escape_radius, power, de_pixel_size
+            )
+        else:
+            iter_flat, last_z_real_flat, last_z_imag_flat = _compute_mandelbrot_points_jit(
+                real_flat, imag_flat, max_iterations, escape_radius * escape_radius, power
+            )
+            distance_flat = None
+        fractal_data = FractalData(iter_flat.reshape(shape), last_z_real_flat.reshape(shape),
+                                   last_z_imag_flat.reshape(shape), max_iterations)
+        if distance_flat is not None:
+            fractal_data['distance_estimate'] = distance_flat.reshape(shape)
+        return fractal_data
 
 if __name__ == '__main__':
     plugin = MandelbrotPlugin()
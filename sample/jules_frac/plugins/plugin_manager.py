@@ -1,8 +1,12 @@
+import copy
+import json
 import os
 import importlib.util
 import sys
 import inspect
+import threading
 from pathlib import Path
+from types import ModuleType
 
 # アプリケーションの構造に基づいた絶対インポートを使用します。
 # main.py で _project_root (jules_frac ディレクトリ) が sys.path に追加されるため、
@@ -13,159 +17,346 @@ from logger.custom_logger import CustomLogger
 
 logger = CustomLogger()
 
+MANIFEST_FILENAME = ".plugin_manifest.json"
+_MANIFEST_VERSION = 1
+
 class PluginManager:
     """
     フラクタルおよびカラーリングアルゴリズムプラグインの動的読み込みを管理します。
+
+    プラグインファイルごとの名前・ターゲットタイプ・パラメータ定義を、ファイルの更新時刻・サイズとともに
+    マニフェスト (`MANIFEST_FILENAME`) にキャッシュします。起動時はマニフェストと一致するファイルを
+    インポートせずに登録するため、UI の一覧やパラメータ定義はモジュールを読み込まずに用意できます。
+    プラグインのモジュールは、インスタンスが最初に要求されたとき (アクティブにしたときなど) に読み込みます。
     """
     def __init__(self,
                  project_root_path: Path,
                  fractal_plugin_folder_path: str = "plugins/fractals", # project_root_path からの相対パス
                  divergent_coloring_plugin_folder_path: str = "plugins/coloring/divergent", # 同上
-                 non_divergent_coloring_plugin_folder_path: str = "plugins/coloring/non_divergent"): # 同上
+                 non_divergent_coloring_plugin_folder_path: str = "plugins/coloring/non_divergent", # 同上
+                 manifest_path: Path | str | None = None):
         """
         PluginManager を初期化します。
         `fractal_plugin_folder_path`, `divergent_coloring_plugin_folder_path`,
         および `non_divergent_coloring_plugin_folder_path` は `project_root_path` からの相対パスです。
+        `manifest_path` を省略した場合、マニフェストは `project_root_path/plugins/MANIFEST_FILENAME` に保存します。
         """
         self.project_root = project_root_path
         self.fractal_plugin_folder = (self.project_root / fractal_plugin_folder_path).resolve()
-        self.fractal_plugins: dict[str, FractalPlugin] = {}
+        self.fractal_plugins: dict[str, FractalPlugin] = {} # 読み込み済みのインスタンス
         self.divergent_coloring_plugin_folder = (self.project_root / divergent_coloring_plugin_folder_path).resolve()
         self.non_divergent_coloring_plugin_folder = (self.project_root / non_divergent_coloring_plugin_folder_path).resolve()
         self.coloring_plugins: dict[str, ColoringAlgorithmPlugin] = {} # 単一の辞書で管理
+        self.manifest_path = Path(manifest_path) if manifest_path is not None else self.project_root / "plugins" / MANIFEST_FILENAME
+        self._fractal_entries: dict[str, dict] = {} # プラグイン名 -> マニフェストの項目 (読み込み前のプラグインも含む)
+        self._coloring_entries: dict[str, dict] = {}
+        self._modules: dict[str, ModuleType] = {} # ファイルパス -> 読み込んだモジュール
+        self._lock = threading.RLock() # バックグラウンドのウォームアップからも読み込まれるため
         self.load_all_plugins()
 
-    def load_all_plugins(self) -> None:
-        """すべての種類のプラグインを読み込みます。"""
-        logger.log("全プラグイン読込中...", level="INFO")
-        self.fractal_plugins.clear()
-        self.coloring_plugins.clear()
-
-        self._load_plugins_from_folder(
-            self.fractal_plugin_folder,
-            self.fractal_plugins,
-            FractalPlugin,
-            "Fractal"
-        )
-        self._load_plugins_from_folder(
-            self.divergent_coloring_plugin_folder,
-            self.coloring_plugins, #同じ辞書に追加
-            ColoringAlgorithmPlugin,
-            "Divergent Coloring Algorithm"
-        )
-        self._load_plugins_from_folder(
-            self.non_divergent_coloring_plugin_folder,
-            self.coloring_plugins, #同じ辞書に追加
-            ColoringAlgorithmPlugin,
-            "Non-Divergent Coloring Algorithm"
-        )
-
-    def _load_plugins_from_folder(self, folder_path: Path, target_dict: dict, base_class: type, plugin_type_name: str) -> None:
+    def load_all_plugins(self, use_manifest: bool = True) -> None:
+        """
+        すべての種類のプラグインを登録します。
+
+        Args:
+            use_manifest (bool, optional): True の場合、マニフェストと更新時刻・サイズが一致するファイルは
+                インポートせずにマニフェストの内容で登録します。False の場合はすべてのファイルを読み込み直します。
+                Defaults to True.
         """
-        指定された folder_path から特定の base_class のプラグインを target_dict に読み込みます。
-        このメソッドは呼び出し側で target_dict.clear() を行うことを想定しています。
+        logger.log("全プラグイン読込中...", level="INFO")
+        with self._lock:
+            self.fractal_plugins.clear()
+            self.coloring_plugins.clear()
+            self._fractal_entries.clear()
+            self._coloring_entries.clear()
+            self._modules.clear()
+
+            cached_files = self._read_manifest() if use_manifest else {}
+            manifest_files = {}
+            imported_files = 0
+            imported_files += self._register_plugins_from_folder(
+                self.fractal_plugin_folder,
+                self._fractal_entries,
+                self.fractal_plugins,
+                FractalPlugin,
+                "Fractal",
+                cached_files, manifest_files
+            )
+            imported_files += self._register_plugins_from_folder(
+                self.divergent_coloring_plugin_folder,
+                self._coloring_entries, #同じ辞書に追加
+                self.coloring_plugins,
+                ColoringAlgorithmPlugin,
+                "Divergent Coloring Algorithm",
+                cached_files, manifest_files
+            )
+            imported_files += self._register_plugins_from_folder(
+                self.non_divergent_coloring_plugin_folder,
+                self._coloring_entries, #同じ辞書に追加
+                self.coloring_plugins,
+                ColoringAlgorithmPlugin,
+                "Non-Divergent Coloring Algorithm",
+                cached_files, manifest_files
+            )
+            if imported_files or manifest_files.keys() != cached_files.keys():
+                self._write_manifest(manifest_files)
+        logger.log(f"プラグイン登録完了: フラクタル {len(self._fractal_entries)} 件, カラーリング {len(self._coloring_entries)} 件 "
+                   f"(読み込んだファイル {imported_files} 件)", level="DEBUG")
+
+    def _register_plugins_from_folder(self, folder_path: Path, entries: dict, loaded: dict, base_class: type,
+                                      plugin_type_name: str, cached_files: dict, manifest_files: dict) -> int:
         """
-        # target_dict.clear() # 呼び出し側 (load_all_plugins) でクリアするよう変更
+        指定された folder_path の base_class のプラグインを entries に登録します。
+
+        マニフェスト (cached_files) と更新時刻・サイズが一致するファイルはその内容で登録し、それ以外のファイルは
+        読み込んで調べます (このとき作成したインスタンスは loaded に保持します)。登録したファイルの項目は manifest_files に加えます。
+        このメソッドは呼び出し側で entries.clear() を行うことを想定しています。
 
-        logger.log(f"{plugin_type_name} プラグインを読込中...", level="INFO")
+        Returns:
+            int: 読み込んだファイルの数。
+        """
+        logger.log(f"{plugin_type_name} プラグインを登録中...", level="INFO")
 
         if not folder_path.is_dir():
             logger.log(f"{plugin_type_name} プラグインフォルダが見つかりません: {folder_path}", level="ERROR")
-            return
+            return 0
 
-        # プラグインは 'src.' からの絶対インポートを使用するため、sys.path の変更は不要です。
-        for file_path in folder_path.glob("*.py"):
-                module_name = file_path.stem
+        imported_files = 0
+        for file_path in sorted(folder_path.glob("*.py")):
+            module_name = file_path.stem
+            if module_name.startswith("__") or module_name in ["base_fractal_plugin", "base_coloring_plugin"]:
+                continue
 
-                if module_name.startswith("__") or module_name in ["base_fractal_plugin", "base_coloring_plugin"]:
+            key = str(file_path.resolve())
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.log(f"{plugin_type_name} プラグインファイル '{file_path.name}' の情報を取得できません: {e}", level="ERROR")
+                continue
+            file_entry = cached_files.get(key)
+            instances = {}
+            if file_entry is None or file_entry['mtime_ns'] != stat.st_mtime_ns or file_entry['size'] != stat.st_size:
+                imported_files += 1
+                file_entry, instances = self._inspect_plugin_file(file_path, base_class, plugin_type_name)
+                if file_entry is None:
+                    continue  # マニフェストに残さず、次回も読み込みを試みる
+                file_entry['mtime_ns'] = stat.st_mtime_ns
+                file_entry['size'] = stat.st_size
+            if file_entry.get('cacheable', True):
+                manifest_files[key] = file_entry
+
+            for plugin_entry in file_entry['plugins']:
+                name = plugin_entry['name']
+                if name in entries:
+                    logger.log(f"{plugin_type_name} プラグイン名 '{name}' が重複しています。"
+                          f"{file_path.name} を無視し、既存のものを使用します。", level="WARNING")
                     continue
-                try:
-                    spec = importlib.util.spec_from_file_location(module_name, str(file_path.resolve()))
-                    if spec is None or spec.loader is None:
-                        logger.log(f"{file_path.name} のモジュール仕様を作成できませんでした", level="WARNING")
-                        continue
-
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-
-                    for member_name, cls in inspect.getmembers(module, inspect.isclass):
-                        # ---- デバッグ用コード開始 ----
-                        # print(f"PluginManager デバッグ: クラス '{cls.__module__}.{cls.__name__}' (id: {id(cls)}) を確認中")
-                        # print(f"PluginManager デバッグ: 基底クラス '{base_class.__module__}.{base_class.__name__}' (id: {id(base_class)}) と比較")
-                        # is_sub = False
-                        # try:
-                        #     is_sub = issubclass(cls, base_class)
-                        # except TypeError as te:
-                        #     print(f"PluginManager デバッグ: issubclass の確認で TypeError が発生: {te}")
-                        # print(f"PluginManager デバッグ: issubclass(cls, base_class) -> {is_sub}")
-                        # print(f"PluginManager デバッグ: cls is base_class -> {cls is base_class}")
-                        # print(f"PluginManager デバッグ: inspect.isabstract(cls) -> {inspect.isabstract(cls)}")
-                        # ---- デバッグ用コード終了 ----
-                        if issubclass(cls, base_class) and cls is not base_class and not inspect.isabstract(cls):
-                            try:
-                                plugin_instance = cls()
-                                if plugin_instance.name in target_dict:
-                                    logger.log(f"{plugin_type_name} プラグイン名 '{plugin_instance.name}' が重複しています。"
-                                          f"{file_path.name} を無視し、既存のものを使用します。", level="WARNING")
-                                else:
-                                    target_dict[plugin_instance.name] = plugin_instance
-                                    logger.log(f"'{plugin_instance.name}' を読込完了", level="DEBUG")
-                            except Exception as e:
-                                logger.log(f"{file_path.name} から {plugin_type_name} プラグイン '{member_name}' のインスタンス化に失敗: {e}", level="ERROR")
-                except Exception as e:
-                    logger.log(f"{plugin_type_name} プラグインファイル '{file_path.name}' の読込失敗: {e}", level="ERROR")
+                entries[name] = dict(plugin_entry, file=key)
+                if name in instances:
+                    loaded[name] = instances[name]
+                logger.log(f"'{name}' を登録完了", level="DEBUG")
 
-        if not target_dict:
+        if not entries:
             logger.log(f"'{folder_path}' に有効な {plugin_type_name} プラグインが見つかりませんでした。", level="WARNING")
+        return imported_files
+
+    def _inspect_plugin_file(self, file_path: Path, base_class: type, plugin_type_name: str) -> tuple[dict | None, dict]:
+        """
+        プラグインファイルを読み込み、base_class のプラグインをインスタンス化してマニフェストの項目を作成します。
+
+        Returns:
+            tuple[dict | None, dict]: (ファイルの項目, プラグイン名 -> インスタンス)。読み込みに失敗した場合、項目は None です。
+                パラメータ定義を JSON に保存できない場合、項目の 'cacheable' は False になります。
+        """
+        try:
+            module = self._load_module(file_path)
+        except Exception as e:
+            logger.log(f"{plugin_type_name} プラグインファイル '{file_path.name}' の読込失敗: {e}", level="ERROR")
+            return None, {}
+
+        plugin_entries = []
+        instances = {}
+        for member_name, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, base_class) and cls is not base_class and not inspect.isabstract(cls):
+                try:
+                    plugin_instance = cls()
+                    plugin_entry = {
+                        'class_name': member_name,
+                        'name': plugin_instance.name,
+                        'parameters': plugin_instance.get_parameters_definition(),
+                    }
+                    if isinstance(plugin_instance, ColoringAlgorithmPlugin):
+                        plugin_entry['target_type'] = plugin_instance.target_type
+                except Exception as e:
+                    logger.log(f"{file_path.name} から {plugin_type_name} プラグイン '{member_name}' のインスタンス化に失敗: {e}", level="ERROR")
+                    continue
+                plugin_entries.append(plugin_entry)
+                instances.setdefault(plugin_instance.name, plugin_instance)
+
+        file_entry = {'plugins': plugin_entries}
+        try:
+            json.dumps(plugin_entries)
+        except (TypeError, ValueError):
+            logger.log(f"'{file_path.name}' のパラメータ定義は JSON に保存できないため、毎回読み込みます。", level="DEBUG")
+            file_entry['cacheable'] = False
+        return file_entry, instances
+
+    def _load_module(self, file_path: Path) -> ModuleType:
+        """プラグインファイルをモジュールとして読み込みます。同じファイルは一度だけ読み込みます。"""
+        key = str(file_path.resolve())
+        module = self._modules.get(key)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(file_path.stem, key)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"{file_path.name} のモジュール仕様を作成できませんでした")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._modules[key] = module
+        return module
+
+    def _read_manifest(self) -> dict:
+        """マニフェストを読み込み、ファイルパス -> ファイルの項目 の辞書を返します。読めない場合は空の辞書です。"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.log(f"プラグインマニフェストを読み込めません。すべてのプラグインを読み込みます: {e}", level="WARNING")
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('version') != _MANIFEST_VERSION:
+            return {}
+        files = manifest.get('files')
+        if not isinstance(files, dict):
+            return {}
+        for file_entry in files.values():
+            for plugin_entry in file_entry.get('plugins', []):
+                # JSON ではタプル ('range' など) がリストになるため戻す
+                plugin_entry['parameters'] = [
+                    {k: tuple(v) if isinstance(v, list) else v for k, v in p_def.items()}
+                    for p_def in plugin_entry.get('parameters', [])
+                ]
+        return files
+
+    def _write_manifest(self, files: dict) -> None:
+        """マニフェストを一時ファイルに書き込んでから置き換えます (並行して起動したプロセスが壊れたファイルを読まないように)。"""
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': _MANIFEST_VERSION, 'files': files}, f, indent=1, ensure_ascii=False)
+            os.replace(temp_path, self.manifest_path)
+            logger.log(f"プラグインマニフェストを保存しました: {self.manifest_path}", level="DEBUG")
+        except OSError as e:
+            logger.log(f"プラグインマニフェストを保存できません: {e}", level="WARNING")
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _instantiate(self, entry: dict, loaded: dict) -> FractalPlugin | ColoringAlgorithmPlugin | None:
+        """マニフェストの項目のプラグインを読み込み、インスタンスを返します。読み込み済みであればそれを返します。"""
+        with self._lock:
+            name = entry['name']
+            plugin = loaded.get(name)
+            if plugin is not None:
+                return plugin
+            file_path = Path(entry['file'])
+            try:
+                module = self._load_module(file_path)
+                plugin = getattr(module, entry['class_name'])()
+            except Exception as e:
+                logger.log(f"プラグイン '{name}' ({file_path.name}) の読込失敗: {e}", level="ERROR")
+                return None
+            if plugin.name != name:
+                logger.log(f"'{file_path.name}' のプラグイン名が登録時の '{name}' から '{plugin.name}' に変わっています。"
+                           f"プラグインを再読み込みしてください。", level="WARNING")
+                return None
+            loaded[name] = plugin
+            logger.log(f"'{name}' を読込完了", level="DEBUG")
+            return plugin
 
     # フラクタルプラグイン固有のメソッド
+    def get_fractal_plugin_names(self) -> list[str]:
+        """登録されているフラクタルプラグインの名前のリストを返します (モジュールは読み込みません)。"""
+        return list(self._fractal_entries)
+
+    def get_fractal_plugin_parameters_definition(self, name: str) -> list | None:
+        """
+        フラクタルプラグインのパラメータ定義を、モジュールを読み込まずにマニフェストから返します。
+
+        Returns:
+            list | None: パラメータ定義のコピー。プラグインが登録されていない場合はNone。
+        """
+        entry = self._fractal_entries.get(name)
+        return copy.deepcopy(entry['parameters']) if entry else None
+
     def get_available_fractal_plugins(self) -> list[FractalPlugin]:
-        return list(self.fractal_plugins.values())
+        """すべてのフラクタルプラグインのインスタンスを返します。未読み込みのモジュールはここで読み込みます。"""
+        plugins = (self.get_fractal_plugin(name) for name in self.get_fractal_plugin_names())
+        return [plugin for plugin in plugins if plugin is not None]
 
     def get_fractal_plugin(self, name: str) -> FractalPlugin | None:
-        return self.fractal_plugins.get(name)
+        """指定された名前のフラクタルプラグインを返します。モジュールは最初に要求されたときに読み込みます。"""
+        entry = self._fractal_entries.get(name)
+        if entry is None:
+            return None
+        return self._instantiate(entry, self.fractal_plugins)
 
     # カラーリングアルゴリズムプラグイン固有のメソッド
+    def get_coloring_plugin_names(self, target_type: str | None = None) -> list[str]:
+        """
+        登録されているカラーリングプラグインの名前のリストを返します (モジュールは読み込みません)。
+        target_type が指定された場合、そのタイプに一致するプラグインのみを返します。
+        """
+        return [name for name, entry in self._coloring_entries.items()
+                if not target_type or entry.get('target_type', 'divergent') == target_type]
+
+    def get_coloring_plugin_parameters_definition(self, name: str, target_type: str | None = None) -> list | None:
+        """
+        カラーリングプラグインのパラメータ定義を、モジュールを読み込まずにマニフェストから返します。
+
+        Returns:
+            list | None: パラメータ定義のコピー。プラグインが登録されていないか、target_type が異なる場合はNone。
+        """
+        entry = self._coloring_entries.get(name)
+        if entry is None or (target_type and entry.get('target_type', 'divergent') != target_type):
+            return None
+        return copy.deepcopy(entry['parameters'])
+
     def get_available_coloring_plugins(self, target_type: str | None = None) -> list[ColoringAlgorithmPlugin]:
         """
-        利用可能なカラーリングプラグインのリストを返します。
+        利用可能なカラーリングプラグインのリストを返します。未読み込みのモジュールはここで読み込みます。
         target_type が指定された場合、そのタイプに一致するプラグインのみを返します。
         """
-        plugins = list(self.coloring_plugins.values())
-        if target_type:
-            return [p for p in plugins if p.target_type == target_type]
-        return plugins
+        plugins = (self._instantiate(self._coloring_entries[name], self.coloring_plugins)
+                   for name in self.get_coloring_plugin_names(target_type))
+        return [plugin for plugin in plugins if plugin is not None]
 
     def get_coloring_plugin(self, name: str, target_type: str | None = None) -> ColoringAlgorithmPlugin | None:
         """
-        指定された名前のカラーリングプラグインを取得します。
+        指定された名前のカラーリングプラグインを取得します。モジュールは最初に要求されたときに読み込みます。
         target_type が指定された場合、プラグインのタイプも一致する必要があります。
         """
-        plugin = self.coloring_plugins.get(name)
-        if plugin and target_type:
-            if plugin.target_type == target_type:
-                pass # プラグインが見つかり、タイプも一致
-            else:
-                return None # 名前は一致したが、タイプが異なる
-
-        if plugin:
-            try:
-                params = plugin.get_parameters_definition()
-                logger.log(f"'{getattr(plugin, 'target_type', 'N/A')}'用プラグインあり: '{plugin.name}'", level="DEBUG")
-            except Exception as e:
-                logger.log(f"'{plugin.name}' のパラメータ取得中にエラー: {e}", level="ERROR")
-        else:
+        entry = self._coloring_entries.get(name)
+        if entry is None:
             logger.log(f"名前 '{name}' およびターゲット '{target_type}' に該当するプラグインが見つかりません。", level="WARNING")
+            return None
+        if target_type and entry.get('target_type', 'divergent') != target_type:
+            return None # 名前は一致したが、タイプが異なる
+        plugin = self._instantiate(entry, self.coloring_plugins)
+        if plugin:
+            logger.log(f"'{entry.get('target_type', 'divergent')}'用プラグインあり: '{plugin.name}'", level="DEBUG")
         return plugin
 
     def reload_all_plugins(self) -> None:
         """すべてのプラグインをディスクから再読み込みします。
 
-        既存のプラグインリストはクリアされ、再度プラグインフォルダをスキャンして読み込みます。
+        既存のプラグインリストはクリアされ、マニフェストを使わずにプラグインフォルダのすべてのファイルを読み込み直します。
         プラグインファイルの変更をアプリケーション実行中に反映させたい場合などに使用します。
         """
         logger.log("すべてのプラグインを再読み込み中...", level="INFO")
-        self.load_all_plugins()
+        self.load_all_plugins(use_manifest=False)
 
 if __name__ == '__main__':
     logger.log("PluginManager スタンドアロンテスト", level="INFO")
@@ -281,7 +472,8 @@ class TestColorNonDivergent(ColoringAlgorithmPlugin):
         project_root_path=Path.cwd(), # テストは CWD が一時ディレクトリの作成場所であることを前提としています
         fractal_plugin_folder_path=test_fractal_dir.name,
         divergent_coloring_plugin_folder_path=test_divergent_coloring_dir.name,
-        non_divergent_coloring_plugin_folder_path=test_non_divergent_coloring_dir.name
+        non_divergent_coloring_plugin_folder_path=test_non_divergent_coloring_dir.name,
+        manifest_path=Path("temp_plugin_manifest_delete_me.json")
     )
 
     logger.log("\n利用可能なフラクタルプラグイン:", level="INFO")
@@ -330,6 +522,7 @@ class TestColorNonDivergent(ColoringAlgorithmPlugin):
         shutil.rmtree(test_divergent_coloring_dir)
         shutil.rmtree(test_non_divergent_coloring_dir)
         shutil.rmtree(temp_base_dir)
+        Path("temp_plugin_manifest_delete_me.json").unlink(missing_ok=True)
         # sys.path.pop(0) # sys.path から temp_base_dir を削除します
         logger.log("\n一時テストディレクトリとファイルをクリーンアップしました。", level="INFO")
     except Exception as e:
@@ -1,7 +1,10 @@
+import atexit
 import json
 from pathlib import Path
 import os
 import re # 追加: 正規表現モジュールをインポート
+import threading
+import weakref
 
 from typing import Any, Dict, Optional
 
@@ -11,8 +14,14 @@ class SettingsManager:
 
     設定の読み込み、保存、個別の設定値の取得・設定機能を提供します。
     ロガー(CustomLogger)との循環依存を避けるための特別な初期化パスも持ちます。
+
+    `set_setting` / `set_section` の自動保存は遅延書き込みです。変更は未保存フラグ (`is_dirty`) を立てて
+    `save_delay_sec` 秒のタイマーを張り直すだけで、最後の変更から一定時間後にまとめて1回だけ
+    バックグラウンドスレッドでファイルに書き込みます。未保存の変更は `flush` またはプロセス終了時に書き込まれます。
+    ファイルは一時ファイルに書いてから置き換えるため、書き込み中に終了しても壊れた設定ファイルは残りません。
     """
     _logger_instance = None # ロガーインスタンスのクラス変数
+    SAVE_DELAY_SEC = 1.0  # 最後の変更から自動保存するまでの待ち時間 (秒)
 
     @staticmethod
     def _to_relpath(path):
@@ -41,7 +50,8 @@ class SettingsManager:
             SettingsManager._logger_instance = FallbackLogger()
         return SettingsManager._logger_instance
 
-    def __init__(self, settings_filename: str = "settings.jsonc", _is_for_logger_init: bool = False) -> None:
+    def __init__(self, settings_filename: str = "settings.jsonc", _is_for_logger_init: bool = False,
+                 save_delay_sec: float | None = None) -> None:
         """
         SettingsManagerを初期化します。
 
@@ -51,7 +61,14 @@ class SettingsManager:
         :param _is_for_logger_init: CustomLoggerの初期化中に呼び出されたかどうかを示す内部フラグ。
                                     Trueの場合、ファイルI/Oや複雑なパス解決を避け、
                                     ロガーの循環依存を防ぐための最小限の初期化を行います。
+        :param save_delay_sec: 自動保存の待ち時間 (秒)。None の場合は `SAVE_DELAY_SEC`。
         """
+        self.save_delay_sec = self.SAVE_DELAY_SEC if save_delay_sec is None else max(0.0, float(save_delay_sec))
+        self._lock = threading.RLock()  # 設定辞書・未保存フラグ・タイマーを保護する
+        self._write_lock = threading.Lock()  # ファイルへの書き込みを1つずつ行う
+        self._revision = 0  # 設定を変更するたびに増える版番号
+        self._saved_revision = 0  # ファイルに書き込んだ版番号
+        self._save_timer: threading.Timer | None = None  # 遅延書き込みのタイマー
         logger = self._get_logger()
         logger.log(f"SettingsManagerの初期化開始: settings_filename='{SettingsManager._to_relpath(settings_filename)}', _is_for_logger_init={_is_for_logger_init}", level="DEBUG")
 
@@ -84,6 +101,8 @@ class SettingsManager:
 
             self.settings: Dict[str, Any] = {}
             self.load_settings() # 通常のインスタンスのみ設定をロード
+            # 終了時に未保存の変更を書き込む (インスタンスの寿命は延ばさない)
+            atexit.register(SettingsManager._flush_at_exit, weakref.ref(self))
 
     def load_settings(self) -> None:
         """
@@ -112,23 +131,116 @@ class SettingsManager:
         else:
             logger.log(f"設定ファイル '{SettingsManager._to_relpath(self.filepath)}' が見つかりません。デフォルト設定を使用します。", level="INFO")
             self.settings = {}
+        with self._lock:
+            self._saved_revision = self._revision
 
-    def save_settings(self) -> None:
+    def save_settings(self) -> bool:
         """
-        現在の設定をファイルに保存します。
+        現在の設定をファイルにすぐ保存します。保留中の遅延書き込みは取り消されます。
         保存先のディレクトリが存在しない場合は作成します。
+
+        一時ファイルに書き込んでから設定ファイルと置き換えるため、保存に失敗しても元のファイルは残ります。
+
+        Returns:
+            bool: 保存に成功した場合は True。
         """
+        self._cancel_save_timer()
         logger = self._get_logger()
-        try:
-            # self.settings 全体を保存（engine_settings, presets も含む）
-            settings_to_save = self.settings.copy()
-            # 親ディレクトリが存在することを確認します
-            self.filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(settings_to_save, f, indent=4, ensure_ascii=False)
-            logger.log(f"設定を '{SettingsManager._to_relpath(self.filepath)}' に保存しました。", level="INFO")
-        except (IOError, Exception) as e: # より一般的な例外もキャッチします
-            logger.log(f"設定ファイル '{SettingsManager._to_relpath(self.filepath)}' の保存に失敗しました: {e}", level="ERROR")
+        with self._write_lock:
+            with self._lock:
+                revision = self._revision
+                try:
+                    # self.settings 全体を保存（engine_settings, presets も含む）。ロック中に文字列にしておく
+                    content = json.dumps(self.settings, indent=4, ensure_ascii=False)
+                except RuntimeError as e:
+                    # 取得した辞書が別スレッドで変更中だった。少し待って書き直す
+                    logger.log(f"設定の変換中に設定が変更されたため、保存をやり直します: {e}", level="DEBUG")
+                    self._schedule_save()
+                    return False
+                except (TypeError, ValueError) as e:
+                    logger.log(f"設定をJSONに変換できませんでした: {e}", level="ERROR")
+                    return False
+            temp_path = self.filepath.with_name(self.filepath.name + ".tmp")
+            try:
+                # 親ディレクトリが存在することを確認します
+                self.filepath.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.filepath)
+            except (IOError, Exception) as e: # より一般的な例外もキャッチします
+                logger.log(f"設定ファイル '{SettingsManager._to_relpath(self.filepath)}' の保存に失敗しました: {e}", level="ERROR")
+                try:
+                    temp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                return False
+            with self._lock:
+                self._saved_revision = max(self._saved_revision, revision)
+        logger.log(f"設定を '{SettingsManager._to_relpath(self.filepath)}' に保存しました。", level="INFO")
+        return True
+
+    @property
+    def is_dirty(self) -> bool:
+        """ファイルに書き込まれていない変更がある場合は True。"""
+        with self._lock:
+            return self._revision != self._saved_revision
+
+    def mark_dirty(self, auto_save: bool = True) -> None:
+        """
+        設定が変更されたことを記録します。`get_setting` などで取得した辞書を直接変更した場合に呼び出します。
+
+        :param auto_save: Trueの場合、遅延書き込みを予約します。
+        """
+        with self._lock:
+            self._revision += 1
+            if auto_save:
+                self._schedule_save()
+
+    def flush(self) -> bool:
+        """
+        保留中の遅延書き込みを待たずに、未保存の変更があればすぐに保存します。
+
+        Returns:
+            bool: 未保存の変更がないか、保存に成功した場合は True。
+        """
+        self._cancel_save_timer()
+        if not self.is_dirty:
+            return True
+        return self.save_settings()
+
+    @staticmethod
+    def _flush_at_exit(manager_ref: 'weakref.ReferenceType[SettingsManager]') -> None:
+        """プロセス終了時に、まだ存在するインスタンスの未保存の変更を保存します。"""
+        manager = manager_ref()
+        if manager is not None:
+            manager.flush()
+
+    def _schedule_save(self) -> None:
+        """遅延書き込みのタイマーを張り直します。連続した変更は最後の変更から save_delay_sec 秒後の1回にまとめられます。"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.save_delay_sec, self._on_save_timer)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _cancel_save_timer(self) -> None:
+        """保留中の遅延書き込みを取り消します。"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+    def _on_save_timer(self) -> None:
+        """遅延書き込みのタイマーから呼ばれ、未保存の変更を保存します。"""
+        with self._lock:
+            if threading.current_thread() is not self._save_timer:
+                return  # 張り直されたか取り消された古いタイマー
+            self._save_timer = None
+        if self.is_dirty:
+            self.save_settings()
 
     def get_all_settings(self) -> Dict[str, Any]:
         """
@@ -176,19 +288,20 @@ class SettingsManager:
 
         :param key_path: 設定したい値のキーパス。
         :param value: 設定する値。
-        :param auto_save: Trueの場合、設定後に自動的に `save_settings` を呼び出します。デフォルトは True。
+        :param auto_save: Trueの場合、遅延書き込みを予約します (`SAVE_DELAY_SEC` 参照)。デフォルトは True。
+                          Falseの場合も未保存フラグは立ち、`flush` または終了時に保存されます。
         """
         keys = key_path.split('.')
-        current_level = self.settings
+        with self._lock:
+            current_level = self.settings
 
-        for i, key in enumerate(keys[:-1]): # 最後から2番目のキーまで反復
-            if key not in current_level or not isinstance(current_level[key], dict):
-                current_level[key] = {} # 存在しない場合は中間辞書を作成します
-            current_level = current_level[key]
+            for i, key in enumerate(keys[:-1]): # 最後から2番目のキーまで反復
+                if key not in current_level or not isinstance(current_level[key], dict):
+                    current_level[key] = {} # 存在しない場合は中間辞書を作成します
+                current_level = current_level[key]
 
-        current_level[keys[-1]] = value
-        if auto_save:
-            self.save_settings()
+            current_level[keys[-1]] = value
+            self.mark_dirty(auto_save)
 
     def get_section(self, section_name: str) -> Dict[str, Any]:
         """
@@ -210,11 +323,11 @@ class SettingsManager:
 
         :param section_name: 設定したいセクションの名前。
         :param section_data: 設定するデータ。
-        :param auto_save: Trueの場合、設定後に自動的に `save_settings` を呼び出します。デフォルトは True。
+        :param auto_save: Trueの場合、遅延書き込みを予約します (`SAVE_DELAY_SEC` 参照)。デフォルトは True。
         """
-        self.settings[section_name] = section_data
-        if auto_save:
-            self.save_settings()
+        with self._lock:
+            self.settings[section_name] = section_data
+            self.mark_dirty(auto_save)
 
     def export_presets_to_file(self, filepath: Path) -> None:
         """
@@ -286,7 +399,7 @@ class SettingsManager:
         presets = self.get_presets()
         if name in presets:
             del presets[name]
-            self.set_setting("presets", presets) # auto_save=True なので自動保存される
+            self.set_setting("presets", presets) # auto_save=True なので遅延書き込みされる
             logger.log(f"プリセット '{name}' を設定から削除しました。", level="DEBUG")
         else:
             logger.log(f"プリセット '{name}' が見つかりませんでした。削除はスキップされました。", level="WARNING")
@@ -324,6 +437,9 @@ if __name__ == '__main__':
     assert manager.get_setting('test.value1') == 456
 
     # テスト 5: ファイルから設定を読み込み (最初に設定を保存する必要があります)
+    # 自動保存は遅延書き込みなので、まだファイルには書き込まれていない
+    assert manager.is_dirty
+    assert manager.flush() and not manager.is_dirty
     _main_logger.log("アプリの再起動をシミュレート: 同じファイルに対して新しい SettingsManager インスタンスを作成中...", level="INFO")
     manager_reloaded = SettingsManager(settings_filename=test_settings_file)
     _main_logger.log(f"再読み込みされた 'test.value1': {manager_reloaded.get_setting('test.value1')}", level="DEBUG")
@@ -336,9 +452,21 @@ if __name__ == '__main__':
     _main_logger.log(f"セクション 'section1' のデータ: {manager.get_section('section1')}", level="DEBUG")
     assert manager.get_section("section1") == {"a":1, "b":2}
 
+    manager.flush()
     manager_reloaded_2 = SettingsManager(settings_filename=test_settings_file)
     assert manager_reloaded_2.get_section("section1") == {"a":1, "b":2}
 
+    # テスト 6b: 連続した変更は待ち時間の後に1回だけ書き込まれる
+    manager.save_delay_sec = 0.2
+    mtime_before = manager.filepath.stat().st_mtime_ns
+    for i in range(100):
+        manager.set_setting('test.counter', i)
+    assert manager.is_dirty and manager.filepath.stat().st_mtime_ns == mtime_before
+    import time
+    time.sleep(0.5)
+    assert not manager.is_dirty
+    assert SettingsManager(settings_filename=test_settings_file).get_setting('test.counter') == 99
+
     # テスト 7: 新しい構造のキーパスのテスト
     _main_logger.log("新しい構造のキーパスのテスト...", level="INFO")
     manager.set_setting("application.logging.level", "WARNING")
@@ -388,7 +516,9 @@ if __name__ == '__main__':
     assert manager_import.get_setting("presets.ExportTest1.val") == 1 # 上書きされたことを確認
     _main_logger.log(f"上書きインポートされたプリセット: {imported_names_overwrite}", level="INFO")
 
-    # テスト設定ファイルをクリーンアップ
+    # テスト設定ファイルをクリーンアップ (終了時に未保存の変更が書き戻されないよう、先に保存を済ませる)
+    for test_manager in (manager, manager_reloaded, manager_reloaded_2, manager_import):
+        test_manager.flush()
     try:
         if Path(test_settings_file).exists(): Path(test_settings_file).unlink()
         app_data_dir_for_test = Path.home() / ".fractalapp"
@@ -0,0 +1,36 @@
+import threading
+
+
+class RenderCancelledError(Exception):
+    """キャンセルトークンによって処理が中断されたことを示す例外。"""
+
+
+class CancelToken:
+    """
+    別スレッドで実行中の処理に中断を伝えるための協調的なキャンセルトークン。
+
+    要求側が cancel() を呼び、処理側は区切りごとに is_cancelled または
+    raise_if_cancelled() で確認して自ら処理を打ち切ります。
+    """
+    def __init__(self):
+        """CancelToken を初期化します。"""
+        self._event = threading.Event()
+
+    def cancel(self):
+        """キャンセルを要求します。"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """キャンセルが要求されていれば True を返します。"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """
+        キャンセルが要求されていれば例外を送出します。
+
+        Raises:
+            RenderCancelledError: キャンセルが要求されている場合。
+        """
+        if self._event.is_set():
+            raise RenderCancelledError("処理がキャンセルされました")
@@ -0,0 +1,68 @@
+import numpy as np
+from numba import jit
+
+
+@jit(nopython=True, inline='always')
+def complex_int_power_jit(z_real, z_imag, power):
+    """
+    複素数 z = z_real + i*z_imag の整数乗を二進累乗法（繰り返し二乗）で計算します。
+
+    arctan2 / cos / sin / pow を使う極形式の計算に比べ、実数の乗算と加算だけで済むため
+    高速で、丸め誤差も小さくなります。
+
+    Args:
+        z_real (float): zの実数部。
+        z_imag (float): zの虚数部。
+        power (int): 指数（1以上の整数）。
+
+    Returns:
+        tuple[float, float]: z^power の (実数部, 虚数部)。
+    """
+    result_real = 1.0
+    result_imag = 0.0
+    base_real = z_real
+    base_imag = z_imag
+    n = power
+    while n > 0:
+        if n & 1:
+            temp_real = result_real * base_real - result_imag * base_imag
+            result_imag = result_real * base_imag + result_imag * base_real
+            result_real = temp_real
+        n >>= 1
+        if n > 0:
+            temp_real = base_real * base_real - base_imag * base_imag
+            base_imag = 2.0 * base_real * base_imag
+            base_real = temp_real
+    return result_real, result_imag
+
+
+@jit(nopython=True, inline='always')
+def complex_polar_power_jit(z_real, z_imag, power):
+    """
+    複素数 z の実数乗を極形式で計算します。整数でない次数の場合にのみ使用します。
+
+    Args:
+        z_real (float): zの実数部。
+        z_imag (float): zの虚数部。
+        power (float): 指数。
+
+    Returns:
+        tuple[float, float]: z^power の (実数部, 虚数部)。
+    """
+    r = (z_real * z_real + z_imag * z_imag) ** (power / 2)
+    theta = np.arctan2(z_imag, z_real) * power
+    return r * np.cos(theta), r * np.sin(theta)
+
+
+@jit(nopython=True, inline='always')
+def is_integer_power(power):
+    """
+    次数が整数乗の高速経路で扱える値（1以上の整数値）かどうかを判定します。
+
+    Args:
+        power (int | float): 次数。
+
+    Returns:
+        bool: 整数値かつ1以上であれば True。
+    """
+    return power >= 1 and power == np.floor(power)
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+# 反復0回で発散した画素では初期値そのものとなり、原点対称の複製時に符号が反転するキー
+_FINAL_Z_KEYS = ('last_zn_values', 'last_z_real', 'last_z_imag')
+
+
+def is_centred_grid(x_offset: float, y_offset: float, width_px: int, height_px: int) -> bool:
+    """
+    ピクセル格子が原点対称になっているかを判定します。
+
+    格子 (plugins.base_fractal_plugin.pixel_grid 参照) の列 x の実部は `(x_offset + x) * ピクセル幅` なので、
+    x_offset が `-幅px / 2` なら列 x と列 `幅px - x` (行も同様) がちょうど符号反転した座標になります。
+    中心が原点から4分の1ピクセル未満しかずれていないビューはこの格子になります。
+
+    Args:
+        x_offset (float): 列 0 の格子上の位置。
+        y_offset (float): 行 0 の格子上の位置。
+        width_px (int): 画像の幅 (ピクセル)。
+        height_px (int): 画像の高さ (ピクセル)。
+    Returns:
+        bool: 格子が原点対称の場合は True。
+    """
+    return x_offset == -width_px / 2 and y_offset == -height_px / 2
+
+
+def point_symmetric_regions(height_px: int, width_px: int) -> list[tuple[int, int, int, int]]:
+    """
+    原点対称な画像のうち、実際に計算が必要な矩形の一覧を返します。
+
+    上側の行 0..height_px//2 は全列を計算し、下側の行は対になる画素が存在しない列 0 だけを計算します。
+    残りは `fill_point_symmetric` で上側から複製します。
+
+    Args:
+        height_px (int): 画像の高さ (ピクセル)。
+        width_px (int): 画像の幅 (ピクセル)。
+    Returns:
+        list[tuple[int, int, int, int]]: (y0, y1, x0, x1) の一覧。y1, x1 は含みません。
+    """
+    top_rows = min(height_px // 2 + 1, height_px)
+    regions = [(0, top_rows, 0, width_px)]
+    if top_rows < height_px and width_px > 0:
+        regions.append((top_rows, height_px, 0, 1))
+    return regions
+
+
+def fill_point_symmetric(fractal_data: dict, height_px: int, width_px: int) -> None:
+    """
+    `point_symmetric_regions` の矩形だけが計算済みのフラクタルデータについて、
+    下側の残りの画素を原点に関して反対側の画素から複製します (インプレース)。
+
+    f(-z) = f(z) となる反復では、z と -z の軌道は1回目の反復以降一致するため、
+    画素ごとの配列はすべて同じ値になります。例外は反復0回で発散した画素で、
+    最終Z値が初期値そのものなので最終Z値 ('last_zn_values' または 'last_z_real' / 'last_z_imag')
+    の符号を反転します。
+
+    FractalData の場合は保持している配列だけを複製し、派生配列のメモは破棄します。
+
+    Args:
+        fractal_data (dict): 画像全体の大きさの配列を持つフラクタルデータ。
+        height_px (int): 画像の高さ (ピクセル)。
+        width_px (int): 画像の幅 (ピクセル)。
+    """
+    top_rows = height_px // 2 + 1
+    if top_rows >= height_px or width_px < 2:
+        return
+    src_rows = slice(height_px - top_rows, 0, -1)
+    src_cols = slice(width_px - 1, 0, -1)
+    grid_arrays = {key: value for key, value in fractal_data.items()
+                   if isinstance(value, np.ndarray) and value.shape[:2] == (height_px, width_px)}
+    for value in grid_arrays.values():
+        value[top_rows:, 1:] = value[src_rows, src_cols]
+
+    iterations = grid_arrays.get('iterations')
+    if iterations is not None:
+        escaped_at_start = iterations[top_rows:, 1:] == 0
+        for key in _FINAL_Z_KEYS:
+            if key in grid_arrays:
+                bottom_z = grid_arrays[key][top_rows:, 1:]
+                bottom_z[escaped_at_start] = -bottom_z[escaped_at_start]
+
+    if hasattr(fractal_data, 'release_derived'):
+        fractal_data.release_derived()
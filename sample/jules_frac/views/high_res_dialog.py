@@ -23,6 +23,9 @@ class HighResOutputDialog(QDialog):
     設定値を取得する機能も持ちます。SettingsManagerと連携して設定の読み書きを行います。
     """
     SETTINGS_SECTION_NAME = "high_res_export_defaults" # 設定セクションキー
+    DEFAULT_OUTPUT_TILE_PX = 256 # current_view_params に 'output_tile_px' がない場合のタイルの一辺
+    DEFAULT_ADAPTIVE_AA_GRID = 4 # current_view_params に 'adaptive_aa_grid' がない場合の適応型AAの1辺のサンプル数
+    FRACTAL_DATA_BYTES_PER_SAMPLE = 20 # 反復回数 (int32) と最終Zの実部・虚部 (float64)
 
     def __init__(self, settings_manager: SettingsManager,
                  current_dialog_defaults: dict | None = None, # 以前の current_export_settings
@@ -36,6 +39,8 @@ class HighResOutputDialog(QDialog):
                                                               保存された設定や前回使用された設定を反映します。
             current_view_params (dict | None, optional): 現在のビュー（例: メインウィンドウの描画エリア）の
                                                          パラメータ。プリセットの「現在の表示」などに使用されます。
+                                                         'output_tile_px' (出力のタイルの一辺, 画像全体を一度に着色する場合は None) と
+                                                         'adaptive_aa_grid' はメモリ使用量の予測に使用されます。
             parent (QWidget, optional): 親ウィジェット。
         """
         super().__init__(parent)
@@ -132,7 +137,10 @@ class HighResOutputDialog(QDialog):
         self.iterations_spinbox = QSpinBox(); self.iterations_spinbox.setRange(10, 1000000)
         layout.addRow(QLabel("最大反復回数:"), self.iterations_spinbox)
         self.antialiasing_combo = QComboBox()
-        self.antialiasing_combo.addItems(["なし", "2x2 SSAA", "3x3 SSAA", "4x4 SSAA"]) # SSAA = スーパーサンプリングアンチエイリアス
+        self.antialiasing_combo.addItems(["なし", "2x2 SSAA", "3x3 SSAA", "4x4 SSAA", "Adaptive"]) # SSAA = スーパーサンプリングアンチエイリアス
+        self.antialiasing_combo.setItemData(
+            4, "境界付近のピクセルだけを 4x4 相当で再サンプリングします。4x4 SSAA に近い画質をより短い時間で得られます。",
+            Qt.ItemDataRole.ToolTipRole)
         layout.addRow(QLabel("アンチエイリアス:"), self.antialiasing_combo)
         group.setLayout(layout)
         return group
@@ -153,6 +161,7 @@ class HighResOutputDialog(QDialog):
         self.width_spinbox.valueChanged.connect(partial(self._on_dimension_changed, "width"))
         self.height_spinbox.valueChanged.connect(partial(self._on_dimension_changed, "height"))
         self.aspect_ratio_check.stateChanged.connect(self._on_aspect_ratio_toggled)
+        self.antialiasing_combo.currentTextChanged.connect(self._update_memory_usage_label)
 
     def _load_settings(self): # _load_initial_settings から名前変更
         """保存された設定またはデフォルト値をダイアログの各ウィジェットに読み込み、表示します。"""
@@ -330,12 +339,24 @@ class HighResOutputDialog(QDialog):
 
 
     def _update_memory_usage_label(self):
-        """現在の解像度とアンチエイリアス設定に基づいて、予測されるメモリ使用量を計算し、ラベルに表示します。"""
+        """現在の解像度とアンチエイリアス設定に基づいて、予測されるメモリ使用量を計算し、ラベルに表示します。
+
+        出力はタイルごとにスーパーサンプリング解像度で計算・着色して帯へ縮小し、帯ごとにファイルへ書き込むため、
+        出力画像の帯1本と、スーパーサンプリング解像度のタイル1枚分 (フラクタルデータとRGBA) を見積もります。
+        画像全体を一度に着色するカラーリングでは、画像全体が1枚のタイル (帯) になります。
+        """
         width = self.width_spinbox.value(); height = self.height_spinbox.value()
         bytes_per_pixel = 4 # RGBA
         ssaa_text = self.antialiasing_combo.currentText(); ssaa_factor = 1
-        if "SSAA" in ssaa_text and ssaa_text[0].isdigit(): ssaa_factor = int(ssaa_text[0])**2
-        mem_bytes = width * height * bytes_per_pixel * ssaa_factor
+        if "SSAA" in ssaa_text and ssaa_text[0].isdigit(): ssaa_factor = int(ssaa_text[0])
+        elif ssaa_text == "Adaptive": # 最大でタイル全体を再サンプリングする
+            ssaa_factor = self.current_view_params.get('adaptive_aa_grid', self.DEFAULT_ADAPTIVE_AA_GRID)
+        tile_px = self.current_view_params.get('output_tile_px', self.DEFAULT_OUTPUT_TILE_PX)
+        if tile_px is None:
+            tile_px = max(width, height)
+        band_bytes = min(tile_px, height) * width * bytes_per_pixel
+        tile_samples = min(tile_px, width) * min(tile_px, height) * ssaa_factor**2
+        mem_bytes = band_bytes + tile_samples * (bytes_per_pixel + self.FRACTAL_DATA_BYTES_PER_SAMPLE)
         mem_mb = mem_bytes / (1024 * 1024)
         self.memory_usage_label.setText(f"予測メモリ使用量: {mem_mb:.2f} MB")
 
@@ -75,6 +75,12 @@ class MainWindow(QMainWindow):
         self.open_colormap_editor_action.setToolTip("カラーマップエディタを開きます")
         self.open_colormap_editor_action.triggered.connect(self._open_colormap_editor)
 
+        self.palette_cycle_action = QAction("パレットアニメーション", self)
+        self.palette_cycle_action.setCheckable(True)
+        self.palette_cycle_action.setShortcut("Ctrl+P")
+        self.palette_cycle_action.setStatusTip("現在の画像のままカラーマップを循環させます")
+        self.palette_cycle_action.setToolTip("現在の画像のままカラーマップを循環させます")
+
 
     def _create_menu_bar(self): # 一貫性のために _create_menus から名前変更
         """
@@ -90,11 +96,13 @@ class MainWindow(QMainWindow):
         # ツールメニュー
         tool_menu = menu_bar.addMenu("&ツール")
         tool_menu.addAction(self.open_colormap_editor_action)
+        tool_menu.addAction(self.palette_cycle_action)
 
         # hoveredシグナルで説明を明示的に表示
         self.export_action.hovered.connect(lambda: self.statusBar().showMessage(self.export_action.statusTip()))
         self.exit_action.hovered.connect(lambda: self.statusBar().showMessage(self.exit_action.statusTip()))
         self.open_colormap_editor_action.hovered.connect(lambda: self.statusBar().showMessage(self.open_colormap_editor_action.statusTip()))
+        self.palette_cycle_action.hovered.connect(lambda: self.statusBar().showMessage(self.palette_cycle_action.statusTip()))
 
         # ヘルプメニュー (プレースホルダー)
         help_menu = menu_bar.addMenu("&ヘルプ")
@@ -155,6 +163,11 @@ class MainWindow(QMainWindow):
             # エクスポートアクショントリガーを接続
             if hasattr(self, 'export_action'):
                  self.export_action.triggered.connect(self._open_high_res_dialog)
+
+            # パレットアニメーション (メニューのチェック状態とコントローラーの状態を同期)
+            if hasattr(self, 'palette_cycle_action'):
+                self.palette_cycle_action.toggled.connect(self._on_palette_cycle_toggled)
+                self.fractal_controller.palette_cycling_changed.connect(self.palette_cycle_action.setChecked)
             # ステータスバー接続の堅牢性を確保
             if hasattr(self, 'status_bar') and self.status_bar is not None:
                  self.fractal_controller.status_updated.connect(self.update_status_bar)
@@ -163,6 +176,14 @@ class MainWindow(QMainWindow):
         else:
             logger.log("シグナル接続に FractalController が利用できません。", level="WARNING")
 
+    @pyqtSlot(bool)
+    def _on_palette_cycle_toggled(self, checked: bool):
+        """パレットアニメーションのメニュー項目が切り替えられたときに、アニメーションを開始または停止します。"""
+        if checked:
+            self.fractal_controller.start_palette_cycling()
+        else:
+            self.fractal_controller.stop_palette_cycling()
+
     @pyqtSlot()
     def _open_colormap_editor(self):
         """
@@ -269,10 +290,13 @@ class MainWindow(QMainWindow):
         current_color_map_ctrl = self.fractal_controller.get_active_color_map_name_from_engine()
 
 
+        output_tile_px, adaptive_aa_grid = self.fractal_controller.get_output_tiling_from_engine()
         view_params_for_dialog = {
             'image_width_px': self.render_area.width(),
             'image_height_px': self.render_area.height(),
-            'max_iterations': common_params.get('max_iterations', 100)
+            'max_iterations': common_params.get('max_iterations', 100),
+            'output_tile_px': output_tile_px,  # メモリ使用量の予測用 (None の場合は画像全体を一度に着色する)
+            'adaptive_aa_grid': adaptive_aa_grid
         }
 
         dialog_defaults = self.last_export_settings.copy()
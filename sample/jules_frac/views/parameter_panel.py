@@ -21,6 +21,7 @@ class ParameterPanel(QWidget):
     QToolBoxを使用して、設定をカテゴリ別に整理します。
     """
     parameters_changed_in_ui_signal = pyqtSignal(dict)
+    PRESET_THUMBNAIL_ICON_SIZE = QSize(96, 72)  # プリセットの一覧に表示するサムネイルの大きさ
 
     def __init__(self, fractal_controller: 'FractalController', parent=None):
         super().__init__(parent)
@@ -71,6 +72,9 @@ class ParameterPanel(QWidget):
         if hasattr(self.fractal_controller, 'configuration_applied'):
             self.fractal_controller.configuration_applied.connect(self.load_initial_parameters)
 
+        if hasattr(self.fractal_controller, 'preset_thumbnail_ready'):
+            self.fractal_controller.preset_thumbnail_ready.connect(self._on_preset_thumbnail_ready)
+
     def _set_ui_for_no_controller(self):
         """コントローラーが利用できない場合のフォールバックUI設定。"""
         self._set_ui_values(100)
@@ -192,6 +196,9 @@ class ParameterPanel(QWidget):
         self.save_preset_button.clicked.connect(self._on_save_preset)
         self.delete_preset_button.clicked.connect(self._on_delete_preset)
         self.import_presets_button.clicked.connect(self._on_import_presets)
+        self.preset_gallery.itemClicked.connect(self._on_preset_gallery_item_clicked)
+        self.preset_gallery.itemDoubleClicked.connect(self._on_preset_gallery_item_double_clicked)
+        self.presets_combo_box.currentTextChanged.connect(self._select_preset_gallery_item)
 
     def _init_preset_ui_elements(self):
         """プリセット管理用のUI要素を初期化します。"""
@@ -200,6 +207,15 @@ class ParameterPanel(QWidget):
 
         self.presets_combo_box = QComboBox()
 
+        # サムネイルの一覧 (クリックで選択、ダブルクリックで読み込み)。サムネイルはバックグラウンドで用意される
+        self.preset_gallery = QListWidget()
+        self.preset_gallery.setViewMode(QListWidget.ViewMode.IconMode)
+        self.preset_gallery.setIconSize(self.PRESET_THUMBNAIL_ICON_SIZE)
+        self.preset_gallery.setResizeMode(QListWidget.ResizeMode.Adjust)
+        self.preset_gallery.setMovement(QListWidget.Movement.Static)
+        self.preset_gallery.setWordWrap(True)
+        self.preset_gallery.setMinimumHeight(self.PRESET_THUMBNAIL_ICON_SIZE.height() * 2 + 48)
+
         top_buttons_layout = QHBoxLayout()
         self.load_preset_button = QPushButton("読み込み")
         self.save_preset_button = QPushButton("保存")
@@ -215,6 +231,7 @@ class ParameterPanel(QWidget):
         bottom_buttons_layout.addWidget(self.import_presets_button)
 
         preset_layout.addWidget(self.presets_combo_box)
+        preset_layout.addWidget(self.preset_gallery)
         preset_layout.addLayout(top_buttons_layout)
         preset_layout.addLayout(bottom_buttons_layout)
         self.preset_group_box.setLayout(preset_layout)
@@ -321,6 +338,54 @@ class ParameterPanel(QWidget):
             if current_text in filtered_names:
                 self.presets_combo_box.setCurrentText(current_text)
         self.presets_combo_box.blockSignals(False)
+        self._populate_preset_gallery(sorted(filtered_names))
+
+    def _populate_preset_gallery(self, names: list[str]):
+        """プリセットの一覧を作り直し、キャッシュにないサムネイルをバックグラウンドで要求します。"""
+        if not hasattr(self, 'preset_gallery'): return
+        self.preset_gallery.clear()
+        for name in names:
+            item = QListWidgetItem(name)
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            item.setSizeHint(QSize(self.PRESET_THUMBNAIL_ICON_SIZE.width() + 16, self.PRESET_THUMBNAIL_ICON_SIZE.height() + 36))
+            thumbnail_path = self.fractal_controller.get_preset_thumbnail_path(name) \
+                if hasattr(self.fractal_controller, 'get_preset_thumbnail_path') else None
+            if thumbnail_path:
+                item.setIcon(QIcon(thumbnail_path))
+            self.preset_gallery.addItem(item)
+        self._select_preset_gallery_item(self.presets_combo_box.currentText())
+        if names and hasattr(self.fractal_controller, 'request_preset_thumbnails'):
+            self.fractal_controller.request_preset_thumbnails(names)
+
+    @pyqtSlot(str, str)
+    def _on_preset_thumbnail_ready(self, name: str, path: str):
+        """用意できたサムネイルを一覧の該当するプリセットに表示します。"""
+        for row in range(self.preset_gallery.count()):
+            item = self.preset_gallery.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == name:
+                item.setIcon(QIcon(path))
+                break
+
+    @pyqtSlot(str)
+    def _select_preset_gallery_item(self, name: str):
+        """コンボボックスで選ばれたプリセットを一覧でも選択状態にします。"""
+        self.preset_gallery.blockSignals(True)
+        self.preset_gallery.clearSelection()
+        for row in range(self.preset_gallery.count()):
+            item = self.preset_gallery.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == name:
+                self.preset_gallery.setCurrentItem(item)
+                break
+        self.preset_gallery.blockSignals(False)
+
+    @pyqtSlot(QListWidgetItem)
+    def _on_preset_gallery_item_clicked(self, item: QListWidgetItem):
+        self.presets_combo_box.setCurrentText(item.data(Qt.ItemDataRole.UserRole))
+
+    @pyqtSlot(QListWidgetItem)
+    def _on_preset_gallery_item_double_clicked(self, item: QListWidgetItem):
+        self.presets_combo_box.setCurrentText(item.data(Qt.ItemDataRole.UserRole))
+        self._on_load_preset()
 
     @pyqtSlot()
     def _on_load_preset(self):
@@ -4,7 +4,6 @@ import numpy as np
 from PyQt6.QtWidgets import QLabel, QSizePolicy, QApplication, QMainWindow
 from PyQt6.QtGui import QImage, QPixmap, QCursor
 from PyQt6.QtCore import Qt, QPointF, QTimer, QObject, pyqtSignal
-from PIL import Image, ImageQt
 from logger.custom_logger import CustomLogger
 
 logger = CustomLogger()
@@ -23,6 +22,9 @@ class RenderArea(QLabel):
 
     QLabel を継承し、NumPy 配列として提供される画像データを表示します。
     マウスイベントを処理して、フラクタルコントローラーを介した画像のナビゲーションを可能にします。
+
+    受け取った RGBA 配列はコピーせずに QImage で包んで保持し、ウィジェットのサイズに合わせて
+    拡大縮小したピックスマップは (ウィジェットのサイズ, 変換モード) ごとにキャッシュします。
     """
     def __init__(self, parent=None, fractal_controller=None):
         """
@@ -37,7 +39,10 @@ class RenderArea(QLabel):
 
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
-        self._original_pixmap = None
+        self._image_buffer: np.ndarray | None = None  # _original_image が参照する RGBA 配列 (QImage より長く保持する)
+        self._original_image: QImage | None = None  # _image_buffer をコピーせずに包んだ QImage
+        self._scaled_pixmap_key: tuple | None = None  # _scaled_pixmap を作ったときの (幅, 高さ, 変換モード)
+        self._scaled_pixmap: QPixmap | None = None  # 表示中の、ウィジェットのサイズに合わせたピックスマップ
         self.set_default_background()
 
         self.panning = False
@@ -89,9 +94,7 @@ class RenderArea(QLabel):
         if image_data_np is None or image_data_np.size == 0:
             # print("RenderArea: 画像データを受信しませんでした。デフォルトの背景を表示します。")
             # 画像データが受信されなかった場合はデフォルト背景を表示
-            self.set_default_background()
-            self._original_pixmap = None
-            self.clear()
+            self._clear_image()
             return
 
         try:
@@ -99,16 +102,12 @@ class RenderArea(QLabel):
             if channels != 4:
                 # print(f"RenderArea: 4チャンネル(RGBA)を期待しましたが、{channels}チャンネルでした。")
                 # RGBAの4チャンネルでない場合はデフォルト背景を表示
-                self.set_default_background()
-                self._original_pixmap = None
-                self.clear()
+                self._clear_image()
                 return
             if width == 0 or height == 0:
                 # print(f"RenderArea: 無効な画像サイズ ({width}x{height})。")
                 # 幅または高さが0の場合はデフォルト背景を表示
-                self.set_default_background()
-                self._original_pixmap = None
-                self.clear()
+                self._clear_image()
                 return
 
             if self.is_interactive_mode:
@@ -118,35 +117,55 @@ class RenderArea(QLabel):
                 # 高品質レンダリング後はスムーズなスケーリング
                 scaling_mode = Qt.TransformationMode.SmoothTransformation
 
-            pil_image = Image.fromarray(image_data_np, 'RGBA')
-            qimage = ImageQt.ImageQt(pil_image)
-            self._original_pixmap = QPixmap.fromImage(qimage)
+            # レンダラーの配列が C 連続の uint8 ならコピーせずにそのまま QImage で包む
+            buffer = np.ascontiguousarray(image_data_np, dtype=np.uint8)
+            self._image_buffer = buffer
+            self._original_image = QImage(buffer.data, width, height, buffer.strides[0], QImage.Format.Format_RGBA8888)
+            self._scaled_pixmap_key = None
+            self._scaled_pixmap = None
             self._display_scaled_pixmap(scaling_mode) # スケーリングモードを渡す
             # print(f"RenderArea: 画像更新 ({width}x{height})。表示サイズ: {self.width()}x{self.height()}")
             # 画像が更新された際のデバッグメッセージ
         except Exception as e:
             logger.log(f"画像更新中にエラーが発生しました - {e}", level="ERROR")
-            self.set_default_background()
-            self._original_pixmap = None
-            self.clear()
+            self._clear_image()
+
+    def _clear_image(self):
+        """保持している画像とキャッシュを破棄し、デフォルトの背景を表示します。"""
+        self.set_default_background()
+        self._original_image = None
+        self._image_buffer = None
+        self._scaled_pixmap_key = None
+        self._scaled_pixmap = None
+        self.clear()
 
     def _display_scaled_pixmap(self, mode=Qt.TransformationMode.SmoothTransformation):
         """
-        現在の `_original_pixmap` をウィジェットのサイズに合わせてスケーリングし、表示します。
+        現在の `_original_image` をウィジェットのサイズに合わせてスケーリングし、表示します。
         アスペクト比は維持されます。
+
+        同じ画像・ウィジェットのサイズ・変換モードで作ったピックスマップがあれば、スケーリングせずに再利用します。
+        画像がすでにウィジェットに収まる大きさ (通常のレンダリング結果) ならスケーリングしません。
+
         Args:
             mode (Qt.TransformationMode): スケーリングに使用するトランスフォーメーションモード。
         """
-        if self._original_pixmap and not self._original_pixmap.isNull():
-            scaled_pixmap = self._original_pixmap.scaled(
-                self.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                mode
-            )
-            self.setPixmap(scaled_pixmap)
-            self.setStyleSheet("")
-        else:
+        if self._original_image is None or self._original_image.isNull():
             self.set_default_background()
+            return
+
+        key = (self.width(), self.height(), mode)
+        if key != self._scaled_pixmap_key or self._scaled_pixmap is None:
+            target_size = self._original_image.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            if target_size == self._original_image.size() or target_size.isEmpty():
+                image = self._original_image
+            else:
+                image = self._original_image.scaled(target_size, Qt.AspectRatioMode.IgnoreAspectRatio, mode)
+            self._scaled_pixmap = QPixmap.fromImage(image)
+            self._scaled_pixmap_key = key
+        self.setPixmap(self._scaled_pixmap)
+        if self.styleSheet():
+            self.setStyleSheet("")  # スタイルの再適用は重いため、背景表示から切り替わるときだけ行う
 
     def resizeEvent(self, event):
         """
@@ -157,7 +176,7 @@ class RenderArea(QLabel):
             event (QResizeEvent): リサイズイベントオブジェクト。
         """
         super().resizeEvent(event)
-        if self._original_pixmap and not self._original_pixmap.isNull():
+        if self._original_image is not None and not self._original_image.isNull():
             self._display_scaled_pixmap()
 
         if not self.initial_render_complete:
@@ -0,0 +1,345 @@
+"""
+ゴールデン画像による回帰テストハーネス。
+
+参照ビューのカタログを各計算エンジンで描画し、保存済みのゴールデン反復回数配列
+（test/golden/*.npz）と完全一致または許容誤差内で比較する。
+正しさの確認と同時に処理速度（ピクセル/秒）を記録する。
+
+ゴールデンの再生成:
+    python -m test.golden_harness --update
+比較のみ実行:
+    python -m test.golden_harness
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mandelbrot_core import compute_mandelbrot_grid, select_precision, _generate_mandelbrot_custom_vectorized
+from numba_utils import RenderSchedule
+
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+THROUGHPUT_LOG = Path(__file__).parent.parent / "logs" / "golden_throughput.jsonl"
+
+# JIT最適化の対象となる基本式
+BASIC_FORMULAS = ('z * z + c', 'z**2 + c', 'z*z+c')
+
+
+@dataclass(frozen=True)
+class ReferenceView:
+    """ゴールデン画像を持つ参照ビュー"""
+    name: str
+    formula: str
+    re_start: float
+    re_end: float
+    im_start: float
+    im_end: float
+    width: int
+    height: int
+    max_iter: int
+
+    @property
+    def is_basic(self) -> bool:
+        """基本式（z * z + c）のビューかどうか"""
+        return self.formula.strip() in BASIC_FORMULAS
+
+    @property
+    def is_deep(self) -> bool:
+        """float64では精度が不足する深いズームのビューかどうか"""
+        return select_precision("auto", self.width, self.height, self.re_start, self.re_end,
+                                self.im_start, self.im_end) != "float64"
+
+
+@dataclass(frozen=True)
+class Engine:
+    """
+    比較対象の計算エンジン
+
+    max_mismatch_fraction は反復回数が一致しないピクセルの許容割合、
+    max_color_delta はグレースケール変換後の平均色差（0-255）の許容値。
+    """
+    name: str
+    compute: Callable[[ReferenceView], np.ndarray]
+    supports: Callable[[ReferenceView], bool]
+    max_mismatch_fraction: float = 0.0
+    max_color_delta: float = 0.0
+
+
+@dataclass
+class ComparisonResult:
+    """1つのビューと1つのエンジンの比較結果"""
+    view: str
+    engine: str
+    mismatch_fraction: float
+    max_iteration_delta: int
+    mean_color_delta: float
+    seconds: float
+    pixels_per_second: float
+    passed: bool
+
+
+def _basic_jit(schedule: RenderSchedule, precision: str = "float64") -> Callable[[ReferenceView], np.ndarray]:
+    """指定スケジュールと演算精度で基本式のJITグリッド計算を行う関数を返す"""
+    def compute(view: ReferenceView) -> np.ndarray:
+        return compute_mandelbrot_grid(view.width, view.height, view.re_start, view.re_end,
+                                       view.im_start, view.im_end, view.max_iter, schedule,
+                                       precision=precision)
+    return compute
+
+
+def _float64_basic(view: ReferenceView) -> bool:
+    """float64で計算できる基本式のビューかどうか"""
+    return view.is_basic and not view.is_deep
+
+
+def _custom_formula(exploit_symmetry: bool) -> Callable[[ReferenceView], np.ndarray]:
+    """カスタム式の最適化版で計算する関数を返す"""
+    def compute(view: ReferenceView) -> np.ndarray:
+        return _generate_mandelbrot_custom_vectorized(view.width, view.height, view.re_start, view.re_end,
+                                                      view.im_start, view.im_end, view.formula, view.max_iter,
+                                                      exploit_symmetry=exploit_symmetry)
+    return compute
+
+
+# 登録済みのエンジン（新しいバックエンドは register_engine で追加する）
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine):
+    """
+    比較対象のエンジンを登録する
+
+    Args:
+        engine: 登録するエンジン
+    """
+    ENGINES[engine.name] = engine
+
+
+# 各ビューで最初に登録されたエンジンがゴールデン生成に使われるため、
+# 参照エンジンは最適化を行わない全画素計算にする
+register_engine(Engine("basic_jit", _basic_jit(RenderSchedule(exploit_symmetry=False)), _float64_basic))
+# 深いズームのビューは倍々精度が参照エンジンになる。通常のビューではfloat64より
+# 正確な分だけ境界付近の画素がわずかに異なるため、許容誤差を設ける
+register_engine(Engine("basic_jit_double_double",
+                       _basic_jit(RenderSchedule(exploit_symmetry=False), precision="double_double"),
+                       lambda v: v.is_basic, max_mismatch_fraction=0.01, max_color_delta=0.1))
+register_engine(Engine("basic_jit_tiles",
+                       _basic_jit(RenderSchedule(strategy="tiles", tile_size=32, chunk_size=1,
+                                                 exploit_symmetry=False)),
+                       _float64_basic))
+register_engine(Engine("basic_jit_symmetric", _basic_jit(RenderSchedule()), _float64_basic))
+register_engine(Engine("basic_jit_tiles_symmetric",
+                       _basic_jit(RenderSchedule(strategy="tiles", tile_size=32, chunk_size=1)),
+                       _float64_basic))
+register_engine(Engine("basic_jit_double_double_symmetric",
+                       _basic_jit(RenderSchedule(), precision="double_double"),
+                       lambda v: v.is_basic, max_mismatch_fraction=0.01, max_color_delta=0.1))
+register_engine(Engine("custom_formula", _custom_formula(False), lambda v: not v.is_basic))
+register_engine(Engine("custom_formula_symmetric", _custom_formula(True), lambda v: not v.is_basic))
+
+
+# ゴールデンを持つ参照ビューのカタログ
+REFERENCE_VIEWS: List[ReferenceView] = [
+    ReferenceView("default", "z * z + c", -2.0, 1.0, -1.2, 1.2, 200, 150, 100),
+    ReferenceView("seahorse_valley", "z * z + c", -0.76, -0.73, 0.09, 0.1125, 160, 120, 300),
+    ReferenceView("elephant_valley", "z * z + c", 0.25, 0.35, -0.04, 0.035, 160, 120, 300),
+    ReferenceView("off_axis", "z * z + c", -0.2, 0.1, 0.6, 0.825, 160, 120, 200),
+    ReferenceView("cubic", "z * z * z + c", -1.5, 1.5, -1.5, 1.5, 96, 96, 50),
+    ReferenceView("deep_dendrite", "z * z + c", -0.101096363845622, -0.101096363845618,
+                  0.956286510809138, 0.956286510809142, 64, 64, 500),
+]
+
+
+def golden_path(view: ReferenceView) -> Path:
+    """ビューのゴールデンファイルのパスを返す"""
+    return GOLDEN_DIR / f"{view.name}.npz"
+
+
+def reference_engine(view: ReferenceView) -> Engine:
+    """ゴールデン生成に使うエンジン（ビューに対応する最初の登録エンジン）を返す"""
+    for engine in ENGINES.values():
+        if engine.supports(view):
+            return engine
+    raise ValueError(f"ビュー '{view.name}' に対応するエンジンがありません")
+
+
+def save_golden(view: ReferenceView, iterations: np.ndarray):
+    """
+    ゴールデン配列をビューの条件と一緒に保存する
+
+    Args:
+        view: 参照ビュー
+        iterations: 反復回数配列
+    """
+    GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(golden_path(view), iterations=iterations.astype(np.int32),
+                        view=json.dumps(asdict(view)))
+
+
+def load_golden(view: ReferenceView) -> np.ndarray:
+    """
+    ゴールデン配列を読み込む
+
+    Args:
+        view: 参照ビュー
+
+    Returns:
+        np.ndarray: 反復回数配列
+
+    Raises:
+        FileNotFoundError: ゴールデンファイルがない場合
+        ValueError: 保存時とビューの条件が異なる場合
+    """
+    with np.load(golden_path(view)) as data:
+        stored_view = json.loads(str(data["view"]))
+        if stored_view != asdict(view):
+            raise ValueError(f"ゴールデン '{view.name}' の描画条件がカタログと一致しません。--update で再生成してください")
+        return data["iterations"]
+
+
+def compare_iterations(actual: np.ndarray, expected: np.ndarray, max_iter: int) -> Dict[str, float]:
+    """
+    反復回数配列を比較する
+
+    色差はアプリのグレースケール変換（255 - n * 255 / max_iter）後の値で測る。
+
+    Args:
+        actual: 計算結果
+        expected: ゴールデン
+        max_iter: 最大反復回数
+
+    Returns:
+        Dict[str, float]: 不一致ピクセル割合、最大反復回数差、平均色差
+
+    Raises:
+        ValueError: 配列の形状が異なる場合
+    """
+    if actual.shape != expected.shape:
+        raise ValueError(f"配列の形状が異なります: {actual.shape} != {expected.shape}")
+    delta = np.abs(actual.astype(np.int64) - expected.astype(np.int64))
+    color_delta = delta * (255.0 / max_iter)
+    return {
+        "mismatch_fraction": float(np.count_nonzero(delta)) / delta.size,
+        "max_iteration_delta": int(delta.max()) if delta.size else 0,
+        "mean_color_delta": float(color_delta.mean()) if delta.size else 0.0,
+    }
+
+
+def run_engine(engine: Engine, view: ReferenceView, expected: np.ndarray) -> ComparisonResult:
+    """
+    エンジンでビューを描画し、ゴールデンとの比較結果と処理速度を返す
+
+    Args:
+        engine: 計算エンジン
+        view: 参照ビュー
+        expected: ゴールデン配列
+
+    Returns:
+        ComparisonResult: 比較結果
+    """
+    # JITコンパイルを測定から除外するため、1回目は計測しない
+    engine.compute(view)
+    start_time = time.perf_counter()
+    actual = engine.compute(view)
+    seconds = time.perf_counter() - start_time
+
+    stats = compare_iterations(actual, expected, view.max_iter)
+    passed = (stats["mismatch_fraction"] <= engine.max_mismatch_fraction
+              and stats["mean_color_delta"] <= engine.max_color_delta)
+    return ComparisonResult(
+        view=view.name,
+        engine=engine.name,
+        mismatch_fraction=stats["mismatch_fraction"],
+        max_iteration_delta=stats["max_iteration_delta"],
+        mean_color_delta=stats["mean_color_delta"],
+        seconds=seconds,
+        pixels_per_second=(view.width * view.height) / max(seconds, 1e-9),
+        passed=passed,
+    )
+
+
+def record_throughput(results: Sequence[ComparisonResult], log_path: Path = THROUGHPUT_LOG):
+    """
+    比較結果を処理速度の履歴としてJSON Linesで追記する
+
+    Args:
+        results: 比較結果
+        log_path: 追記先のパス
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(log_path, 'a', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps({"timestamp": timestamp, **asdict(result)}, ensure_ascii=False) + "\n")
+
+
+def run_harness(views: Optional[Sequence[ReferenceView]] = None,
+                engines: Optional[Sequence[Engine]] = None,
+                log_path: Optional[Path] = THROUGHPUT_LOG) -> List[ComparisonResult]:
+    """
+    全ビューを対応する全エンジンで描画し、ゴールデンと比較する
+
+    Args:
+        views: 参照ビュー（省略時はカタログ全体）
+        engines: エンジン（省略時は登録済み全体）
+        log_path: 処理速度の記録先（Noneの場合は記録しない）
+
+    Returns:
+        List[ComparisonResult]: 比較結果
+    """
+    views = REFERENCE_VIEWS if views is None else views
+    engines = list(ENGINES.values()) if engines is None else engines
+    results = []
+    for view in views:
+        expected = load_golden(view)
+        for engine in engines:
+            if engine.supports(view):
+                results.append(run_engine(engine, view, expected))
+    if log_path is not None:
+        record_throughput(results, log_path)
+    return results
+
+
+def update_goldens(views: Optional[Sequence[ReferenceView]] = None):
+    """
+    参照エンジンでゴールデンを再生成する
+
+    Args:
+        views: 再生成するビュー（省略時はカタログ全体）
+    """
+    for view in REFERENCE_VIEWS if views is None else views:
+        engine = reference_engine(view)
+        save_golden(view, engine.compute(view))
+        print(f"ゴールデンを更新しました: {golden_path(view)} ({engine.name})")
+
+
+def main():
+    """コマンドラインから比較またはゴールデンの再生成を行う"""
+    parser = argparse.ArgumentParser(description="ゴールデン画像による回帰テスト")
+    parser.add_argument("--update", action="store_true", help="ゴールデンを再生成する")
+    args = parser.parse_args()
+
+    if args.update:
+        update_goldens()
+        return
+
+    results = run_harness()
+    print(f"{'ビュー':<18} {'エンジン':<34} {'不一致率':>10} {'色差':>8} {'px/s':>14} 判定")
+    for r in results:
+        status = "OK" if r.passed else "NG"
+        print(f"{r.view:<18} {r.engine:<34} {r.mismatch_fraction:>10.4%} "
+              f"{r.mean_color_delta:>8.3f} {r.pixels_per_second:>14,.0f} {status}")
+    sys.exit(0 if all(r.passed for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
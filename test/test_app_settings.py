@@ -0,0 +1,109 @@
+"""
+設定オブジェクトと設定ファイル監視の単体テスト
+"""
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import FrozenInstanceError
+from PyQt6.QtCore import QCoreApplication
+from app_settings import AppSettings, load_settings, as_settings
+from config_watcher import ConfigWatcher
+
+
+class TestAppSettings(unittest.TestCase):
+    """AppSettings の検証とデフォルト値補完のテストクラス"""
+
+    def test_defaults_for_missing_sections(self):
+        """欠けているセクションがデフォルト値で補完されることのテスト"""
+        settings = AppSettings.from_dict({})
+        self.assertEqual(settings.mandelbrot.max_iterations, 100)
+        self.assertEqual(settings.mandelbrot.real_start, -2.0)
+        self.assertEqual(settings.performance.num_threads, 0)
+        self.assertEqual(settings.performance.precision, "auto")
+
+    def test_load_project_config(self):
+        """同梱の config.json が検証を通過することのテスト"""
+        settings = load_settings("config.json")
+        self.assertEqual(settings.window.image_width, 800)
+        self.assertEqual(settings.mandelbrot.imaginary_end, 1.2)
+
+    def test_immutable(self):
+        """設定オブジェクトが変更不可であることのテスト"""
+        settings = AppSettings.from_dict({})
+        with self.assertRaises(FrozenInstanceError):
+            settings.mandelbrot.max_iterations = 10
+
+    def test_roundtrip_dict(self):
+        """辞書への変換と再構築で同じ設定になることのテスト"""
+        settings = AppSettings.from_dict({"performance": {"num_threads": 2, "tile_size": 32}})
+        self.assertEqual(AppSettings.from_dict(settings.to_dict()), settings)
+        self.assertIs(as_settings(settings), settings)
+
+    def test_validation_errors(self):
+        """不正な設定値で ValueError が発生することのテスト"""
+        invalid_configs = [
+            {"mandelbrot": {"max_iterations": 0}},
+            {"mandelbrot": {"max_iterations": "100"}},
+            {"mandelbrot": {"real_range": {"start": 1.0, "end": -2.0}}},
+            {"performance": {"precision": "float16"}},
+            {"performance": {"num_threads": -1}},
+            {"window": []},
+            {"performance": {"auto_tune": "yes"}},
+            {"logging": {"enabled": "1"}},
+        ]
+        for config in invalid_configs:
+            with self.assertRaises(ValueError, msg=str(config)):
+                AppSettings.from_dict(config)
+
+    def test_bool_strings(self):
+        """真偽値の文字列は大文字小文字を問わず "true"/"false" のみ受け付けることのテスト"""
+        settings = AppSettings.from_dict({"performance": {"auto_tune": "TRUE", "exploit_symmetry": "False"}})
+        self.assertTrue(settings.performance.auto_tune)
+        self.assertFalse(settings.performance.exploit_symmetry)
+
+
+class TestConfigWatcher(unittest.TestCase):
+    """ConfigWatcher の差し替え処理のテストクラス"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self._write({"mandelbrot": {"max_iterations": 100}})
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, config: dict):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+    def test_reload_swaps_and_notifies(self):
+        """変更後の再読み込みで新しい設定に差し替わり通知されることのテスト"""
+        watcher = ConfigWatcher(self.path, load_settings(self.path))
+        received = []
+        watcher.settings_changed.connect(received.append)
+
+        self._write({"mandelbrot": {"max_iterations": 250}})
+        self.assertTrue(watcher.reload())
+        self.assertEqual(watcher.settings.mandelbrot.max_iterations, 250)
+        self.assertEqual(len(received), 1)
+        self.assertIs(received[0], watcher.settings)
+
+    def test_invalid_file_keeps_current(self):
+        """不正な設定ファイルでは現在の設定が維持されることのテスト"""
+        original = load_settings(self.path)
+        watcher = ConfigWatcher(self.path, original)
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{ invalid json")
+        self.assertFalse(watcher.reload())
+        self.assertIs(watcher.settings, original)
+
+
+if __name__ == '__main__':
+    unittest.main()
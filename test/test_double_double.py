@@ -0,0 +1,65 @@
+"""
+倍々精度カーネルと演算精度の自動選択の単体テスト
+"""
+import unittest
+from decimal import Decimal, localcontext
+from mandelbrot_core import compute_mandelbrot_grid, select_precision
+from numba_utils import RenderSchedule
+
+
+def _decimal_iterations(c_real: Decimal, c_imag: Decimal, max_iter: int) -> int:
+    """多倍長十進数で z = z^2 + c の発散までの反復回数を計算する（検証用）"""
+    z_real = Decimal(0)
+    z_imag = Decimal(0)
+    for i in range(max_iter):
+        z_real, z_imag = z_real * z_real - z_imag * z_imag + c_real, 2 * z_real * z_imag + c_imag
+        if z_real * z_real + z_imag * z_imag > 4:
+            return i
+    return max_iter
+
+
+class TestDoubleDouble(unittest.TestCase):
+    """倍々精度計算のテストクラス"""
+
+    def setUp(self):
+        # ピクセル間隔 1.25e-16 の深いズーム（float64では座標が丸められる）
+        self.width = self.height = 32
+        self.view = (-0.101096363845622, -0.101096363845618, 0.956286510809138, 0.956286510809142)
+        self.max_iter = 300
+
+    def test_select_precision(self):
+        """ピクセル間隔に応じた演算精度の選択のテスト"""
+        self.assertEqual(select_precision("auto", 800, 600, -2.0, 1.0, -1.2, 1.2), "float64")
+        self.assertEqual(select_precision("auto", self.width, self.height, *self.view), "double_double")
+        self.assertEqual(select_precision("float64", self.width, self.height, *self.view), "float64")
+        self.assertEqual(select_precision("double_double", 800, 600, -2.0, 1.0, -1.2, 1.2), "double_double")
+
+    def test_matches_high_precision_reference(self):
+        """深いズームで倍々精度の結果が多倍長計算と一致することのテスト"""
+        re_start, re_end, im_start, im_end = self.view
+        iterations = compute_mandelbrot_grid(
+            self.width, self.height, re_start, re_end, im_start, im_end,
+            self.max_iter, RenderSchedule(), precision="double_double")
+
+        pixel_width = (re_end - re_start) / self.width
+        pixel_height = (im_end - im_start) / self.height
+        with localcontext() as ctx:
+            ctx.prec = 60
+            for y in range(0, self.height, 5):
+                for x in range(0, self.width, 5):
+                    c_real = Decimal(re_start) + x * Decimal(pixel_width)
+                    c_imag = Decimal(im_start) + y * Decimal(pixel_height)
+                    with self.subTest(x=x, y=y):
+                        self.assertEqual(iterations[y, x],
+                                         _decimal_iterations(c_real, c_imag, self.max_iter))
+
+    def test_symmetric_view_matches_full(self):
+        """倍々精度でも実軸対称性の利用結果が全画素計算と一致することのテスト"""
+        args = (64, 64, -1.75, -1.75 + 2.0 ** -40, -2.0 ** -41, 2.0 ** -41, 200)
+        full = compute_mandelbrot_grid(*args, RenderSchedule(exploit_symmetry=False), precision="double_double")
+        mirrored = compute_mandelbrot_grid(*args, RenderSchedule(), precision="double_double")
+        self.assertTrue((full == mirrored).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
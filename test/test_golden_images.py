@@ -0,0 +1,49 @@
+"""
+ゴールデン画像による回帰テスト
+"""
+import unittest
+import numpy as np
+from test.golden_harness import (
+    REFERENCE_VIEWS, ENGINES, load_golden, run_harness, compare_iterations
+)
+
+
+class TestGoldenImages(unittest.TestCase):
+    """各エンジンの計算結果がゴールデンと一致することのテストクラス"""
+
+    def test_goldens_exist(self):
+        """全参照ビューのゴールデンが存在することのテスト"""
+        for view in REFERENCE_VIEWS:
+            with self.subTest(view=view.name):
+                golden = load_golden(view)
+                self.assertEqual(golden.shape, (view.height, view.width))
+
+    def test_engines_match_goldens(self):
+        """全エンジンの結果が許容誤差内でゴールデンと一致することのテスト"""
+        results = run_harness()
+        self.assertTrue(results)
+        for result in results:
+            with self.subTest(view=result.view, engine=result.engine):
+                engine = ENGINES[result.engine]
+                self.assertTrue(
+                    result.passed,
+                    f"不一致率 {result.mismatch_fraction:.4%} (許容 {engine.max_mismatch_fraction:.4%}), "
+                    f"平均色差 {result.mean_color_delta:.3f} (許容 {engine.max_color_delta:.3f})")
+                self.assertGreater(result.pixels_per_second, 0)
+
+    def test_compare_iterations(self):
+        """比較関数の統計値のテスト"""
+        expected = np.zeros((2, 2), dtype=np.int32)
+        actual = expected.copy()
+        actual[0, 0] = 10
+        stats = compare_iterations(actual, expected, max_iter=100)
+        self.assertEqual(stats["mismatch_fraction"], 0.25)
+        self.assertEqual(stats["max_iteration_delta"], 10)
+        self.assertAlmostEqual(stats["mean_color_delta"], 25.5 / 4)
+
+        with self.assertRaises(ValueError):
+            compare_iterations(actual, np.zeros((3, 2), dtype=np.int32), max_iter=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
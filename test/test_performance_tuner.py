@@ -0,0 +1,82 @@
+"""
+並列計算の自動チューニングの単体テスト
+"""
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+import numba
+import numpy as np
+from app_settings import PerformanceSettings
+from mandelbrot_core import compute_mandelbrot_grid
+from numba_utils import RenderSchedule
+from performance_tuner import (
+    TuningProfile, load_tuning_profile, save_tuning_profile,
+    resolve_render_schedule, run_calibration
+)
+
+
+class TestPerformanceTuner(unittest.TestCase):
+    """スケジュール決定とキャリブレーションのテストクラス"""
+
+    def setUp(self):
+        self.profile = TuningProfile(
+            num_threads=2, strategy="tiles", tile_size=32, chunk_size=1,
+            pixels_per_second=1.0, max_threads=numba.config.NUMBA_NUM_THREADS,
+            numba_version=numba.__version__, created_at="2026-01-01T00:00:00")
+
+    def test_tiled_grid_matches_rows(self):
+        """タイル分割と行分割の計算結果が一致することのテスト"""
+        args = (97, 61, -2.0, 1.0, -1.2, 1.2, 60)
+        rows = compute_mandelbrot_grid(*args, RenderSchedule(strategy="rows", chunk_size=4))
+        tiles = compute_mandelbrot_grid(*args, RenderSchedule(strategy="tiles", tile_size=16, chunk_size=1))
+        np.testing.assert_array_equal(rows, tiles)
+
+    def test_profile_used_for_auto(self):
+        """自動設定ではプロファイルの値が使われることのテスト"""
+        schedule = resolve_render_schedule(PerformanceSettings(), self.profile)
+        self.assertEqual(schedule, RenderSchedule(num_threads=2, strategy="tiles", tile_size=32, chunk_size=1))
+
+    def test_explicit_settings_override_profile(self):
+        """明示的な設定がプロファイルより優先されることのテスト"""
+        performance = replace(PerformanceSettings(), num_threads=3, schedule="rows", chunk_size=8)
+        schedule = resolve_render_schedule(performance, self.profile)
+        self.assertEqual(schedule.num_threads, 3)
+        self.assertEqual(schedule.strategy, "rows")
+        self.assertEqual(schedule.chunk_size, 8)
+
+    def test_parallel_disabled_uses_single_thread(self):
+        """並列処理が無効な場合は1スレッドになることのテスト"""
+        performance = replace(PerformanceSettings(), use_parallel_processing=False)
+        self.assertEqual(resolve_render_schedule(performance, self.profile).num_threads, 1)
+
+    def test_profile_roundtrip(self):
+        """プロファイルの保存と読み込みのテスト"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            save_tuning_profile(self.profile, path)
+            self.assertEqual(load_tuning_profile(path), self.profile)
+        finally:
+            os.remove(path)
+
+    def test_profile_from_other_environment_ignored(self):
+        """別環境のプロファイルが無視されることのテスト"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            save_tuning_profile(replace(self.profile, numba_version="0.0.0"), path)
+            self.assertIsNone(load_tuning_profile(path))
+        finally:
+            os.remove(path)
+
+    def test_run_calibration(self):
+        """キャリブレーションが候補内の設定を選ぶことのテスト"""
+        profile = run_calibration(repeats=1, max_threads=2, tile_sizes=(32,), chunk_sizes=(0,))
+        self.assertIn(profile.num_threads, (1, 2))
+        self.assertIn(profile.strategy, ("rows", "tiles"))
+        self.assertGreater(profile.pixels_per_second, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+実軸対称性の判定と鏡映計算の単体テスト
+"""
+import unittest
+import numpy as np
+from mandelbrot_core import compute_mandelbrot_grid, is_conjugate_symmetric, real_axis_mirror_rows
+from numba_utils import RenderSchedule
+
+
+class TestRealAxisSymmetry(unittest.TestCase):
+    """実軸対称性の利用に関するテストクラス"""
+
+    def test_conjugate_symmetric_formulas(self):
+        """共役対称な数式が対称と判定されることのテスト"""
+        for formula in ["z * z + c", "z**3 + c", "sin(z) + c", "z**2 + c*cos(z)",
+                        "z * z + c * n", "exp(z) - 0.5 * c", "-z**2 + pi * c"]:
+            with self.subTest(formula=formula):
+                self.assertTrue(is_conjugate_symmetric(formula))
+
+    def test_non_symmetric_formulas(self):
+        """複素係数や未知の名前を含む数式が非対称と判定されることのテスト"""
+        for formula in ["z * z + c + 0.1j", "z * z + 1j * c", "z * z + c.imag",
+                        "z * z + foo(c)", "z * z + ", "z if n else c", "True * z + c"]:
+            with self.subTest(formula=formula):
+                self.assertFalse(is_conjugate_symmetric(formula))
+
+    def test_mirror_rows_default_view(self):
+        """既定の表示範囲で対称な行の組が求まることのテスト"""
+        # 虚部 -1.2..1.2 を600行に分割すると、行300が実軸、行yと行600-yが対称
+        self.assertEqual(real_axis_mirror_rows(600, -1.2, 2.4 / 600), (600, 1, 299))
+
+    def test_mirror_rows_unaligned_or_off_axis(self):
+        """実軸をまたがない、またはピクセルが揃わない場合はNoneになることのテスト"""
+        self.assertIsNone(real_axis_mirror_rows(120, 0.6, 0.225 / 120))
+        self.assertIsNone(real_axis_mirror_rows(100, -1.0, 2.0 / 99.5))
+
+    def test_symmetric_grid_matches_full(self):
+        """対称性を利用した計算が全画素計算と一致することのテスト"""
+        views = [(-2.0, 1.0, -1.2, 1.2), (-2.0, 1.0, -0.5, 1.5), (-2.0, 1.0, -1.5, 0.5)]
+        for view in views:
+            re_start, re_end, im_start, im_end = view
+            with self.subTest(view=view):
+                args = (120, 100, re_start, re_end, im_start, im_end, 80)
+                full = compute_mandelbrot_grid(*args, RenderSchedule(exploit_symmetry=False))
+                mirrored = compute_mandelbrot_grid(*args, RenderSchedule())
+                np.testing.assert_array_equal(full, mirrored)
+
+
+if __name__ == '__main__':
+    unittest.main()